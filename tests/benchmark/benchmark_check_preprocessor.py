@@ -0,0 +1,69 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Measure the time to preprocess files with many check_relation calls
+
+The generated files mix check_relation calls with strings, character literals, qualified expressions and
+comments. The time per call should stay constant when the number of calls grows.
+
+  python tests/benchmark/benchmark_check_preprocessor.py --num-calls 1000 2000 4000 8000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position
+from vunit.check_preprocessor import CheckPreprocessor
+
+CALLS = [
+    "check_relation(a{idx:d} = b{idx:d});\n",
+    'check_relation(len("Smile :-)") = {idx:d}, "Message with ) and ( characters");\n',
+    "check_relation(std_logic'('1') = sig{idx:d}, level => warning); -- Comment with ) and (\n",
+    "check_relation(ascii(')') /= /* Block comment with ) */ {idx:d});\n",
+]
+
+
+def create_code(num_calls):
+    """
+    Return the code of a test bench with num_calls check_relation calls
+    """
+    code = "architecture a of tb is\nbegin\n  main : process\n  begin\n"
+    for idx in range(num_calls):
+        code += "    " + CALLS[idx % len(CALLS)].format(idx=idx)
+        code += f"    wait for {idx:d} ns; -- Some filler code with a 'quote'\n"
+    code += "  end process;\nend architecture;\n"
+    return code
+
+
+def main():
+    """
+    Run the benchmark for each number of calls
+    """
+    parser = argparse.ArgumentParser(description="Measure the check preprocessor time")
+    parser.add_argument("--num-calls", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    preprocessor = CheckPreprocessor()
+    print(f"{'calls':>8s} {'size':>10s} {'time':>10s} {'per call':>10s}")
+    for num_calls in args.num_calls:
+        code = create_code(num_calls)
+        elapsed = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = preprocessor.run(code, "tb.vhd")
+            elapsed = min(elapsed, time.perf_counter() - start)
+        assert result.count("context_msg =>") == num_calls
+        print(f"{num_calls:8d} {len(code):10d} {elapsed:9.3f}s {1e6 * elapsed / num_calls:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
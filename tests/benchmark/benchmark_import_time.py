@@ -0,0 +1,75 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Measure the time it takes to import vunit
+
+The cumulative import time is measured by python -X importtime in a new interpreter for each repetition and
+the fastest repetition is compared to the budget. The slowest modules are listed to find what to make lazy.
+
+  python tests/benchmark/benchmark_import_time.py --budget-ms 400
+"""
+
+import argparse
+import sys
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+
+# Budget in milliseconds for the cumulative import time of vunit
+IMPORT_TIME_BUDGET_MS = 400
+
+
+def import_times(module):
+    """
+    Return a dictionary mapping the name of each module imported when importing module
+    to its cumulative import time in microseconds
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module!s}"],
+        cwd=str(ROOT),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+
+    result = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        try:
+            result[fields[2].strip()] = int(fields[1])
+        except ValueError:
+            # Header line
+            continue
+    return result
+
+
+def main():
+    """
+    Measure the import time and exit with an error if it exceeds the budget
+    """
+    parser = argparse.ArgumentParser(description="Measure the time it takes to import vunit")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    times = min((import_times("vunit") for _ in range(args.repeat)), key=lambda times: times["vunit"])
+    for name, time_us in sorted(times.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{time_us / 1000.0:8.1f} ms {name!s}")
+
+    import_time_ms = times["vunit"] / 1000.0
+    print(f"Importing vunit took {import_time_ms:.1f} ms with a budget of {args.budget_ms:.1f} ms")
+    if import_time_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
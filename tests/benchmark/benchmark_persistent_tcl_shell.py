@@ -0,0 +1,115 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Measure the per test overhead of the persistent TCL shell
+
+The read eval loop of the vsim based simulators is run by tclsh with stubs for the VUnit procedures
+such that only the communication with the persistent shell is measured. Running a test with one
+command per round trip is compared to running it as a single script.
+
+  python tests/benchmark/benchmark_persistent_tcl_shell.py --num-tests 1000
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position
+from vunit.ostools import Process, write_file
+from vunit.persistent_tcl_shell import PersistentTclShell
+from vunit.sim_if.vsim_simulator_mixin import fix_path
+
+LOOP_FILE_NAME = Path(__file__).parent.parent.parent / "vunit" / "sim_if" / "tcl_read_eval_loop.tcl"
+
+STUBS = """\
+fconfigure stdout -buffering line
+proc quit {args} {
+    if {"-sim" ni $args} {
+        exit 0
+    }
+}
+"""
+
+COMMON = """\
+proc vunit_load {} {
+    return false
+}
+proc vunit_run {} {
+    return false
+}
+"""
+
+
+def run_one_command_per_round_trip(shell, common_file_name):
+    """
+    Run a test the way it was done before scripts were supported
+    """
+    shell.execute(f'source "{fix_path(common_file_name)!s}"')
+    shell.execute("set failed [vunit_load]")
+    assert not shell.read_bool("failed")
+    shell.execute("set failed [vunit_run]")
+    assert not shell.read_bool("failed")
+    shell.execute("quit -sim")
+
+
+def run_script(shell, common_file_name):
+    """
+    Run a test with a single script
+    """
+    replies = shell.execute_script(
+        [
+            f'source "{fix_path(common_file_name)!s}"',
+            "if {[vunit_load]} {error {vunit_load failed}}",
+            "vunit_run",
+            "quit -sim",
+        ]
+    )
+    assert replies[2].value == "false"
+
+
+def main():
+    """
+    Run the benchmark
+    """
+    parser = argparse.ArgumentParser(description="Measure the per test overhead of the persistent TCL shell")
+    parser.add_argument("--tclsh", default=shutil.which("tclsh"))
+    parser.add_argument("--num-tests", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.tclsh is None:
+        print("tclsh was not found")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as output_path:
+        script_file_name = str(Path(output_path) / "loop.tcl")
+        write_file(script_file_name, STUBS + f'source "{fix_path(str(LOOP_FILE_NAME))!s}"\n')
+        common_file_name = str(Path(output_path) / "common.do")
+        write_file(common_file_name, COMMON)
+
+        shell = PersistentTclShell(create_process=lambda ident: Process([args.tclsh, script_file_name]))
+        try:
+            for name, function in [
+                ("one command per round trip", run_one_command_per_round_trip),
+                ("script", run_script),
+            ]:
+                function(shell, common_file_name)
+                start = time.perf_counter()
+                for _ in range(args.num_tests):
+                    function(shell, common_file_name)
+                elapsed = time.perf_counter() - start
+                print(f"{name:>26s}: {1e6 * elapsed / args.num_tests:8.1f} us per test")
+        finally:
+            shell.teardown()
+
+
+if __name__ == "__main__":
+    main()
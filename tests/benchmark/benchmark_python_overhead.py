@@ -0,0 +1,243 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Measure the overhead of VUnit itself on a synthetic project
+
+The simulator is replaced by a stub that neither compiles nor simulates anything such that only the
+Python side of VUnit is measured. The results are written as JSON to track regressions over time.
+
+  python tests/benchmark/benchmark_python_overhead.py --num-files 1000 --depth 10 -o overhead.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position
+from vunit import VUnit
+from vunit.about import version
+from vunit.ostools import write_file
+from vunit.sim_if import SimulatorInterface
+from vunit.test.runner import TestScheduler
+from vunit.test.suites import get_result_file_name
+from tests.benchmark.synthetic_project import SyntheticProject
+
+
+class StubSimulator(SimulatorInterface):
+    """
+    A simulator which passes all files and tests without running anything
+    """
+
+    name = "stub"
+    package_users_depend_on_bodies = False
+
+    @classmethod
+    def from_args(cls, args, output_path, **kwargs):  # pylint: disable=unused-argument
+        return cls(output_path=output_path, gui=False)
+
+    def _compile_source_file(self, source_file, printer):  # pylint: disable=unused-argument
+        return True
+
+    @staticmethod
+    def compile_source_file_command(source_file):  # pylint: disable=unused-argument
+        return []
+
+    @staticmethod
+    def simulate(output_path, test_suite_name, config, elaborate_only):  # pylint: disable=unused-argument
+        test_name = test_suite_name.split(".", 2)[-1]
+        write_file(get_result_file_name(output_path), f"test_start:{test_name!s}\ntest_suite_done\n")
+        return True
+
+
+class Benchmark(object):
+    """
+    Time the phases of VUnit on a synthetic project
+    """
+
+    def __init__(self, project, root, repeat, num_threads):
+        self._project = project
+        self._root = Path(root)
+        self._repeat = repeat
+        self._num_threads = num_threads
+        self._file_names = project.generate(self._root / "project")
+        self.results = {}
+
+    def _time(self, name, function, setup=None):
+        """
+        Record the minimum execution time of function, setup is called before each repetition
+        and its return value is passed to function
+        """
+        timings = []
+        for _ in range(self._repeat):
+            argument = setup() if setup is not None else None
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                function(argument)
+                timings.append(time.perf_counter() - start)
+        self.results[name] = min(timings)
+
+    def _create_vunit(self, *args, clean=False):
+        """
+        Create a VUnit instance using the stub simulator
+        """
+        argv = ["--output-path", str(self._root / "vunit_out"), "--no-color", "-p", str(self._num_threads)]
+        argv += ["--clean"] if clean else []
+        with mock.patch("vunit.sim_if.factory.SIMULATOR_FACTORY.select_simulator", return_value=StubSimulator):
+            vunit = VUnit.from_argv(argv=argv + list(args))
+        vunit.add_vhdl_builtins()
+        vunit.add_verilog_builtins()
+        return vunit
+
+    def _add_source_files(self, vunit):
+        """
+        Add the source files of the project to vunit
+        """
+        lib = vunit.add_library("lib")
+        vhdl_file_names = [file_name for file_name in self._file_names if file_name.endswith(".vhd")]
+        sv_file_names = [file_name for file_name in self._file_names if file_name.endswith(".sv")]
+        if vhdl_file_names:
+            lib.add_source_files(vhdl_file_names)
+        if sv_file_names:
+            lib.add_source_files(sv_file_names, include_dirs=[str(self._root / "project" / "include")])
+        return vunit
+
+    @staticmethod
+    def _main(vunit):
+        """
+        Run the main function of VUnit without exiting
+        """
+        with mock.patch("vunit.sim_if.factory.SIMULATOR_FACTORY.select_simulator", return_value=StubSimulator):
+            try:
+                vunit.main()
+            except SystemExit as exc:
+                assert exc.code == 0, f"VUnit exited with code {exc.code!r}"
+
+    def _test_suites(self):
+        """
+        Return test suites and test history for the scheduler
+        """
+
+        class TestSuite(object):
+            def __init__(self, name, test_names, file_name):
+                self.name = name
+                self.test_names = test_names
+                self.file_name = file_name
+
+        test_suites = []
+        test_history = {}
+        for idx in range(self._project.num_testbenches * self._project.num_tests):
+            name = f"lib.tb_{idx % self._project.num_testbenches:d}.test_{idx:d}"
+            test_suites.append(TestSuite(name, [name], f"tb_{idx:d}.vhd"))
+            if idx % 4:
+                test_history[name] = {
+                    name: {"start_time": 0, "skipped": False, "failed": idx % 3 == 0, "total_time": 0.1 * (idx % 7)}
+                }
+        return test_suites, test_history, {test_suite.file_name: 1 for test_suite in test_suites}
+
+    def run(self):
+        """
+        Time all phases
+        """
+        self._time(
+            "add_source_files_cold",
+            self._add_source_files,
+            setup=lambda: self._create_vunit(clean=True),
+        )
+        self._time("add_source_files_warm", self._add_source_files, setup=self._create_vunit)
+
+        vunit = self._add_source_files(self._create_vunit())
+        self._time("create_dependency_graph", lambda _: vunit._project.create_dependency_graph(True))
+        self._time(
+            "get_files_in_compile_order",
+            lambda _: vunit._project.get_files_in_compile_order(incremental=False),
+        )
+
+        self._time("list", self._main, setup=lambda: self._add_source_files(self._create_vunit("--list")))
+        self._time(
+            "export_json",
+            self._main,
+            setup=lambda: self._add_source_files(self._create_vunit("--export-json", str(self._root / "export.json"))),
+        )
+        self._time("compile", self._main, setup=lambda: self._add_source_files(self._create_vunit("--compile")))
+
+        test_suites, test_history, latest_dependency_updates = self._test_suites()
+
+        def schedule(_):
+            scheduler = TestScheduler(test_suites, self._num_threads, latest_dependency_updates, test_history)
+            thread_id = 0
+            try:
+                while True:
+                    scheduler.next(thread_id)
+                    scheduler.test_done(thread_id)
+                    thread_id = (thread_id + 1) % self._num_threads
+            except StopIteration:
+                pass
+
+        self._time("test_scheduler", schedule)
+        self._time("test_runner", self._main, setup=lambda: self._add_source_files(self._create_vunit()))
+
+
+def main():
+    """
+    Run the benchmark and write the results as JSON
+    """
+    parser = argparse.ArgumentParser(description="Measure the overhead of VUnit itself on a synthetic project")
+    parser.add_argument("--num-files", type=int, default=200, help="Number of packages")
+    parser.add_argument("--depth", type=int, default=8, help="Depth of the package dependency graph")
+    parser.add_argument("--fan-out", type=int, default=3, help="Number of dependencies of each package")
+    parser.add_argument("--num-testbenches", type=int, default=50)
+    parser.add_argument("--num-tests", type=int, default=5, help="Number of tests per test bench")
+    parser.add_argument("--include-size", type=int, default=50, help="Lines in each package and include file")
+    parser.add_argument("--language", choices=SyntheticProject.LANGUAGES, default="mixed")
+    parser.add_argument("-p", "--num-threads", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", default=None, help="JSON output file, standard output by default")
+    args = parser.parse_args()
+
+    project = SyntheticProject(
+        num_files=args.num_files,
+        depth=args.depth,
+        fan_out=args.fan_out,
+        num_testbenches=args.num_testbenches,
+        num_tests=args.num_tests,
+        include_size=args.include_size,
+        language=args.language,
+    )
+
+    with tempfile.TemporaryDirectory() as root:
+        benchmark = Benchmark(project, root, args.repeat, args.num_threads)
+        benchmark.run()
+
+    output = json.dumps(
+        {
+            "vunit": version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": dict(project.to_dict(), num_threads=args.num_threads, repeat=args.repeat),
+            "timings": benchmark.results,
+        },
+        indent=2,
+        sort_keys=True,
+    )
+
+    if args.output is None:
+        print(output)
+    else:
+        write_file(args.output, output + "\n")
+
+
+if __name__ == "__main__":
+    main()
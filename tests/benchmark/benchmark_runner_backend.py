@@ -0,0 +1,113 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Compare the thread and process backends of the test runner
+
+Each test suite emulates a chatty simulator by starting a process printing many lines which are
+consumed and written to the test output line by line, the same way as the simulator interfaces do.
+
+  python tests/benchmark/benchmark_runner_backend.py -p 16 --num-tests 64 --num-lines 20000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# pylint: disable=wrong-import-position
+from vunit.ostools import Process
+from vunit.test.list import TestList
+from vunit.test.report import TestReport
+from vunit.test.runner import TestRunner
+from vunit.color_printer import NO_COLOR_PRINTER
+
+
+class ChattyTestCase(object):
+    """
+    A test case running a process which prints num_lines lines
+    """
+
+    def __init__(self, name, num_lines):
+        self.name = name
+        self._num_lines = num_lines
+
+    def run(self, output_path, read_output):  # pylint: disable=unused-argument
+        """
+        Run the chatty process and pass if the transcript ends with the expected line
+        """
+        process = Process(
+            [
+                sys.executable,
+                "-c",
+                f"for idx in range({self._num_lines:d}): print('# ** Note: transcript line', idx)",
+            ]
+        )
+        last = []
+
+        def consume(line):
+            print(line)
+            last[:] = [line]
+
+        process.consume_output(consume)
+        return read_output().endswith(f"{self._num_lines - 1:d}\n") and bool(last)
+
+    @staticmethod
+    def get_seed():
+        return "0123456789abcdef"
+
+
+def run(backend, args):
+    """
+    Run the benchmark test suites with a backend and return the execution time
+    """
+    test_list = TestList()
+    for idx in range(args.num_tests):
+        test_list.add_test(ChattyTestCase(f"lib.tb.test{idx:d}", args.num_lines))
+
+    report = TestReport(printer=NO_COLOR_PRINTER)
+    with tempfile.TemporaryDirectory() as output_path:
+        runner = TestRunner(
+            report,
+            output_path,
+            verbosity=TestRunner.VERBOSITY_QUIET,
+            num_threads=args.num_threads,
+            backend=backend,
+        )
+        start = time.perf_counter()
+        runner.run(test_list)
+        elapsed = time.perf_counter() - start
+
+    assert report.all_ok()
+    return elapsed
+
+
+def main():
+    """
+    Run the benchmark for both backends
+    """
+    parser = argparse.ArgumentParser(description="Compare the test runner backends")
+    parser.add_argument("-p", "--num-threads", type=int, default=8)
+    parser.add_argument("--num-tests", type=int, default=32)
+    parser.add_argument("--num-lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    for backend in TestRunner.BACKENDS:
+        results[backend] = min(run(backend, args) for _ in range(args.repeat))
+
+    print()
+    print(f"{args.num_tests:d} tests with {args.num_lines:d} lines of output each, p = {args.num_threads:d}")
+    for backend, elapsed in results.items():
+        print(f"{backend:>8s}: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Generate synthetic VHDL and SystemVerilog projects of configurable size
+
+The packages of a project are organized in layers. Each package in a layer depends on fan_out
+packages in the layer below such that the depth of the dependency graph is the number of layers.
+The test benches depend on packages in the top layer.
+"""
+
+import random
+from pathlib import Path
+from vunit.ostools import write_file
+
+
+class SyntheticProject(object):
+    """
+    The parameters of a synthetic project
+    """
+
+    LANGUAGES = ("vhdl", "sv", "mixed")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        num_files=200,
+        depth=8,
+        fan_out=3,
+        num_testbenches=50,
+        num_tests=5,
+        include_size=50,
+        language="vhdl",
+        seed=0,
+    ):
+        assert language in self.LANGUAGES
+        self.num_files = num_files
+        self.depth = max(1, min(depth, num_files))
+        self.fan_out = fan_out
+        self.num_testbenches = num_testbenches
+        self.num_tests = num_tests
+        self.include_size = include_size
+        self.language = language
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    def _layers(self):
+        """
+        Return the number of packages in each layer
+        """
+        layer_size, remainder = divmod(self.num_files, self.depth)
+        return [layer_size + (1 if idx < remainder else 0) for idx in range(self.depth)]
+
+    def _language_of(self, idx):
+        if self.language == "mixed":
+            return "vhdl" if idx % 2 == 0 else "sv"
+        return self.language
+
+    def generate(self, root):
+        """
+        Write the project to root and return the source file names in a random order
+        """
+        rng = random.Random(self.seed)
+        root = Path(root)
+        files = []
+
+        previous_layer = []
+        for layer, layer_size in enumerate(self._layers()):
+            current_layer = []
+            for idx in range(layer_size):
+                name = f"pkg_{layer:d}_{idx:d}"
+                dependencies = rng.sample(previous_layer, min(self.fan_out, len(previous_layer)))
+                language = self._language_of(idx)
+                files.append(self._write_package(root, language, name, dependencies))
+                current_layer.append((language, name))
+            previous_layer = current_layer
+
+        for idx in range(self.num_testbenches):
+            dependencies = rng.sample(previous_layer, min(self.fan_out, len(previous_layer)))
+            language = self._language_of(idx)
+            files.append(self._write_testbench(root, language, f"tb_{idx:d}", dependencies))
+
+        rng.shuffle(files)
+        return [str(file_name) for file_name in files]
+
+    def _write_package(self, root, language, name, dependencies):
+        """
+        Write a package depending on the packages of the same language in dependencies
+        """
+        constants = [f"c_{idx:d}" for idx in range(self.include_size)]
+
+        if language == "vhdl":
+            file_name = root / "src" / f"{name!s}.vhd"
+            code = "".join(f"use work.{dep!s}.all;\n" for lang, dep in dependencies if lang == "vhdl")
+            code += f"\npackage {name!s} is\n"
+            code += "".join(
+                f"  constant {constant!s} : natural := {idx:d};\n" for idx, constant in enumerate(constants)
+            )
+            code += f"end package;\n\npackage body {name!s} is\nend package body;\n"
+        else:
+            include_file_name = root / "include" / f"{name!s}.svh"
+            write_file(
+                str(include_file_name),
+                "".join(f"localparam int {constant!s} = {idx:d};\n" for idx, constant in enumerate(constants)),
+            )
+            file_name = root / "src" / f"{name!s}.sv"
+            code = f"package {name!s};\n"
+            code += "".join(f"  import {dep!s}::*;\n" for lang, dep in dependencies if lang == "sv")
+            code += f'  `include "{include_file_name.name!s}"\nendpackage\n'
+
+        write_file(str(file_name), code)
+        return file_name
+
+    def _write_testbench(self, root, language, name, dependencies):
+        """
+        Write a test bench with num_tests tests depending on the packages of the same language in dependencies
+        """
+        if language == "vhdl":
+            file_name = root / "tb" / f"{name!s}.vhd"
+            code = "library vunit_lib;\ncontext vunit_lib.vunit_context;\n"
+            code += "".join(f"use work.{dep!s}.all;\n" for lang, dep in dependencies if lang == "vhdl")
+            code += f"\nentity {name!s} is\n  generic (runner_cfg : string);\nend entity;\n\n"
+            code += f"architecture tb of {name!s} is\nbegin\n  main : process\n  begin\n"
+            code += "    test_runner_setup(runner, runner_cfg);\n    while test_suite loop\n"
+            code += "".join(
+                f'      {"if" if idx == 0 else "elsif"} run("test_{idx:d}") then\n' for idx in range(self.num_tests)
+            )
+            code += (
+                "      end if;\n    end loop;\n    test_runner_cleanup(runner);\n  end process;\nend architecture;\n"
+            )
+        else:
+            file_name = root / "tb" / f"{name!s}.sv"
+            code = '`include "vunit_defines.svh"\n\n'
+            code += f"module {name!s};\n"
+            code += "".join(f"  import {dep!s}::*;\n" for lang, dep in dependencies if lang == "sv")
+            code += "  `TEST_SUITE begin\n"
+            code += "".join(f'    `TEST_CASE("test_{idx:d}") begin\n    end\n' for idx in range(self.num_tests))
+            code += "  end\nendmodule\n"
+
+        write_file(str(file_name), code)
+        return file_name
@@ -203,6 +203,80 @@ check_relation(a ?>= b, context_msg => %s);""" % (
         self._verify_result(code, expected_result)
 
 
+    def test_that_calls_in_comments_are_preprocessed_without_affecting_other_calls(self):
+        code = """
+-- check_relation(a = '(');
+check_relation(c = d); -- :-)
+/* check_relation(e = "(") */ check_relation(g = h);"""
+
+        expected_result = """
+-- check_relation(a = '(', context_msg => %s);
+check_relation(c = d, context_msg => %s); -- :-)
+/* check_relation(e = "(", context_msg => %s) */ check_relation(g = h, context_msg => %s);""" % (
+            make_context_msg("a", "=", "'('"),
+            make_context_msg("c", "=", "d"),
+            make_context_msg("e", "=", '"("'),
+            make_context_msg("g", "=", "h"),
+        )
+
+        self._verify_result(code, expected_result)
+
+    def test_that_many_calls_are_preprocessed(self):
+        code = "\n"
+        expected_result = "\n"
+        for idx in range(1000):
+            left = "a%d" % idx
+            right = "'%d'" % (idx % 10)
+            code += 'check_relation(%s = %s, "msg"); -- :-)\n' % (left, right)
+            expected_result += 'check_relation(%s = %s, "msg", context_msg => %s); -- :-)\n' % (
+                left,
+                right,
+                make_context_msg(left, "=", right),
+            )
+
+        self._verify_result(code, expected_result)
+
+    def test_that_nested_calls_are_preprocessed_from_the_inside_out(self):
+        inner_call = "check_relation(b = c, context_msg => %s)" % make_context_msg("b", "=", "c")
+        code = """
+check_relation(a = f(check_relation(b = c)));"""
+        expected_result = """
+check_relation(a = f(%s), context_msg => %s);""" % (
+            inner_call,
+            make_context_msg("a", "=", "f(%s)" % inner_call),
+        )
+
+        self._verify_result(code, expected_result)
+
+    def test_that_calls_in_strings_and_comments_within_a_call_are_preprocessed_first(self):
+        code = """
+check_relation(a = b, "check_relation(c = d)");
+check_relation(e = f -- check_relation(g = h)
+);
+check_relation(i = j /* check_relation(k = l) */);"""
+        expected_result = """
+check_relation(a = b, "check_relation(c = d, context_msg => %s)", context_msg => %s);
+check_relation(e = f -- check_relation(g = h, context_msg => %s)
+, context_msg => %s);
+check_relation(i = j /* check_relation(k = l, context_msg => %s) */, context_msg => %s);""" % (
+            make_context_msg("c", "=", "d"),
+            make_context_msg("a", "=", "b"),
+            make_context_msg("g", "=", "h"),
+            make_context_msg("e", "=", "f"),
+            make_context_msg("k", "=", "l"),
+            make_context_msg("i", "=", "j"),
+        )
+
+        self._verify_result(code, expected_result)
+
+    def test_that_enclosing_call_is_lexed_after_preprocessing_the_call_in_its_string(self):
+        code = """
+check_relation((a) = (b), "check_relation(c = d)");"""
+        result = self._check_preprocessor.run(code, "foo.vhd")
+        self.assertTrue(result.startswith('\ncheck_relation((a) = (b), "check_relation(c = d, context_msg => '))
+        self.assertIn('.")", context_msg => "Expected ', result)
+
+
 def make_context_msg(left, relation, right):
     return '"Expected %s %s %s. Left is " & to_string(%s) & ". Right is " & to_string(%s) & "."' % (
         left.replace('"', '""'),
@@ -0,0 +1,170 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the codec generator
+"""
+
+import os
+import sys
+import subprocess
+import multiprocessing
+import unittest
+from pathlib import Path
+from unittest import mock
+from vunit.com import codec_generator
+from vunit.com.codec_generator import generate_codecs, generate_codecs_in_parallel
+from vunit.ostools import write_file
+from tests.common import with_tempdir
+
+
+class TestCodecGenerator(unittest.TestCase):
+    """
+    Test the codec generator
+    """
+
+    @with_tempdir
+    def test_generates_codec_package(self, tempdir):
+        design_unit = self._create_package(tempdir, "pkg")
+        output_file = Path(tempdir) / "codecs" / "pkg_codecs.vhd"
+        generate_codecs(design_unit, "pkg_codecs", ["ieee.std_logic_1164", "other_pkg"], output_file)
+
+        code = output_file.read_text()
+        self.assertIn("package pkg_codecs is", code)
+        self.assertIn("use work.pkg.all;", code)
+        self.assertIn("library ieee;\nuse ieee.std_logic_1164.all;\nuse work.other_pkg.all;\n", code)
+        self.assertIn("constant data : color_t", code)
+
+    @with_tempdir
+    def test_missing_package_raises_key_error(self, tempdir):
+        design_unit = self._create_package(tempdir, "pkg")
+        design_unit.name = "missing_pkg"
+        self.assertRaises(
+            KeyError, generate_codecs, design_unit, "pkg_codecs", None, Path(tempdir) / "codecs" / "pkg_codecs.vhd"
+        )
+
+    @with_tempdir
+    def test_skips_generation_when_unchanged(self, tempdir):
+        design_unit = self._create_package(tempdir, "pkg")
+        output_file = Path(tempdir) / "codecs" / "pkg_codecs.vhd"
+        generate_codecs(design_unit, "pkg_codecs", None, output_file)
+
+        with mock.patch("vunit.com.codec_generator._create_codec_package") as create_codec_package:
+            generate_codecs(design_unit, "pkg_codecs", None, output_file)
+            self.assertFalse(create_codec_package.called)
+
+            for codec_package_name, used_packages, version in (
+                ("other_codecs", None, codec_generator.GENERATOR_VERSION),
+                ("pkg_codecs", ["other_pkg"], codec_generator.GENERATOR_VERSION),
+                ("pkg_codecs", None, codec_generator.GENERATOR_VERSION + 1),
+            ):
+                create_codec_package.reset_mock()
+                create_codec_package.return_value = "code"
+                with mock.patch("vunit.com.codec_generator.GENERATOR_VERSION", version):
+                    generate_codecs(design_unit, codec_package_name, used_packages, output_file)
+                self.assertTrue(create_codec_package.called)
+
+    @with_tempdir
+    def test_only_writes_changed_codec_package(self, tempdir):
+        design_unit = self._create_package(tempdir, "pkg")
+        output_file = Path(tempdir) / "codecs" / "pkg_codecs.vhd"
+        generate_codecs(design_unit, "pkg_codecs", None, output_file)
+        os.utime(output_file, (0, 0))
+
+        # A change in the input package not affecting the codecs
+        design_unit.source_file.content_hash = "changed"
+        generate_codecs(design_unit, "pkg_codecs", None, output_file)
+        self.assertEqual(output_file.stat().st_mtime, 0)
+
+        design_unit = self._create_package(tempdir, "pkg", types="type shape_t is (circle, square);")
+        generate_codecs(design_unit, "pkg_codecs", None, output_file)
+        self.assertNotEqual(output_file.stat().st_mtime, 0)
+        self.assertIn("constant data : shape_t", output_file.read_text())
+
+    @with_tempdir
+    def test_regenerates_missing_codec_package(self, tempdir):
+        design_unit = self._create_package(tempdir, "pkg")
+        output_file = Path(tempdir) / "codecs" / "pkg_codecs.vhd"
+        generate_codecs(design_unit, "pkg_codecs", None, output_file)
+        os.remove(output_file)
+        generate_codecs(design_unit, "pkg_codecs", None, output_file)
+        self.assertTrue(output_file.exists())
+
+    @with_tempdir
+    def test_generates_codec_packages_in_parallel(self, tempdir):
+        jobs = []
+        for idx in range(3):
+            design_unit = self._create_package(tempdir, f"pkg{idx:d}")
+            jobs.append((design_unit, f"pkg{idx:d}_codecs", None, Path(tempdir) / "codecs" / f"pkg{idx:d}_codecs.vhd"))
+
+        generate_codecs_in_parallel(jobs, num_processes=2)
+        for _, codec_package_name, _, output_file in jobs:
+            self.assertIn(f"package {codec_package_name!s} is", output_file.read_text())
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "Requires fork")
+    @with_tempdir
+    def test_run_script_without_main_guard_is_not_reimported_under_spawn(self, tempdir):
+        script = Path(tempdir) / "run.py"
+        write_file(
+            str(script),
+            f"""\
+import multiprocessing
+from pathlib import Path
+from unittest import mock
+from vunit.com.codec_generator import generate_codecs_in_parallel
+
+multiprocessing.set_start_method("spawn")
+print("run.py executed")
+jobs = []
+for idx in range(2):
+    file_name = Path({str(tempdir)!r}) / f"pkg{{idx:d}}.vhd"
+    file_name.write_text(f"package pkg{{idx:d}} is\\n  type color_t is (red, green);\\nend package;\\n")
+    design_unit = mock.Mock(source_file=mock.Mock(content_hash=str(idx)))
+    design_unit.name = f"pkg{{idx:d}}"
+    design_unit.source_file.name = str(file_name)
+    jobs.append((design_unit, f"pkg{{idx:d}}_codecs", None, Path({str(tempdir)!r}) / f"pkg{{idx:d}}_codecs.vhd"))
+generate_codecs_in_parallel(jobs, num_processes=2)
+""",
+        )
+        process = subprocess.run(
+            [sys.executable, str(script)],
+            env=dict(os.environ, PYTHONPATH=str(Path(__file__).parent.parent.parent)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            check=False,
+        )
+        self.assertEqual(process.returncode, 0, process.stdout)
+        self.assertEqual(process.stdout.count("run.py executed"), 1, process.stdout)
+        for idx in range(2):
+            self.assertIn(f"package pkg{idx:d}_codecs is", (Path(tempdir) / f"pkg{idx:d}_codecs.vhd").read_text())
+
+    @with_tempdir
+    def test_generates_codec_packages_serially_without_fork(self, tempdir):
+        jobs = []
+        for idx in range(2):
+            design_unit = self._create_package(tempdir, f"pkg{idx:d}")
+            jobs.append((design_unit, f"pkg{idx:d}_codecs", None, Path(tempdir) / f"pkg{idx:d}_codecs.vhd"))
+
+        with mock.patch("multiprocessing.get_all_start_methods", return_value=["spawn"]):
+            with mock.patch.object(codec_generator, "ProcessPoolExecutor") as executor:
+                generate_codecs_in_parallel(jobs, num_processes=2)
+        self.assertFalse(executor.called)
+        for _, codec_package_name, _, output_file in jobs:
+            self.assertIn(f"package {codec_package_name!s} is", output_file.read_text())
+
+    @staticmethod
+    def _create_package(tempdir, name, types="type color_t is (red, green, blue);"):
+        """
+        Create a package and return a design unit stub for it
+        """
+        file_name = str(Path(tempdir) / f"{name!s}.vhd")
+        write_file(file_name, f"package {name!s} is\n  {types!s}\nend package;\n")
+        design_unit = mock.Mock()
+        design_unit.name = name
+        design_unit.source_file.name = file_name
+        design_unit.source_file.content_hash = types
+        return design_unit
@@ -0,0 +1,289 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test distributed test execution
+"""
+
+from pathlib import Path
+import base64
+import multiprocessing
+import socket
+import threading
+import unittest
+from unittest import mock
+from tests.common import with_tempdir
+from tests.unit.test_test_runner import TestCaseMock
+from vunit.test.distributed import (
+    TestCoordinator,
+    TestWorker,
+    Channel,
+    parse_address,
+    is_loopback,
+    _send_archive,
+    _receive_archive,
+)
+from vunit.test.report import TestReport
+from vunit.test.runner import TRASH_PATH
+from vunit.ostools import BackgroundDeleter
+from vunit.test.list import TestList
+
+
+class TestDistributed(unittest.TestCase):
+    """
+    Test distributed test execution
+    """
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "Requires fork")
+    @with_tempdir
+    def test_worker_processes_run_all_tests(self, tempdir):
+        tests = {"pass1": True, "fail": False, "pass2": True, "pass3": True}
+        report = TestReport()
+        coordinator = TestCoordinator(report, str(Path(tempdir) / "coordinator"), ("localhost", 0))
+
+        def run_worker(idx):
+            """
+            Run a worker in a separate process with a separate output path
+            """
+            worker = TestWorker(TestReport(), str(Path(tempdir) / f"worker{idx:d}"), coordinator.address, num_threads=2)
+            worker.run(create_test_list(tests))
+
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=run_worker, args=(idx,)) for idx in range(2)]
+        for worker in workers:
+            worker.start()
+        coordinator.run(create_test_list(tests))
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(report.num_tests(), 4)
+        self.assertTrue(report.result_of("pass1").passed)
+        self.assertTrue(report.result_of("pass2").passed)
+        self.assertTrue(report.result_of("pass3").passed)
+        self.assertTrue(report.result_of("fail").failed)
+        for name in tests:
+            self.assertEqual(report.result_of(name).output, f"Running {name!s}\n")
+        self.assertEqual(report.result_of("fail").seed, "0123456789abcdef")
+
+    @with_tempdir
+    def test_worker_sharing_output_path_does_not_send_output(self, tempdir):
+        report = TestReport()
+        coordinator = TestCoordinator(report, tempdir, ("localhost", 0))
+        worker = TestWorker(TestReport(), tempdir, coordinator.address, num_threads=2)
+
+        thread = threading.Thread(target=worker.run, args=(create_test_list({"test1": True, "test2": False}),))
+        thread.start()
+        with mock.patch("vunit.test.distributed._receive_archive") as receive_archive:
+            coordinator.run(create_test_list({"test1": True, "test2": False}))
+        thread.join()
+
+        self.assertFalse(receive_archive.called)
+        self.assertTrue(report.result_of("test1").passed)
+        self.assertTrue(report.result_of("test2").failed)
+        self.assertEqual(report.result_of("test2").output, "Running test2\n")
+
+    @with_tempdir
+    def test_tests_on_lost_worker_fail(self, tempdir):
+        report = TestReport()
+        coordinator = TestCoordinator(report, tempdir, ("localhost", 0))
+
+        def lost_worker():
+            """
+            Worker which disconnects while running a test
+            """
+            channel = Channel(socket.create_connection(coordinator.address))
+            channel.send({"type": "hello", "name": "lost"})
+            channel.send({"type": "request"})
+            self.assertEqual(channel.receive()["type"], "run")
+            channel.close()
+
+        worker = threading.Thread(target=lost_worker)
+        worker.start()
+        coordinator.run(create_test_list({"test": True}))
+        worker.join()
+
+        self.assertTrue(report.result_of("test").failed)
+        self.assertIn("Lost connection to worker lost", report.result_of("test").output)
+
+    @with_tempdir
+    def test_tests_unknown_to_worker_fail(self, tempdir):
+        report = TestReport()
+        coordinator = TestCoordinator(report, str(Path(tempdir) / "coordinator"), ("localhost", 0))
+        worker = TestWorker(TestReport(), str(Path(tempdir) / "worker"), coordinator.address)
+
+        thread = threading.Thread(target=worker.run, args=(create_test_list({"other": True}),))
+        thread.start()
+        coordinator.run(create_test_list({"test": True}))
+        thread.join()
+
+        self.assertTrue(report.result_of("test").failed)
+        self.assertIn("Worker does not have a test suite named test", report.result_of("test").output)
+
+    @with_tempdir
+    def test_worker_with_separate_output_path_sends_output(self, tempdir):
+        report = TestReport()
+        coordinator = TestCoordinator(report, str(Path(tempdir) / "coordinator"), ("localhost", 0))
+        worker = TestWorker(TestReport(), str(Path(tempdir) / "worker"), coordinator.address)
+
+        thread = threading.Thread(target=worker.run, args=(create_test_list({"test1": True, "test2": False}),))
+        thread.start()
+        with mock.patch("vunit.test.distributed.ARCHIVE_CHUNK_SIZE", new=16):
+            coordinator.run(create_test_list({"test1": True, "test2": False}))
+        thread.join()
+
+        self.assertTrue(report.result_of("test1").passed)
+        self.assertTrue(report.result_of("test2").failed)
+        self.assertEqual(report.result_of("test2").output, "Running test2\n")
+
+    @with_tempdir
+    def test_coordinator_deletes_old_output_in_the_background(self, tempdir):
+        output_path = Path(tempdir) / "coordinator"
+        for _ in range(2):
+            deleter = mock.Mock(wraps=BackgroundDeleter(output_path / TRASH_PATH))
+            coordinator = TestCoordinator(TestReport(), str(output_path), ("localhost", 0), deleter=deleter)
+            worker = TestWorker(TestReport(), str(Path(tempdir) / "worker"), coordinator.address)
+
+            thread = threading.Thread(target=worker.run, args=(create_test_list({"test": True}),))
+            thread.start()
+            with mock.patch("vunit.ostools._remove_tree") as remove_tree:
+                coordinator.run(create_test_list({"test": True}))
+            thread.join()
+            deleter.wait()
+
+            self.assertFalse(remove_tree.called)
+            self.assertTrue(deleter.discard_leftovers.called)
+            self.assertEqual(
+                [Path(call.args[0]).name for call in deleter.discard.mock_calls],
+                [Path(coordinator._get_output_path("test")).name],
+            )
+        self.assertEqual(list((output_path / TRASH_PATH).iterdir()), [])
+
+    @with_tempdir
+    def test_archive_is_sent_in_chunks(self, tempdir):
+        source = Path(tempdir) / "source"
+        (source / "sub").mkdir(parents=True)
+        (source / "output.txt").write_bytes(bytes(range(256)) * 4)
+        (source / "sub" / "file.txt").write_text("content")
+        destination = Path(tempdir) / "destination"
+        destination.mkdir()
+        (destination / "old.txt").write_text("old")
+
+        channel = QueueChannel()
+        with mock.patch("vunit.test.distributed.ARCHIVE_CHUNK_SIZE", new=64):
+            _send_archive(channel, source)
+
+        self.assertGreater(len(channel.messages), 2)
+        self.assertIsNone(channel.messages[-1]["data"])
+        for message in channel.messages[:-1]:
+            self.assertEqual(message["type"], "archive")
+            self.assertLessEqual(len(base64.b64decode(message["data"])), 64)
+
+        _receive_archive(channel, destination)
+        self.assertEqual((destination / "output.txt").read_bytes(), bytes(range(256)) * 4)
+        self.assertEqual((destination / "sub" / "file.txt").read_text(), "content")
+        self.assertFalse((destination / "old.txt").exists())
+
+    def test_channel_rejects_too_long_messages(self):
+        sock1, sock2 = socket.socketpair()
+        sender, receiver = Channel(sock1), Channel(sock2)
+        try:
+            with mock.patch("vunit.test.distributed.MAX_MESSAGE_SIZE", new=32):
+                sender.send({"type": "short"})
+                self.assertEqual(receiver.receive(), {"type": "short"})
+                sender.send({"type": "long", "data": "x" * 32})
+                self.assertRaises(ValueError, receiver.receive)
+        finally:
+            sender.close()
+            receiver.close()
+
+    @with_tempdir
+    def test_coordinator_listens_to_loopback_by_default(self, tempdir):
+        coordinator = TestCoordinator(TestReport(), tempdir, ("", 0))
+        self.assertEqual(coordinator.address[0], "127.0.0.1")
+        coordinator.run(create_test_list({}))
+
+    @with_tempdir
+    def test_coordinator_requires_token_for_other_hosts(self, tempdir):
+        self.assertRaises(ValueError, TestCoordinator, TestReport(), tempdir, ("0.0.0.0", 0))
+        self.assertRaises(ValueError, TestCoordinator, TestReport(), tempdir, ("host", 0))
+
+    @with_tempdir
+    def test_coordinator_rejects_workers_with_invalid_token(self, tempdir):
+        report = TestReport()
+        coordinator = TestCoordinator(report, str(Path(tempdir) / "coordinator"), ("localhost", 0), token="secret")
+        rejected_report = TestReport()
+
+        def run_workers():
+            """
+            Run a worker with an invalid token followed by a worker with the valid token
+            """
+            with mock.patch("vunit.test.distributed.LOGGER") as logger:
+                worker = TestWorker(rejected_report, str(Path(tempdir) / "rejected"), coordinator.address)
+                worker.run(create_test_list({"test": True}))
+            self.assertIn("invalid token", logger.error.call_args[0][0])
+
+            worker = TestWorker(TestReport(), str(Path(tempdir) / "worker"), coordinator.address, token="secret")
+            worker.run(create_test_list({"test": True}))
+
+        thread = threading.Thread(target=run_workers)
+        thread.start()
+        coordinator.run(create_test_list({"test": True}))
+        thread.join()
+
+        self.assertEqual(rejected_report.num_tests(), 0)
+        self.assertTrue(report.result_of("test").passed)
+
+    def test_is_loopback(self):
+        self.assertTrue(is_loopback("localhost"))
+        self.assertTrue(is_loopback("127.0.0.1"))
+        self.assertTrue(is_loopback("::1"))
+        self.assertFalse(is_loopback("0.0.0.0"))
+        self.assertFalse(is_loopback("192.168.0.1"))
+        self.assertFalse(is_loopback("host"))
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("host:1234"), ("host", 1234))
+        self.assertEqual(parse_address("1234"), ("", 1234))
+        self.assertEqual(parse_address("[::1]:1234"), ("::1", 1234))
+        self.assertRaises(ValueError, parse_address, "host")
+        self.assertRaises(ValueError, parse_address, "host:123456")
+
+
+class QueueChannel(object):
+    """
+    Channel receiving the messages sent on it
+    """
+
+    def __init__(self):
+        self.messages = []
+        self._received = 0
+
+    def send(self, message):
+        self.messages.append(message)
+
+    def receive(self):
+        if self._received == len(self.messages):
+            return None
+        self._received += 1
+        return self.messages[self._received - 1]
+
+
+def create_test_list(tests):
+    """
+    Create a test list with mocked tests that pass or fail
+    """
+    test_list = TestList()
+    for name, passed in tests.items():
+
+        def run_side_effect(*args, name=name, passed=passed, **kwargs):  # pylint: disable=unused-argument
+            """
+            Side effect that prints the test name
+            """
+            print(f"Running {name!s}")
+            return passed
+
+        test_list.add_test(TestCaseMock(name=name, run_side_effect=run_side_effect))
+    return test_list
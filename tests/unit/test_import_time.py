@@ -0,0 +1,64 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test that importing vunit does not import the modules which are only needed on first use
+
+The import time itself is measured by tests/benchmark/benchmark_import_time.py
+"""
+
+import sys
+import subprocess
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+
+# Modules that shall only be imported on first use
+LAZY_MODULES = [
+    "vunit.vhdl_parser",
+    "vunit.parsing.verilog.parser",
+    "vunit.parsing.verilog.preprocess",
+    "vunit.parsing.verilog.tokenizer",
+    "vunit.location_preprocessor",
+    "vunit.check_preprocessor",
+    "vunit.com.codec_generator",
+    "vunit.test.runner",
+    "vunit.test.distributed",
+    "vunit.sim_if.activehdl",
+    "vunit.sim_if.ghdl",
+    "vunit.sim_if.incisive",
+    "vunit.sim_if.modelsim",
+    "vunit.sim_if.nvc",
+    "vunit.sim_if.rivierapro",
+    "csv",
+]
+
+
+def imported_modules(module):
+    """
+    Return the names of the modules in sys.modules after importing module in a new interpreter
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", f"import sys\nimport {module!s}\nprint('\\n'.join(sys.modules))"],
+        cwd=str(ROOT),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout
+    return set(output.splitlines())
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    Test that importing vunit does not import the modules which are only needed on first use
+    """
+
+    def test_lazy_modules_are_not_imported(self):
+        modules = imported_modules("vunit")
+        self.assertIn("vunit.ui", modules)
+        imported = [module for module in LAZY_MODULES if module in modules]
+        self.assertEqual(imported, [])
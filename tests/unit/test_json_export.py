@@ -0,0 +1,56 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the server of the JSON export
+"""
+
+import socket
+import threading
+import unittest
+from unittest import mock
+from vunit.ui.json_export import JsonExportServer
+
+
+class TestJsonExportServer(unittest.TestCase):
+    """
+    Test the server of the JSON export
+    """
+
+    def setUp(self):
+        self.exports = iter(['{"n":1}', '{"n":2}'])
+        self.refresh = mock.Mock()
+        self.server = JsonExportServer(("localhost", 0), lambda: next(self.exports), self.refresh)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.thread.join()
+
+    def _request(self):
+        """
+        Connect to the server and return everything it sends
+        """
+        with socket.create_connection(self.server.address) as sock:
+            data = b""
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    return data
+                data += chunk
+
+    def test_sends_the_latest_export_to_each_client(self):
+        self.assertEqual(self._request(), b'{"n":1}\n')
+        self.assertEqual(self._request(), b'{"n":2}\n')
+        self.assertEqual(self.refresh.call_count, 2)
+
+    def test_survives_failing_export(self):
+        self.refresh.side_effect = [RuntimeError("Parse error"), None]
+        with mock.patch("vunit.ui.json_export.LOGGER") as logger:
+            self.assertEqual(self._request(), b"")
+        self.assertTrue(logger.exception.called)
+        self.assertEqual(self._request(), b'{"n":1}\n')
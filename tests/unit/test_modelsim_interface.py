@@ -16,6 +16,7 @@ from shutil import rmtree
 from unittest import mock
 from tests.common import set_env
 from vunit.sim_if.modelsim import ModelSimInterface
+from vunit.persistent_tcl_shell import PersistentTclShell, TclReply, tcl_quote, tcl_string_map
 from vunit.project import Project
 from vunit.ostools import renew_path, write_file
 from vunit.test.bench import Configuration
@@ -456,6 +457,67 @@ class TestModelSimInterface(unittest.TestCase):
         self.assertEqual(LOGGER.error.call_count, len(expected_error_calls))
         LOGGER.error.assert_has_calls(expected_error_calls)
 
+    @mock.patch("vunit.sim_if.modelsim.check_output", autospec=True, return_value="")
+    @mock.patch("vunit.sim_if.check_output", autospec=True, return_value="")
+    @mock.patch("vunit.sim_if.vsim_simulator_mixin.Process", autospec=True)
+    def test_common_script_template(self, vsim_simulator_mixin_process, check_output, modelsim_check_output):
+        simif = ModelSimInterface(prefix=self.prefix_path, output_path=self.output_path, persistent=False)
+        sim_options = {"enable_coverage": True, "modelsim.vsim_flags": ["-novopt"]}
+        generics = {"runner_cfg": "active python runner : true,output path : a b/", "str": "a,b", "int": 1}
+        config = make_config(sim_options=sim_options, generics=generics)
+        config.copy.side_effect = lambda: make_config(sim_options=dict(sim_options), generics=dict(generics))
+        output_path = str(Path(self.test_path) / "test output" / "lib.tb.test")
+
+        script = simif._create_common_script(
+            "lib.tb.test", config, Path(output_path) / simif.name, output_path, optimize_design=False
+        )
+
+        template = simif._create_common_script_template(config, optimize_design=False)
+        mapping = simif._get_common_script_template_mapping(output_path, "lib.tb.test", config)
+        self.assertNotIn(output_path, template)
+        self.assertEqual(tcl_string_map(template, mapping), script)
+
+    @mock.patch("vunit.sim_if.modelsim.check_output", autospec=True, return_value="")
+    @mock.patch("vunit.sim_if.check_output", autospec=True, return_value="")
+    @mock.patch("vunit.sim_if.vsim_simulator_mixin.Process", autospec=True)
+    def test_persistent_simulate_uses_script_template(
+        self, vsim_simulator_mixin_process, check_output, modelsim_check_output
+    ):
+        simif = ModelSimInterface(prefix=self.prefix_path, output_path=self.output_path, persistent=True)
+        shell = mock.create_autospec(PersistentTclShell, instance=True)
+        shell.execute_script.return_value = [TclReply(0, ""), TclReply(0, ""), TclReply(0, "false"), TclReply(0, "")]
+        simif._persistent_shell = shell
+
+        sim_options = {"enable_coverage": True}
+        coverage_files = set()
+        with mock.patch.object(
+            simif, "_create_common_script_template", wraps=simif._create_common_script_template
+        ) as create_template:
+            for idx in range(2):
+                config = make_config(sim_options=sim_options, generics={"runner_cfg": f"output path : {idx:d}"})
+                config.copy.side_effect = lambda: make_config(
+                    sim_options=dict(sim_options), generics={"runner_cfg": "placeholder"}
+                )
+                output_path = str(Path(self.test_path) / "test_output" / f"lib.tb.test{idx:d}")
+                self.assertTrue(simif.simulate(output_path, f"lib.tb.test{idx:d}", config, False))
+                script_path = Path(output_path) / simif.name
+                coverage_files.add(str(script_path / "coverage.ucdb"))
+                common_script = (script_path / "common.do").read_text()
+                self.assertIn(tcl_quote(f'{{"output path : {idx:d}"}}'), common_script)
+                self.assertNotIn("proc vunit_load", common_script)
+                self.assertIn("common.do", (script_path / "batch.do").read_text())
+                self.assertIn("common.do", (script_path / "gui.do").read_text())
+
+        create_template.assert_called_once()
+        self.assertEqual(simif._coverage_files, coverage_files)
+        templates = list((Path(self.output_path) / "script_templates").glob("*.do"))
+        self.assertEqual(len(templates), 1)
+        self.assertIn("proc vunit_load", templates[0].read_text())
+        self.assertEqual(shell.execute_script.call_count, 2)
+        for call in shell.execute_script.call_args_list:
+            self.assertTrue(call.args[0][0].startswith("vunit_source_template "))
+            self.assertIn(templates[0].name, call.args[0][0])
+
     def setUp(self):
         self.test_path = str(Path(__file__).parent / "test_modelsim_out")
 
@@ -9,11 +9,16 @@ Test the os-dependent functionality wrappers
 """
 
 
+import os
+import unittest
 from unittest import TestCase
 from pathlib import Path
 from shutil import rmtree
 import sys
-from vunit.ostools import Process, renew_path
+import threading
+import time
+from unittest import mock
+from vunit.ostools import Process, FileWatcher, BackgroundDeleter, DEADLINE, PEAK_MEMORY, renew_path
 
 
 class TestOSTools(TestCase):
@@ -68,6 +73,23 @@ exit(1)
         self.assertRaises(Process.NonZeroExitCode, process.consume_output, output.append)
         self.assertEqual(output, ["error"])
 
+    @unittest.skipUnless(hasattr(os, "wait4"), "Requires wait4")
+    def test_peak_memory_of_process_is_measured(self):
+        python_script = self.make_file(
+            "allocate.py",
+            r"""
+data = bytearray(200 * 2**20)
+""",
+        )
+        PEAK_MEMORY.reset()
+        process = Process([sys.executable, python_script])
+        process.consume_output()
+        self.assertGreater(PEAK_MEMORY.get(), 200)
+        self.assertLess(PEAK_MEMORY.get(), 1000)
+
+        PEAK_MEMORY.reset()
+        self.assertIsNone(PEAK_MEMORY.get())
+
     def test_parses_stderr(self):
         python_script = self.make_file(
             "run_err.py",
@@ -98,9 +120,156 @@ sleep(1000)
         process.terminate()
         self.assertEqual(message, "message")
 
+    def test_process_group_is_killed_when_deadline_passes(self):
+        python_script = self.make_file(
+            "run_with_child.py",
+            r"""
+import subprocess
+import sys
+import time
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+time.sleep(30)
+""",
+        )
+
+        process = Process([sys.executable, python_script])
+        start = time.monotonic()
+        DEADLINE.set(1)
+        try:
+            self.assertRaises(Process.TimeoutExpired, process.consume_output)
+            self.assertTrue(DEADLINE.expired)
+        finally:
+            DEADLINE.set(None)
+        self.assertFalse(DEADLINE.expired)
+
+        # The output pipe is only closed when the child started by the process has been killed as well
+        process.terminate()
+        self.assertLess(time.monotonic() - start, 10)
+
     def test_non_utf8_in_output(self):
         python_script = str(Path(__file__).parent / "non_utf8_printer.py")
         output = []
         process = Process([sys.executable, python_script])
         process.consume_output(output.append)
         self.assertEqual(output, ["ac"])
+
+    def test_printed_output_is_copied_in_binary_chunks_when_supported(self):
+        python_script = self.make_file(
+            "run_many_lines.py",
+            r"""
+from sys import stdout
+for idx in range(10000):
+    stdout.write("line %d\n" % idx)
+""",
+        )
+
+        chunks = []
+
+        class RawOutput(object):
+            """
+            Standard output accepting binary output
+            """
+
+            @staticmethod
+            def write(txt):
+                raise AssertionError(f"Unexpected text output {txt!r}")
+
+            @staticmethod
+            def raw_writer():
+                return chunks.append
+
+        process = Process([sys.executable, python_script])
+        with mock.patch("sys.stdout", new=RawOutput()):
+            process.consume_output()
+
+        output = b"".join(chunks).decode().splitlines()
+        self.assertEqual(output, [f"line {idx:d}" for idx in range(10000)])
+        self.assertLess(len(chunks), 10000)
+
+    def test_file_watcher_detects_changed_and_removed_files(self):
+        file_names = [self.make_file("foo.vhd", "foo"), self.make_file("bar.vhd", "bar")]
+        timestamps = {file_name: 1.0 for file_name in file_names}
+
+        def get_modification_time(file_name):
+            if file_name not in timestamps:
+                raise FileNotFoundError(file_name)
+            return timestamps[file_name]
+
+        with mock.patch("vunit.ostools.get_modification_time", new=get_modification_time):
+            watcher = FileWatcher(file_names)
+            self.assertEqual(watcher.poll(), [])
+
+            timestamps[file_names[0]] = 2.0
+            self.assertEqual(watcher.poll(), [file_names[0]])
+            self.assertEqual(watcher.poll(), [])
+
+            del timestamps[file_names[1]]
+            self.assertEqual(watcher.poll(), [file_names[1]])
+            self.assertEqual(watcher.poll(), [])
+
+    def test_file_watcher_waits_for_changes_to_settle(self):
+        file_name = self.make_file("foo.vhd", "foo")
+        timestamps = iter([1.0, 1.0, 2.0, 3.0, 3.0])
+
+        with mock.patch("vunit.ostools.get_modification_time", new=lambda _: next(timestamps)), mock.patch(
+            "vunit.ostools.time.sleep"
+        ) as sleep:
+            watcher = FileWatcher([file_name])
+            self.assertEqual(watcher.wait_for_changes(interval=0.25), [file_name])
+            self.assertEqual(sleep.mock_calls, [mock.call(0.25)] * 3)
+
+    def test_renew_path_with_background_deleter(self):
+        output_path = Path(self.tmp_dir) / "output"
+        trash_path = Path(self.tmp_dir) / "trash"
+        renew_path(output_path)
+        self.make_file(str(output_path / "wave.ghw"), "wave")
+        deleter = BackgroundDeleter(trash_path)
+
+        with mock.patch("vunit.ostools.shutil.rmtree", wraps=rmtree) as rmtree_mock:
+            renew_path(output_path, deleter=deleter)
+            self.assertEqual(list(output_path.iterdir()), [])
+            deleter.wait()
+
+        self.assertEqual(list(trash_path.iterdir()), [])
+        self.assertEqual(len(rmtree_mock.mock_calls), 1)
+        self.assertEqual(Path(rmtree_mock.mock_calls[0].args[0]).parent, trash_path)
+
+    def test_background_deleter_deletes_in_place_when_rename_fails(self):
+        output_path = Path(self.tmp_dir) / "output"
+        renew_path(output_path)
+        self.make_file(str(output_path / "wave.ghw"), "wave")
+        deleter = BackgroundDeleter(Path(self.tmp_dir) / "trash")
+
+        with mock.patch("vunit.ostools.os.replace", side_effect=PermissionError):
+            deleter.discard(output_path)
+
+        self.assertFalse(output_path.exists())
+        deleter.wait()
+
+    def test_background_deleter_is_paused(self):
+        output_path = Path(self.tmp_dir) / "output"
+        trash_path = Path(self.tmp_dir) / "trash"
+        renew_path(output_path)
+        self.make_file(str(output_path / "wave.ghw"), "wave")
+        deleter = BackgroundDeleter(trash_path)
+        num_threads = threading.active_count()
+
+        with deleter.paused():
+            deleter.discard(output_path)
+            self.assertFalse(output_path.exists())
+            self.assertEqual(len(list(trash_path.iterdir())), 1)
+            self.assertEqual(threading.active_count(), num_threads)
+
+        deleter.wait()
+        self.assertEqual(list(trash_path.iterdir()), [])
+
+    def test_background_deleter_deletes_leftovers(self):
+        trash_path = Path(self.tmp_dir) / "trash"
+        renew_path(trash_path / "output.1.1")
+        self.make_file(str(trash_path / "output.1.1" / "wave.ghw"), "wave")
+
+        deleter = BackgroundDeleter(trash_path)
+        deleter.discard_leftovers()
+        deleter.wait()
+
+        self.assertEqual(list(trash_path.iterdir()), [])
@@ -0,0 +1,185 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the persistent TCL shell using tclsh
+"""
+
+import shutil
+import unittest
+from pathlib import Path
+from unittest import mock
+from vunit.ostools import Process, renew_path, write_file
+from vunit.persistent_tcl_shell import PersistentTclShell, TclReply
+from vunit.sim_if.vsim_simulator_mixin import VsimSimulatorMixin, fix_path
+
+TCLSH = shutil.which("tclsh")
+
+
+def create_tclsh_process_factory(output_path):
+    """
+    Return a function creating a tclsh process running the read eval loop of the vsim based simulators
+    """
+    loop_file_name = Path(__file__).parent.parent.parent / "vunit" / "sim_if" / "tcl_read_eval_loop.tcl"
+    script_file_name = Path(output_path) / "tclsh_loop.tcl"
+    write_file(
+        str(script_file_name),
+        f"""\
+fconfigure stdout -buffering line
+proc quit {{args}} {{
+    if {{"-sim" ni $args}} {{
+        exit 0
+    }}
+    puts "quit -sim"
+}}
+source "{fix_path(str(loop_file_name))!s}"
+""",
+    )
+
+    def create_process(ident):  # pylint: disable=unused-argument
+        return Process([TCLSH, str(script_file_name)], cwd=str(output_path))
+
+    return create_process
+
+
+@unittest.skipIf(TCLSH is None, "Requires tclsh")
+class TestPersistentTclShell(unittest.TestCase):
+    """
+    Test the persistent TCL shell using tclsh
+    """
+
+    def setUp(self):
+        self.output_path = str(Path(__file__).parent / "test_persistent_tcl_shell_out")
+        renew_path(self.output_path)
+        self.shell = PersistentTclShell(create_process=create_tclsh_process_factory(self.output_path))
+
+    def tearDown(self):
+        self.shell.teardown()
+        if Path(self.output_path).exists():
+            shutil.rmtree(self.output_path)
+
+    def test_execute_and_read_var(self):
+        self.shell.execute("set value true")
+        self.assertTrue(self.shell.read_bool("value"))
+
+    def test_execute_script_replies_with_results(self):
+        with mock.patch("vunit.persistent_tcl_shell.print") as print_mock:
+            replies = self.shell.execute_script(
+                [
+                    'set value "line1\\nline2\\\\"',
+                    "puts output",
+                    "string length $value",
+                    "continue",
+                ]
+            )
+        self.assertEqual(
+            replies,
+            [TclReply(0, "line1\nline2\\"), TclReply(0, ""), TclReply(0, "12"), TclReply(4, "")],
+        )
+        self.assertTrue(all(reply.succeeded for reply in replies))
+        print_mock.assert_called_once_with("output")
+
+    def test_execute_script_quotes_commands(self):
+        command = 'set value [list {a b} "$x" \\{ ; \t]'
+        self.shell.execute("set x 1")
+        replies = self.shell.execute_script([command, "set x"])
+        self.assertEqual(replies, [TclReply(0, "{a b} 1 \\{"), TclReply(0, "1")])
+
+    def test_execute_script_stops_at_first_error(self):
+        with mock.patch("vunit.persistent_tcl_shell.print") as print_mock:
+            replies = self.shell.execute_script(["set value 1", "error failure", "set value 2"])
+        self.assertEqual(replies, [TclReply(0, "1"), TclReply(1, "failure")])
+        self.assertFalse(replies[1].succeeded)
+        print_mock.assert_called_once_with("error failure - failure")
+        self.assertEqual(self.shell.execute_script(["set value"]), [TclReply(0, "1")])
+
+    def test_execute_script_with_empty_command(self):
+        self.assertEqual(self.shell.execute_script([""]), [TclReply(0, "")])
+
+    def _run_persistent(self, vunit_load, vunit_run, load_only=False):
+        """
+        Run a common script with vunit_load and vunit_run returning the given values
+        """
+        common_file_name = str(Path(self.output_path) / "common.do")
+        write_file(
+            common_file_name,
+            f"""\
+proc vunit_load {{}} {{
+    puts vunit_load
+    return {vunit_load!s}
+}}
+proc vunit_run {{}} {{
+    puts vunit_run
+    return {vunit_run!s}
+}}
+""",
+        )
+        simif = VsimSimulatorMixin.__new__(VsimSimulatorMixin)
+        simif._persistent_shell = self.shell  # pylint: disable=protected-access
+        with mock.patch("vunit.persistent_tcl_shell.print") as print_mock:
+            result = simif._run_persistent(common_file_name, load_only=load_only)  # pylint: disable=protected-access
+        return result, [call.args[0] for call in print_mock.call_args_list]
+
+    def test_run_persistent(self):
+        self.assertEqual(self._run_persistent("false", "false"), (True, ["vunit_load", "vunit_run", "quit -sim"]))
+
+    def test_run_persistent_run_failure(self):
+        self.assertEqual(self._run_persistent("false", "true"), (False, ["vunit_load", "vunit_run", "quit -sim"]))
+
+    def test_run_persistent_load_only(self):
+        self.assertEqual(self._run_persistent("false", "true", load_only=True), (True, ["vunit_load", "quit -sim"]))
+
+    def test_run_persistent_load_failure(self):
+        result, output = self._run_persistent("true", "false")
+        self.assertFalse(result)
+        self.assertEqual(output[0], "vunit_load")
+        self.assertEqual(len(output), 2)
+        self.assertIn("vunit_load failed", output[1])
+
+    def test_run_persistent_with_template(self):
+        template_file_name = str(Path(self.output_path) / "template with space.do")
+        write_file(
+            template_file_name,
+            """\
+proc vunit_load {} {
+    puts "vunit_load @NAME@"
+    return false
+}
+proc vunit_run {} {
+    puts {vunit_run @NAME@}
+    return false
+}
+""",
+        )
+        simif = VsimSimulatorMixin.__new__(VsimSimulatorMixin)
+        simif._persistent_shell = self.shell  # pylint: disable=protected-access
+        for name in ["first", "second {with} space"]:
+            with mock.patch("vunit.persistent_tcl_shell.print") as print_mock:
+                self.assertTrue(
+                    simif._run_persistent(  # pylint: disable=protected-access
+                        template_file_name, mapping=[("@NAME@", name)]
+                    )
+                )
+            self.assertEqual(
+                [call.args[0] for call in print_mock.call_args_list],
+                [f"vunit_load {name!s}", f"vunit_run {name!s}", "quit -sim"],
+            )
+
+    def test_template_script(self):
+        template_file_name = str(Path(self.output_path) / "template with space.do")
+        write_file(template_file_name, "proc vunit_load {} {\n    puts {vunit_load @NAME@}\n}\n")
+        name = "second {with} [space] $and \\backslash"
+        common_file_name = str(Path(self.output_path) / "common.do")
+        write_file(
+            common_file_name,
+            VsimSimulatorMixin._create_template_script(  # pylint: disable=protected-access
+                template_file_name, [("@NAME@", name)]
+            ),
+        )
+        with mock.patch("vunit.persistent_tcl_shell.print") as print_mock:
+            replies = self.shell.execute_script([f'source "{fix_path(common_file_name)!s}"', "vunit_load"])
+        self.assertTrue(all(reply.succeeded for reply in replies))
+        self.assertEqual([call.args[0] for call in print_mock.call_args_list], [f"vunit_load {name!s}"])
@@ -1053,6 +1053,209 @@ endpackage
         os.remove(self.hash_file_name_of(file2))
         self.assert_should_recompile([file2, file3])
 
+    def test_early_cutoff_does_not_recompile_dependent_files_after_body_change(self):
+        source_files = self.create_early_cutoff_project_with_secondary_unit_files()
+        self.assert_should_recompile(list(source_files))
+        for source_file in source_files:
+            self.update(source_file)
+        self.assert_should_recompile([])
+
+        _, pkg_body, _, _, _ = self.create_early_cutoff_project_with_secondary_unit_files(body_value="2")
+        self.assert_should_recompile([pkg_body])
+
+        _, _, _, user_arch, _ = self.create_early_cutoff_project_with_secondary_unit_files(architecture_value="2")
+        self.assert_should_recompile([user_arch])
+
+    def test_early_cutoff_recompiles_dependent_files_after_body_change_in_file_with_primary_unit(self):
+        pkg, user, top = self.create_early_cutoff_project()
+        for source_file in [pkg, user, top]:
+            self.update(source_file)
+
+        # Re-analysing the package makes the units depending on it obsolete
+        pkg, user, top = self.create_early_cutoff_project(body_value="2")
+        self.assert_should_recompile([pkg, user, top])
+
+        pkg, user, top = self.create_early_cutoff_project()
+        for source_file in [pkg, user, top]:
+            self.update(source_file)
+
+        pkg, user, top = self.create_early_cutoff_project(architecture_value="2")
+        self.assert_should_recompile([user, top])
+
+    def test_early_cutoff_recompiles_indirectly_dependent_files_after_interface_change(self):
+        pkg, user, top = self.create_early_cutoff_project()
+        for source_file in [pkg, user, top]:
+            self.update(source_file)
+
+        pkg, user, top = self.create_early_cutoff_project(declaration_value="2")
+        self.assert_should_recompile([pkg, user, top])
+
+        # Files which were not compiled against the new interface are still recompiled
+        self.update(pkg)
+        pkg, user, top = self.create_early_cutoff_project(declaration_value="2")
+        self.assert_should_recompile([user, top])
+
+    def test_early_cutoff_recompiles_dependent_files_after_body_change_when_depending_on_package_body(self):
+        pkg, user, top = self.create_early_cutoff_project(depend_on_package_body=True)
+        for source_file in [pkg, user, top]:
+            self.update(source_file)
+
+        pkg, user, top = self.create_early_cutoff_project(body_value="2", depend_on_package_body=True)
+        self.assert_should_recompile([pkg, user, top])
+
+    def test_early_cutoff_recompiles_dependent_files_after_not_compiled_dependency(self):
+        pkg, user, top = self.create_early_cutoff_project()
+        for source_file in [pkg, user, top]:
+            self.update(source_file)
+
+        os.remove(self.hash_file_name_of(pkg))
+        self.assert_should_recompile([pkg, user, top])
+
+    def test_early_cutoff_with_verilog_module_ports(self):
+        self.project = Project(early_cutoff=True)
+        self.project.add_library("lib", "lib_path")
+        module = self.add_source_file("lib", "module.v", "module module1(input a); assign b = a; endmodule")
+        top = self.add_source_file("lib", "top.v", "module top; module1 inst(.a(1'b0)); endmodule")
+        self.update(module)
+        self.update(top)
+        self.assert_should_recompile([])
+
+        self.project = Project(early_cutoff=True)
+        self.project.add_library("lib", "lib_path")
+        module = self.add_source_file("lib", "module.v", "module module1(input a); assign c = a; endmodule")
+        top = self.add_source_file("lib", "top.v", "module top; module1 inst(.a(1'b0)); endmodule")
+        self.assert_should_recompile([module])
+
+        self.project = Project(early_cutoff=True)
+        self.project.add_library("lib", "lib_path")
+        module = self.add_source_file("lib", "module.v", "module module1(input a, output c); endmodule")
+        top = self.add_source_file("lib", "top.v", "module top; module1 inst(.a(1'b0)); endmodule")
+        self.assert_should_recompile([module, top])
+
+    def create_early_cutoff_project(
+        self, declaration_value="1", body_value="1", architecture_value="1", depend_on_package_body=False
+    ):
+        """
+        Create a project with early cutoff containing a package, an entity using the package
+        and a top level instantiating the entity
+        """
+        self.project = Project(depend_on_package_body=depend_on_package_body, early_cutoff=True)
+        self.project.add_library("lib", "lib_path")
+        pkg = self.add_source_file(
+            "lib",
+            "pkg.vhd",
+            f"""\
+package pkg is
+  constant c : natural := {declaration_value};
+  function f return natural;
+end package;
+
+package body pkg is
+  function f return natural is
+  begin
+    return {body_value};
+  end;
+end package body;
+""",
+        )
+        user = self.add_source_file(
+            "lib",
+            "user.vhd",
+            f"""\
+use work.pkg.all;
+
+entity user is
+  generic (g : natural := c);
+end entity;
+
+architecture a of user is
+begin
+  assert f = {architecture_value};
+end architecture;
+""",
+        )
+        top = self.add_source_file(
+            "lib",
+            "top.vhd",
+            """\
+entity top is
+end entity;
+
+architecture a of top is
+begin
+  inst : entity work.user;
+end architecture;
+""",
+        )
+        return pkg, user, top
+
+    def create_early_cutoff_project_with_secondary_unit_files(self, body_value="1", architecture_value="1"):
+        """
+        Create a project with early cutoff like create_early_cutoff_project but with the package body
+        and the architecture of the entity in files of their own
+        """
+        self.project = Project(early_cutoff=True)
+        self.project.add_library("lib", "lib_path")
+        pkg = self.add_source_file(
+            "lib",
+            "pkg.vhd",
+            """\
+package pkg is
+  constant c : natural := 1;
+  function f return natural;
+end package;
+""",
+        )
+        pkg_body = self.add_source_file(
+            "lib",
+            "pkg_body.vhd",
+            f"""\
+package body pkg is
+  function f return natural is
+  begin
+    return {body_value};
+  end;
+end package body;
+""",
+        )
+        user = self.add_source_file(
+            "lib",
+            "user.vhd",
+            """\
+use work.pkg.all;
+
+entity user is
+  generic (g : natural := c);
+end entity;
+""",
+        )
+        user_arch = self.add_source_file(
+            "lib",
+            "user_arch.vhd",
+            f"""\
+use work.pkg.all;
+
+architecture a of user is
+begin
+  assert f = {architecture_value};
+end architecture;
+""",
+        )
+        top = self.add_source_file(
+            "lib",
+            "top.vhd",
+            """\
+entity top is
+end entity;
+
+architecture a of top is
+begin
+  inst : entity work.user;
+end architecture;
+""",
+        )
+        return pkg, pkg_body, user, user_arch, top
+
     def test_finds_component_instantiation_dependencies(self):
         self.project.add_library("toplib", "work_path")
         top = self.add_source_file(
@@ -1318,6 +1521,63 @@ endmodule
         )
         self.assert_not_compiles(pkg, before=module)
 
+    def test_finds_verilog_package_dependencies_in_package_added_after_dependency_graph(self):
+        self.project.add_library("lib1", "lib1_path")
+        self.project.add_library("lib2", "lib2_path")
+        module = self.add_source_file(
+            "lib1",
+            "module.sv",
+            """\
+module name;
+  import pkg::*;
+endmodule
+""",
+        )
+        self.project.create_dependency_graph()
+        pkg = self.add_source_file(
+            "lib2",
+            "pkg.sv",
+            """\
+package pkg;
+endpackage
+""",
+        )
+        self.assert_compiles(pkg, before=module)
+
+    def test_find_source_files(self):
+        self.project.add_library("lib1", "lib1_path")
+        self.project.add_library("lib2", "lib2_path")
+        os.makedirs("dir")
+        file1 = self.add_source_file("lib1", str(Path("dir") / "file1.vhd"), "")
+        file2 = self.add_source_file("lib2", "file2.vhd", "")
+        file3 = self.add_source_file("lib1", "file3.vhd", "")
+
+        self.assertEqual(self.project.find_source_files("*"), [file1, file2, file3])
+        self.assertEqual(self.project.find_source_files("*", "lib1"), [file1, file3])
+        self.assertEqual(self.project.find_source_files("*", "missing_lib"), [])
+        self.assertEqual(self.project.find_source_files("file2.vhd"), [file2])
+        self.assertEqual(self.project.find_source_files("file2.vhd", "lib1"), [])
+        self.assertEqual(self.project.find_source_files(str(Path("file3.vhd").resolve())), [file3])
+        self.assertEqual(self.project.find_source_files(str(Path("dir") / "file1.vhd")), [file1])
+        self.assertEqual(self.project.find_source_files("file1.vhd"), [])
+        self.assertEqual(self.project.find_source_files(str(Path("*") / "file1.vhd")), [file1])
+        self.assertEqual(self.project.find_source_files("*file1.vhd"), [file1])
+        self.assertEqual(self.project.find_source_files("file[23].vhd"), [file2, file3])
+        self.assertEqual(self.project.find_source_files("dir[/\\]file?.vhd"), [file1])
+
+        file4 = self.add_source_file("lib2", str(Path("dir") / "file4.vhd"), "")
+        self.assertEqual(self.project.find_source_files(str(Path("dir") / "*")), [file1, file4])
+
+    def test_find_source_files_relative_to_current_working_directory(self):
+        self.project.add_library("lib", "lib_path")
+        os.makedirs("dir")
+        source_file = self.add_source_file("lib", str(Path("dir").resolve() / "file.vhd"), "")
+        self.assertEqual(self.project.find_source_files(str(Path("dir") / "file.vhd")), [source_file])
+
+        os.chdir("dir")
+        self.assertEqual(self.project.find_source_files(str(Path("dir") / "file.vhd")), [])
+        self.assertEqual(self.project.find_source_files("file.vhd"), [source_file])
+
     def test_finds_verilog_module_instantiation_dependencies(self):
         self.project.add_library("lib", "lib_path")
         module1 = self.add_source_file(
@@ -1846,6 +2106,55 @@ end architecture;
         )
         return file1, file2, file3
 
+    def test_refresh_source_files_updates_design_units_and_dependencies(self):
+        self.project.add_library("lib", "lib_path")
+        pkg = self.add_source_file(
+            "lib",
+            "pkg.vhd",
+            """\
+package pkg is
+end package;
+""",
+        )
+        ent = self.add_source_file(
+            "lib",
+            "ent.vhd",
+            """\
+entity ent is
+end entity;
+""",
+        )
+        self.assertNotIn(pkg, self.project.create_dependency_graph().get_direct_dependencies(ent))
+
+        write_file(
+            "ent.vhd",
+            """\
+use work.pkg.all;
+
+entity ent2 is
+end entity;
+""",
+        )
+        write_file(
+            "pkg.vhd",
+            """\
+package pkg is
+end package;
+
+package body pkg is
+end package body;
+""",
+        )
+        old_content_hash = ent.content_hash
+        self.project.refresh_source_files([ent, pkg])
+
+        self.assertNotEqual(ent.content_hash, old_content_hash)
+        library = self.project.get_library("lib")
+        self.assertFalse(library.has_entity("ent"))
+        self.assertTrue(library.has_entity("ent2"))
+        self.assert_has_package_body("pkg.vhd", "pkg")
+        self.assertIn(pkg, self.project.create_dependency_graph().get_direct_dependencies(ent))
+
     def test_add_source_file_has_vhdl_standard(self):
         write_file("file.vhd", "")
 
@@ -0,0 +1,95 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the retention policy of the test output directories
+"""
+
+from unittest import TestCase
+from pathlib import Path
+from vunit.ostools import BackgroundDeleter
+from vunit.test.report import TestReport, PASSED, FAILED
+from vunit.test.retention import RetentionPolicy
+from tests.common import with_tempdir
+
+
+class TestRetentionPolicy(TestCase):
+    """
+    Test the retention policy of the test output directories
+    """
+
+    @with_tempdir
+    def test_keep_all_keeps_all_output(self, tempdir):
+        report = self._run(tempdir, {"passed": PASSED, "failed": FAILED})
+
+        self.assertEqual(self._apply(RetentionPolicy(), tempdir, report), [])
+        self.assertEqual(self._output_names(tempdir), ["failed", "passed"])
+
+    @with_tempdir
+    def test_keep_failed_only_keeps_output_of_failed_test_suites(self, tempdir):
+        report = self._run(tempdir, {"passed": PASSED, "failed": FAILED, "old": PASSED})
+        report = self._run(tempdir, {"passed": PASSED, "failed": FAILED})
+
+        self._apply(RetentionPolicy(keep="failed"), tempdir, report)
+        self.assertEqual(self._output_names(tempdir), ["failed", "old"])
+
+    @with_tempdir
+    def test_keep_output_of_last_runs(self, tempdir):
+        policy = RetentionPolicy(max_runs=2)
+        self._apply(policy, tempdir, self._run(tempdir, {"first": PASSED, "always": PASSED}))
+        self._apply(policy, tempdir, self._run(tempdir, {"second": PASSED, "always": PASSED}))
+        self.assertEqual(self._output_names(tempdir), ["always", "first", "second"])
+
+        self._apply(policy, tempdir, self._run(tempdir, {"third": FAILED, "always": PASSED}))
+        self.assertEqual(self._output_names(tempdir), ["always", "second", "third"])
+
+    @with_tempdir
+    def test_max_size_discards_oldest_output(self, tempdir):
+        policy = RetentionPolicy(max_size=250)
+        self._apply(policy, tempdir, self._run(tempdir, {"first": PASSED, "second": PASSED}, size=100))
+        self.assertEqual(self._output_names(tempdir), ["first", "second"])
+
+        self._apply(policy, tempdir, self._run(tempdir, {"first": PASSED}, size=100))
+        self.assertEqual(self._output_names(tempdir), ["first", "second"])
+
+        self._apply(policy, tempdir, self._run(tempdir, {"third": PASSED}, size=100))
+        self.assertEqual(self._output_names(tempdir), ["first", "third"])
+
+    @staticmethod
+    def _run(tempdir, statuses, size=10):
+        """
+        Create the output directories of a run with the given test statuses
+        """
+        report = TestReport()
+        for name, status in statuses.items():
+            output_path = Path(tempdir) / name
+            output_path.mkdir(exist_ok=True)
+            output_file_name = output_path / "output.txt"
+            output_file_name.write_text("x" * size)
+            report.add_result(
+                name,
+                status,
+                time=1.0,
+                output_file_name=str(output_file_name),
+                test_suite_name=name,
+                start_time=0,
+                seed="0123456789abcdef",
+            )
+        return report
+
+    @staticmethod
+    def _apply(policy, tempdir, report):
+        """
+        Apply the policy and wait for the discarded output to be deleted
+        """
+        deleter = BackgroundDeleter(Path(tempdir) / ".trash")
+        discarded = policy.apply(tempdir, report, deleter)
+        deleter.wait()
+        return discarded
+
+    @staticmethod
+    def _output_names(tempdir):
+        return sorted(path.name for path in Path(tempdir).iterdir() if path.is_dir() and path.name != ".trash")
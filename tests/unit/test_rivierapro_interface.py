@@ -14,10 +14,12 @@ from pathlib import Path
 import os
 from shutil import rmtree
 from unittest import mock
+from tests.unit.test_modelsim_interface import make_config
 from vunit.sim_if.rivierapro import RivieraProInterface
 from vunit.project import Project
 from vunit.ostools import renew_path, write_file
 from vunit.vhdl_standard import VHDL
+from vunit.persistent_tcl_shell import tcl_string_map
 
 
 class TestRivieraProInterface(unittest.TestCase):
@@ -384,6 +386,26 @@ class TestRivieraProInterface(unittest.TestCase):
             env=simif.get_env(),
         )
 
+    @mock.patch("vunit.sim_if.check_output", autospec=True, return_value="")
+    @mock.patch("vunit.sim_if.rivierapro.Process", autospec=True)
+    @mock.patch("vunit.sim_if.rivierapro.RivieraProInterface.find_prefix", return_value="prefix")
+    def test_common_script_template(self, _find_prefix, process, check_output):
+        simif = RivieraProInterface(prefix="prefix", output_path=self.output_path)
+        sim_options = {"enable_coverage": True, "pli": ["pli.so"]}
+        generics = {"runner_cfg": "active python runner : true,output path : a b/", "str": "a,b", "int": 1}
+        config = make_config(sim_options=sim_options, generics=generics)
+        config.copy.side_effect = lambda: make_config(sim_options=dict(sim_options), generics=dict(generics))
+        output_path = str(Path(self.output_path) / "test output" / "lib.tb.test")
+
+        script = simif._create_common_script(
+            "lib.tb.test", config, Path(output_path) / simif.name, output_path, optimize_design=False
+        )
+
+        template = simif._create_common_script_template(config, optimize_design=False)
+        mapping = simif._get_common_script_template_mapping(output_path, "lib.tb.test", config)
+        self.assertNotIn(output_path, template)
+        self.assertEqual(tcl_string_map(template, mapping), script)
+
     def setUp(self):
         self.output_path = str(Path(__file__).parent / "test_rivierapro_out")
         renew_path(self.output_path)
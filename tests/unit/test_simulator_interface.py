@@ -22,8 +22,10 @@ from vunit.sim_if import (
     StringOption,
     VHDLAssertLevelOption,
 )
+from vunit.sim_if.toolchain_cache import ToolchainCache
 from vunit.exceptions import CompileError
 from vunit.ostools import renew_path, write_file
+from vunit.vhdl_standard import VHDL
 
 
 class TestSimulatorInterface(unittest.TestCase):
@@ -190,6 +192,112 @@ Compile failed
             self.assertRaises(CompileError, simif.compile_source_files, project)
         self.assertEqual(project.get_files_in_compile_order(incremental=True), [source_file])
 
+    def test_compile_source_files_batch(self):
+        simif = create_simulator_interface()
+        simif.compile_source_file_command.side_effect = lambda source_file: ["vcom", "-work", "lib", source_file.name]
+        project = Project()
+        project.add_library("lib", "lib_path")
+        project.add_library("lib2", "lib2_path")
+        source_files = []
+        for name, library_name in [("file1.vhd", "lib"), ("file2.vhd", "lib"), ("file3.vhd", "lib2")]:
+            write_file(name, "")
+            source_files.append(project.add_source_file(name, library_name, file_type="vhdl"))
+        file1, file2, file3 = source_files
+        project.add_manual_dependency(file2, depends_on=file1)
+        project.add_manual_dependency(file3, depends_on=file2)
+
+        with mock.patch("vunit.sim_if.check_output", autospec=True) as check_output:
+            check_output.return_value = "output\n"
+            printer = MockPrinter()
+            simif.compile_source_files(project, printer=printer, batch=True)
+            self.assertEqual(
+                check_output.mock_calls,
+                [
+                    mock.call(["vcom", "-work", "lib", "file1.vhd", "file2.vhd"], env=simif.get_env()),
+                    mock.call(["vcom", "-work", "lib", "file3.vhd"], env=simif.get_env()),
+                ],
+            )
+            self.assertEqual(
+                printer.output,
+                """\
+Compiling into lib:  file1.vhd passed
+Compiling into lib:  file2.vhd passed
+output
+Compiling into lib2: file3.vhd passed
+output
+Compile passed
+""",
+            )
+        self.assertEqual(project.get_files_in_compile_order(incremental=True), [])
+
+    def test_compile_source_files_batch_with_different_options(self):
+        simif = create_simulator_interface()
+        simif.compile_source_file_command.side_effect = lambda source_file: ["command", source_file.name]
+        project = Project()
+        project.add_library("lib", "lib_path")
+        write_file("file1.vhd", "")
+        file1 = project.add_source_file("file1.vhd", "lib", file_type="vhdl")
+        write_file("file2.vhd", "")
+        file2 = project.add_source_file("file2.vhd", "lib", file_type="vhdl", vhdl_standard=VHDL.standard("2002"))
+        project.add_manual_dependency(file2, depends_on=file1)
+
+        with mock.patch("vunit.sim_if.check_output", autospec=True) as check_output:
+            check_output.return_value = ""
+            simif.compile_source_files(project, printer=MockPrinter(), batch=True)
+            self.assertEqual(
+                check_output.mock_calls,
+                [
+                    mock.call(["command", "file1.vhd"], env=simif.get_env()),
+                    mock.call(["command", "file2.vhd"], env=simif.get_env()),
+                ],
+            )
+
+    def test_compile_source_files_batch_falls_back_to_one_by_one(self):
+        simif = create_simulator_interface()
+        simif.compile_source_file_command.side_effect = lambda source_file: ["command", source_file.name]
+        project = Project()
+        project.add_library("lib", "lib_path")
+        source_files = []
+        for name in ["file1.vhd", "file2.vhd", "file3.vhd"]:
+            write_file(name, "")
+            source_files.append(project.add_source_file(name, "lib", file_type="vhdl"))
+        file1, file2, file3 = source_files
+        project.add_manual_dependency(file2, depends_on=file1)
+        project.add_manual_dependency(file3, depends_on=file2)
+
+        def check_output_side_effect(command, env=None):  # pylint: disable=missing-docstring, unused-argument
+            if "file2.vhd" in command:
+                raise subprocess.CalledProcessError(returncode=-1, cmd=command, output="bad stuff")
+            return ""
+
+        with mock.patch("vunit.sim_if.check_output", autospec=True) as check_output:
+            check_output.side_effect = check_output_side_effect
+            printer = MockPrinter()
+            self.assertRaises(CompileError, simif.compile_source_files, project, printer=printer, batch=True)
+            self.assertEqual(
+                check_output.mock_calls,
+                [
+                    mock.call(["command", "file1.vhd", "file2.vhd", "file3.vhd"], env=simif.get_env()),
+                    mock.call(["command", "file1.vhd"], env=simif.get_env()),
+                    mock.call(["command", "file2.vhd"], env=simif.get_env()),
+                ],
+            )
+            self.assertEqual(
+                printer.output,
+                """\
+Compiling into lib: file1.vhd passed
+Compiling into lib: file2.vhd failed
+=== Command used: ===
+command file2.vhd
+
+=== Command output: ===
+bad stuff
+Compile failed
+""",
+            )
+        self.assertEqual(project.get_files_in_compile_order(incremental=True), [file2, file3])
+
+    @mock.patch.object(ToolchainCache, "_active", new=None)
     @mock.patch("os.environ", autospec=True)
     def test_find_prefix(self, environ):
         class MySimulatorInterface(SimulatorInterface):  # pylint: disable=abstract-method
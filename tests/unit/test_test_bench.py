@@ -23,6 +23,7 @@ from vunit.test.bench import (
     _lookup_lineno,
     _find_attributes,
     _find_tests_and_attributes,
+    split_test_cases,
     Test,
     FileLocation,
     Attribute,
@@ -660,6 +661,69 @@ if run("Test 2")
             self.assertEqual(test.location.lineno, 1)
             assert logger.warning.called
 
+    def test_split_test_cases_vhdl(self):
+        common_code, test_case_code = split_test_cases(
+            """\
+while test_suite loop
+  if run("Test 1") then
+    if x then report "end if"; end if; -- end if
+  elsif run("Test 2") or run("Test 3") then
+    report "shared";
+  ELSIF run("Test 4") then
+    report "4";
+  END IF;
+end loop;
+""",
+            file_name="file_name.vhd",
+        )
+
+        self.assertEqual(
+            test_case_code,
+            {
+                "Test 1": 'Test 1") then\n    if x then report "end if"; end if;          \n  ',
+                "Test 2": "",
+                "Test 3": "",
+                "Test 4": 'Test 4") then\n    report "4";\n  ',
+            },
+        )
+        self.assertEqual(
+            common_code,
+            """\
+while test_suite loop
+  if run("elsif run("Test 2") or run("Test 3") then
+    report "shared";
+  ELSIF run("END IF;
+end loop;
+""",
+        )
+
+    def test_split_test_cases_verilog(self):
+        common_code, test_case_code = split_test_cases(
+            """\
+`TEST_SUITE begin
+  `TEST_CASE("Test 1") begin
+    if (x) begin $display("end"); end // end
+  end
+  `TEST_CASE("Test 2") $display("2");
+end
+""",
+            file_name="file_name.sv",
+        )
+
+        self.assertEqual(
+            test_case_code,
+            {"Test 1": 'Test 1") begin\n    if (x) begin $display("end"); end       \n  end', "Test 2": ""},
+        )
+        self.assertEqual(
+            common_code,
+            """\
+`TEST_SUITE begin
+  `TEST_CASE("
+  `TEST_CASE("Test 2") $display("2");
+end
+""",
+        )
+
     @mock.patch("vunit.test.bench.LOGGER")
     def test_duplicate_tests_cause_error(self, mock_logger):
         file_name = "file.vhd"
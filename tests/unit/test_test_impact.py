@@ -0,0 +1,209 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the test impact analysis
+"""
+
+import os
+import unittest
+from pathlib import Path
+from shutil import rmtree
+from types import SimpleNamespace
+from vunit.ostools import renew_path, write_file
+from vunit.project import Project
+from vunit.source_file import file_type_of
+from vunit.test import impact
+
+PACKAGES = """\
+package pkg_a is
+  constant a : natural := 1;
+end package;
+
+package body pkg_a is
+end package body;
+
+-- Comment
+package pkg_b is
+  constant b : natural := 2;
+end package;
+
+package body pkg_b is
+end package body;
+"""
+
+ENTITY = """\
+entity ent is
+end entity;
+
+architecture rtl of ent is
+begin
+end architecture;
+
+architecture sim of ent is
+begin
+end architecture;
+"""
+
+
+def create_test_bench(name, package_name, instance=""):
+    """
+    Return the code of a test bench using package_name with the tests one and two
+    """
+    return f"""\
+library vunit_lib;
+context vunit_lib.vunit_context;
+use work.{package_name!s}.all;
+
+entity {name!s} is
+  generic (runner_cfg : string);
+end entity;
+
+architecture tb of {name!s} is
+begin
+  {instance!s}
+  main : process
+  begin
+    test_runner_setup(runner, runner_cfg);
+    while test_suite loop
+      if run("one") then
+        report "one";
+      elsif run("two") then
+        report "two";
+      end if;
+    end loop;
+    test_runner_cleanup(runner);
+  end process;
+end architecture;
+"""
+
+
+class TestTestImpactAnalysis(unittest.TestCase):
+    """
+    Test the test impact analysis
+    """
+
+    def setUp(self):
+        self.output_path = str(Path(__file__).parent / "test_test_impact_out")
+        renew_path(self.output_path)
+        self.project = Project()
+        self.project.add_library("vunit_lib", "vunit_lib_path")
+        self.project.add_library("lib", "lib_path")
+        self.cwd = os.getcwd()
+        os.chdir(self.output_path)
+
+        self.source_files = {}
+        self.add_source_file(
+            "vunit_lib",
+            "vunit_context.vhd",
+            """\
+context vunit_context is
+end context;
+""",
+        )
+        self.add_source_file("lib", "packages.vhd", PACKAGES)
+        self.add_source_file("lib", "ent.vhd", ENTITY)
+        self.add_source_file("lib", "tb_a.vhd", create_test_bench("tb_a", "pkg_a", "dut : entity work.ent(rtl);"))
+        self.add_source_file("lib", "tb_b.vhd", create_test_bench("tb_b", "pkg_b"))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        if Path(self.output_path).exists():
+            rmtree(self.output_path)
+
+    def add_source_file(self, library_name, file_name, contents):
+        write_file(file_name, contents)
+        self.source_files[file_name] = self.project.add_source_file(
+            file_name, library_name, file_type=file_type_of(file_name)
+        )
+
+    def modify(self, file_name, old, new):
+        """
+        Replace old with new in the file and refresh the project
+        """
+        contents = Path(file_name).read_text()
+        self.assertIn(old, contents)
+        write_file(file_name, contents.replace(old, new))
+        self.project.refresh_source_files([self.source_files[file_name]])
+
+    def digests(self, split_test_bench=False):
+        """
+        Return the digests of the tests one and two of tb_a and tb_b
+        """
+        analysis = impact.TestImpactAnalysis(self.project, self.project.create_dependency_graph(True))
+        result = {}
+        for name in ["tb_a", "tb_b"]:
+            for test_name in ["one", "two"]:
+                full_name = f"lib.{name!s}.{test_name!s}"
+                test_suite = SimpleNamespace(
+                    test_configuration={
+                        full_name: SimpleNamespace(
+                            library_name="lib", design_unit_name=name, vhdl_configuration_name=None
+                        )
+                    },
+                    file_name=f"{name!s}.vhd",
+                    test_information={full_name: SimpleNamespace(name=test_name)},
+                )
+                result[f"{name!s}.{test_name!s}"] = analysis.digest(test_suite, split_test_bench=split_test_bench)
+        return result
+
+    def assert_changed(self, before, after, expected):
+        self.assertCountEqual([name for name in before if before[name] != after[name]], expected)
+
+    def test_change_of_package_only_affects_its_users(self):
+        before = self.digests()
+        self.modify("packages.vhd", "constant b : natural := 2;", "constant b : natural := 3;")
+        self.assert_changed(before, self.digests(), ["tb_b.one", "tb_b.two"])
+
+    def test_change_of_comments_and_whitespace_affects_nothing(self):
+        before = self.digests()
+        self.modify("packages.vhd", "-- Comment\n", "-- Changed comment\n\n")
+        self.assert_changed(before, self.digests(), [])
+
+    def test_change_of_architecture_only_affects_its_users(self):
+        before = self.digests()
+        self.modify(
+            "ent.vhd", "architecture sim of ent is\nbegin\n", "architecture sim of ent is\nbegin\n  report 1;\n"
+        )
+        self.assert_changed(before, self.digests(), [])
+
+        self.modify(
+            "ent.vhd", "architecture rtl of ent is\nbegin\n", "architecture rtl of ent is\nbegin\n  report 1;\n"
+        )
+        self.assert_changed(before, self.digests(), ["tb_a.one", "tb_a.two"])
+
+    def test_change_of_context_clause_affects_the_design_unit(self):
+        before = self.digests()
+        self.modify("packages.vhd", "-- Comment\n", "library ieee;\n")
+        self.assert_changed(before, self.digests(), ["tb_b.one", "tb_b.two"])
+
+    def test_unresolved_reference_depends_on_all_dependencies_of_the_file(self):
+        self.modify("tb_b.vhd", "begin\n  \n", "begin\n  inst : comp port map (clk => clk);\n")
+        self.project.add_manual_dependency(self.source_files["tb_b.vhd"], depends_on=self.source_files["ent.vhd"])
+        before = self.digests()
+        self.modify(
+            "ent.vhd", "architecture sim of ent is\nbegin\n", "architecture sim of ent is\nbegin\n  report 1;\n"
+        )
+        self.assert_changed(before, self.digests(), ["tb_b.one", "tb_b.two"])
+
+    def test_change_of_test_case_only_affects_the_test_case(self):
+        before = self.digests(split_test_bench=True)
+        self.modify("tb_a.vhd", 'report "two";', 'report "changed";')
+        self.assert_changed(before, self.digests(split_test_bench=True), ["tb_a.two"])
+
+        self.modify("tb_a.vhd", "test_runner_cleanup(runner);", "test_runner_cleanup(runner, true);")
+        self.assert_changed(before, self.digests(split_test_bench=True), ["tb_a.one", "tb_a.two"])
+
+    def test_change_of_test_case_affects_all_test_cases_without_split_test_bench(self):
+        before = self.digests()
+        self.modify("tb_a.vhd", 'report "two";', 'report "changed";')
+        self.assert_changed(before, self.digests(), ["tb_a.one", "tb_a.two"])
+
+    def test_unknown_test_bench(self):
+        analysis = impact.TestImpactAnalysis(self.project, self.project.create_dependency_graph(True))
+        config = SimpleNamespace(library_name="lib", design_unit_name="tb_c", vhdl_configuration_name=None)
+        test_suite = SimpleNamespace(test_configuration={"lib.tb_c.all": config})
+        self.assertIsNone(analysis.digest(test_suite))
@@ -12,9 +12,10 @@ from unittest import TestCase
 import os
 from pathlib import Path
 from xml.etree import ElementTree
-from vunit.test.report import TestReport, PASSED, SKIPPED, FAILED
+from vunit.test.report import TestReport, JUnitXmlWriter, PASSED, SKIPPED, FAILED
 from vunit.ui.common import TEST_OUTPUT_PATH
 from vunit.ui.results import Results
+from tests.common import with_tempdir
 
 
 class TestTestReport(TestCase):
@@ -62,6 +63,33 @@ Elapsed time was 1.0 s
         self.assertTrue(report.result_of("passed_test1").passed)
         self.assertRaises(KeyError, report.result_of, "invalid_test")
 
+    def test_report_with_finish_times(self):
+        report = self._report_with_all_passed_tests()
+        report.set_real_total_time(3.5)
+        report.set_finish_times({"passed_test0": {"predicted": 2.5, "actual": 3.0}})
+        self.assertEqual(
+            self.report_to_str(report),
+            """\
+==== Summary ========================
+{gi}pass{x} passed_test0 (1.0 s)
+{gi}pass{x} passed_test1 (2.0 s)
+=====================================
+{gi}pass{x} 2 of 2
+=====================================
+Total time was 3.0 s
+Elapsed time was 3.5 s
+Predicted test finish time was 2.5 s (actual 3.0 s)
+=====================================
+{gi}All passed!{x}
+""",
+        )
+        self.assertEqual(report.result_of("passed_test1").to_dict()["predicted_finish_time"], 2.5)
+        self.assertEqual(report.result_of("passed_test1").to_dict()["finish_time"], 3.0)
+
+        test = Results(self.output_file_name, None, report).get_report().tests["passed_test0"]
+        self.assertEqual(test.predicted_finish_time, 2.5)
+        self.assertEqual(test.finish_time, 3.0)
+
     def test_report_with_missing_tests(self):
         report = self._report_with_missing_tests()
         report.set_real_total_time(1.0)
@@ -340,6 +368,75 @@ Elapsed time was 1 h 1 min 40.0 s
             ),
         )
 
+    @with_tempdir
+    def test_junit_xml_writer_streams_results(self, tempdir):
+        xml_file_name = Path(tempdir) / "report" / "xunit.xml"
+        xml_file_name.parent.mkdir()
+        xml_file_name.write_text("<testsuite>stale report</testsuite>", encoding="utf-8")
+        writer = JUnitXmlWriter(xml_file_name, xunit_xml_format="bamboo")
+
+        # The stale report of a previous run is replaced by an empty report
+        root = ElementTree.parse(str(xml_file_name)).getroot()
+        self.assertEqual(root.attrib["tests"], "0")
+        self.assertEqual(root.findall("*"), [])
+
+        # The report is complete up to the last result without being finalized, for example when killed
+        report = self._report_with_some_failed_tests(TestReport(self.printer, junit_xml_writer=writer))
+        root = ElementTree.parse(str(xml_file_name)).getroot()
+        self.assertEqual(root.attrib["failures"], "2")
+        self.assertEqual(root.attrib["tests"], "3")
+        self.assertEqual(len(root.findall("testcase")), 3)
+
+        report.finalize_junit_xml()
+        self.assertEqual(list(xml_file_name.parent.iterdir()), [xml_file_name])
+        root = ElementTree.parse(str(xml_file_name)).getroot()
+        expected = ElementTree.fromstring(report.to_junit_xml_str(xunit_xml_format="bamboo"))
+        self.assertEqual(root.attrib, expected.attrib)
+        self.assertEqual(root.attrib["failures"], "2")
+        self.assertEqual(root.attrib["tests"], "3")
+        self.assertEqual(len(root.findall("*")), 3)
+        self.assert_has_test(root, "failed_test0", time="11.1", status="failed", fmt="bamboo")
+        self.assert_has_test(root, "passed_test", time="2.0", status="passed", fmt="bamboo")
+        self.assert_has_test(root, "failed_test1", time="3.0", status="failed", fmt="bamboo")
+
+        # Finalizing is only done once
+        report.finalize_junit_xml()
+        self.assertEqual(len(ElementTree.parse(str(xml_file_name)).getroot().findall("*")), 3)
+
+    @with_tempdir
+    def test_junit_xml_writer_without_results(self, tempdir):
+        xml_file_name = Path(tempdir) / "xunit.xml"
+        report = TestReport(self.printer, junit_xml_writer=JUnitXmlWriter(xml_file_name))
+        report.finalize_junit_xml()
+        root = ElementTree.parse(str(xml_file_name)).getroot()
+        self.assertEqual(root.tag, "testsuite")
+        self.assertEqual(root.attrib["tests"], "0")
+        self.assertEqual(root.findall("*"), [])
+
+    @with_tempdir
+    def test_junit_xml_writer_truncates_output(self, tempdir):
+        xml_file_name = Path(tempdir) / "xunit.xml"
+        output_file_name = Path(tempdir) / "output.txt"
+        output_file_name.write_text("".join(f"line {i:d}\n" for i in range(1000)), encoding="utf-8")
+
+        report = TestReport(self.printer, junit_xml_writer=JUnitXmlWriter(xml_file_name, max_output_size=20))
+        report.add_result(
+            "test",
+            PASSED,
+            time=1.0,
+            output_file_name=str(output_file_name),
+            test_suite_name="test",
+            start_time=0,
+            seed="0123456789abcdef",
+        )
+        report.finalize_junit_xml()
+
+        output = ElementTree.parse(str(xml_file_name)).getroot().find("testcase/system-out").text
+        self.assertEqual(
+            output,
+            f"(Output truncated to the last 18 bytes, see {output_file_name!s})\nline 998\nline 999\n",
+        )
+
     def test_dict_report_with_all_passed_tests(self):
         opath = Path(self.output_file_name).parent.parent
         test_path = opath / TEST_OUTPUT_PATH / "unit"
@@ -419,9 +516,9 @@ Elapsed time was 1 h 1 min 40.0 s
         report.set_expected_num_tests(3)
         return report
 
-    def _report_with_some_failed_tests(self):
+    def _report_with_some_failed_tests(self, report=None):
         "@returns A report with some failed tests"
-        report = self._new_report()
+        report = self._new_report() if report is None else report
         report.add_result(
             "failed_test0",
             FAILED,
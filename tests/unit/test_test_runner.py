@@ -9,11 +9,19 @@ Test the test runner
 """
 
 from pathlib import Path
+import io
+import multiprocessing
+from shutil import rmtree
+import os
+import sys
+import threading
+import time
 import unittest
 from unittest import mock
 from tests.common import with_tempdir
 from vunit.hashing import hash_string
-from vunit.test.runner import TestRunner
+from vunit.ostools import Process, BackgroundDeleter
+from vunit.test.runner import TestRunner, OutputCapture, TRASH_PATH, _WorkerProcess
 from vunit.test.report import TestReport
 from vunit.test.list import TestList
 
@@ -156,6 +164,176 @@ class TestTestRunner(unittest.TestCase):
             self.assertEqual(report.result_of("test").start_time, 1000)
             self.assertEqual(report.result_of("test").test_suite_name, "test")
 
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "Requires fork")
+    @with_tempdir
+    def test_process_backend_runs_tests_in_worker_processes(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir, num_threads=2, backend="process")
+
+        test_list = TestList()
+        for name, passed in [("test1", True), ("test2", False), ("test3", True)]:
+            test_case = self.create_test(name, passed)
+
+            def side_effect(*args, name=name, passed=passed, **kwargs):  # pylint: disable=unused-argument
+                print(f"{name!s} in {os.getpid():d}")
+                return passed
+
+            test_case.run_side_effect = side_effect
+            test_list.add_test(test_case)
+
+        runner.run(test_list)
+        self.assertTrue(report.result_of("test1").passed)
+        self.assertTrue(report.result_of("test2").failed)
+        self.assertTrue(report.result_of("test3").passed)
+        self.assertEqual(report.result_of("test1").seed, "0123456789abcdef")
+        for name in ["test1", "test2", "test3"]:
+            output_name, _, pid = report.result_of(name).output.strip().partition(" in ")
+            self.assertEqual(output_name, name)
+            self.assertNotEqual(int(pid), os.getpid())
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "Requires fork")
+    @with_tempdir
+    def test_process_backend_continues_when_worker_process_dies(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir, backend="process")
+
+        order = []
+        test_case1 = self.create_test("test1", True)
+        test_case2 = self.create_test("test2", True, order=order)
+        test_list = TestList()
+        test_list.add_test(test_case1)
+        test_list.add_test(test_case2)
+
+        def side_effect(*args, **kwargs):  # pylint: disable=unused-argument
+            os._exit(1)  # pylint: disable=protected-access
+
+        test_case1.run_side_effect = side_effect
+        runner.run(test_list)
+        self.assertTrue(report.result_of("test1").failed)
+        self.assertTrue(report.result_of("test2").passed)
+        self.assertEqual(order, ["test2"])
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "Requires fork")
+    @with_tempdir
+    def test_process_backend_forks_while_deleting_in_the_background(self, tempdir):
+        report = TestReport()
+        deleter = BackgroundDeleter(Path(tempdir) / TRASH_PATH)
+        runner = TestRunner(report, tempdir, num_threads=2, backend="process", deleter=deleter)
+        num_threads = threading.active_count()
+
+        test_list = TestList()
+        test_list.add_test(self.create_test("test1", True))
+        test_list.add_test(self.create_test("test2", True))
+
+        def slow_rmtree(*args, **kwargs):
+            time.sleep(0.2)
+            rmtree(*args, **kwargs)
+
+        worker_process_init = _WorkerProcess.__init__
+        num_threads_when_forking = []
+
+        def init(*args, **kwargs):
+            num_threads_when_forking.append(threading.active_count())
+            worker_process_init(*args, **kwargs)
+
+        with mock.patch("vunit.ostools.shutil.rmtree", new=slow_rmtree):
+            with mock.patch.object(_WorkerProcess, "__init__", new=init):
+                for idx in range(3):
+                    old_output_path = Path(tempdir) / f"old{idx:d}"
+                    old_output_path.mkdir()
+                    (old_output_path / "output.txt").write_text("old")
+                    deleter.discard(old_output_path)
+                self.assertGreater(threading.active_count(), num_threads)
+
+                runner.run(test_list)
+                deleter.wait()
+
+        self.assertEqual(num_threads_when_forking, [num_threads, num_threads])
+        self.assertTrue(report.result_of("test1").passed)
+        self.assertTrue(report.result_of("test2").passed)
+        self.assertEqual(list((Path(tempdir) / TRASH_PATH).iterdir()), [])
+
+    @with_tempdir
+    def test_test_suite_is_killed_when_timed_out(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir, timeout=0.5)
+
+        test_case1 = self.create_test("test1", True)
+        test_case2 = self.create_test("test2", True)
+        test_list = TestList()
+        test_list.add_test(test_case1)
+        test_list.add_test(test_case2)
+
+        def side_effect(*args, **kwargs):  # pylint: disable=unused-argument
+            Process([sys.executable, "-c", "import time; time.sleep(30)"]).consume_output()
+            return True
+
+        test_case1.run_side_effect = side_effect
+        start = time.monotonic()
+        runner.run(test_list)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertTrue(report.result_of("test1").timed_out)
+        self.assertTrue(report.result_of("test1").failed)
+        self.assertTrue(report.result_of("test2").passed)
+        self.assertIn("Test suite test1 timed out after 0.5 s and was killed", report.result_of("test1").output)
+
+    @with_tempdir
+    def test_prints_output_of_failing_test(self, tempdir):
+        stdout = io.StringIO()
+        report = TestReport()
+        with mock.patch("sys.stdout", new=stdout):
+            runner = TestRunner(report, tempdir, no_color=True)
+
+        test_list = TestList()
+        for name, passed in [("test1", True), ("test2", False)]:
+            test_case = self.create_test(name, passed)
+
+            def side_effect(*args, name=name, passed=passed, **kwargs):  # pylint: disable=unused-argument
+                print(f"\x1b[31mOutput of {name!s}\x1b[0m")
+                return passed
+
+            test_case.run_side_effect = side_effect
+            test_list.add_test(test_case)
+
+        runner.run(test_list)
+        self.assertNotIn("Output of test1", stdout.getvalue())
+        self.assertIn("Output of test2\n", stdout.getvalue())
+        self.assertEqual(report.result_of("test2").output, "Output of test2\n")
+
+    @with_tempdir
+    def test_simulator_output_is_captured_in_binary_chunks(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir)
+
+        test_case = self.create_test("test", True)
+        test_list = TestList()
+        test_list.add_test(test_case)
+
+        def side_effect(read_output, **kwargs):  # pylint: disable=unused-argument
+            """
+            Side effect printing the output of a process
+            """
+            print("before")
+            process = Process(
+                [
+                    sys.executable,
+                    "-c",
+                    r"for idx in range(1000): print('\x1b[32mline %d\x1b[0m' % idx)",
+                ]
+            )
+            with mock.patch.object(Process, "_start_reader", side_effect=AssertionError):
+                process.consume_output()
+            print("after")
+            return read_output().endswith("line 999\nafter\n")
+
+        test_case.run_side_effect = side_effect
+        runner.run(test_list)
+        self.assertTrue(report.result_of("test").passed)
+        output = report.result_of("test").output.splitlines()
+        self.assertEqual(output, ["before"] + [f"line {idx:d}" for idx in range(1000)] + ["after"])
+        color_output = (Path(report.result_of("test").to_dict()["path"]) / "output_with_color.txt").read_bytes()
+        self.assertIn(b"\x1b[32mline 999\x1b[0m", color_output)
+
     def test_get_output_path_on_linux(self):
         output_path = "output_path"
         report = TestReport()
@@ -216,6 +394,28 @@ class TestTestRunner(unittest.TestCase):
                     str(Path(output_path).resolve() / hash_string(test_name)),
                 )
 
+    @with_tempdir
+    def test_old_output_is_deleted_in_the_background(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir)
+        output_path = Path(runner._get_output_path("test"))
+        output_path.mkdir(parents=True)
+        (output_path / "wave.ghw").write_text("wave")
+        (Path(tempdir) / "test_name_to_path_mapping.txt").write_text("deleted_folder deleted_test\n")
+
+        test_list = TestList()
+        test_list.add_test(self.create_test("test", True))
+        with mock.patch.object(runner._deleter, "discard", wraps=runner._deleter.discard) as discard:
+            runner.run(test_list)
+        runner._deleter.wait()
+
+        discard.assert_called_once_with(str(output_path))
+        self.assertFalse((output_path / "wave.ghw").exists())
+        self.assertEqual(list((Path(tempdir) / ".trash").iterdir()), [])
+        self.assertEqual(
+            (Path(tempdir) / "test_name_to_path_mapping.txt").read_text().splitlines(), [f"{output_path.name!s} test"]
+        )
+
     @staticmethod
     def create_test(name, passed, order=None):
         """
@@ -235,6 +435,74 @@ class TestTestRunner(unittest.TestCase):
         return test_case
 
 
+class TestOutputCapture(unittest.TestCase):
+    """
+    Test the output capture
+    """
+
+    @with_tempdir
+    def test_strips_color_codes_split_between_writes(self, tempdir):
+        color_output_file_name = str(Path(tempdir) / "output_with_color.txt")
+        output = OutputCapture(color_output_file_name, str(Path(tempdir) / "output.txt"))
+        output.write_raw(b"\x1b[3")
+        self.assertEqual(output.read(), "")
+        output.write_raw(b"1mred\x1b[0m \xc3")
+        self.assertEqual(output.read(), "red ")
+        output.write_raw(b"\xa5\n")
+        output.write("text\n")
+        self.assertEqual(output.read(), "red \u00e5\ntext\n")
+        output.close()
+        self.assertEqual(
+            Path(color_output_file_name).read_bytes(), ("\x1b[31mred\x1b[0m \u00e5\ntext" + os.linesep).encode()
+        )
+
+    @with_tempdir
+    def test_plain_output_file_is_written_before_close(self, tempdir):
+        output_file_name = Path(tempdir) / "output.txt"
+        output = OutputCapture(str(Path(tempdir) / "output_with_color.txt"), str(output_file_name))
+        output.write_raw(b"\x1b[31mred\x1b[0m\n\x1b[3")
+        output.flush()
+        self.assertEqual(output_file_name.read_bytes(), b"red\n")
+        output.write_raw(b"2mgreen\x1b[0m\n")
+        output.write("text\n")
+        output.flush()
+        self.assertEqual(output_file_name.read_bytes(), ("red\ngreen\ntext" + os.linesep).encode())
+        output.close()
+
+    @with_tempdir
+    def test_output_files_are_flushed_periodically(self, tempdir):
+        output_file_name = Path(tempdir) / "output.txt"
+        with mock.patch("time.monotonic", side_effect=[0.0, 0.5, 1.5]):
+            output = OutputCapture(str(Path(tempdir) / "output_with_color.txt"), str(output_file_name))
+            output.write_raw(b"first\n")
+            self.assertEqual(output_file_name.read_bytes(), b"")
+            output.write_raw(b"second\n")
+            self.assertEqual(output_file_name.read_bytes(), b"first\nsecond\n")
+        output.close()
+
+    @with_tempdir
+    def test_keeps_bounded_tail(self, tempdir):
+        output = OutputCapture(str(Path(tempdir) / "color.txt"), str(Path(tempdir) / "output.txt"), tail_size=10)
+        output.write_raw(b"0123")
+        self.assertEqual(output.tail(), (b"0123", False))
+        output.write_raw(b"456789")
+        self.assertEqual(output.tail(), (b"0123456789", False))
+        output.write_raw(b"abc")
+        self.assertEqual(output.tail(), (b"3456789abc", True))
+        output.close()
+        self.assertEqual(Path(tempdir, "output.txt").read_text(), "0123456789abc")
+
+    @with_tempdir
+    def test_echoes_text_output(self, tempdir):
+        echo = io.StringIO()
+        output = OutputCapture(str(Path(tempdir) / "color.txt"), str(Path(tempdir) / "output.txt"), echo=echo)
+        self.assertIsNone(output.raw_writer())
+        output.write("\x1b[31mred\x1b[0m\n")
+        output.close()
+        self.assertEqual(echo.getvalue(), "\x1b[31mred\x1b[0m\n")
+        self.assertEqual(Path(tempdir, "output.txt").read_text(), "red\n")
+
+
 class TestCaseMock(object):
     """
     A test case mock class
@@ -246,6 +514,7 @@ class TestCaseMock(object):
         self.read_output = None
         self.called = False
         self.run_side_effect = run_side_effect
+        self.test_configuration = mock.Mock(sim_options={})
 
     def run(self, output_path, read_output):
         """
@@ -8,9 +8,13 @@
 Test the test scheduler
 """
 
+import threading
 import unittest
 from unittest import mock
-from vunit.test.runner import TestScheduler
+from vunit.test.runner import TestScheduler, create_shards
+from vunit.test.duration import ExecTimeEstimator, get_test_duration, update_duration_model
+from vunit.test.resources import create_resource_budget, get_resource_demand
+from vunit.test.timeout import get_timeout, MIN_HISTORY_TIMEOUT
 
 
 class TestTestScheduler(unittest.TestCase):
@@ -29,9 +33,20 @@ class TestTestScheduler(unittest.TestCase):
         test_suite.name = name
         test_suite.test_names = test_names
         test_suite.file_name = file_name
+        test_suite.test_configuration = {}
         return test_suite
 
-    def _add_test_history(self, test_suite_name, test_name, status, start_time, total_time):
+    def _create_test_suite_using(self, name, **sim_options):
+        """Helper method to create a test suite with resources sim options"""
+        test_suite = self._create_test_suite(name, [name], "file")
+        test_suite.test_configuration = {
+            name: mock.Mock(sim_options={f"resources.{key!s}": value for key, value in sim_options.items()})
+        }
+        return test_suite
+
+    def _add_test_history(
+        self, test_suite_name, test_name, status, start_time, total_time, duration=None
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
         """Helper method to create test suite histories."""
 
         if test_suite_name not in self._test_history:
@@ -43,6 +58,8 @@ class TestTestScheduler(unittest.TestCase):
         history["skipped"] = status == "skipped"
         history["failed"] = status == "failed"
         history["start_time"] = start_time
+        if duration is not None:
+            history["duration"] = duration
         self._test_history[test_suite_name][test_name] = history
 
     def test_that_new_test_suites_go_to_set_2(self):
@@ -55,10 +72,10 @@ class TestTestScheduler(unittest.TestCase):
 
         for set_idx in range(5):
             if set_idx == 2:
-                self.assertIsNone(result[set_idx]["total_exec_time"])
+                self.assertEqual(result[set_idx]["total_exec_time"], 10)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 1)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb1.test1")
-                self.assertIsNone(result[set_idx]["test_suites"][0]["exec_time"])
+                self.assertEqual(result[set_idx]["test_suites"][0]["exec_time"], 10)
             else:
                 self.assertEqual(result[set_idx]["total_exec_time"], 0)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 0)
@@ -73,7 +90,9 @@ class TestTestScheduler(unittest.TestCase):
 
         for set_idx in range(5):
             if set_idx == 2:
-                self.assertIsNone(result[set_idx]["total_exec_time"])
+                # Skipped test suites have no execution time to add to the total
+                self.assertEqual(result[set_idx]["total_exec_time"], 0)
+                self.assertIsNone(result[set_idx]["test_suites"][0]["exec_time"])
                 self.assertEqual(len(result[set_idx]["test_suites"]), 1)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb1.test1")
             else:
@@ -94,10 +113,7 @@ class TestTestScheduler(unittest.TestCase):
                 self.assertEqual(len(result[set_idx]["test_suites"]), 1)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb1.test1")
             else:
-                if set_idx == 2:
-                    self.assertIsNone(result[set_idx]["total_exec_time"])
-                else:
-                    self.assertEqual(result[set_idx]["total_exec_time"], 0)
+                self.assertEqual(result[set_idx]["total_exec_time"], 0)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 0)
 
     def test_that_failed_test_suites_w_updates_go_to_set_1(self):
@@ -114,10 +130,7 @@ class TestTestScheduler(unittest.TestCase):
                 self.assertEqual(len(result[set_idx]["test_suites"]), 1)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb1.test1")
             else:
-                if set_idx == 2:
-                    self.assertIsNone(result[set_idx]["total_exec_time"])
-                else:
-                    self.assertEqual(result[set_idx]["total_exec_time"], 0)
+                self.assertEqual(result[set_idx]["total_exec_time"], 0)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 0)
 
     def test_that_passed_test_suites_wo_updates_go_to_set_4(self):
@@ -134,10 +147,7 @@ class TestTestScheduler(unittest.TestCase):
                 self.assertEqual(len(result[set_idx]["test_suites"]), 1)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb1.test1")
             else:
-                if set_idx == 2:
-                    self.assertIsNone(result[set_idx]["total_exec_time"])
-                else:
-                    self.assertEqual(result[set_idx]["total_exec_time"], 0)
+                self.assertEqual(result[set_idx]["total_exec_time"], 0)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 0)
 
     def test_that_passed_test_suites_w_updates_go_to_set_3(self):
@@ -154,10 +164,7 @@ class TestTestScheduler(unittest.TestCase):
                 self.assertEqual(len(result[set_idx]["test_suites"]), 1)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb1.test1")
             else:
-                if set_idx == 2:
-                    self.assertIsNone(result[set_idx]["total_exec_time"])
-                else:
-                    self.assertEqual(result[set_idx]["total_exec_time"], 0)
+                self.assertEqual(result[set_idx]["total_exec_time"], 0)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 0)
 
     def test_that_highest_priority_set_wins(self):
@@ -180,14 +187,11 @@ class TestTestScheduler(unittest.TestCase):
 
         for set_idx in range(5):
             if set_idx == 0:
-                self.assertEqual(result[set_idx]["total_exec_time"], 48)
+                self.assertEqual(result[set_idx]["total_exec_time"], 60)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 1)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb1")
             else:
-                if set_idx == 2:
-                    self.assertIsNone(result[set_idx]["total_exec_time"])
-                else:
-                    self.assertEqual(result[set_idx]["total_exec_time"], 0)
+                self.assertEqual(result[set_idx]["total_exec_time"], 0)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 0)
 
     def test_that_sets_are_ordered_by_execution_time(self):
@@ -214,16 +218,13 @@ class TestTestScheduler(unittest.TestCase):
 
         for set_idx in range(5):
             if set_idx == 0:
-                self.assertEqual(result[set_idx]["total_exec_time"], 65)
+                self.assertEqual(result[set_idx]["total_exec_time"], 77)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 3)
                 self.assertEqual(result[set_idx]["test_suites"][0]["test_suite"].name, "lib1.tb3")
                 self.assertEqual(result[set_idx]["test_suites"][1]["test_suite"].name, "lib1.tb2")
                 self.assertEqual(result[set_idx]["test_suites"][2]["test_suite"].name, "lib1.tb1")
             else:
-                if set_idx == 2:
-                    self.assertIsNone(result[set_idx]["total_exec_time"])
-                else:
-                    self.assertEqual(result[set_idx]["total_exec_time"], 0)
+                self.assertEqual(result[set_idx]["total_exec_time"], 0)
                 self.assertEqual(len(result[set_idx]["test_suites"]), 0)
 
     def test_that_next_test_suite_is_picked_in_time_order_for_single_thread(self):
@@ -296,3 +297,245 @@ class TestTestScheduler(unittest.TestCase):
             self.assertRaises(StopIteration, test_scheduler.next, thread_id=0)
 
         self.assertTrue(test_scheduler.is_finished())
+
+    def test_that_shards_are_balanced_by_execution_time(self):
+        test_suites = []
+        for idx, total_time in enumerate([7, 5, 4, 3, 3, 2]):
+            name = f"lib.tb{idx:d}.test"
+            test_suites.append(self._create_test_suite(name, [name], "file"))
+            self._add_test_history(name, name, "passed", 0, total_time)
+
+        shards = create_shards(test_suites, 2, self._test_history)
+        self.assertEqual(
+            [[test_suite.name for test_suite in shard] for shard in shards],
+            [["lib.tb0.test", "lib.tb3.test", "lib.tb5.test"], ["lib.tb1.test", "lib.tb2.test", "lib.tb4.test"]],
+        )
+
+    def test_that_shards_are_deterministic(self):
+        test_suites = [
+            self._create_test_suite(f"lib.tb{idx:d}.test", [f"lib.tb{idx:d}.test"], "file") for idx in range(10)
+        ]
+        for test_suite in test_suites:
+            self._add_test_history(test_suite.name, test_suite.name, "passed", 0, 1)
+
+        shards = create_shards(test_suites, 3, self._test_history)
+        shards_of_reversed = create_shards(list(reversed(test_suites)), 3, self._test_history)
+        for shard, shard_of_reversed in zip(shards, shards_of_reversed):
+            self.assertEqual(shard, list(reversed(shard_of_reversed)))
+        self.assertEqual([len(shard) for shard in shards], [4, 3, 3])
+
+    def test_that_test_suites_without_history_are_given_the_mean_execution_time(self):
+        test_suites = [
+            self._create_test_suite("lib.tb1.test", ["lib.tb1.test"], "file"),
+            self._create_test_suite("lib.tb2.test", ["lib.tb2.test"], "file"),
+            self._create_test_suite("lib.tb3.new", ["lib.tb3.new"], "file"),
+            self._create_test_suite("lib.tb4.new", ["lib.tb4.new"], "file"),
+        ]
+        self._add_test_history("lib.tb1.test", "lib.tb1.test", "passed", 0, 10)
+        self._add_test_history("lib.tb2.test", "lib.tb2.test", "passed", 0, 2)
+
+        shards = create_shards(test_suites, 2, self._test_history)
+        self.assertEqual(
+            [[test_suite.name for test_suite in shard] for shard in shards],
+            [["lib.tb1.test", "lib.tb2.test"], ["lib.tb3.new", "lib.tb4.new"]],
+        )
+
+    def test_duration_model(self):
+        duration_model = None
+        for exec_time in [10, 20] + [1] * 19:
+            duration_model = update_duration_model(duration_model, exec_time)
+            if exec_time == 20:
+                self.assertEqual(duration_model, {"ewma": 13, "samples": [10, 20]})
+
+        self.assertEqual(duration_model["samples"], [20] + [1] * 19)
+        self.assertLess(duration_model["ewma"], 1.1)
+
+    def test_test_duration(self):
+        test_data = dict(total_time=4, skipped=False)
+        self.assertEqual(get_test_duration(test_data), 4)
+        self.assertEqual(get_test_duration(test_data, percentile=90), 4)
+
+        test_data["duration"] = {"ewma": 3, "samples": list(range(1, 11))}
+        self.assertEqual(get_test_duration(test_data), 3)
+        self.assertEqual(get_test_duration(test_data, percentile=50), 6)
+        self.assertEqual(get_test_duration(test_data, percentile=90), 10)
+        self.assertEqual(get_test_duration(test_data, percentile=100), 10)
+
+        test_data["skipped"] = True
+        self.assertIsNone(get_test_duration(test_data))
+
+    def test_that_new_tests_are_estimated_from_similar_tests(self):
+        self._add_test_history("lib.tb1", "lib.tb1.test1", "passed", 0, 10)
+        self._add_test_history("lib.tb1", "lib.tb1.test2", "passed", 0, 20)
+        self._add_test_history("lib.tb1.cfg1", "lib.tb1.cfg1.test1", "passed", 0, 4)
+        self._add_test_history("lib.tb1.cfg2", "lib.tb1.cfg2.test1", "failed", 0, 2)
+        self._add_test_history("lib.tb2", "lib.tb2.test1", "passed", 0, 5, duration={"ewma": 6, "samples": [4, 6]})
+        estimator = ExecTimeEstimator(self._test_history)
+
+        self.assertEqual(estimator.test_exec_time("lib.tb1.test1"), 10)
+        self.assertEqual(estimator.test_exec_time("lib.tb2.test1"), 6)
+        self.assertEqual(estimator.test_exec_time("lib.tb1.cfg3.test1"), (10 + 4 + 2) / 3)
+        self.assertEqual(estimator.test_exec_time("lib.tb1.cfg3.test2"), 20)
+        self.assertEqual(estimator.test_exec_time("lib.tb1.test3"), (10 + 20 + 4 + 2) / 4)
+        self.assertEqual(estimator.test_exec_time("lib.tb3.test1"), (10 + 20 + 4 + 2 + 6) / 5)
+
+        test_suite = self._create_test_suite("lib.tb1.cfg3", ["lib.tb1.cfg3.test1", "lib.tb1.cfg3.test2"], "file")
+        self.assertEqual(estimator.exec_time(test_suite), 16 / 3 + 20)
+        self.assertIsNone(ExecTimeEstimator({}).exec_time(test_suite))
+
+    def test_that_risk_of_delaying_the_longest_test_is_based_on_pessimistic_estimate(self):
+        latest_dependency_updates = dict(file1=0, file2=0, file3=0)
+        test_suites = [
+            self._create_test_suite("lib1.tb1", ["lib1.tb1.test1"], "file1"),
+            self._create_test_suite("lib1.tb2", ["lib1.tb2.test1"], "file2"),
+            self._create_test_suite("lib1.tb3", ["lib1.tb3.test1"], "file3"),
+        ]
+        self._add_test_history("lib1.tb1", "lib1.tb1.test1", "passed", 3, 2)
+        self._add_test_history("lib1.tb2", "lib1.tb2.test1", "passed", 3, 2)
+
+        # Usually short but with a long tail
+        self._add_test_history(
+            "lib1.tb3",
+            "lib1.tb3.test1",
+            "passed",
+            3,
+            3,
+            duration={"ewma": 3, "samples": [3, 3, 3, 3, 3, 3, 3, 3, 3, 10]},
+        )
+
+        test_scheduler = TestScheduler(test_suites, 2, latest_dependency_updates, self._test_history)
+        with mock.patch("time.time", lambda: 1000):
+            self.assertEqual(test_scheduler.next(thread_id=0).name, "lib1.tb3")
+
+    def test_finish_times(self):
+        latest_dependency_updates = dict(file1=0, file2=0)
+        test_suites = [
+            self._create_test_suite("lib1.tb1", ["lib1.tb1.test1"], "file1"),
+            self._create_test_suite("lib1.tb2", ["lib1.tb2.test1"], "file2"),
+        ]
+        self._add_test_history("lib1.tb1", "lib1.tb1.test1", "passed", 3, 2)
+
+        test_scheduler = TestScheduler(test_suites, 1, latest_dependency_updates, self._test_history)
+        with mock.patch("time.time", lambda: 1000):
+            self.assertEqual(test_scheduler.next(thread_id=0).name, "lib1.tb2")
+        self.assertEqual(test_scheduler.get_finish_times(), {"lib1.tb2": {"predicted": 2, "actual": None}})
+
+        with mock.patch("time.time", lambda: 1003):
+            test_scheduler.test_done(thread_id=0)
+            self.assertEqual(test_scheduler.next(thread_id=0).name, "lib1.tb1")
+
+        with mock.patch("time.time", lambda: 1004):
+            test_scheduler.test_done(thread_id=0)
+
+        self.assertEqual(
+            test_scheduler.get_finish_times(),
+            {"lib1.tb2": {"predicted": 2, "actual": 3}, "lib1.tb1": {"predicted": 5, "actual": 4}},
+        )
+
+    def test_resource_demand(self):
+        test_suite = self._create_test_suite_using("lib.tb.test", cpu=4, memory=1000, license="formal")
+        self.assertEqual(
+            get_resource_demand(test_suite, self._test_history), {"cpu": 4, "memory": 1000, "license.formal": 1}
+        )
+
+        self._add_test_history("lib.tb.test", "lib.tb.test", "passed", 0, 1)
+        self._test_history["lib.tb.test"]["lib.tb.test"]["peak_memory"] = 1500
+        self.assertEqual(
+            get_resource_demand(test_suite, self._test_history), {"cpu": 4, "memory": 1500, "license.formal": 1}
+        )
+
+        test_suite = self._create_test_suite("lib.tb.other", ["lib.tb.other"], "file")
+        self.assertEqual(get_resource_demand(test_suite, self._test_history), {"cpu": 1, "memory": 0})
+
+    def test_timeout(self):
+        test_suite = self._create_test_suite("lib.tb.test", ["lib.tb.test"], "file")
+        test_suite.test_configuration = {"lib.tb.test": mock.Mock(sim_options={})}
+        self.assertIsNone(get_timeout(test_suite, self._test_history))
+        self.assertEqual(get_timeout(test_suite, self._test_history, default=10), 10)
+        self.assertEqual(get_timeout(test_suite, self._test_history, default=10, factor=3), 10)
+
+        self._add_test_history("lib.tb.test", "lib.tb.test", "passed", 0, 100)
+        self.assertEqual(get_timeout(test_suite, self._test_history, default=10, factor=3), 300)
+
+        self._add_test_history("lib.tb.test", "lib.tb.test", "passed", 0, 1)
+        self.assertEqual(get_timeout(test_suite, self._test_history, factor=3), MIN_HISTORY_TIMEOUT)
+
+        test_suite.test_configuration["lib.tb.test"].sim_options["timeout"] = 5
+        self.assertEqual(get_timeout(test_suite, self._test_history, default=10, factor=3), 5)
+
+    def test_that_test_suites_are_packed_within_the_resource_budget(self):
+        test_suites = [
+            self._create_test_suite_using("lib.tb1.test", memory=6),
+            self._create_test_suite_using("lib.tb2.test", memory=4, license="formal"),
+            self._create_test_suite_using("lib.tb3.test", license="formal"),
+        ]
+        test_scheduler = TestScheduler(
+            test_suites, 3, {}, {}, resource_budget=create_resource_budget(cpu=3, memory=10, licenses={"formal": 1})
+        )
+
+        self.assertEqual(test_scheduler.next(thread_id=0).name, "lib.tb1.test")
+        self.assertEqual(test_scheduler.next(thread_id=1).name, "lib.tb2.test")
+        self.assertIsNone(test_scheduler._pick(thread_id=2, now=0))
+
+        test_scheduler.test_done(thread_id=1)
+        self.assertEqual(test_scheduler.next(thread_id=1).name, "lib.tb3.test")
+
+    def test_that_resources_are_reserved_for_a_test_suite_which_does_not_fit(self):
+        test_suites = [
+            self._create_test_suite_using("lib.tb1.test", cpu=2),
+            self._create_test_suite_using("lib.tb2.test", cpu=4),
+            self._create_test_suite_using("lib.tb3.test", cpu=1),
+            self._create_test_suite_using("lib.tb4.test", cpu=1),
+        ]
+        statuses = ["failed", "failed", "passed", "passed"]
+        for test_suite, status, total_time in zip(test_suites, statuses, [0.5, 1, 0.2, 10]):
+            self._add_test_history(test_suite.name, test_suite.name, status, 1, total_time)
+
+        test_scheduler = TestScheduler(
+            test_suites, 3, {"file": 0}, self._test_history, resource_budget=create_resource_budget(cpu=4)
+        )
+
+        with mock.patch("time.time", lambda: 1000):
+            self.assertEqual(test_scheduler.next(thread_id=0).name, "lib.tb1.test")
+
+            # Expected to finish before the second test suite can start
+            self.assertEqual(test_scheduler.next(thread_id=1).name, "lib.tb3.test")
+
+            # Would delay the second test suite
+            self.assertIsNone(test_scheduler._pick(thread_id=2, now=1000))
+
+            test_scheduler.test_done(thread_id=0)
+            self.assertIsNone(test_scheduler._pick(thread_id=0, now=1000))
+
+            test_scheduler.test_done(thread_id=1)
+            self.assertEqual(test_scheduler.next(thread_id=1).name, "lib.tb2.test")
+
+    def test_that_test_suite_exceeding_the_resource_budget_is_run_alone(self):
+        test_suites = [
+            self._create_test_suite_using("lib.tb1.test", cpu=1),
+            self._create_test_suite_using("lib.tb2.test", cpu=8),
+        ]
+        test_scheduler = TestScheduler(test_suites, 2, {}, {}, resource_budget=create_resource_budget(cpu=2))
+
+        self.assertEqual(test_scheduler.next(thread_id=0).name, "lib.tb1.test")
+        self.assertIsNone(test_scheduler._pick(thread_id=1, now=0))
+        test_scheduler.test_done(thread_id=0)
+        self.assertEqual(test_scheduler.next(thread_id=1).name, "lib.tb2.test")
+
+    def test_that_next_blocks_until_resources_are_released(self):
+        test_suites = [
+            self._create_test_suite_using("lib.tb1.test", memory=6),
+            self._create_test_suite_using("lib.tb2.test", memory=6),
+        ]
+        test_scheduler = TestScheduler(test_suites, 2, {}, {}, resource_budget=create_resource_budget(memory=10))
+        self.assertEqual(test_scheduler.next(thread_id=0).name, "lib.tb1.test")
+
+        picked = []
+        thread = threading.Thread(target=lambda: picked.append(test_scheduler.next(thread_id=1).name))
+        thread.start()
+        thread.join(0.2)
+        self.assertEqual(picked, [])
+
+        test_scheduler.test_done(thread_id=0)
+        thread.join(5)
+        self.assertEqual(picked, ["lib.tb2.test"])
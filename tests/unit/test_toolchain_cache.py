@@ -0,0 +1,143 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the toolchain cache
+"""
+
+import os
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+from tests.common import with_tempdir
+from vunit.ostools import write_file
+from vunit.sim_if.ghdl import GHDLInterface
+from vunit.sim_if.toolchain_cache import ToolchainCache, file_fingerprint, path_fingerprint
+
+
+class TestToolchainCache(unittest.TestCase):
+    """
+    Test the toolchain cache
+    """
+
+    def test_nothing_is_cached_before_loading(self):
+        cache = ToolchainCache()
+        function = mock.Mock(side_effect=[1, 2])
+        self.assertEqual(cache.get("key", lambda: "fingerprint", function), 1)
+        self.assertEqual(cache.get("key", lambda: "fingerprint", function), 2)
+
+    @with_tempdir
+    def test_entries_are_reused_while_the_fingerprint_is_unchanged(self, tempdir):
+        file_name = Path(tempdir) / "cache.json"
+        cache = ToolchainCache()
+        cache.load(file_name)
+        self.assertEqual(cache.get("key", lambda: "fingerprint", lambda: "value"), "value")
+        self.assertTrue(file_name.exists())
+
+        cache = ToolchainCache()
+        cache.load(file_name)
+        function = mock.Mock(return_value="new value")
+        self.assertEqual(cache.get("key", lambda: "fingerprint", function), "value")
+        self.assertFalse(function.called)
+
+        self.assertEqual(cache.get("key", lambda: "new fingerprint", function), "new value")
+        self.assertEqual(cache.get("key", lambda: "new fingerprint", function), "new value")
+        self.assertEqual(function.call_count, 1)
+
+    @with_tempdir
+    def test_refresh_discards_entries(self, tempdir):
+        file_name = Path(tempdir) / "cache.json"
+        cache = ToolchainCache()
+        cache.load(file_name)
+        cache.get("key", lambda: "fingerprint", lambda: "value")
+
+        cache.load(file_name, refresh=True)
+        self.assertEqual(cache.get("key", lambda: "fingerprint", lambda: "new value"), "new value")
+
+    @with_tempdir
+    def test_invalid_cache_file_is_ignored(self, tempdir):
+        file_name = Path(tempdir) / "cache.json"
+        write_file(str(file_name), "{")
+        cache = ToolchainCache()
+        cache.load(file_name)
+        self.assertEqual(cache.get("key", lambda: "fingerprint", lambda: "value"), "value")
+
+    @with_tempdir
+    def test_probe_is_cached_while_the_executable_is_unchanged(self, tempdir):
+        executable = Path(tempdir) / "tool"
+        write_file(str(executable), "")
+        cache = ToolchainCache()
+        cache.load(Path(tempdir) / "cache.json")
+        function = mock.Mock(side_effect=["1.0", "2.0"])
+
+        self.assertEqual(cache.probe("version", executable, function), "1.0")
+        self.assertEqual(cache.probe("version", executable, function), "1.0")
+
+        stat = os.stat(executable)
+        os.utime(executable, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        self.assertEqual(cache.probe("version", executable, function), "2.0")
+
+    @with_tempdir
+    def test_probe_of_missing_executable_is_not_cached(self, tempdir):
+        cache = ToolchainCache()
+        cache.load(Path(tempdir) / "cache.json")
+        function = mock.Mock(side_effect=["1.0", "2.0"])
+        executable = Path(tempdir) / "missing"
+        self.assertIsNone(file_fingerprint(executable))
+        self.assertEqual(cache.probe("version", executable, function), "1.0")
+        self.assertEqual(cache.probe("version", executable, function), "2.0")
+
+    @with_tempdir
+    def test_path_fingerprint_includes_current_directory_only_when_in_path(self, tempdir):
+        bin_path = str(Path(tempdir) / "bin")
+        project_path = str(Path(tempdir) / "project")
+        os.makedirs(bin_path)
+        os.makedirs(project_path)
+
+        with mock.patch("os.getcwd", return_value=project_path):
+            with mock.patch.dict(os.environ, {"PATH": bin_path}):
+                fingerprint = path_fingerprint()
+                write_file(str(Path(project_path) / "transcript"), "transcript")
+                self.assertEqual(path_fingerprint(), fingerprint)
+
+            for path in [bin_path + os.pathsep, bin_path + os.pathsep + os.curdir]:
+                with mock.patch.dict(os.environ, {"PATH": path}):
+                    self.assertIn(project_path, [directory for directory, _ in path_fingerprint()[1:]])
+
+    @with_tempdir
+    def test_ghdl_version_is_probed_once(self, tempdir):
+        write_file(str(Path(tempdir) / "ghdl"), "")
+        cache = ToolchainCache()
+        cache.load(Path(tempdir) / "cache.json")
+
+        check_output = mock.Mock(return_value=b"GHDL 5.0.1 (tarball) [Dunoon edition]\n mcode JIT code generator\n")
+        with mock.patch.object(ToolchainCache, "_active", new=cache):
+            with mock.patch("subprocess.check_output", check_output):
+                self.assertEqual(GHDLInterface.determine_backend(tempdir), "mcode")
+                self.assertEqual(GHDLInterface.determine_version(tempdir), 5.0)
+                self.assertEqual(check_output.call_count, 1)
+
+    @with_tempdir
+    def test_activated_cache_is_used_by_the_simulator_interfaces(self, tempdir):
+        cache1 = ToolchainCache()
+        cache1.load(Path(tempdir) / "cache1.json")
+        cache2 = ToolchainCache()
+        cache2.load(Path(tempdir) / "cache2.json")
+
+        with mock.patch.object(ToolchainCache, "_active", new=None):
+            self.assertIsNot(ToolchainCache.active(), ToolchainCache.active())
+
+            cache1.activate()
+            self.assertIs(ToolchainCache.active(), cache1)
+            ToolchainCache.active().get("key", lambda: "fingerprint", lambda: "value1")
+
+            cache2.activate()
+            self.assertIs(ToolchainCache.active(), cache2)
+            self.assertEqual(ToolchainCache.active().get("key", lambda: "fingerprint", lambda: "value2"), "value2")
+
+        self.assertEqual(json.loads((Path(tempdir) / "cache1.json").read_text())["entries"]["key"]["value"], "value1")
+        self.assertEqual(json.loads((Path(tempdir) / "cache2.json").read_text())["entries"]["key"]["value"], "value2")
@@ -23,11 +23,12 @@ from unittest import mock
 from tests.common import set_env, with_tempdir, create_vhdl_test_bench_file
 from vunit.ui import VUnit
 from vunit.source_file import VHDL_EXTENSIONS, VERILOG_EXTENSIONS
-from vunit.ostools import renew_path
+from vunit.ostools import renew_path, write_file
 from vunit.builtins import add_verilog_include_dir
 from vunit.sim_if import SimulatorInterface
 from vunit.vhdl_standard import VHDL
 from vunit.ui.preprocessor import Preprocessor
+from vunit.test.bench import TestBench
 
 
 class TestUi(unittest.TestCase):
@@ -484,6 +485,21 @@ end entity;
         )
         self.assertRaisesRegex(ValueError, r"missing\.vhd", lib.add_source_files, "missing.vhd")
 
+    def test_generate_codecs_of_several_packages(self):
+        ui = self._create_ui()
+        lib = ui.add_library("lib")
+        for name in ("pkg1", "pkg2"):
+            write_file(f"{name!s}.vhd", f"package {name!s} is\n  type {name!s}_t is (a, b);\nend package;\n")
+            lib.add_source_file(f"{name!s}.vhd")
+
+        source_files = ui.generate_codecs([lib.package("pkg1"), lib.package("pkg2")], num_processes=2)
+        self.assertEqual(
+            [Path(source_file.name).resolve() for source_file in source_files],
+            [(Path(ui.codecs_path) / "lib" / f"{name!s}_codecs.vhd").resolve() for name in ("pkg1", "pkg2")],
+        )
+        self.assertEqual(source_files[0].library.name, "lib")
+        self.assertEqual(len(lib.get_source_files("*_codecs.vhd")), 2)
+
     def test_get_source_files(self):
         ui = self._create_ui()
         lib1 = ui.add_library("lib1")
@@ -715,6 +731,73 @@ Listed 2 files""".splitlines()
             },
         )
 
+    @with_tempdir
+    def test_export_json_is_compact_and_only_recreates_changed_parts(self, tempdir):
+        json_file = Path(tempdir) / "export.json"
+        ui = self._create_ui("--export-json", str(json_file))
+        lib = ui.add_library("lib")
+        for name in ["tb_foo", "tb_bar"]:
+            file_name = str(Path(tempdir) / f"{name!s}.vhd")
+            create_vhdl_test_bench_file(name, file_name, tests=["Test one"])
+            lib.add_source_file(file_name)
+
+        self._run_main(ui)
+        data = json_file.read_text()
+        self.assertEqual(len(data.splitlines()), 1)
+        self.assertNotIn(", ", data)
+
+        with mock.patch.object(ui, "get_compile_order", wraps=ui.get_compile_order) as get_compile_order, mock.patch(
+            "vunit.test.bench.TestBench.create_tests", autospec=True, side_effect=TestBench.create_tests
+        ) as create_tests:
+            ui._main_export_json(json_file)
+            self.assertEqual(json_file.read_text(), data)
+            self.assertFalse(get_compile_order.called)
+            self.assertFalse(create_tests.called)
+
+            lib.test_bench("tb_bar").set_attribute(".attr", "bar")
+            ui._main_export_json(json_file)
+            self.assertFalse(get_compile_order.called)
+            self.assertEqual([call.args[0].name for call in create_tests.mock_calls], ["tb_bar"])
+
+        tests = {item["name"]: item["attributes"] for item in json.loads(json_file.read_text())["tests"]}
+        self.assertEqual(tests, {"lib.tb_foo.Test one": {}, "lib.tb_bar.Test one": {".attr": "bar"}})
+
+    @with_tempdir
+    def test_changed_test_benches_are_rescanned_keeping_configurations(self, tempdir):
+        ui = self._create_ui()
+        lib = ui.add_library("lib")
+        file_name = str(Path(tempdir) / "tb_foo.vhd")
+        create_vhdl_test_bench_file("tb_foo", file_name, tests=["Test one", "Test two"])
+        lib.add_source_file(file_name)
+        lib.test_bench("tb_foo").test("Test one").set_attribute(".attr", "one")
+        lib.test_bench("tb_foo").set_attribute(".tb_attr", "foo")
+
+        create_vhdl_test_bench_file("tb_foo", file_name, tests=["Test zero", "Test one"])
+        ui._refresh_changed_files(ui._get_watched_files(), [str(Path(file_name).resolve())])
+
+        data = json.loads(ui._create_json_exporter().export())
+        self.assertEqual(
+            {item["name"]: item["attributes"] for item in data["tests"]},
+            {
+                "lib.tb_foo.Test zero": {},
+                "lib.tb_foo.Test one": {".attr": "one", ".tb_attr": "foo"},
+            },
+        )
+        self.assertLess(data["tests"][0]["location"]["offset"], data["tests"][1]["location"]["offset"])
+
+    @with_tempdir
+    def test_change_of_file_in_several_libraries_is_printed_once(self, tempdir):
+        ui = self._create_ui()
+        file_name = str(Path(tempdir) / "pkg.vhd")
+        write_file(file_name, "package pkg is end package;")
+        ui.add_library("lib1").add_source_file(file_name)
+        ui.add_library("lib2").add_source_file(file_name)
+
+        with mock.patch("sys.stdout", autospec=True) as stdout:
+            ui._refresh_changed_files(ui._get_watched_files(), [str(Path(file_name).resolve())])
+        text = "".join([call[1][0] for call in stdout.write.mock_calls])
+        self.assertEqual(text.count("Detected change in"), 1)
+
     def test_library_attributes(self):
         ui = self._create_ui()
         lib1 = ui.add_library("lib1")
@@ -1030,6 +1113,191 @@ Listed 2 files""".splitlines()
             self._run_main(ui, post_run=post_run)
             self.assertFalse(post_run.called)
 
+    @with_tempdir
+    def test_watch_reruns_tests_affected_by_changes(self, tempdir):
+        ui = self._create_ui("--watch")
+        lib = ui.add_library("lib")
+        tb_one = str(Path(tempdir) / "tb_one.vhd")
+        tb_two = str(Path(tempdir) / "tb_two.vhd")
+        create_vhdl_test_bench_file("tb_one", tb_one)
+        create_vhdl_test_bench_file("tb_two", tb_two)
+        lib.add_source_file(tb_one)
+        lib.add_source_file(tb_two)
+
+        def modify_tb_one(interval):  # pylint: disable=unused-argument
+            if wait_for_changes.call_count > 1:
+                raise KeyboardInterrupt
+
+            with Path(tb_one).open("a") as fptr:
+                fptr.write("-- Modified\n")
+            return [str(Path(tb_one).resolve())]
+
+        simulate = mock.Mock(return_value=True)
+        with mock.patch.object(MockSimulator, "simulate", new=simulate), mock.patch.object(
+            MockSimulator, "_compile_source_file", new=mock.Mock(return_value=True)
+        ), mock.patch("vunit.ui.FileWatcher.wait_for_changes", side_effect=modify_tb_one) as wait_for_changes:
+            self._run_main(ui, code=1)
+
+        self.assertEqual(wait_for_changes.call_count, 2)
+        simulated = [call.kwargs["test_suite_name"] for call in simulate.mock_calls]
+        self.assertCountEqual(simulated[:2], ["lib.tb_one.all", "lib.tb_two.all"])
+        self.assertEqual(simulated[2:], ["lib.tb_one.all"])
+
+    @with_tempdir
+    def test_changed_granularity_selects_tests_depending_on_changed_code(self, tempdir):
+        packages = str(Path(tempdir) / "packages.vhd")
+        write_file(packages, "package pkg_a is\nend package;\n\npackage pkg_b is\nend package;\n")
+        test_benches = {name: str(Path(tempdir) / f"{name!s}.vhd") for name in ["tb_a", "tb_b"]}
+        for name, file_name in test_benches.items():
+            write_file(
+                file_name,
+                f"""\
+use work.pkg_{name[-1]!s}.all;
+
+entity {name!s} is
+  generic (runner_cfg : string);
+end entity;
+
+architecture tb of {name!s} is
+begin
+  main : process
+  begin
+    test_runner_setup(runner, runner_cfg);
+    while test_suite loop
+      if run("one") then
+        report "one";
+      elsif run("two") then
+        report "two";
+      end if;
+    end loop;
+  end process;
+end architecture;
+""",
+            )
+
+        def run_changed(granularity):
+            with mock.patch("vunit.sim_if.factory.SIMULATOR_FACTORY.select_simulator", new=lambda: MockSimulator):
+                ui = VUnit.from_argv(
+                    argv=[f"--output-path={self._output_path!s}", "--changed", "--changed-granularity", granularity]
+                )
+            lib = ui.add_library("lib")
+            lib.add_source_files([packages] + list(test_benches.values()))
+
+            simulate = mock.Mock(return_value=True)
+            with mock.patch.object(MockSimulator, "simulate", new=simulate), mock.patch.object(
+                MockSimulator, "_compile_source_file", new=mock.Mock(return_value=True)
+            ), self.assertRaises(SystemExit):
+                ui.main()
+            return sorted(call.kwargs["test_suite_name"] for call in simulate.mock_calls)
+
+        def modify(file_name, old, new):
+            write_file(file_name, Path(file_name).read_text().replace(old, new))
+
+        all_tests = ["lib.tb_a.one", "lib.tb_a.two", "lib.tb_b.one", "lib.tb_b.two"]
+        self.assertEqual(run_changed("design-unit"), all_tests)
+        self.assertEqual(run_changed("design-unit"), [])
+        modify(packages, "package pkg_b is\n", "package pkg_b is\n  constant c : natural := 0;\n")
+        self.assertEqual(run_changed("design-unit"), ["lib.tb_b.one", "lib.tb_b.two"])
+        modify(test_benches["tb_a"], 'report "two";', 'report "changed";')
+        self.assertEqual(run_changed("design-unit"), ["lib.tb_a.one", "lib.tb_a.two"])
+
+        self.assertEqual(run_changed("test-case"), all_tests)
+        modify(test_benches["tb_a"], 'report "changed";', 'report "two";')
+        self.assertEqual(run_changed("test-case"), ["lib.tb_a.two"])
+        self.assertEqual(run_changed("test-case"), [])
+
+    @with_tempdir
+    def test_shard_runs_balanced_part_of_the_tests(self, tempdir):
+        exec_times = {"tb_a": 10, "tb_b": 6, "tb_c": 3, "tb_d": 1}
+        test_history = {
+            f"lib.{name}.all": {
+                f"lib.{name}.all": {
+                    "total_time": exec_time,
+                    "passed": True,
+                    "skipped": False,
+                    "failed": False,
+                    "start_time": 0,
+                    "seed": None,
+                }
+            }
+            for name, exec_time in exec_times.items()
+        }
+
+        simulated = []
+        for shard in ["1/2", "2/2"]:
+            ui = self._create_ui("--shard", shard)
+            lib = ui.add_library("lib")
+            for name in exec_times:
+                file_name = str(Path(tempdir) / f"{name!s}.vhd")
+                create_vhdl_test_bench_file(name, file_name)
+                lib.add_source_file(file_name)
+            ui._database[b"test_history"] = test_history
+
+            simulate = mock.Mock(return_value=True)
+            with mock.patch.object(MockSimulator, "simulate", new=simulate), mock.patch.object(
+                MockSimulator, "_compile_source_file", new=mock.Mock(return_value=True)
+            ):
+                self._run_main(ui, code=1)
+            simulated.append(sorted(call.kwargs["test_suite_name"] for call in simulate.mock_calls))
+
+        self.assertEqual(simulated, [["lib.tb_a.all"], ["lib.tb_b.all", "lib.tb_c.all", "lib.tb_d.all"]])
+
+    @with_tempdir
+    def test_test_history_updates_duration_model_and_keeps_peak_memory(self, tempdir):
+        ui = self._create_ui()
+        file_name = str(Path(tempdir) / "tb_a.vhd")
+        create_vhdl_test_bench_file("tb_a", file_name)
+        ui.add_library("lib").add_source_file(file_name)
+        ui._database[b"test_history"] = {
+            "lib.tb_a.all": {
+                "lib.tb_a.all": {
+                    "total_time": 10,
+                    "passed": True,
+                    "skipped": False,
+                    "failed": False,
+                    "start_time": 0,
+                    "seed": None,
+                    "duration": {"ewma": 10, "samples": [10]},
+                    "peak_memory": 100,
+                }
+            }
+        }
+
+        with mock.patch.object(MockSimulator, "simulate", new=mock.Mock(return_value=True)), mock.patch.object(
+            MockSimulator, "_compile_source_file", new=mock.Mock(return_value=True)
+        ):
+            self._run_main(ui, code=1)
+
+        test_data = ui._database[b"test_history"]["lib.tb_a.all"]["lib.tb_a.all"]
+        self.assertEqual(test_data["duration"]["samples"], [10, test_data["total_time"]])
+        self.assertAlmostEqual(test_data["duration"]["ewma"], 7 + 0.3 * test_data["total_time"])
+
+        # The peak memory is not measured for the mocked simulator
+        self.assertEqual(test_data["peak_memory"], 100)
+
+    @with_tempdir
+    def test_import_items_merges_test_history(self, tempdir):
+        ui = self._create_ui()
+        shard_histories = [
+            {"suite1": {"test1": {"start_time": 2, "passed": True}}, "suite2": {"test2": {"start_time": 1}}},
+            {"suite2": {"test2": {"start_time": 3, "passed": False}}, "suite3": {"test3": {"start_time": 3}}},
+        ]
+        for idx, test_history in enumerate(shard_histories):
+            ui._database[b"test_history"] = test_history
+            ui.export_items(["test_history"], Path(tempdir) / f"shard{idx:d}")
+
+        ui = self._create_ui()
+        ui.import_items(Path(tempdir) / "shard0")
+        ui.import_items(Path(tempdir) / "shard1")
+        self.assertEqual(
+            ui._database[b"test_history"],
+            {
+                "suite1": {"test1": {"start_time": 2, "passed": True}},
+                "suite2": {"test2": {"start_time": 3, "passed": False}},
+                "suite3": {"test3": {"start_time": 3}},
+            },
+        )
+
     def test_error_on_adding_duplicate_library(self):
         ui = self._create_ui()
         ui.add_library("lib")
@@ -1447,6 +1715,19 @@ endmodule
         ui.update_test_pattern([tb[1]._source_file.name])
         check_stdout(ui, "lib1.tb0.Test 1\nlib2.tb1.all\nListed 2 tests")
 
+    def test_worker_uses_timeout_factor_and_token(self):
+        ui = self._create_ui("--worker", "host:1234", "--test-timeout", "10", "--test-timeout-factor", "3")
+        with set_env(VUNIT_DISTRIBUTED_TOKEN="secret"):
+            with mock.patch("vunit.test.distributed.TestWorker", autospec=True) as worker:
+                self._run_main(ui)
+
+        args, kwargs = worker.call_args
+        self.assertEqual(args[2], ("host", 1234))
+        self.assertEqual(kwargs["token"], "secret")
+        self.assertEqual(kwargs["timeout"], 10)
+        self.assertEqual(kwargs["timeout_factor"], 3)
+        self.assertEqual(kwargs["test_history"], {})
+
     def test_get_simulator_name(self):
         ui = self._create_ui()
         self.assertEqual(ui.get_simulator_name(), "mock")
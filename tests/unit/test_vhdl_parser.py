@@ -523,6 +523,124 @@ package instance_pkg is new work.generic_pkg
         )
         self.assertEqual(len(design_file.packages), 0)
 
+    def test_interface_hash(self):
+        def interface_hash(body="", architecture="", use="ieee.std_logic_1164.all"):
+            return VHDLDesignFile.parse(
+                f"""\
+library ieee;
+use {use};
+
+package body pkg is
+  procedure proc is
+  begin
+    {body}
+  end;
+end package body;
+
+architecture a of ent is -- comment
+begin
+  {architecture}
+end architecture;
+"""
+            ).interface_hash
+
+        self.assertIsNotNone(interface_hash())
+        self.assertEqual(interface_hash(), interface_hash(body="report 1;", architecture="assert false;"))
+        self.assertNotEqual(interface_hash(), interface_hash(use="ieee.numeric_std.all"))
+
+    def test_no_interface_hash_with_primary_units(self):
+        for code in [
+            "entity ent is end entity; architecture a of ent is begin end architecture;",
+            "package pkg is end package; package body pkg is end package body;",
+            "context ctx is library ieee; end context;",
+            "configuration cfg of ent is for a end for; end configuration;",
+        ]:
+            self.assertIsNone(VHDLDesignFile.parse(code).interface_hash, code)
+
+    def test_design_unit_sections(self):
+        def parse(body="", architecture="", comment=""):
+            return VHDLDesignFile.parse(
+                f"""\
+library ieee;
+use ieee.std_logic_1164.all;
+
+package Pkg is {comment}
+  procedure proc;
+end package;
+
+package body pkg is
+  procedure proc is
+  begin
+    {body}
+  end;
+end package body;
+
+package inst is new work.gen_pkg generic map (value => 1);
+
+use work.pkg.all;
+entity ent is
+  generic (package gen is new work.gen_pkg generic map (<>));
+end entity;
+
+architecture a of ent is
+  package nested is
+  end package;
+begin
+  {architecture}
+  inst : comp port map (clk => clk);
+end architecture;
+
+configuration cfg of ent is
+  for a
+  end for;
+end configuration;
+
+context ctx is
+  context work.other_ctx;
+end context;
+"""
+            ).design_unit_sections
+
+        def code_hashes(**kwargs):
+            return [section.code_hash for section in parse(**kwargs)]
+
+        sections = parse()
+        self.assertEqual(
+            [(section.unit_type, section.identifier, section.primary_identifier) for section in sections],
+            [
+                ("package", "pkg", "pkg"),
+                ("package body", "pkg", "pkg"),
+                ("package", "inst", "inst"),
+                ("entity", "ent", "ent"),
+                ("architecture", "a", "ent"),
+                ("configuration", "cfg", "ent"),
+                ("context", "ctx", "ctx"),
+            ],
+        )
+        self.assertEqual(
+            [section.references for section in sections],
+            [
+                [VHDLReference("package", "ieee", "std_logic_1164", "all")],
+                [],
+                [VHDLReference("package", "work", "gen_pkg")],
+                [VHDLReference("package", "work", "pkg", "all"), VHDLReference("package", "work", "gen_pkg")],
+                [],
+                [],
+                [VHDLReference("context", "work", "other_ctx")],
+            ],
+        )
+        self.assertEqual([section.component_instantiations for section in sections], [[], [], [], [], ["comp"], [], []])
+
+        self.assertEqual(code_hashes(comment="-- comment"), code_hashes())
+        self.assertEqual(
+            [old != new for old, new in zip(code_hashes(), code_hashes(body="report 1;"))],
+            [False, True, False, False, False, False, False],
+        )
+        self.assertEqual(
+            [old != new for old, new in zip(code_hashes(), code_hashes(architecture="assert false;"))],
+            [False, False, False, False, True, False, False],
+        )
+
     def test_parsing_context(self):
         context = self.parse_single_context(
             """\
@@ -50,11 +50,12 @@ class Builtins(object):
     Manage VUnit builtins and their dependencies
     """
 
-    def __init__(self, vunit_obj, vhdl_standard: VHDLStandard, simulator_class):
+    def __init__(self, vunit_obj, vhdl_standard: VHDLStandard, simulator_class, toolchain_cache=None):
         self._vunit_obj = vunit_obj
         self._vunit_lib = vunit_obj.add_library("vunit_lib")
         self._vhdl_standard = vhdl_standard
         self._simulator_class = simulator_class
+        self._toolchain_cache = toolchain_cache
         self._builtins_adder = BuiltinsAdder()
 
         def add(name, deps=tuple()):
@@ -399,6 +400,8 @@ class Builtins(object):
         if library is None:
             return
 
+        if self._toolchain_cache is not None:
+            self._toolchain_cache.activate()
         simulator_coverage_api = self._simulator_class.get_osvvm_coverage_api()
         supports_vhdl_package_generics = self._simulator_class.supports_vhdl_package_generics()
 
@@ -8,6 +8,7 @@
 Preprocessing of check functions
 """
 
+from bisect import bisect_right
 import re
 from vunit.ui.preprocessor import Preprocessor
 
@@ -25,29 +26,53 @@ class CheckPreprocessor(Preprocessor):
         self._actual_formal = re.compile(r"=>(?P<actual>.*)", re.MULTILINE)
         self._leading_paranthesis = re.compile(r"[\s(]*")
         self._trailing_paranthesis = re.compile(r"[\s)]*")
+        self._check_relation_pattern = re.compile(
+            r"[^a-zA-Z0-9_](?P<call>check_relation)\s*(?P<parameters>\()", re.MULTILINE
+        )
 
     def run(self, code, file_name):  # pylint: disable=unused-argument
-        check_relation_pattern = re.compile(r"[^a-zA-Z0-9_](?P<call>check_relation)\s*(?P<parameters>\()", re.MULTILINE)
-
-        check_relation_calls = list(check_relation_pattern.finditer(code))
-        check_relation_calls.reverse()
-
-        for match in check_relation_calls:
-            (
-                relation,
-                offset_to_point_before_closing_paranthesis,
-            ) = self._extract_relation(code, match)
-            if relation:
-                context_msg_parameter = f", context_msg => {relation.make_context_msg()!s}"
-                code = (
-                    code[: match.end("parameters") + offset_to_point_before_closing_paranthesis]
-                    + context_msg_parameter
-                    + code[match.end("parameters") + offset_to_point_before_closing_paranthesis :]
+        """
+        Add a context message parameter to all check_relation calls
+
+        The calls are preprocessed last to first, each in the code modified by the calls after it, which
+        matters when a call encloses other calls. The code is lexed once and the modified code is kept as
+        slices of the original code such that the preprocessing time is linear in the size of the code unless
+        calls are nested.
+        """
+        lexer = Lexer(code)
+
+        # The modified code is the original code up to boundary followed by the pieces of tail in reverse order
+        boundary = len(code)
+        tail = []
+        for match in reversed(list(self._check_relation_pattern.finditer(code))):
+            try:
+                relation, offset = self._extract_relation(code, match, lexer.tokens(match.start("parameters")))
+                index = match.end("parameters") + offset
+            except SyntaxError:
+                if not tail:
+                    raise
+                index = boundary
+
+            if tail and index >= boundary:
+                # The call reaches into code modified by the calls after it and is preprocessed in the modified code
+                modified_code = code[:boundary] + "".join(reversed(tail))
+                relation, offset = self._extract_relation(
+                    modified_code, match, Lexer(modified_code).tokens(match.start("parameters"))
                 )
+                index = match.end("parameters") + offset
+                if index > boundary:
+                    rest = modified_code[boundary:]
+                    tail = [rest[index - boundary :], rest[: index - boundary]]
+                    tail.insert(1, f", context_msg => {relation.make_context_msg()!s}")
+                    continue
+
+            tail.append(code[index:boundary])
+            tail.append(f", context_msg => {relation.make_context_msg()!s}")
+            boundary = index
 
-        return code
+        return code[:boundary] + "".join(reversed(tail))
 
-    def _extract_relation(self, code, check):
+    def _extract_relation(self, code, check, tokens):
         # pylint: disable=missing-docstring
         def end_of_parameter(token):
             return token.value == "," if token.level == 1 else token.level == 0
@@ -55,7 +80,7 @@ class CheckPreprocessor(Preprocessor):
         parameter_tokens = []
         index = 1
         relation = None
-        for token in self._classify_tokens(code[check.start("parameters") + 1 :]):
+        for token in tokens:
             add_token = True
             if token.type == Token.NORMAL:
                 # The first found parameter containing a top-level relation is assumed
@@ -85,65 +110,6 @@ class CheckPreprocessor(Preprocessor):
 
         return relation, index - 1
 
-    @staticmethod
-    def _classify_tokens(code):
-        # pylint: disable=missing-docstring
-        # pylint: disable=too-many-branches
-        def even_quotes(code):
-            n_quotes = 0
-            for index in range(0, len(code), 2):
-                if code[index] != "'":
-                    break
-                n_quotes += 1
-
-            return (n_quotes % 2) == 0
-
-        code_section = Token.NORMAL
-        next_code_section = Token.NORMAL
-        level = 1
-        index = 0
-        for char in code:
-            token = Token(char)
-            if code_section == Token.NORMAL:
-                if char == '"':
-                    code_section = Token.STRING
-                elif char == "'":
-                    # Used to avoid mixing up qualified expressions and
-                    # character literals, e.g. std_logic'('1').
-                    if even_quotes(code[index:]):
-                        code_section = Token.CHARACTER_LITERAL
-                elif code[index : index + 2] == "--":
-                    code_section = Token.LINE_COMMENT
-                elif code[index : index + 2] == "/*":
-                    code_section = Token.BLOCK_COMMENT
-                elif char == "(":
-                    level += 1
-                elif char == ")":
-                    level -= 1
-
-                next_code_section = code_section
-
-            elif code_section == Token.STRING:
-                if char == '"':
-                    next_code_section = Token.NORMAL
-            elif code_section == Token.CHARACTER_LITERAL:
-                if char == "'":
-                    next_code_section = Token.NORMAL
-            elif code_section == Token.LINE_COMMENT:
-                if char == "\n":
-                    next_code_section = Token.NORMAL
-            elif code_section == Token.BLOCK_COMMENT:
-                if code[index - 1 : index + 1] == "*/":
-                    next_code_section = Token.NORMAL
-
-            token.type = code_section
-            token.level = level
-            index += 1
-
-            yield token
-
-            code_section = next_code_section
-
     def _get_relation_from_parameter(self, tokens):
         # pylint: disable=missing-docstring
         def find_top_level_match(matches, tokens, top_level=1):
@@ -191,6 +157,117 @@ class CheckPreprocessor(Preprocessor):
         return relation
 
 
+class Lexer(object):
+    """
+    Finds the strings, character literals and comments of the code in a single forward pass
+    """
+
+    _section_start = re.compile(r"[\"']|--|/\*")
+
+    def __init__(self, code):
+        self._code = code
+        self._sections = list(self._find_sections(code, 0))
+        self._starts = [start for start, _, _ in self._sections]
+
+    @classmethod
+    def _find_sections(cls, code, index):
+        """
+        Yield the start, end and type of the sections of the code, starting at index, that are not normal code
+        """
+        while True:
+            match = cls._section_start.search(code, index)
+            if match is None:
+                return
+
+            start = match.start()
+            if match.group() == '"':
+                section_type = Token.STRING
+                end = cls._find_end(code, '"', start + 1)
+            elif match.group() == "'":
+                if not cls._even_quotes(code, start):
+                    index = start + 1
+                    continue
+                section_type = Token.CHARACTER_LITERAL
+                end = cls._find_end(code, "'", start + 1)
+            elif match.group() == "--":
+                section_type = Token.LINE_COMMENT
+                end = cls._find_end(code, "\n", start + 1)
+            else:
+                section_type = Token.BLOCK_COMMENT
+                end = cls._find_end(code, "*/", start + 1)
+
+            yield start, end, section_type
+            index = end
+
+    @staticmethod
+    def _find_end(code, terminator, start):
+        """
+        Return the index after the first terminator at or after start or the end of the code if there is none
+        """
+        index = code.find(terminator, start)
+        return len(code) if index == -1 else index + len(terminator)
+
+    @staticmethod
+    def _even_quotes(code, index):
+        """
+        Return True if the number of quotes at every other character starting at index is even
+
+        Used to avoid mixing up qualified expressions and character literals, e.g. std_logic'('1').
+        """
+        n_quotes = 0
+        while index < len(code) and code[index] == "'":
+            n_quotes += 1
+            index += 2
+
+        return (n_quotes % 2) == 0
+
+    def is_normal(self, index):
+        """
+        Return True if the character at index is normal code
+        """
+        section_idx = bisect_right(self._starts, index) - 1
+        return section_idx == -1 or index >= self._sections[section_idx][1]
+
+    def tokens(self, index):
+        """
+        Return the classified tokens following the opening parenthesis at index up to and including the
+        closing parenthesis. The level of the tokens is relative the opening parenthesis.
+        """
+        if self.is_normal(index):
+            first = bisect_right(self._starts, index)
+            sections = (self._sections[section_idx] for section_idx in range(first, len(self._sections)))
+        else:
+            # A parenthesis within a comment or string is lexed as if it was followed by normal code
+            sections = self._find_sections(self._code, index + 1)
+
+        return self._classify_tokens(index, sections)
+
+    def _classify_tokens(self, index, sections):
+        # pylint: disable=missing-docstring
+        code = self._code
+        section = next(sections, None)
+        level = 1
+        for token_index in range(index + 1, len(code)):
+            while (section is not None) and (token_index >= section[1]):
+                section = next(sections, None)
+
+            token = Token(code[token_index])
+            if (section is not None) and (token_index >= section[0]):
+                token.type = section[2]
+            else:
+                token.type = Token.NORMAL
+                if token.value == "(":
+                    level += 1
+                elif token.value == ")":
+                    level -= 1
+            token.level = level
+
+            yield token
+
+            if level == 0:
+                break
+
+
 class Token(object):
     # pylint: disable=missing-docstring
     NORMAL = 0
@@ -6,12 +6,25 @@
 
 """
 Module for generating VHDL com codecs.
+
+Codec packages are content addressed. The digest of the input package, the generation arguments and the
+generator version is stored next to the codec package such that the input package is only parsed again
+when the digest changes. The codec package is only written when its contents change to keep its
+timestamp, and the timestamps of everything depending on it, unless there is a change.
 """
 
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from string import Template
+from vunit.hashing import hash_string
 from vunit.ostools import read_file, write_file
 from vunit.com.codec_vhdl_package import CodecVHDLPackage
 
+# Increment when the generated code changes to regenerate existing codec packages
+GENERATOR_VERSION = 1
+
 
 def generate_codecs(
     input_package_design_unit,
@@ -24,13 +37,94 @@ def generate_codecs(
     other than the input package. A used package on the format 'lib.pkg' will result in a library and
     a use statement. A used package on the format 'pkg' is assumed to be located in work. output_file
     is where the resulting codec package is written."""
+    generate_codecs_in_parallel([(input_package_design_unit, codec_package_name, used_packages, output_file)])
+
+
+def generate_codecs_in_parallel(jobs, num_processes=None):
+    """
+    Generate several independent codec packages in parallel using a pool of num_processes processes
+
+    The codec packages are generated serially on platforms where processes cannot be forked.
 
+    :param jobs: List of tuples with the arguments to :func:`generate_codecs`
+    :param num_processes: The number of processes, defaults to the number of CPUs
+    """
+    stale_jobs = []
+    for input_package_design_unit, codec_package_name, used_packages, output_file in jobs:
+        digest = _digest(input_package_design_unit, codec_package_name, used_packages)
+        if not (Path(output_file).exists() and _read_digest(output_file) == digest):
+            args = (
+                input_package_design_unit.source_file.name,
+                input_package_design_unit.name,
+                codec_package_name,
+                used_packages,
+            )
+            stale_jobs.append((args, output_file, digest))
+
+    # Only forked workers are used since spawned workers re-import the run script, which most often has no
+    # if __name__ == "__main__" guard and would then generate codecs recursively
+    if len(stale_jobs) > 1 and num_processes != 1 and "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=num_processes, mp_context=multiprocessing.get_context("fork")) as executor:
+            codec_packages = list(executor.map(_create_codec_package, *zip(*(args for args, _, _ in stale_jobs))))
+    else:
+        codec_packages = [_create_codec_package(*args) for args, _, _ in stale_jobs]
+
+    for (_, output_file, digest), codec_package in zip(stale_jobs, codec_packages):
+        if not (Path(output_file).exists() and read_file(output_file) == codec_package):
+            _write_file_atomically(output_file, codec_package)
+        _write_file_atomically(_digest_file_name(output_file), digest)
+
+
+def _digest(input_package_design_unit, codec_package_name, used_packages):
+    """
+    Return the digest of everything the generated codec package depends on
+    """
+    return hash_string(
+        repr(
+            (
+                GENERATOR_VERSION,
+                input_package_design_unit.source_file.content_hash,
+                input_package_design_unit.name,
+                codec_package_name,
+                list(used_packages) if used_packages is not None else [],
+            )
+        )
+    )
+
+
+def _digest_file_name(output_file):
+    return f"{output_file!s}.digest"
+
+
+def _read_digest(output_file):
+    """
+    Return the digest of the last generation of the output file or None if unknown
+    """
+    digest_file_name = _digest_file_name(output_file)
+    if not Path(digest_file_name).exists():
+        return None
+    return read_file(digest_file_name)
+
+
+def _write_file_atomically(file_name, contents):
+    """
+    Write the file such that it is never partially written
+    """
+    temp_file_name = f"{file_name!s}.{os.getpid()}.tmp"
+    write_file(temp_file_name, contents)
+    os.replace(temp_file_name, file_name)
+
+
+def _create_codec_package(source_file_name, package_name, codec_package_name, used_packages):
+    """
+    Return the code of the codec package for the named package in the source file
+    """
     # The design unit doesn't contain the package so it must be found first in the source file. This file
     # may contain other packages
-    code = read_file(input_package_design_unit.source_file.name)
-    package = CodecVHDLPackage.find_named_package(code, input_package_design_unit.name)
+    code = read_file(source_file_name)
+    package = CodecVHDLPackage.find_named_package(code, package_name)
     if package is None:
-        raise KeyError(input_package_design_unit.name)
+        raise KeyError(package_name)
 
     # Get all function declarations and definitions derived from the package type definitions
     declarations, definitions = package.generate_codecs_and_support_functions()
@@ -48,7 +142,7 @@ def generate_codecs(
     if libraries:
         use_clauses = "library " + ";\nlibrary ".join(libraries) + ";\n" + use_clauses
 
-    # Assemble everything and write to output file
+    # Assemble everything
     codec_package_template = Template(
         """\
 library vunit_lib;
@@ -73,12 +167,10 @@ end package body $codec_package_name;
 """
     )
 
-    codec_package = codec_package_template.substitute(
+    return codec_package_template.substitute(
         declarations=declarations,
         definitions=definitions,
         package_name=package.identifier,
         codec_package_name=codec_package_name,
         use_clauses=use_clauses,
     )
-
-    write_file(output_file, codec_package)
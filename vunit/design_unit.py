@@ -20,6 +20,7 @@ class DesignUnit(object):
         self.name = name
         self.source_file = source_file
         self.unit_type = unit_type
+        self.is_primary = True
 
     @property
     def file_name(self):
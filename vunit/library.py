@@ -80,6 +80,22 @@ class Library(object):  # pylint: disable=too-many-instance-attributes
 
         return source_file
 
+    def rebuild_design_units(self):
+        """
+        Re-create the design unit tables from the source files of the library
+
+        Used when source files have been re-scanned and design units may have been added or removed
+        """
+        self._entities = {}
+        self._package_bodies = {}
+        self.primary_design_units = {}
+        self._architectures = {}
+        self.modules = {}
+        self.verilog_packages = {}
+
+        for source_file in self._source_files.values():
+            source_file.add_to_library(self)
+
     def get_source_file(self, file_name):
         """
         Get source file with file name or raise KeyError
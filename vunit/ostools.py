@@ -11,10 +11,14 @@ stubbed for testing
 
 
 import time
+import signal
+import sys
 import subprocess
 import threading
 import shutil
 from queue import Queue, Empty
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 from os.path import getmtime, relpath, splitdrive
 import os
@@ -59,13 +63,81 @@ class ProgramStatus(object):
 PROGRAM_STATUS = ProgramStatus()
 
 
+class PeakMemory(object):
+    """
+    Track the peak memory usage of the processes waited for by each thread
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def reset(self):
+        self._local.value = None
+
+    def get(self):
+        """
+        Return the peak memory usage in MB of the processes waited for by the current thread since the
+        last reset or None if unknown
+        """
+        return getattr(self._local, "value", None)
+
+    def update(self, value):
+        """
+        Update the peak memory usage of the current thread with the peak memory usage in MB of a process
+        """
+        current = self.get()
+        self._local.value = value if current is None else max(current, value)
+
+
+PEAK_MEMORY = PeakMemory()
+
+
+class Deadline(object):
+    """
+    Track the wall-clock deadline of the processes waited for by each thread
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def set(self, timeout):
+        """
+        Set the deadline of the current thread to timeout seconds from now or remove it if timeout is None
+        """
+        self._local.time = None if timeout is None else time.monotonic() + timeout
+        self._local.expired = False
+
+    @property
+    def expired(self):
+        """
+        True if the deadline of the current thread has passed while waiting for a process
+        """
+        return getattr(self._local, "expired", False)
+
+    def has_passed(self):
+        """
+        Return True and mark the deadline as expired if the deadline of the current thread has passed
+        """
+        deadline = getattr(self._local, "time", None)
+        if deadline is not None and time.monotonic() >= deadline:
+            self._local.expired = True
+        return self.expired
+
+
+DEADLINE = Deadline()
+
+# The unit of the maximum resident set size reported by wait4
+_MAX_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
 class InterruptableQueue(object):
     """
     A Queue which can be interrupted
     """
 
-    def __init__(self):
+    def __init__(self, check=None):
         self._queue = Queue()
+        self._check = check
 
     def get(self):
         """
@@ -73,6 +145,8 @@ class InterruptableQueue(object):
         """
         while True:
             PROGRAM_STATUS.check_for_shutdown()
+            if self._check is not None:
+                self._check()
             try:
                 return self._queue.get(timeout=0.1)
             except Empty:
@@ -94,6 +168,11 @@ class Process(object):
     class NonZeroExitCode(Exception):
         pass
 
+    class TimeoutExpired(NonZeroExitCode):
+        """
+        The process group was killed since the deadline of the thread waiting for it passed
+        """
+
     def __init__(self, args, cwd=None, env=None):
         self._args = args
 
@@ -129,9 +208,40 @@ class Process(object):
 
         LOGGER.debug("Started process with pid=%i: '%s'", self._process.pid, (" ".join(args)))
 
-        self._queue = InterruptableQueue()
-        self._reader = AsynchronousFileReader(self._process.stdout, self._queue)
-        self._reader.start()
+        self._poll_lock = threading.Lock()
+
+        self._queue = InterruptableQueue(check=self._check_deadline)
+        # The reader is started on demand such that the output can be consumed in binary chunks instead
+        self._reader = None
+
+    def _poll(self):
+        """
+        Return the exit code of the process or None if it is still running
+
+        Where supported the process is reaped with wait4 and its peak memory usage, including the
+        descendants it has waited for, is added to :data:`PEAK_MEMORY`.
+        """
+        with self._poll_lock:
+            if (self._process.returncode is None) and hasattr(os, "wait4"):
+                try:
+                    pid, status, rusage = os.wait4(self._process.pid, os.WNOHANG)  # pylint: disable=no-member
+                except ChildProcessError:
+                    return self._process.poll()
+
+                if pid == self._process.pid:
+                    self._process.returncode = os.waitstatus_to_exitcode(status)
+                    PEAK_MEMORY.update(rusage.ru_maxrss * _MAX_RSS_UNIT / 2**20)
+
+            return self._process.poll()
+
+    def _start_reader(self):
+        """
+        Start reading the output line by line unless already started
+        """
+        if self._reader is None:
+            self._reader = AsynchronousFileReader(self._process.stdout, self._queue)
+            self._reader.start()
+        return self._reader
 
     def write(self, *args, **kwargs):
         """Write to stdin"""
@@ -149,7 +259,7 @@ class Process(object):
         Return either the next line or the exit code
         """
 
-        if not self._reader.eof():
+        if not self._start_reader().eof():
             # Show what we received from standard output.
             msg = self._queue.get()
 
@@ -164,8 +274,13 @@ class Process(object):
         Wait while without completely blocking to avoid
         deadlock when shutting down
         """
-        while self._process.poll() is None:
+        if self._reader is None and self._poll() is None:
+            # Make sure the process does not block on a full output pipe
+            self._start_reader()
+
+        while self._poll() is None:
             PROGRAM_STATUS.check_for_shutdown()
+            self._check_deadline()
             time.sleep(0.05)
             LOGGER.debug("Waiting for process with pid=%i to stop", self._process.pid)
         return self._process.returncode
@@ -174,13 +289,17 @@ class Process(object):
         """
         Returns true if alive
         """
-        return self._process.poll() is None
+        return self._poll() is None
 
     def consume_output(self, callback=print):
         """
         Consume the output of the process.
         The output is interpreted as UTF-8 text.
 
+        When the output is printed and the current standard output accepts binary output, see
+        :class:`vunit.test.runner.OutputCapture`, the output is copied unmodified in large chunks
+        instead of line by line.
+
         @param callback Called for each line of output
         @raises Process.NonZeroExitCode when the process does not exit with code zero
         """
@@ -191,13 +310,18 @@ class Process(object):
         if not callback:
             callback = default_callback
 
-        while not self._reader.eof():
-            line = self._queue.get()
-            if line is None:
-                break
+        raw_writer = sys.stdout.raw_writer() if callback is print and hasattr(sys.stdout, "raw_writer") else None
+        if (raw_writer is not None) and (self._reader is None):
+            self._copy_output(raw_writer)
+        else:
+            reader = self._start_reader()
+            while not reader.eof():
+                line = self._queue.get()
+                if line is None:
+                    break
 
-            if callback(line) is not None:
-                return
+                if callback(line) is not None:
+                    return
 
         retcode = None
         while retcode is None:
@@ -205,23 +329,62 @@ class Process(object):
             if retcode != 0:
                 raise Process.NonZeroExitCode
 
+    def _copy_output(self, write):
+        """
+        Copy the output of the process in binary chunks until end of file
+        """
+        self._reader = OutputCopier(self._process.stdout.fileno(), write)
+        self._reader.start()
+        while self._reader.is_alive():
+            PROGRAM_STATUS.check_for_shutdown()
+            self._check_deadline()
+            self._reader.join(0.05)
+        self._reader.check()
+
+    def _check_deadline(self):
+        """
+        Kill the process group and raise TimeoutExpired if the deadline of the current thread has passed
+        """
+        if DEADLINE.has_passed():
+            LOGGER.debug("Deadline passed for process with pid=%i", self._process.pid)
+            self.kill_process_group()
+            raise Process.TimeoutExpired
+
+    def kill_process_group(self):
+        """
+        Kill the process and all processes in its process group, including any processes it has started
+        """
+        LOGGER.debug("Killing process group of process with pid=%i", self._process.pid)
+        if IS_WINDOWS_SYSTEM:
+            subprocess.call(
+                ["taskkill", "/F", "/T", "/PID", str(self._process.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            try:
+                # The process is the leader of its process group, see __init__
+                os.killpg(self._process.pid, signal.SIGKILL)  # pylint: disable=no-member
+            except ProcessLookupError:
+                pass
+
     def terminate(self):
         """
         Terminate the process
         """
         # Let's be tidy and join the threads we've started.
-        if self._process.poll() is None:
+        if self._poll() is None:
             LOGGER.debug("Terminating process with pid=%i", self._process.pid)
             self._process.terminate()
 
-        if self._process.poll() is None:
+        if self._poll() is None:
             time.sleep(0.05)
 
-        if self._process.poll() is None:
+        if self._poll() is None:
             LOGGER.debug("Killing process with pid=%i", self._process.pid)
             self._process.kill()
 
-        if self._process.poll() is None:
+        if self._poll() is None:
             LOGGER.debug("Waiting for process with pid=%i", self._process.pid)
             self.wait()
 
@@ -231,7 +394,8 @@ class Process(object):
             self._process.returncode,
         )
 
-        self._reader.join()
+        if self._reader is not None:
+            self._reader.join()
         self._process.stdout.close()
         self._process.stdin.close()
 
@@ -272,6 +436,199 @@ class AsynchronousFileReader(threading.Thread):
         return not self.is_alive() and self._queue.empty()
 
 
+class OutputCopier(threading.Thread):
+    """
+    Helper class copying the output of a process in large binary chunks
+    in a separate thread
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, fd, write):
+        threading.Thread.__init__(self)
+        self._fd = fd
+        self._write = write
+        self._exception = None
+
+    def run(self):
+        """The body of the thread: copy chunks until end of file"""
+        try:
+            while not PROGRAM_STATUS.is_shutting_down:
+                data = os.read(self._fd, self.CHUNK_SIZE)
+                if not data:
+                    break
+                self._write(data)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._exception = exc
+
+    def check(self):
+        """Re-raise any exception raised while copying"""
+        if self._exception is not None:
+            raise self._exception
+
+    def eof(self):
+        """Check whether there is no more content to expect."""
+        return not self.is_alive()
+
+
+class FileWatcher(object):
+    """
+    Detect changes to a set of files by polling their modification times
+    """
+
+    def __init__(self, file_names):
+        self._timestamps = {file_name: self._get_timestamp(file_name) for file_name in file_names}
+
+    @staticmethod
+    def _get_timestamp(file_name):
+        """
+        Return the modification time or None if the file does not exist
+        """
+        try:
+            return get_modification_time(file_name)
+        except OSError:
+            return None
+
+    def poll(self):
+        """
+        Return the files that have been changed, created or removed since the last poll
+        """
+        changed = []
+        for file_name, timestamp in self._timestamps.items():
+            new_timestamp = self._get_timestamp(file_name)
+            if new_timestamp != timestamp:
+                self._timestamps[file_name] = new_timestamp
+                changed.append(file_name)
+        return changed
+
+    def wait_for_changes(self, interval=0.5):
+        """
+        Block until at least one file has changed and return the changed files
+
+        Editors often save a file in several steps so polling continues until
+        a full interval has passed without any new changes.
+        """
+        changed = []
+        while True:
+            PROGRAM_STATUS.check_for_shutdown()
+            new_changes = self.poll()
+            if new_changes:
+                changed += [file_name for file_name in new_changes if file_name not in changed]
+            elif changed:
+                return changed
+            time.sleep(interval)
+
+
+class BackgroundDeleter(object):
+    """
+    Delete directories in a background thread
+
+    A directory is first renamed into the trash path, which is instant when it is on the same file system,
+    such that the caller can re-create it right away without waiting for the contents to be deleted.
+    """
+
+    def __init__(self, trash_path):
+        self._trash_path = Path(trash_path)
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._thread = None
+        self._paused = False
+        self._count = 0
+
+    def discard(self, path):
+        """
+        Move the directory out of the way and delete it in the background
+        """
+        path = Path(path)
+        if not path.exists():
+            return
+
+        with self._lock:
+            self._count += 1
+            trash_name = self._trash_path / f"{path.name!s}.{os.getpid():d}.{self._count:d}"
+
+        try:
+            makedirs(self._trash_path, exist_ok=True)
+            os.replace(path, trash_name)
+        except OSError:
+            # For example when a file in the directory is still open on Windows
+            LOGGER.debug("BackgroundDeleter: Could not rename %s, deleting it in place", path)
+            _remove_tree(path)
+            return
+
+        self._schedule(trash_name)
+
+    def discard_leftovers(self):
+        """
+        Delete the contents of the trash path left by a previous run that was aborted before it was emptied
+        """
+        if self._trash_path.is_dir():
+            for path in self._trash_path.iterdir():
+                self._schedule(path)
+
+    def wait(self):
+        """
+        Wait until all discarded directories have been deleted
+        """
+        while True:
+            with self._lock:
+                thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            thread.join()
+
+    @contextmanager
+    def paused(self):
+        """
+        Stop the deletion thread after the directory being deleted and keep it stopped within the context
+
+        Directories discarded within the context are deleted when leaving it. Used when forking such that
+        no thread is running in the process being forked.
+        """
+        with self._lock:
+            self._paused = True
+        try:
+            self.wait()
+            yield
+        finally:
+            with self._lock:
+                self._paused = False
+                self._start_thread()
+
+    def _schedule(self, path):
+        """
+        Add the path to the deletion queue and start the deletion thread unless it is running
+        """
+        with self._lock:
+            self._pending.append(path)
+            self._start_thread()
+
+    def _start_thread(self):
+        """
+        Start the deletion thread unless it is running, paused or there is nothing to delete
+        """
+        if self._paused or not self._pending:
+            return
+
+        # The thread may also be inherited from the parent of a forked process in which case it is not alive
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._delete_pending, daemon=True)
+            self._thread.start()
+
+    def _delete_pending(self):
+        """
+        The body of the deletion thread: delete paths until the queue is empty or the deleter is paused
+        """
+        while True:
+            with self._lock:
+                if self._paused or not self._pending:
+                    self._thread = None
+                    return
+                path = self._pending.popleft()
+
+            shutil.rmtree(path, ignore_errors=True)
+
+
 def read_file(file_name, encoding="utf-8", newline=None):
     """To stub during testing"""
     try:
@@ -318,10 +675,23 @@ def get_time():
     return time.time()
 
 
-def renew_path(path):
+def renew_path(path, deleter=None):
     """
     Ensure path directory exists and is empty
 
+    With a BackgroundDeleter the old contents are deleted in the background.
+    """
+    if deleter is not None:
+        deleter.discard(path)
+    else:
+        _remove_tree(path)
+    makedirs(path)
+
+
+def _remove_tree(path):
+    """
+    Remove the directory and its contents if it exists
+
     On Windows deleting a file will not actually delete it right away but only
     mark it for deletion. Therefore there is a race-condition between rmtree and makedirs.
     Virus scanners and file system indexers might temporarily block a file from being deleted right away
@@ -337,7 +707,6 @@ def renew_path(path):
     else:
         if Path(path).exists():
             shutil.rmtree(path)
-    makedirs(path)
 
 
 def simplify_path(path):
@@ -32,15 +32,20 @@ from vunit.parsing.verilog.tokens import (
     HASH,
     IDENTIFIER,
     IMPORT,
+    INOUT,
+    INPUT,
     MODULE,
     MULTI_COMMENT,
     NEWLINE,
+    OUTPUT,
     PACKAGE,
     PARAMETER,
+    REF,
     SEMI_COLON,
     WHITESPACE,
 )
 from vunit.cached import file_content_hash
+from vunit.hashing import hash_string
 
 LOGGER = logging.getLogger(__name__)
 
@@ -171,6 +176,7 @@ class VerilogDesignFile(object):
         package_references=None,
         instances=None,
         included_files=None,
+        interface_hash=None,
     ):
         self.modules = [] if modules is None else modules
         self.packages = [] if packages is None else packages
@@ -178,6 +184,7 @@ class VerilogDesignFile(object):
         self.package_references = [] if package_references is None else package_references
         self.instances = [] if instances is None else instances
         self.included_files = [] if included_files is None else included_files
+        self.interface_hash = interface_hash
 
     @classmethod
     def parse(cls, tokens, included_files):
@@ -192,8 +199,36 @@ class VerilogDesignFile(object):
             package_references=cls.find_package_references(tokens),
             instances=cls.find_instances(tokens),
             included_files=included_files,
+            interface_hash=hash_string(" ".join(cls.find_interface(tokens))),
         )
 
+    @staticmethod
+    def find_interface(tokens):
+        """
+        Find the token values seen by users of the modules and packages within the file
+
+        Module items other than port and parameter declarations are left out
+        """
+        results = []
+        balance = 0
+        in_declaration = False
+        for token in tokens:
+            if token.kind == MODULE:
+                balance += 1
+                in_declaration = True
+            elif token.kind in (INPUT, OUTPUT, INOUT, REF, PARAMETER):
+                in_declaration = True
+
+            if balance == 0 or in_declaration:
+                results.append(str(token.value))
+
+            if token.kind == ENDMODULE:
+                balance -= 1
+            elif token.kind == SEMI_COLON:
+                in_declaration = False
+
+        return results
+
     @staticmethod
     def find_imports(tokens):
         """
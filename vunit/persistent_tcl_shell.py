@@ -10,6 +10,9 @@ A persistent TCL shell to avoid startup overhead in TCL-based simulators
 
 import threading
 import logging
+import itertools
+import re
+from multiprocessing import util as multiprocessing_util
 from vunit.ostools import Process
 
 LOGGER = logging.getLogger(__name__)
@@ -24,6 +27,18 @@ class PersistentTclShell(object):
         self._processes = {}
         self._lock = threading.Lock()
         self._create_process = create_process
+        self._tags = itertools.count()
+
+        # Worker processes forked by the process based test runner backend start their own processes
+        multiprocessing_util.register_after_fork(self, PersistentTclShell._after_fork)
+
+    def _after_fork(self):
+        """
+        Forget the processes of the parent and teardown the processes of the forked process when it exits
+        """
+        self._processes = {}
+        self._lock = threading.Lock()
+        multiprocessing_util.Finalize(self, self.teardown, exitpriority=10)
 
     def _process(self):
         """
@@ -62,6 +77,25 @@ class PersistentTclShell(object):
         process.writeline("puts #VUNIT_RETURN")
         process.consume_output(output_consumer)
 
+    def execute_script(self, commands):
+        """
+        Execute a script of single line commands to the persistent TCL shell in one round trip
+
+        The commands are evaluated in order in the global scope until a command returns an error.
+        Returns a list with a :class:`TclReply` for each evaluated command.
+        """
+        process = self._process()
+        tag = next(self._tags)
+        process.writeline(" ".join(["vunit_batch", str(tag)] + [tcl_quote(command) for command in commands]))
+        consumer = BatchOutputConsumer(tag)
+        process.consume_output(consumer)
+
+        for command, reply in zip(commands, consumer.replies):
+            if not reply.succeeded:
+                print(f"{command!s} - {reply.value!s}")
+
+        return consumer.replies
+
     def read_var(self, varname):
         """
         Read a variable from the persistent TCL shell
@@ -125,6 +159,60 @@ class SilentOutputConsumer(object):
         return None
 
 
+class TclReply(object):
+    """
+    The reply from a command executed in a script
+    """
+
+    TCL_OK = 0
+    TCL_ERROR = 1
+
+    def __init__(self, code, value):
+        self.code = code
+        self.value = value
+
+    @property
+    def succeeded(self):
+        return self.code != self.TCL_ERROR
+
+    def __eq__(self, other):
+        return isinstance(other, TclReply) and (self.code, self.value) == (other.code, other.value)
+
+    def __repr__(self):
+        return f"TclReply({self.code!r}, {self.value!r})"
+
+
+class BatchOutputConsumer(object):
+    """
+    Consume output until reaching the end of the batch with tag, collect the replies and print all other output
+    """
+
+    _RE_REPLY = re.compile(r"#VUNIT_REPLY=(\d+) (\d+) (-?\d+) ?(.*)$")
+    _RE_ESCAPE = re.compile(r"\\(.)")
+    _ESCAPES = {"n": "\n", "r": "\r"}
+
+    def __init__(self, tag):
+        self._done = f"#VUNIT_BATCH_DONE={tag:d}"
+        self._tag = str(tag)
+        self.replies = []
+
+    def _unescape(self, match):
+        return self._ESCAPES.get(match.group(1), match.group(1))
+
+    def __call__(self, line):
+        if line.endswith(self._done):
+            return True
+
+        match = self._RE_REPLY.search(line)
+        if match is not None and match.group(1) == self._tag:
+            value = self._RE_ESCAPE.sub(self._unescape, match.group(4))
+            self.replies.append(TclReply(int(match.group(3)), value))
+            return None
+
+        print(line)
+        return None
+
+
 class ReadVarOutputConsumer(object):
     """
     Consume output from modelsim and print with indentation
@@ -136,3 +224,29 @@ class ReadVarOutputConsumer(object):
     def __call__(self, line):
         self.var = line.split("#VUNIT_READVAR=")[-1].strip()
         return True
+
+
+_RE_TCL_SPECIAL = re.compile(r'([\\{}\[\]$";\s])')
+_TCL_WHITESPACE_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def tcl_quote(word):
+    """
+    Quote word with backslashes such that TCL parses it as a single word
+    """
+    if word == "":
+        return "{}"
+    return _RE_TCL_SPECIAL.sub(lambda match: _TCL_WHITESPACE_ESCAPES.get(match.group(1), "\\" + match.group(1)), word)
+
+
+def tcl_string_map(string, mapping):
+    """
+    Replace the keys of mapping in string the same way as the TCL string map command
+    where mapping is a list of (key, value) pairs
+    """
+    if not mapping:
+        return string
+    replacements = {}
+    for key, value in mapping:
+        replacements.setdefault(key, value)
+    return re.sub("|".join(re.escape(key) for key, _ in mapping), lambda match: replacements[match.group(0)], string)
@@ -11,12 +11,13 @@ Functionality to represent and operate on a HDL code project
 """
 from typing import Optional, Union
 from pathlib import Path
+from fnmatch import fnmatchcase
 import logging
+import os
+import re
 from collections import OrderedDict
 from vunit.hashing import hash_string
 from vunit.dependency_graph import DependencyGraph, CircularDependencyException
-from vunit.vhdl_parser import VHDLParser
-from vunit.parsing.verilog.parser import VerilogParser
 from vunit.exceptions import CompileError
 from vunit import ostools
 from vunit.source_file import (
@@ -30,6 +31,9 @@ from vunit.library import Library
 
 LOGGER = logging.getLogger(__name__)
 
+# Characters making a pattern a wildcard pattern
+_WILDCARD_RE = re.compile(r"[*?[]")
+
 
 class Project(object):  # pylint: disable=too-many-instance-attributes
     """
@@ -38,21 +42,52 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
     timestamps and depenencies derived from the design hierarchy.
     """
 
-    def __init__(self, depend_on_package_body=False, database=None):
+    def __init__(self, depend_on_package_body=False, database=None, early_cutoff=False):
         """
         depend_on_package_body - Package users depend also on package body
+        early_cutoff - Only recompile dependent files when the interface of a dependency has changed
         """
         self._database = database
-        self._vhdl_parser = VHDLParser(database=self._database)
-        self._verilog_parser = VerilogParser(database=self._database)
+        # The parsers are created on first use to avoid importing them when no files are added
+        self._vhdl_parser_instance = None
+        self._verilog_parser_instance = None
         self._libraries = OrderedDict()
         # Mapping between library lower case name and real library name
         self._lower_library_names_dict = {}
         self._source_files_in_order = []
+        # Path indexes of all source files and of the source files of each library
+        self._path_indexes = {None: _SourceFilePathIndex()}
+        # Mapping from Verilog package name to the source files defining it, created on first use
+        self._verilog_package_index = None
         self._manual_dependencies = []
         self._depend_on_package_body = depend_on_package_body
+        self._early_cutoff = early_cutoff
+        # The dependencies hash of each file computed when the files to recompile were determined
+        self._dependencies_hashes = {}
         self._builtin_libraries = set(["ieee", "std"])
 
+    @property
+    def _vhdl_parser(self):
+        """
+        Return the VHDL parser which is created on first use
+        """
+        if self._vhdl_parser_instance is None:
+            from vunit.vhdl_parser import VHDLParser  # pylint: disable=import-outside-toplevel
+
+            self._vhdl_parser_instance = VHDLParser(database=self._database)
+        return self._vhdl_parser_instance
+
+    @property
+    def _verilog_parser(self):
+        """
+        Return the Verilog parser which is created on first use
+        """
+        if self._verilog_parser_instance is None:
+            from vunit.parsing.verilog.parser import VerilogParser  # pylint: disable=import-outside-toplevel
+
+            self._verilog_parser_instance = VerilogParser(database=self._database)
+        return self._verilog_parser_instance
+
     def _validate_new_library_name(self, library_name):
         """
         Check that the library_name is valid or raise RuntimeError
@@ -109,6 +144,8 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
 
         self._libraries[logical_name] = library
         self._lower_library_names_dict[logical_name.lower()] = library.name
+        self._path_indexes[logical_name] = _SourceFilePathIndex()
+        self._verilog_package_index = None
 
     def add_source_file(  # pylint: disable=too-many-arguments
         self,
@@ -160,9 +197,35 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
         old_source_file = library.add_source_file(source_file)
         if id(source_file) == id(old_source_file):
             self._source_files_in_order.append(source_file)
+            self._path_indexes[None].add(source_file)
+            self._path_indexes[library_name].add(source_file)
+            self._verilog_package_index = None
 
         return old_source_file
 
+    def refresh_source_files(self, source_files):
+        """
+        Re-scan source files whose contents have changed on disk
+
+        The design units of the affected libraries are rebuilt such that added, removed or renamed
+        design units are reflected in the dependency graph.
+        """
+        libraries = []
+        for source_file in source_files:
+            LOGGER.debug("Refreshing source file %s in library %s", source_file.name, source_file.library.name)
+            if source_file.file_type == "vhdl":
+                source_file.refresh(self._vhdl_parser, self._database)
+            else:
+                source_file.refresh(self._verilog_parser, self._database)
+
+            if source_file.library not in libraries:
+                libraries.append(source_file.library)
+
+        for library in libraries:
+            library.rebuild_design_units()
+
+        self._verilog_package_index = None
+
     def add_manual_dependency(self, source_file, depends_on):
         """
         Add manual dependency where 'source_file' depends_on 'depends_on'
@@ -350,13 +413,14 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
         """
         Find dependencies from import of verilog packages
         """
-        for package_name in source_file.package_dependencies:
+        if self._verilog_package_index is None:
+            self._verilog_package_index = {}
             for library in self._libraries.values():
-                try:
-                    design_unit = library.verilog_packages[package_name]
-                    yield design_unit.source_file
-                except KeyError:
-                    pass
+                for package_name, design_unit in library.verilog_packages.items():
+                    self._verilog_package_index.setdefault(package_name, []).append(design_unit.source_file)
+
+        for package_name in source_file.package_dependencies:
+            yield from self._verilog_package_index.get(package_name, [])
 
     def _find_verilog_module_dependencies(self, source_file):
         """
@@ -501,6 +565,9 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
         files_to_recompile = self._get_files_to_recompile(
             files or self.get_source_files_in_order(), dependency_graph, incremental
         )
+        if incremental and self._early_cutoff:
+            # Dependent files which need to be recompiled are already included
+            return self._get_compile_order(files_to_recompile, dependency_graph)
         return self.get_affected_files_in_compile_order(files_to_recompile, dependency_graph.get_dependent)
 
     def _get_files_to_recompile(self, files, dependency_graph, incremental):
@@ -511,12 +578,73 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
         param: dependency_graph: The DependencyGraph object to be used
         """
         timestamps = self.get_compile_timestamps(files)
+        affected_by_not_compiled = set()
+        if self._early_cutoff:
+            self._dependencies_hashes = self._get_dependencies_hashes(dependency_graph)
+            affected_by_not_compiled = self.get_affected_files(
+                [source_file for source_file in files if timestamps[source_file] is None],
+                dependency_graph.get_dependent,
+            )
+
         result_list = []
         for source_file in files:
-            if (not incremental) or self._needs_recompile(dependency_graph, source_file, timestamps):
+            if (
+                (not incremental)
+                or source_file in affected_by_not_compiled
+                or self._needs_recompile(dependency_graph, source_file, timestamps)
+            ):
                 result_list.append(source_file)
         return result_list
 
+    def _get_dependencies_hashes(self, dependency_graph):
+        """
+        Return a dictionary mapping each file to a hash of the interfaces of its direct dependencies
+
+        The interface of a file includes the interfaces of its own dependencies such that a changed
+        interface propagates to all files depending on it directly or indirectly. A file which
+        only changed in the bodies of its design units does not affect the files depending on it.
+        """
+        try:
+            compile_order = dependency_graph.toposort()
+        except CircularDependencyException as exc:
+            self._handle_circular_dependency(exc)
+            raise CompileError from exc
+
+        interface_hashes = {}
+        dependencies_hashes = {}
+        for source_file in compile_order:
+            dependencies_hash = hash_string(
+                "".join(
+                    sorted(
+                        interface_hashes[dependency]
+                        for dependency in dependency_graph.get_direct_dependencies(source_file)
+                    )
+                )
+            )
+            dependencies_hashes[source_file] = dependencies_hash
+            interface_hashes[source_file] = hash_string(self._interface_hash_of(source_file) + dependencies_hash)
+        return dependencies_hashes
+
+    def _interface_hash_of(self, source_file):
+        """
+        Returns the hash of the interface which files depending on source_file see
+
+        Only a file containing nothing but secondary units, such as architectures and package bodies, can be
+        recompiled without affecting the files depending on it. Re-analysing a primary unit makes the simulators
+        treat all units depending on it as obsolete even when its interface is unchanged. Verilog modules are
+        bound at elaboration and do not make the modules instantiating them obsolete.
+        """
+        if any(design_unit.is_primary for design_unit in source_file.design_units if not design_unit.is_module):
+            return source_file.content_hash
+
+        if self._depend_on_package_body and any(
+            design_unit.unit_type == "package body" for design_unit in source_file.design_units
+        ):
+            # Package users must be recompiled when the package body changes
+            return source_file.content_hash
+
+        return source_file.interface_hash
+
     def get_dependencies_in_compile_order(self, target_files=None, implementation_dependencies=False):
         """
         Get a list of dependencies of target files including the
@@ -588,10 +716,8 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
             self._handle_circular_dependency(exc)
             raise CompileError from exc
 
-        def comparison_key(source_file):
-            return compile_order.index(source_file)
-
-        return sorted(files, key=comparison_key)
+        positions = {source_file: idx for idx, source_file in enumerate(compile_order)}
+        return sorted(files, key=positions.__getitem__)
 
     def get_source_files_in_order(self):
         """
@@ -599,6 +725,33 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
         """
         return list(self._source_files_in_order)
 
+    def get_digest(self):
+        """
+        Return a digest of the source files, their contents and the manual dependencies
+
+        The digest changes when the compile order of the project may have changed
+        """
+        source_files = [
+            (source_file.name, source_file.library.name, source_file.content_hash)
+            for source_file in self._source_files_in_order
+        ]
+        manual_dependencies = [
+            (source_file.name, depends_on.name) for source_file, depends_on in self._manual_dependencies
+        ]
+        return hash_string(repr((source_files, manual_dependencies)))
+
+    def find_source_files(self, pattern, library_name=None):
+        """
+        Get a list of source files in the order they were added to the project whose absolute path or
+        path relative to the current working directory matches a wildcard pattern
+
+        :param library_name: The name of a specific library to search if not all libraries
+        """
+        if library_name not in self._path_indexes:
+            return []
+
+        return self._path_indexes[library_name].find(pattern)
+
     def get_libraries(self):
         return self._libraries.values()
 
@@ -632,6 +785,21 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
             )
             return True
 
+        if self._early_cutoff:
+            dependencies_hash_file_name = self._dependencies_hash_file_name_of(source_file)
+            if (
+                not ostools.file_exists(dependencies_hash_file_name)
+                or ostools.read_file(dependencies_hash_file_name) != self._dependencies_hashes[source_file]
+            ):
+                LOGGER.debug(
+                    "%s has dependency with a different interface than last time and must be recompiled",
+                    source_file.name,
+                )
+                return True
+
+            LOGGER.debug("%s has same hash file and must not be recompiled", source_file.name)
+            return False
+
         for other_file in dependency_graph.get_direct_dependencies(source_file):
             other_timestamp = timestamps[other_file]
 
@@ -658,6 +826,13 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
         prefix = hash_string(str(Path(source_file.name).parent))
         return str(Path(library.directory) / prefix / Path(source_file.name).name / ".vunit_hash")
 
+    def _dependencies_hash_file_name_of(self, source_file):
+        """
+        Returns the name of the file storing the hash of the interfaces of the dependencies
+        source_file was compiled against
+        """
+        return str(Path(self.hash_file_name_of(source_file)).parent / ".vunit_dependencies_hash")
+
     def update(self, source_file):
         """
         Mark that source_file has been recompiled, triggers a re-write of the hash file
@@ -666,3 +841,78 @@ See https://github.com/VUnit/vunit/issues/777 and http://vunit.github.io/hdl_lib
         new_content_hash = source_file.content_hash
         ostools.write_file(self.hash_file_name_of(source_file), new_content_hash)
         LOGGER.debug("Wrote %s content_hash=%s", source_file.name, new_content_hash)
+
+        if self._early_cutoff:
+            if source_file not in self._dependencies_hashes:
+                self._dependencies_hashes = self._get_dependencies_hashes(self.create_dependency_graph())
+            ostools.write_file(
+                self._dependencies_hash_file_name_of(source_file), self._dependencies_hashes[source_file]
+            )
+
+
+class _SourceFilePathIndex(object):
+    """
+    Index of source files on their absolute path, their path relative to the current working directory
+    and their base name
+
+    The paths of a source file are computed on the first lookup after the file was added and are only
+    computed again when the current working directory changes.
+    """
+
+    def __init__(self):
+        self._source_files = []
+        self._cwd = None
+        self._paths = []
+        self._by_path = {}
+        self._by_base_name = {}
+
+    def add(self, source_file):
+        self._source_files.append(source_file)
+
+    def _update(self):
+        """
+        Index the source files added since the last lookup
+        """
+        cwd = os.getcwd()
+        if cwd != self._cwd:
+            self._cwd = cwd
+            self._paths = []
+            self._by_path = {}
+            self._by_base_name = {}
+
+        for idx in range(len(self._paths), len(self._source_files)):
+            name = self._source_files[idx].name
+            paths = (os.path.normcase(str(Path(name).resolve())), os.path.normcase(ostools.simplify_path(name)))
+            self._paths.append(paths)
+
+            for path in set(paths):
+                self._by_path.setdefault(path, []).append(idx)
+
+            for base_name in set(os.path.basename(path) for path in paths):
+                self._by_base_name.setdefault(base_name, []).append(idx)
+
+    def find(self, pattern):
+        """
+        Return the source files whose absolute or relative path matches the wildcard pattern
+
+        A pattern without wildcards is looked up directly and a pattern with wildcards only in its
+        directory part is only matched against the files with the same base name.
+        """
+        self._update()
+        pattern = os.path.normcase(pattern)
+
+        if _WILDCARD_RE.search(pattern) is None:
+            return [self._source_files[idx] for idx in self._by_path.get(pattern, [])]
+
+        base_name = os.path.basename(pattern)
+        if "[" in pattern or _WILDCARD_RE.search(base_name) is not None:
+            # A character set may match a path separator such that the base name is not known
+            candidates = range(len(self._source_files))
+        else:
+            candidates = self._by_base_name.get(base_name, [])
+
+        return [
+            self._source_files[idx]
+            for idx in candidates
+            if any(fnmatchcase(path, pattern) for path in self._paths[idx])
+        ]
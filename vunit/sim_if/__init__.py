@@ -18,6 +18,10 @@ from typing import List
 from ..ostools import Process, simplify_path
 from ..exceptions import CompileError
 from ..color_printer import NO_COLOR_PRINTER
+from .toolchain_cache import ToolchainCache, path_fingerprint
+
+# Limit the number of files per compile command to stay within command line length limits
+MAX_COMPILE_BATCH_SIZE = 64
 
 
 class Option(object):
@@ -125,7 +129,9 @@ class SimulatorInterface(object):  # pylint: disable=too-many-public-methods
         prefix = os.environ.get("VUNIT_" + cls.name.upper() + "_PATH", None)
         if prefix is not None:
             return prefix
-        return cls.find_prefix_from_path()
+        return ToolchainCache.active().get(
+            f"{cls.name!s}.find_prefix_from_path", path_fingerprint, cls.find_prefix_from_path
+        )
 
     @classmethod
     def find_prefix_from_path(cls):
@@ -211,14 +217,16 @@ class SimulatorInterface(object):  # pylint: disable=too-many-public-methods
         printer=NO_COLOR_PRINTER,
         continue_on_error=False,
         target_files=None,
+        batch=False,
     ):
         """
         Compile the project
         param: target_files: Given a list of SourceFiles only these and dependent files are compiled
+        param: batch: Compile consecutive files with the same library and options using a single command
         """
         self.add_simulator_specific(project)
         self.setup_library_mapping(project)
-        self.compile_source_files(project, printer, continue_on_error, target_files=target_files)
+        self.compile_source_files(project, printer, continue_on_error, target_files=target_files, batch=batch)
 
     def simulate(self, output_path, test_suite_name, config, elaborate_only):
         """
@@ -261,16 +269,89 @@ class SimulatorInterface(object):  # pylint: disable=too-many-public-methods
 
         return True
 
-    def compile_source_files(
+    def _compile_source_file_batch(self, source_files, command, printer, print_file_name):
+        """
+        Compiles a batch of source files with a single command and prints status information
+
+        Nothing is printed when the batch fails since the files are then compiled one by one
+        """
+        try:
+            output = check_output(command, env=self.get_env())
+        except subprocess.CalledProcessError:
+            return False
+
+        for source_file in source_files:
+            print_file_name(source_file)
+            printer.write("passed", fg="gi")
+            printer.write("\n")
+        printer.write(output)
+        return True
+
+    def _create_batch_command(self, source_files):
+        """
+        Create a single command compiling all source_files from the compile_source_file_command of each file
+
+        Returns None if the commands differ in more than the source file name
+        """
+        batch_command = None
+        for source_file in source_files:
+            try:
+                command = self.compile_source_file_command(source_file)
+            except CompileError:
+                return None
+
+            if command.count(source_file.name) != 1:
+                return None
+
+            idx = command.index(source_file.name)
+            template = command[:idx] + [None] + command[idx + 1 :]
+            if batch_command is None:
+                batch_command = template
+            elif template != batch_command:
+                return None
+
+        idx = batch_command.index(None)
+        return batch_command[:idx] + [source_file.name for source_file in source_files] + batch_command[idx + 1 :]
+
+    @staticmethod
+    def _get_compile_batch(source_files, start, source_files_to_skip):
+        """
+        Return the run of source files starting at start which can be compiled with a single command
+        """
+
+        def key(source_file):
+            return (
+                source_file.library.name,
+                source_file.file_type,
+                source_file.get_vhdl_standard() if source_file.is_vhdl else None,
+                source_file.compile_options,
+            )
+
+        first = source_files[start]
+        end = start + 1
+        while (
+            end < len(source_files)
+            and end - start < MAX_COMPILE_BATCH_SIZE
+            and source_files[end] not in source_files_to_skip
+            and key(source_files[end]) == key(first)
+        ):
+            end += 1
+
+        return source_files[start:end]
+
+    def compile_source_files(  # pylint: disable=too-many-locals,too-many-branches
         self,
         project,
         printer=NO_COLOR_PRINTER,
         continue_on_error=False,
         target_files=None,
+        batch=False,
     ):
         """
         Use compile_source_file_command to compile all source_files
         param: target_files: Given a list of SourceFiles only these and dependent files are compiled
+        param: batch: Compile consecutive files with the same library and options using a single command.
+                      When a batch fails its files are compiled one by one to find the failing file.
         """
         dependency_graph = project.create_dependency_graph()
         failures = []
@@ -288,13 +369,36 @@ class SimulatorInterface(object):  # pylint: disable=too-many-public-methods
             max_library_name = max(len(source_file.library.name) for source_file in source_files)
             max_source_file_name = max(len(simplify_path(source_file.name)) for source_file in source_files)
 
-        for source_file in source_files:
+        def print_file_name(source_file):
             printer.write(
                 f"Compiling into {(source_file.library.name + ':').ljust(max_library_name + 1)!s} "
                 f"{simplify_path(source_file.name).ljust(max_source_file_name)!s} "
             )
             sys.stdout.flush()
 
+        # Files of a failed or unsupported batch are compiled one by one
+        compile_one_by_one_until = 0
+
+        idx = 0
+        while idx < len(source_files):
+            if batch and idx >= compile_one_by_one_until and source_files[idx] not in source_files_to_skip:
+                source_file_batch = self._get_compile_batch(source_files, idx, source_files_to_skip)
+                command = self._create_batch_command(source_file_batch) if len(source_file_batch) > 1 else None
+
+                if command is not None and self._compile_source_file_batch(
+                    source_file_batch, command, printer, print_file_name
+                ):
+                    for source_file in source_file_batch:
+                        project.update(source_file)
+                    idx += len(source_file_batch)
+                    continue
+
+                compile_one_by_one_until = idx + len(source_file_batch)
+
+            source_file = source_files[idx]
+            idx += 1
+            print_file_name(source_file)
+
             if source_file in source_files_to_skip:
                 printer.write("skipped", fg="rgi")
                 printer.write("\n")
@@ -450,6 +554,16 @@ class StringOption(Option):
             raise ValueError(f"Option {self.name!r} must be a string. Got {value!r}")
 
 
+class NumberOption(Option):
+    """
+    Must be a non-negative number
+    """
+
+    def validate(self, value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"Option {self.name!r} must be a non-negative number. Got {value!r}")
+
+
 class ListOfStringOption(Option):
     """
     Must be a list of strings
@@ -19,6 +19,7 @@ from ..ostools import Process, write_file, file_exists, renew_path
 from ..test.suites import get_result_file_name
 from . import SimulatorInterface, ListOfStringOption, StringOption
 from .vsim_simulator_mixin import get_is_test_suite_done_tcl, fix_path
+from .toolchain_cache import ToolchainCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -65,9 +66,22 @@ class ActiveHDLInterface(SimulatorInterface):
         """
         Returns True when this simulator supports VHDL package generics
         """
-        proc = Process([str(Path(cls.find_prefix()) / "vcom"), "-version"], env=cls.get_env())
+        executable = str(Path(cls.find_prefix()) / "vcom")
+
+        def get_version_output():
+            lines = []
+
+            def consume(line):
+                lines.append(line)
+                return True
+
+            proc = Process([executable, "-version"], env=cls.get_env())
+            proc.consume_output(consume)
+            return lines
+
         consumer = VersionConsumer()
-        proc.consume_output(consumer)
+        for line in ToolchainCache.active().probe("activehdl.version_output", executable, get_version_output):
+            consumer(line)
         if consumer.version is not None:
             return consumer.version >= Version(10, 1)
 
@@ -9,13 +9,7 @@ Create simulator instances
 """
 
 import os
-from .activehdl import ActiveHDLInterface
-from .ghdl import GHDLInterface
-from .incisive import IncisiveInterface
-from .modelsim import ModelSimInterface
-from .nvc import NVCInterface
-from .rivierapro import RivieraProInterface
-from . import BooleanOption, ListOfStringOption, VHDLAssertLevelOption, StringOption
+from . import BooleanOption, ListOfStringOption, NumberOption, VHDLAssertLevelOption, StringOption
 
 
 class SimulatorFactory(object):
@@ -27,7 +21,17 @@ class SimulatorFactory(object):
     def supported_simulators():
         """
         Return a list of supported simulator classes
+
+        The simulator interfaces are imported on first use to keep importing vunit fast
         """
+        # pylint: disable=import-outside-toplevel
+        from .activehdl import ActiveHDLInterface
+        from .ghdl import GHDLInterface
+        from .incisive import IncisiveInterface
+        from .modelsim import ModelSimInterface
+        from .nvc import NVCInterface
+        from .rivierapro import RivieraProInterface
+
         return [
             ModelSimInterface,
             RivieraProInterface,
@@ -63,6 +67,10 @@ class SimulatorFactory(object):
                 BooleanOption("enable_coverage"),
                 ListOfStringOption("pli"),
                 StringOption("seed"),
+                NumberOption("resources.cpu"),
+                NumberOption("resources.memory"),
+                StringOption("resources.license"),
+                NumberOption("timeout"),
             ]
         )
 
@@ -146,8 +154,26 @@ class SimulatorFactory(object):
             sim.add_arguments(parser)
 
     def __init__(self):
-        self._compile_options = self._extract_compile_options()
-        self._sim_options = self._extract_sim_options()
+        self._compile_options_cache = None
+        self._sim_options_cache = None
+
+    @property
+    def _compile_options(self):
+        """
+        Return all supported compile options
+        """
+        if self._compile_options_cache is None:
+            self._compile_options_cache = self._extract_compile_options()
+        return self._compile_options_cache
+
+    @property
+    def _sim_options(self):
+        """
+        Return all supported sim options
+        """
+        if self._sim_options_cache is None:
+            self._sim_options_cache = self._extract_sim_options()
+        return self._sim_options_cache
 
     def _detect_available_simulators(self):
         """
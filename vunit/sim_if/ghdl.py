@@ -23,6 +23,7 @@ from . import SimulatorInterface, ListOfStringOption, StringOption, BooleanOptio
 from . import check_executable
 from ..vhdl_standard import VHDL
 from ._viewermixin import ViewerMixin
+from .toolchain_cache import ToolchainCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -132,14 +133,20 @@ class GHDLInterface(SimulatorInterface, ViewerMixin):  # pylint: disable=too-man
         """
         Get the output of 'ghdl --version'
         """
-        return subprocess.check_output([str(Path(prefix) / cls.executable), "--version"]).decode()
+        executable = str(Path(prefix) / cls.executable)
+        return ToolchainCache.active().probe(
+            "ghdl.version_output", executable, lambda: subprocess.check_output([executable, "--version"]).decode()
+        )
 
     @classmethod
     def _get_help_output(cls, prefix):
         """
         Get the output of 'ghdl --help'
         """
-        return subprocess.check_output([str(Path(prefix) / cls.executable), "--help"]).decode()
+        executable = str(Path(prefix) / cls.executable)
+        return ToolchainCache.active().probe(
+            "ghdl.help_output", executable, lambda: subprocess.check_output([executable, "--help"]).decode()
+        )
 
     @classmethod
     def determine_coverage(cls, prefix):
@@ -435,7 +442,22 @@ class GHDLInterface(SimulatorInterface, ViewerMixin):  # pylint: disable=too-man
         Runs parent command for compilation, and moves any .gcno files to the compilation output
         """
         compilation_ok = super()._compile_source_file(source_file, printer)
+        self._move_gcno_file(source_file)
+        return compilation_ok
 
+    def _compile_source_file_batch(self, source_files, command, printer, print_file_name):
+        """
+        Runs parent command for batch compilation, and moves any .gcno files to the compilation output
+        """
+        compilation_ok = super()._compile_source_file_batch(source_files, command, printer, print_file_name)
+        for source_file in source_files:
+            self._move_gcno_file(source_file)
+        return compilation_ok
+
+    def _move_gcno_file(self, source_file):
+        """
+        Move the .gcno file of a compiled source file to the compilation output
+        """
         if source_file.compile_options.get("enable_coverage", False):
             if self._backend == "gcc":
                 # GCOV gcno files are output to where the command is run,
@@ -446,8 +468,6 @@ class GHDLInterface(SimulatorInterface, ViewerMixin):  # pylint: disable=too-man
                     new_path = Path(source_file.library.directory) / gcno_file
                     gcno_file.rename(new_path)
 
-        return compilation_ok
-
     def _merge_coverage_gcc(self, output_dir, args=None):
         """
         Merge coverage (for gcc backend)
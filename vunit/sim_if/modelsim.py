@@ -19,6 +19,7 @@ from ..ostools import write_file, Process, file_exists
 from ..vhdl_standard import VHDL
 from . import SimulatorInterface, ListOfStringOption, StringOption, BooleanOption, check_output
 from .vsim_simulator_mixin import VsimSimulatorMixin, fix_path
+from .toolchain_cache import ToolchainCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -177,11 +178,16 @@ class ModelSimInterface(VsimSimulatorMixin, SimulatorInterface):  # pylint: disa
         """
         Helper function to find a key in the help output of a command.
         """
-        try:
-            help_output = check_output([str(Path(prefix) / tool), "-help", "all"], env=self.get_env())
-            return key in help_output.split()
-        except Process.NonZeroExitCode:
-            return False
+        executable = str(Path(prefix) / tool)
+
+        def find_in_help():
+            try:
+                help_output = check_output([executable, "-help", "all"], env=self.get_env())
+                return key in help_output.split()
+            except Process.NonZeroExitCode:
+                return False
+
+        return ToolchainCache.active().probe(f"modelsim.help_has_{key!s}", executable, find_in_help)
 
     def __init__(self, prefix, output_path, *, persistent=False, gui=False, debugger="original"):
         self._supports_vhdl_2019 = self._find_in_help(prefix, "vcom", "-2019")
@@ -657,9 +663,8 @@ quit -code 0
         Return initialiation part ofter loading design.
         """
 
-        if config.sim_options.get("enable_coverage", False):
-            coverage_file = str(Path(output_path) / "coverage.ucdb")
-            self._coverage_files.add(coverage_file)
+        coverage_file = self._coverage_file(config, output_path)
+        if coverage_file is not None:
             coverage_save_cmd = (
                 f"coverage save -onexit -testname {{{test_suite_name!s}}} -assert -directive "
                 f"-cvg -codeAll {{{fix_path(coverage_file)!s}}}"
@@ -690,6 +695,11 @@ quit -code 0
 
         return tcl
 
+    def _coverage_file(self, config, script_path):
+        if config.sim_options.get("enable_coverage", False):
+            return str(Path(script_path) / "coverage.ucdb")
+        return None
+
     def _create_load_function(self, test_suite_name, config, output_path, optimize_design):
         """
         Create the vunit_load TCL function that runs the vsim command and loads the design
@@ -769,6 +779,10 @@ proc vunit_load {{vsim_extra_args ""}} {"""
 
         return vsim_flags
 
+    @staticmethod
+    def _encode_generic_value(value):
+        return encode_generic_value_for_tcl(value)
+
     def _get_gui_option(self):
         """
         Return the option used to start in GUI mode.
@@ -21,6 +21,7 @@ from ..ostools import Process, file_exists
 from . import SimulatorInterface, ListOfStringOption, StringOption
 from . import run_command, check_executable
 from ._viewermixin import ViewerMixin
+from .toolchain_cache import ToolchainCache
 from ..vhdl_standard import VHDL
 
 LOGGER = logging.getLogger(__name__)
@@ -112,7 +113,10 @@ class NVCInterface(SimulatorInterface, ViewerMixin):  # pylint: disable=too-many
         """
         Get the output of 'nvc --version'
         """
-        return subprocess.check_output([str(Path(prefix) / cls.executable), "--version"]).decode()
+        executable = str(Path(prefix) / cls.executable)
+        return ToolchainCache.active().probe(
+            "nvc.version_output", executable, lambda: subprocess.check_output([executable, "--version"]).decode()
+        )
 
     @classmethod
     def determine_version(cls, prefix):
@@ -17,6 +17,7 @@ from ..ostools import Process, file_exists
 from ..vhdl_standard import VHDL
 from . import SimulatorInterface, ListOfStringOption, StringOption
 from .vsim_simulator_mixin import VsimSimulatorMixin, fix_path
+from .toolchain_cache import ToolchainCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -75,9 +76,22 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
         """
         Return a VersionConsumer object containing the simulator version.
         """
-        proc = Process([str(Path(cls.find_prefix()) / "vcom"), "-version"], env=cls.get_env())
+        executable = str(Path(cls.find_prefix()) / "vcom")
+
+        def get_version_output():
+            lines = []
+
+            def consume(line):
+                lines.append(line)
+                return True
+
+            proc = Process([executable, "-version"], env=cls.get_env())
+            proc.consume_output(consume)
+            return lines
+
         consumer = VersionConsumer()
-        proc.consume_output(consumer)
+        for line in ToolchainCache.active().probe("rivierapro.version_output", executable, get_version_output):
+            consumer(line)
 
         return consumer
 
@@ -284,6 +298,11 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
             libraries[key] = str((Path(library_cfg_file).parent / (Path(value).parent)).resolve())
         return libraries
 
+    def _coverage_file(self, config, script_path):
+        if config.sim_options.get("enable_coverage", False):
+            return str(Path(script_path) / "coverage.acdb")
+        return None
+
     def _create_load_function(
         self, test_suite_name, config, output_path, optimize_design
     ):  # pylint: disable=unused-argument
@@ -301,9 +320,8 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
             set_generic_str,
         ]
 
-        if config.sim_options.get("enable_coverage", False):
-            coverage_file_path = str(Path(output_path) / "coverage.acdb")
-            self._coverage_files.add(coverage_file_path)
+        coverage_file_path = self._coverage_file(config, output_path)
+        if coverage_file_path is not None:
             vsim_flags += [f"-acdb_file {{{coverage_file_path!s}}}"]
 
         vsim_flags += [self._vsim_extra_args(config)]
@@ -358,6 +376,10 @@ proc vunit_load {{}} {{
 
         return tcl
 
+    @staticmethod
+    def _encode_generic_value(value):
+        return format_generic(value)
+
     def _vsim_extra_args(self, config):
         """
         Determine vsim_extra_args
@@ -2,7 +2,38 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this file,
 # You can obtain one at http://mozilla.org/MPL/2.0/.
 #
-# Copyright (c) 2014-2024, Lars Asplund lars.anders.asplund@gmail.com
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+# Evaluate each command given as argument in the global scope and reply with one line per command:
+#   #VUNIT_REPLY=<tag> <index> <return code> <result with backslash, newline and carriage return escaped>
+# Evaluation stops at the first command returning an error. The batch always ends with:
+#   #VUNIT_BATCH_DONE=<tag>
+proc vunit_batch {tag args} {
+    set idx 0
+    foreach cmd $args {
+        set code [catch {uplevel #0 $cmd} result]
+        set result [string map [list "\\" "\\\\" "\n" "\\n" "\r" "\\r"] $result]
+        puts "#VUNIT_REPLY=$tag $idx $code $result"
+        if {$code == 1} {
+            break
+        }
+        incr idx
+    }
+    puts "#VUNIT_BATCH_DONE=$tag"
+    flush stdout
+}
+
+# Evaluate a script template in the global scope after replacing its placeholders using mapping.
+# Each template file is only read once.
+proc vunit_source_template {file_name mapping} {
+    global vunit_templates
+    if {![info exists vunit_templates($file_name)]} {
+        set fd [open $file_name r]
+        set vunit_templates($file_name) [read $fd]
+        close $fd
+    }
+    uplevel #0 [string map $mapping $vunit_templates($file_name)]
+}
 
 while {1} {
     set line [gets stdin]
@@ -0,0 +1,156 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Persistent cache of simulator toolchain discovery and probe results
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ToolchainCache(object):
+    """
+    Cache the toolchain prefixes found in PATH and the results of probing the executables,
+    such as the version and help output, between runs.
+
+    Each entry is stored together with a fingerprint of what it was derived from and is only
+    re-used while the fingerprint is unchanged. Nothing is cached until a cache file is loaded.
+
+    Each VUnit instance has a cache of its own which it activates before using the simulator interfaces
+    such that instances with different output paths never share entries.
+    """
+
+    _version = 1
+    _active = None
+
+    def __init__(self):
+        self._file_name = None
+        self._entries = {}
+
+    @classmethod
+    def active(cls):
+        """
+        Return the activated cache or a cache which does not cache anything if none is activated
+        """
+        if cls._active is None:
+            return ToolchainCache()
+        return cls._active
+
+    def activate(self):
+        """
+        Make this the cache used by the simulator interfaces
+        """
+        ToolchainCache._active = self
+
+    def load(self, file_name, refresh=False):
+        """
+        Load cached entries from file_name which is also where new entries are stored.
+        All existing entries are discarded when refresh is True.
+        """
+        self._file_name = str(file_name)
+        self._entries = {}
+
+        if refresh:
+            return
+
+        try:
+            with Path(self._file_name).open("r", encoding="utf-8") as fptr:
+                data = json.load(fptr)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get("version") == self._version:
+            self._entries = data.get("entries", {})
+
+    def save(self):
+        """
+        Store all entries to the cache file if its directory exists
+        """
+        if self._file_name is None:
+            return
+
+        file_name = Path(self._file_name)
+        if not file_name.parent.is_dir():
+            return
+
+        temp_file_name = file_name.with_name(f"{file_name.name}.{os.getpid()}.tmp")
+        try:
+            temp_file_name.write_text(
+                json.dumps({"version": self._version, "entries": self._entries}, sort_keys=True), encoding="utf-8"
+            )
+            os.replace(temp_file_name, file_name)
+        except OSError as exc:
+            LOGGER.debug("Failed to write toolchain cache %s: %s", self._file_name, exc)
+
+    def get(self, key, fingerprint, function):
+        """
+        Return the cached result of calling function for key if the fingerprint is unchanged,
+        otherwise call function and cache the result.
+
+        The fingerprint is a function returning a JSON serializable value or None when the result
+        shall not be cached.
+        """
+        if self._file_name is None:
+            return function()
+
+        current_fingerprint = fingerprint()
+        if current_fingerprint is None:
+            return function()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry["fingerprint"] == current_fingerprint:
+            return entry["value"]
+
+        value = function()
+        self._entries[key] = {"fingerprint": current_fingerprint, "value": value}
+        self.save()
+        return value
+
+    def probe(self, key, executable, function):
+        """
+        Return the cached result of function probing executable while the executable is unchanged
+        """
+        return self.get(f"{key!s}({executable!s})", lambda: file_fingerprint(executable), function)
+
+
+def file_fingerprint(file_name):
+    """
+    Return the modification time, inode and size of a file or None if it does not exist
+    """
+    for name in (str(file_name), str(file_name) + ".exe"):
+        try:
+            stat = os.stat(name)
+        except OSError:
+            continue
+        return [stat.st_mtime_ns, stat.st_ino, stat.st_size]
+    return None
+
+
+def path_fingerprint():
+    """
+    Return the PATH environment variable and the modification time of each directory in PATH which
+    changes when executables are added or removed
+
+    The current directory is only included when PATH refers to it through an empty or "." entry since
+    files are frequently created and removed in it.
+    """
+
+    def mtime(directory):
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    path = os.environ.get("PATH", None)
+    directories = [] if path is None else path.split(os.pathsep)
+    if any(directory in ("", os.curdir) for directory in directories):
+        directories = [os.getcwd()] + directories
+    return [path] + [[directory, mtime(directory)] for directory in directories]
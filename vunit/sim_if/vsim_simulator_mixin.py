@@ -11,10 +11,17 @@ and RivieraPRO
 
 import sys
 import os
+import threading
 from pathlib import Path
 from ..ostools import write_file, Process
+from ..hashing import hash_string
 from ..test.suites import get_result_file_name
-from ..persistent_tcl_shell import PersistentTclShell
+from ..persistent_tcl_shell import PersistentTclShell, tcl_quote
+
+# Placeholders for the values that differ between the test suites sharing a script template.
+# The output path contains spaces such that the raw path and the path adjusted by fix_path differ.
+TEMPLATE_OUTPUT_PATH = "@VUNIT OUTPUT PATH@"
+TEMPLATE_TEST_SUITE_NAME = "@VUNIT_TEST_SUITE_NAME@"
 
 
 class VsimSimulatorMixin(object):
@@ -50,6 +57,9 @@ class VsimSimulatorMixin(object):
         else:
             self._persistent_shell = None
 
+        self._template_lock = threading.Lock()
+        self._template_file_names = {}
+
     @staticmethod
     def _create_restart_function(optimize_design):
         """ "
@@ -338,25 +348,45 @@ proc vunit_run {} {
             return False
         return True
 
-    def _run_persistent(self, common_file_name, load_only=False):
+    def _run_persistent(self, common_file_name, load_only=False, mapping=None):
         """
         Run a test bench using the persistent vsim process
+
+        When a mapping is given the common file is a template which is instantiated with the mapping
         """
-        try:
-            self._persistent_shell.execute(f'source "{fix_path(common_file_name)!s}"')
-            self._persistent_shell.execute("set failed [vunit_load]")
-            if self._persistent_shell.read_bool("failed"):
-                return False
+        if mapping is None:
+            source = f'source "{fix_path(common_file_name)!s}"'
+        else:
+            source = " ".join(
+                [
+                    "vunit_source_template",
+                    tcl_quote(common_file_name),
+                    tcl_quote(_tcl_list(mapping)),
+                ]
+            )
 
-            run_ok = True
-            if not load_only:
-                self._persistent_shell.execute("set failed [vunit_run]")
-                run_ok = not self._persistent_shell.read_bool("failed")
-            self._persistent_shell.execute("quit -sim")
-            return run_ok
+        script = [
+            source,
+            # Stop the script without quitting the simulation when the load fails
+            "if {[vunit_load]} {error {vunit_load failed}}",
+        ]
+        if not load_only:
+            script.append("vunit_run")
+        script.append("quit -sim")
+
+        try:
+            replies = self._persistent_shell.execute_script(script)
         except Process.NonZeroExitCode:
             return False
 
+        if len(replies) != len(script) or not all(reply.succeeded for reply in replies):
+            return False
+
+        if not load_only:
+            return replies[2].value.lower() == "false"
+
+        return True
+
     def _optimize_design(self, config):  # pylint: disable=unused-argument
         """
         Return True if design shall be optimized.
@@ -394,6 +424,114 @@ proc vunit_run {} {
         """
         return "-gui"
 
+    @staticmethod
+    def _encode_generic_value(value):
+        """
+        Return the value of a generic as it is written in the vsim command of the load function
+        """
+        return str(value)
+
+    def _coverage_file(self, config, script_path):  # pylint: disable=unused-argument
+        """
+        Return the coverage file saved by the simulation or None if coverage is not enabled
+        """
+        return None
+
+    @staticmethod
+    def _common_script_template_key(config, optimize_design):
+        """
+        Return the key of the common script template of a test suite.
+
+        Test suites with the same key only differ in the values of their generics,
+        their output path and their name.
+        """
+        return (
+            config.library_name,
+            config.entity_name,
+            config.architecture_name,
+            config.vhdl_configuration_name,
+            tuple(config.generics),
+            repr(sorted(config.sim_options.items())),
+            optimize_design,
+        )
+
+    def _create_common_script_template(self, config, *, optimize_design):
+        """
+        Create the common script with placeholders for the values that differ between the test suites
+        sharing the template
+        """
+        template_config = config.copy()
+        for idx, name in enumerate(config.generics):
+            template_config.generics[name] = f"@VUNIT_GENERIC_{idx:d}@"
+
+        return self._create_common_script(
+            TEMPLATE_TEST_SUITE_NAME,
+            template_config,
+            Path(TEMPLATE_OUTPUT_PATH) / self.name,
+            TEMPLATE_OUTPUT_PATH,
+            optimize_design=optimize_design,
+        )
+
+    def _get_common_script_template_mapping(self, output_path, test_suite_name, config):
+        """
+        Return the mapping from the placeholders in the common script template to the values of a test suite.
+        The mapping is a list of pairs applied in order, like the TCL string map command.
+        """
+        mapping = [
+            (self._encode_generic_value(f"@VUNIT_GENERIC_{idx:d}@"), self._encode_generic_value(value))
+            for idx, value in enumerate(config.generics.values())
+        ]
+
+        output_path = str(Path(output_path))
+        mapping += [
+            (TEMPLATE_OUTPUT_PATH, output_path),
+            (fix_path(TEMPLATE_OUTPUT_PATH), fix_path(output_path)),
+            (TEMPLATE_TEST_SUITE_NAME, test_suite_name),
+        ]
+        return mapping
+
+    def _get_common_script_template(self, config, optimize_design):
+        """
+        Return the name of the common script template file of a test suite.
+        The template is only created for the first test suite using it.
+        """
+        key = self._common_script_template_key(config, optimize_design)
+
+        with self._template_lock:  # pylint: disable=not-context-manager
+            file_name = self._template_file_names.get(key)
+
+        if file_name is None:
+            template = self._create_common_script_template(config, optimize_design=optimize_design)
+            file_name = self._write_common_script_template(template)
+            with self._template_lock:  # pylint: disable=not-context-manager
+                self._template_file_names[key] = file_name
+
+        return file_name
+
+    def _write_common_script_template(self, template):
+        """
+        Write the template to a file named by its content unless already written and return the file name
+        """
+        file_name = str(Path(self._output_path) / "script_templates" / f"common_{hash_string(template)!s}.do")
+
+        if not Path(file_name).exists():
+            temp_file_name = f"{file_name!s}.{os.getpid()}.{threading.get_ident()}.tmp"
+            write_file(temp_file_name, template)
+            os.replace(temp_file_name, file_name)
+
+        return file_name
+
+    @staticmethod
+    def _create_template_script(template_file_name, mapping):
+        """
+        Create tcl script which evaluates the common script template with the values of a test suite
+        """
+        tcl = f"set vunit_template_file [open {tcl_quote(template_file_name)} r]\n"
+        tcl += "set vunit_template [read $vunit_template_file]\n"
+        tcl += "close $vunit_template_file\n"
+        tcl += f"uplevel #0 [string map [list {_tcl_list(mapping)}] $vunit_template]\n"
+        return tcl
+
     def simulate(self, output_path, test_suite_name, config, elaborate_only):
         """
         Run a test bench
@@ -409,13 +547,23 @@ proc vunit_run {} {
             if not self._optimize(config, script_path):
                 return False
 
-        write_file(
-            str(common_file_name),
-            self._create_common_script(
+        coverage_file = self._coverage_file(config, script_path)  # pylint: disable=assignment-from-none
+        if coverage_file is not None:
+            self._coverage_files.add(coverage_file)
+
+        if self._persistent_shell is not None and not self._gui:
+            # The persistent shell reads each template once and only the mapping is passed per test suite
+            template_file_name = self._get_common_script_template(config, optimize_design)
+            mapping = self._get_common_script_template_mapping(output_path, test_suite_name, config)
+            common_script = self._create_template_script(template_file_name, mapping)
+        else:
+            template_file_name, mapping = None, None
+            common_script = self._create_common_script(
                 test_suite_name, config, script_path, output_path, optimize_design=optimize_design
-            ),
-        )
+            )
 
+        # The scripts are always written such that a test suite can be re-run or debugged by hand
+        write_file(str(common_file_name), common_script)
         write_file(
             str(gui_file_name),
             self._create_gui_script(str(common_file_name), config),
@@ -434,12 +582,19 @@ proc vunit_run {} {
                 extra_args=self._get_load_flags(config, output_path, optimize_design) if early_load else None,
             )
 
-        if self._persistent_shell is not None:
-            return self._run_persistent(str(common_file_name), load_only=elaborate_only)
+        if template_file_name is not None:
+            return self._run_persistent(template_file_name, load_only=elaborate_only, mapping=mapping)
 
         return self._run_batch_file(str(batch_file_name))
 
 
+def _tcl_list(mapping):
+    """
+    Return the TCL list of the keys and values of mapping
+    """
+    return " ".join(tcl_quote(item) for pair in mapping for item in pair)
+
+
 def fix_path(path):
     """
     Adjust path for TCL usage
@@ -14,7 +14,6 @@ from copy import copy
 import traceback
 from vunit.sim_if.factory import SIMULATOR_FACTORY
 from vunit.hashing import hash_string
-from vunit.vhdl_parser import VHDLReference
 from vunit.cached import file_content_hash
 from vunit.parsing.encodings import HDL_FILE_ENCODING
 from vunit.design_unit import DesignUnit, VHDLDesignUnit, Entity, Module
@@ -24,7 +23,7 @@ from vunit.library import Library
 LOGGER = logging.getLogger(__name__)
 
 
-class SourceFile(object):
+class SourceFile(object):  # pylint: disable=too-many-instance-attributes
     """
     Represents a generic source file
     """
@@ -35,6 +34,7 @@ class SourceFile(object):
         self.file_type = file_type
         self.design_units = []
         self._content_hash = None
+        self._interface_hash = None
         self._compile_options = {}
 
         # The file name before preprocessing
@@ -118,8 +118,25 @@ class SourceFile(object):
         """
         return hash_string(self._content_hash + self._compile_options_hash())
 
+    @property
+    def interface_hash(self):
+        """
+        Compute hash of the interface of the design units and compile options
+
+        The content hash is used when the file could not be parsed
+        """
+        if self._interface_hash is None:
+            return self.content_hash
+        return hash_string(self._interface_hash + self._compile_options_hash())
+
+    def hash_with_compile_options(self, code_hash):
+        """
+        Combine the hash of code within the file with the hash of everything else affecting its compilation
+        """
+        return hash_string(code_hash + self._compile_options_hash())
+
 
-class VerilogSourceFile(SourceFile):
+class VerilogSourceFile(SourceFile):  # pylint: disable=too-many-instance-attributes
     """
     Represents a Verilog source file
     """
@@ -141,28 +158,60 @@ class VerilogSourceFile(SourceFile):
         self.module_dependencies = []
         self.include_dirs = include_dirs if include_dirs is not None else []
         self.defines = defines.copy() if defines is not None else {}
+        self._no_parse = no_parse
+        self._scan(verilog_parser, database, include_dirs)
+
+    def _scan(self, verilog_parser, database, include_dirs):
+        """
+        Compute the content hash and parse the file unless parsing is disabled
+        """
         self._content_hash = file_content_hash(self.name, encoding=HDL_FILE_ENCODING, database=database)
+        self._context_hash = ""
+        self._interface_hash = None
 
         for path in self.include_dirs:
-            self._content_hash = hash_string(self._content_hash + hash_string(path))
+            self._add_to_content_hash(hash_string(path))
 
         for key, value in sorted(self.defines.items()):
-            self._content_hash = hash_string(self._content_hash + hash_string(key))
-            self._content_hash = hash_string(self._content_hash + hash_string(value))
+            self._add_to_content_hash(hash_string(key))
+            self._add_to_content_hash(hash_string(value))
 
-        if not no_parse:
+        if not self._no_parse:
             self.parse(verilog_parser, database, include_dirs)
 
+    def _add_to_content_hash(self, string_hash):
+        """
+        Add the hash of something else than the code of the file affecting its compilation
+        """
+        self._content_hash = hash_string(self._content_hash + string_hash)
+        self._context_hash = hash_string(self._context_hash + string_hash)
+
+    def hash_with_compile_options(self, code_hash):
+        """
+        Combine the hash of code within the file with the hash of the compile options, include directories,
+        defines and included files
+        """
+        return hash_string(code_hash + self._context_hash + self._compile_options_hash())
+
+    def refresh(self, verilog_parser, database):
+        """
+        Re-scan the file after its contents have changed on disk
+        """
+        self.design_units = []
+        self.package_dependencies = []
+        self.module_dependencies = []
+        self._scan(verilog_parser, database, self.include_dirs)
+
     def parse(self, parser, database, include_dirs):
         """
         Parse Verilog code and adding dependencies and design units
         """
         try:
             design_file = parser.parse(self.name, include_dirs, self.defines)
+            self._interface_hash = design_file.interface_hash
             for included_file_name in design_file.included_files:
-                self._content_hash = hash_string(
-                    self._content_hash
-                    + file_content_hash(
+                self._add_to_content_hash(
+                    file_content_hash(
                         included_file_name,
                         encoding=HDL_FILE_ENCODING,
                         database=database,
@@ -198,7 +247,7 @@ class VerilogSourceFile(SourceFile):
         library.add_verilog_design_units(self.design_units)
 
 
-class VHDLSourceFile(SourceFile):
+class VHDLSourceFile(SourceFile):  # pylint: disable=too-many-instance-attributes
     """
     Represents a VHDL source file
     """
@@ -216,9 +265,17 @@ class VHDLSourceFile(SourceFile):
         SourceFile.__init__(self, str(name), library, "vhdl")
         self.dependencies = []  # type: ignore
         self.depending_components = []  # type: ignore
+        self.design_unit_sections = []  # type: ignore
         self._vhdl_standard = vhdl_standard
+        self._no_parse = no_parse
+        self._scan(vhdl_parser, database)
 
-        if not no_parse:
+    def _scan(self, vhdl_parser, database):
+        """
+        Parse the file unless parsing is disabled and compute the content hash
+        """
+        self._interface_hash = None
+        if not self._no_parse:
             try:
                 design_file = vhdl_parser.parse(self.name)
             except KeyboardInterrupt as exk:
@@ -228,9 +285,20 @@ class VHDLSourceFile(SourceFile):
                 LOGGER.error("Failed to parse %s", self.name)
             else:
                 self._add_design_file(design_file)
+                self._interface_hash = design_file.interface_hash
 
         self._content_hash = file_content_hash(self.name, encoding=HDL_FILE_ENCODING, database=database)
 
+    def refresh(self, vhdl_parser, database):
+        """
+        Re-scan the file after its contents have changed on disk
+        """
+        self.design_units = []
+        self.dependencies = []
+        self.depending_components = []
+        self.design_unit_sections = []
+        self._scan(vhdl_parser, database)
+
     def get_vhdl_standard(self) -> VHDLStandard:
         """
         Return the VHDL standard used to create this file
@@ -244,6 +312,7 @@ class VHDLSourceFile(SourceFile):
         self.design_units = self._find_design_units(design_file)
         self.dependencies = self._find_dependencies(design_file)
         self.depending_components = design_file.component_instantiations
+        self.design_unit_sections = design_file.design_unit_sections
 
         for design_unit in self.design_units:
             if design_unit.is_primary:
@@ -287,6 +356,8 @@ class VHDLSourceFile(SourceFile):
 
             result.append(ref)
 
+        from vunit.vhdl_parser import VHDLReference  # pylint: disable=import-outside-toplevel
+
         for configuration in design_file.configurations:
             result.append(VHDLReference("entity", self.library.name, configuration.entity, "all"))
 
@@ -337,6 +408,25 @@ class VHDLSourceFile(SourceFile):
         """
         return hash_string(self._content_hash + self._compile_options_hash() + hash_string(str(self._vhdl_standard)))
 
+    @property
+    def interface_hash(self):
+        """
+        Compute hash of the interface of the design units, compile options and VHDL standard
+
+        The content hash is used when the file could not be parsed
+        """
+        if self._interface_hash is None:
+            return self.content_hash
+        return hash_string(
+            self._interface_hash + self._compile_options_hash() + hash_string(str(self._vhdl_standard))
+        )
+
+    def hash_with_compile_options(self, code_hash):
+        """
+        Combine the hash of code within the file with the hash of the compile options and VHDL standard
+        """
+        return hash_string(code_hash + self._compile_options_hash() + hash_string(str(self._vhdl_standard)))
+
     def add_to_library(self, library):
         """
         Add design units to the library
@@ -15,7 +15,7 @@ import collections
 from collections import OrderedDict
 from ..ostools import file_exists
 from ..cached import cached
-from ..vhdl_parser import remove_comments as remove_vhdl_comments
+from ..hashing import hash_string
 from ..parsing.encodings import HDL_FILE_ENCODING
 from ..source_file import file_type_of, VERILOG_FILE_TYPES
 from ..configuration import Configuration, ConfigurationVisitor, DEFAULT_NAME
@@ -38,6 +38,7 @@ class TestBench(ConfigurationVisitor):
         self._configs = {}
         self._test_cases = []
         self._implicit_test = None
+        self._scanned_file_name = None
 
         if design_unit.is_entity:
             design_unit.set_add_architecture_callback(self._add_architecture_callback)
@@ -165,9 +166,29 @@ class TestBench(ConfigurationVisitor):
             del configs[DEFAULT_NAME]
         return configs.values()
 
-    def scan_tests_from_file(self, file_name):
+    @property
+    def scanned_file_name(self):
+        return self._scanned_file_name
+
+    def get_digest(self):
         """
-        Scan file for test cases and attributes
+        Return a digest of the tests and of the names and attributes of the configurations of the test bench
+
+        The digest changes when the names, locations or attributes of the tests created from the test bench
+        may have changed
+        """
+        configs = [
+            [(name, sorted(config.attributes.items())) for name, config in configs.items()]
+            for configs in self.get_configuration_dicts()
+        ]
+        tests = [(test_case.test, test_case.enable_configuration) for test_case in self._test_cases]
+        return hash_string(
+            repr((self.library_name, self.name, self._individual_tests, self._implicit_test, tests, configs))
+        )
+
+    def _parse_tests(self, file_name):
+        """
+        Return the tests and attributes parsed from the file
         """
         if not file_exists(file_name):
             raise ValueError(f"File {file_name!r} does not exist")
@@ -203,9 +224,33 @@ class TestBench(ConfigurationVisitor):
                         f"{file_name!s} line {attr.location.lineno:d}"
                     )
 
+        return tests, attributes
+
+    def scan_tests_from_file(self, file_name):
+        """
+        Scan file for test cases and attributes
+        """
+        tests, attributes = self._parse_tests(file_name)
+        self._scanned_file_name = file_name
+
         default_config = Configuration(DEFAULT_NAME, self.design_unit)
         self._configs = OrderedDict({default_config.name: default_config})
+        self._set_tests(tests, attributes, {})
+
+    def rescan_tests(self):
+        """
+        Re-scan the file scanned for test cases and attributes after it has changed
+
+        The configurations of the test bench and of the test cases which are still in the file are kept.
+        Added test cases get a copy of the default configuration of the test bench.
+        """
+        tests, attributes = self._parse_tests(self._scanned_file_name)
+        self._set_tests(tests, attributes, {test_case.name: test_case for test_case in self._test_cases})
 
+    def _set_tests(self, tests, attributes, old_test_cases):
+        """
+        Set the tests of the test bench re-using the test cases in old_test_cases with the same names
+        """
         explicit_tests = [test for test in tests if test.is_explicit]
         if explicit_tests:
             # All tests shall be explicit when there are at least one explicit test
@@ -217,10 +262,17 @@ class TestBench(ConfigurationVisitor):
             self._implicit_test = tests[0]
 
         self._individual_tests = len(explicit_tests) > 0
-        self._test_cases = [
-            TestConfigurationVisitor(test, self.design_unit, self._individual_tests, default_config.copy())
-            for test in explicit_tests
-        ]
+        self._test_cases = []
+        for test in explicit_tests:
+            if test.name in old_test_cases:
+                test_case = old_test_cases[test.name]
+                test_case.test = test
+                test_case.enable_configuration = self._individual_tests
+            else:
+                test_case = TestConfigurationVisitor(
+                    test, self.design_unit, self._individual_tests, self._configs[DEFAULT_NAME].copy()
+                )
+            self._test_cases.append(test_case)
 
         # This must be done after self._test_cases have been created such that run_all_in_same_sim can disable them
         for attr in attributes:
@@ -404,6 +456,11 @@ class TestConfigurationVisitor(ConfigurationVisitor):
     def test(self):
         return self._test
 
+    @test.setter
+    def test(self, test):
+        assert test.is_explicit and test.name == self._test.name
+        self._test = test
+
     def get_default_config(self):
         """
         Get the default configuration of this test case
@@ -461,6 +518,11 @@ _RE_VHDL_TEST_CASE = re.compile(r'(\s|\()+run\s*\(\s*"(?P<name>.*?)"\s*\)', re.I
 _RE_VERILOG_TEST_CASE = re.compile(r'`TEST_CASE\s*\(\s*"(?P<name>.*?)"\s*\)')
 _RE_VHDL_TEST_SUITE = re.compile(r"test_runner_setup\s*\(", re.IGNORECASE)
 _RE_VERILOG_TEST_SUITE = re.compile(r"`TEST_SUITE\b")
+_RE_VHDL_TEST_CASE_END = re.compile(
+    r"'[^\n]'|\"[^\"\n]*\"|\b(?P<end>end\s+if|elsif|else)\b|\b(?P<if>if)\b", re.IGNORECASE
+)
+_RE_VERILOG_TEST_CASE_BEGIN = re.compile(r"\s*\)\s*begin\b")
+_RE_VERILOG_TEST_CASE_END = re.compile(r'"(?:\\.|[^"\\\n])*"|\b(?P<end>end)\b|\b(?P<begin>begin)\b')
 
 
 def _get_line_offsets(code):
@@ -527,6 +589,8 @@ def _find_tests(code, file_name, line_offsets=None):
         regexp = _RE_VERILOG_TEST_CASE
         suite_regexp = _RE_VERILOG_TEST_SUITE
     else:
+        from ..vhdl_parser import remove_comments as remove_vhdl_comments  # pylint: disable=import-outside-toplevel
+
         code = remove_vhdl_comments(code)
         regexp = _RE_VHDL_TEST_CASE
         suite_regexp = _RE_VHDL_TEST_SUITE
@@ -556,6 +620,88 @@ def _find_tests(code, file_name, line_offsets=None):
     return tests
 
 
+def split_test_cases(code, file_name):
+    """
+    Split the code of a test bench without comments into the code common to all test cases and the code of each
+    explicit test case
+
+    The code of a test case starts at its name and ends where its branch of the if statement (VHDL) or its
+    begin-end block (Verilog) ends. The code of a test case which could not be separated from the code
+    of the following test case is left in the common code.
+
+    Returns the common code and a dictionary mapping test case names to their code
+    """
+    tests = sorted(
+        (test for test in _find_tests(code, file_name) if test.is_explicit),
+        key=lambda test: test.location.offset,
+    )
+
+    if file_type_of(file_name) in VERILOG_FILE_TYPES:
+        code = _remove_verilog_comments(code)
+        find_end = _find_verilog_test_case_end
+    else:
+        from ..vhdl_parser import remove_comments as remove_vhdl_comments  # pylint: disable=import-outside-toplevel
+
+        code = remove_vhdl_comments(code)
+        find_end = _find_vhdl_test_case_end
+
+    common_code = []
+    test_case_code = {}
+    pos = 0
+    separated = True
+    for idx, test in enumerate(tests):
+        start = test.location.offset
+        limit = tests[idx + 1].location.offset if idx + 1 < len(tests) else len(code)
+        end = find_end(code, start + test.location.length + 1, limit)
+
+        if separated and end is not None:
+            common_code.append(code[pos:start])
+            test_case_code[test.name] = code[start:end]
+            pos = end
+        else:
+            test_case_code[test.name] = ""
+
+        # When the end is not found before the next test case both share the code
+        separated = end is not None
+
+    common_code.append(code[pos:])
+    return "".join(common_code), test_case_code
+
+
+def _find_vhdl_test_case_end(code, pos, limit):
+    """
+    Return the end of the if statement branch starting at pos or None if it does not end before limit
+    """
+    depth = 0
+    for match in _RE_VHDL_TEST_CASE_END.finditer(code, pos, limit):
+        if match.group("if") is not None:
+            depth += 1
+        elif match.group("end") is not None:
+            if depth == 0:
+                return match.start()
+            if match.group("end").lower().startswith("end"):
+                depth -= 1
+    return None
+
+
+def _find_verilog_test_case_end(code, pos, limit):
+    """
+    Return the end of the begin-end block starting at pos or None if it does not end before limit
+    """
+    if _RE_VERILOG_TEST_CASE_BEGIN.match(code, pos, limit) is None:
+        return None
+
+    depth = 0
+    for match in _RE_VERILOG_TEST_CASE_END.finditer(code, pos, limit):
+        if match.group("begin") is not None:
+            depth += 1
+        elif match.group("end") is not None:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return None
+
+
 def _check_duplicates(attrs, file_name, test_name=None):
     """
     Check for duplicate attributes, if test_name is None it is a file global attribute
@@ -60,6 +60,15 @@ class TestBenchList(object):
                 result.append(test_bench)
         return result
 
+    def rescan_tests(self, file_names):
+        """
+        Re-scan the tests of the test benches scanned from any of the changed files
+        """
+        file_names = set(str(file_name) for file_name in file_names)
+        for test_bench in self.get_test_benches():
+            if str(test_bench.scanned_file_name) in file_names:
+                test_bench.rescan_tests()
+
     def create_tests(self, simulator_if, seed, elaborate_only):
         """
         Create all test cases from the test benches
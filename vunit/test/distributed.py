@@ -0,0 +1,531 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Distributed test execution with a coordinator handing out test suites to remote workers
+
+The coordinator and the workers talk over TCP using newline separated JSON messages::
+
+  worker -> coordinator: {"type": "hello", "name": ..., "token": ...}
+  worker -> coordinator: {"type": "request"}
+  coordinator -> worker: {"type": "run", "test_suite": ..., "output_path": ...} or {"type": "done"}
+  worker -> coordinator: {"type": "result", "results": {...}, "time": ..., "seed": ..., "archive": ...,
+                          "peak_memory": ...}
+  worker -> coordinator: {"type": "archive", "data": ...} repeated until data is null when archive is true
+
+Every worker connection corresponds to one thread in the coordinator's :class:`.TestScheduler`. A worker
+process opens one connection per thread such that ``-p`` on the worker decides how many test suites
+it runs in parallel.
+
+The coordinator only accepts workers on the loopback interface unless it has a token shared with the
+workers. The token is sent in clear text and only keeps unintended clients out of a trusted network.
+"""
+
+import base64
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from datetime import datetime
+from .. import ostools
+from .report import PASSED, FAILED, STATUSES
+from .runner import TestRunner, TestScheduler
+
+LOGGER = logging.getLogger(__name__)
+
+# Environment variable with the token shared by the coordinator and the workers
+TOKEN_ENVIRONMENT_VARIABLE = "VUNIT_DISTRIBUTED_TOKEN"
+
+# Number of bytes of a test output archive sent in each message
+ARCHIVE_CHUNK_SIZE = 256 * 1024
+
+# Maximum length in bytes of a received message
+MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+
+def parse_address(value):
+    """
+    Parse a network address on the form [host:]port into a (host, port) tuple
+    """
+    host, _, port = value.rpartition(":")
+    if not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"Invalid network address {value!r}. Expected [host:]port")
+    return host.strip("[]"), int(port)
+
+
+def is_loopback(host):
+    """
+    Return True if the host name or address is on the loopback interface
+    """
+    if host == "localhost":
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class Channel(object):
+    """
+    A message channel on top of a connected socket
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        """
+        Send a message
+        """
+        data = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:  # pylint: disable=not-context-manager
+            self._file.write(data)
+            self._file.flush()
+
+    def receive(self):
+        """
+        Receive a message, returns None when the other side has closed the connection
+        """
+        line = self._file.readline(MAX_MESSAGE_SIZE + 1)
+        if not line:
+            return None
+        if len(line) > MAX_MESSAGE_SIZE:
+            raise ValueError(f"Received a message longer than {MAX_MESSAGE_SIZE:d} bytes")
+        return json.loads(line.decode("utf-8"))
+
+    def close(self):
+        """
+        Close the channel and unblock any pending receive
+        """
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._file.close()
+        self._sock.close()
+
+
+class TestCoordinator(TestRunner):
+    """
+    Run a list of test suites by handing them out to remote workers
+
+    The coordinator does not simulate anything itself. It keeps the scheduling, the report and the
+    output files of the test suites while the workers run them.
+
+    An empty host listens to 127.0.0.1. Any other host than the loopback interface requires a token
+    which the workers must present when connecting.
+    """
+
+    def __init__(self, report, output_path, address, *, token=None, **kwargs):
+        host, port = address
+        host = host or "127.0.0.1"
+        if (token is None) and not is_loopback(host):
+            raise ValueError(
+                f"Accepting workers on {host!s} requires a token shared with the workers. "
+                f"Set it in the {TOKEN_ENVIRONMENT_VARIABLE!s} environment variable."
+            )
+
+        super().__init__(report, output_path, num_threads=1, **kwargs)
+        self._token = token
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(0.1)
+        self._channels = []
+
+    @property
+    def address(self):
+        """
+        The (host, port) address the coordinator is listening to
+        """
+        return self._server.getsockname()[:2]
+
+    def run(self, test_suites):
+        """
+        Run a list of test suites on the workers connecting to the coordinator
+        """
+        if not Path(self._output_path).exists():
+            os.makedirs(self._output_path)
+
+        self._deleter.discard_leftovers()
+        self._create_test_mapping_file(test_suites)
+        num_tests = sum(len(test_suite.test_names) for test_suite in test_suites)
+        self._report.set_expected_num_tests(num_tests)
+
+        scheduler = TestScheduler(test_suites, 0, self._latest_dependency_updates, self._test_history)
+
+        host, port = self.address
+        print(f"Waiting for workers on {host!s}:{port:d}")
+
+        threads = []
+        try:
+            while not (scheduler.is_finished() or self._abort):
+                ostools.PROGRAM_STATUS.check_for_shutdown()
+                try:
+                    sock, _ = self._server.accept()
+                except socket.timeout:
+                    continue
+
+                sock.settimeout(None)
+                channel = Channel(sock)
+                with self._lock:  # pylint: disable=not-context-manager
+                    self._channels.append(channel)
+                new_thread = threading.Thread(
+                    target=self._serve_worker,
+                    args=(channel, scheduler, num_tests, scheduler.add_thread()),
+                )
+                threads.append(new_thread)
+                new_thread.start()
+
+        except KeyboardInterrupt:
+            LOGGER.debug("TestCoordinator: Caught Ctrl-C shutting down")
+            ostools.PROGRAM_STATUS.shutdown()
+            raise
+
+        finally:
+            self._server.close()
+            # Workers which are still connected are idle, closing the connection tells them we are done
+            with self._lock:  # pylint: disable=not-context-manager
+                self._abort = True
+                for channel in self._channels:
+                    channel.close()
+            for thread in threads:
+                thread.join()
+            self._report.set_finish_times(scheduler.get_finish_times())
+            LOGGER.debug("TestCoordinator: Leaving")
+
+    def _serve_worker(self, channel, scheduler, num_tests, thread_id):
+        """
+        Serve test suites to a single worker connection until there are no more tests
+        """
+        try:
+            hello = channel.receive()
+            if hello is None:
+                return
+            if (self._token is not None) and not hmac.compare_digest(
+                str(hello.get("token") or "").encode("utf-8"), self._token.encode("utf-8")
+            ):
+                with self._stdout_lock():
+                    print(f"Rejected worker {hello.get('name', '')!s} with an invalid token")
+                channel.send({"type": "error", "message": "Rejected by the coordinator, invalid token"})
+                return
+
+            with self._stdout_lock():
+                print(f"Worker {hello.get('name', '')!s} connected")
+
+            while True:
+                if channel.receive() is None:
+                    return
+
+                try:
+                    with self._lock:  # pylint: disable=not-context-manager
+                        if self._abort:
+                            raise StopIteration
+                    test_suite = scheduler.next(thread_id)
+                except StopIteration:
+                    channel.send({"type": "done"})
+                    return
+
+                try:
+                    self._run_remote_test_suite(channel, test_suite, num_tests, hello.get("name", ""))
+                finally:
+                    scheduler.test_done(thread_id)
+
+        except (OSError, ValueError, KeyError, KeyboardInterrupt) as exc:
+            LOGGER.debug("TestCoordinator: Lost worker connection: %s", exc)
+
+        finally:
+            channel.close()
+
+    def _run_remote_test_suite(self, channel, test_suite, num_tests, worker_name):  # pylint: disable=too-many-locals
+        """
+        Let a worker run the test suite and add the results to the report
+        """
+        output_path = self._get_output_path(test_suite.name)
+        output_file_name = str(Path(output_path) / "output.txt")
+
+        with self._stdout_lock():
+            for test_name in test_suite.test_names:
+                now = datetime.now().strftime("%H:%M:%S")
+                print(f"({now}) Starting {test_name!s} on {worker_name!s}")
+            print(f"Output file: {output_file_name!s}")
+
+        start_time = ostools.get_time()
+        results = self._fail_suite(test_suite)
+        runtime = None
+        seed = None
+        peak_memory = None
+        try:
+            channel.send({"type": "run", "test_suite": test_suite.name, "output_path": output_path})
+            reply = channel.receive()
+            if reply is None:
+                raise OSError("Connection closed by worker")
+
+            if reply.get("error") is not None:
+                _write_output(output_path, reply["error"], deleter=self._deleter)
+            else:
+                results.update((name, STATUSES[status]) for name, status in reply["results"].items() if name in results)
+                runtime = reply["time"]
+                seed = reply["seed"]
+                peak_memory = reply.get("peak_memory")
+                if reply["archive"]:
+                    _receive_archive(channel, output_path, deleter=self._deleter)
+        except (OSError, ValueError, KeyError) as exc:
+            _write_output(
+                output_path,
+                f"Lost connection to worker {worker_name!s} while running test suite: {exc}",
+                deleter=self._deleter,
+            )
+            raise
+        finally:
+            self._add_remote_results(
+                test_suite, results, start_time, runtime, seed, num_tests, output_file_name, peak_memory=peak_memory
+            )
+
+    def _add_remote_results(
+        self, test_suite, results, start_time, runtime, seed, num_tests, output_file_name, *, peak_memory=None
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """
+        Add the results reported by a worker to the test report
+        """
+        if runtime is None:
+            runtime = ostools.get_time() - start_time
+        time_per_test = runtime / len(results)
+        any_not_passed = any(value != PASSED for value in results.values())
+
+        with self._lock:  # pylint: disable=not-context-manager
+            if any_not_passed and not self._is_quiet or self._is_verbose:
+                color_output_file_name = Path(output_file_name).parent / "output_with_color.txt"
+                if color_output_file_name.exists():
+                    self._print_output(color_output_file_name)
+                elif Path(output_file_name).exists():
+                    self._print_output(output_file_name)
+
+            for test_name in test_suite.test_names:
+                self._report.add_result(
+                    test_name,
+                    results[test_name],
+                    time_per_test,
+                    output_file_name,
+                    test_suite_name=test_suite.name,
+                    start_time=start_time,
+                    seed=seed,
+                    peak_memory=peak_memory,
+                )
+                self._report.print_latest_status(total_tests=num_tests)
+            print()
+
+            if self._fail_fast and any_not_passed:
+                self._abort = True
+
+
+class TestWorker(TestRunner):
+    """
+    Run test suites handed out by a remote :class:`.TestCoordinator`
+
+    The worker must have the same test suites as the coordinator, typically by executing the same
+    ``run.py`` script, and have access to the compiled libraries. Each of the ``num_threads`` threads
+    has its own connection to the coordinator.
+    """
+
+    def __init__(self, report, output_path, address, *, token=None, connect_timeout=600.0, **kwargs):
+        super().__init__(report, output_path, **kwargs)
+        self._address = address
+        self._token = token
+        self._connect_timeout = connect_timeout
+        self._channels = []
+
+    def connect(self):
+        """
+        Connect to the coordinator, retrying until it accepts connections or the timeout expires
+        """
+        name = f"{socket.gethostname()!s}:{os.getpid():d}"
+        deadline = time.monotonic() + self._connect_timeout
+        while len(self._channels) < self._num_threads:
+            ostools.PROGRAM_STATUS.check_for_shutdown()
+            try:
+                sock = socket.create_connection(self._address)
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+                continue
+
+            channel = Channel(sock)
+            channel.send({"type": "hello", "name": f"{name!s}/{len(self._channels):d}", "token": self._token})
+            self._channels.append(channel)
+
+    def _create_scheduler(self, test_suites):
+        if not self._channels:
+            self.connect()
+        return _WorkerScheduler(self, self._channels, test_suites)
+
+    def run(self, test_suites):
+        try:
+            super().run(test_suites)
+        finally:
+            for channel in self._channels:
+                channel.close()
+            self._channels = []
+
+    def get_results(self, test_suite):
+        """
+        Return the results of a test suite which has been run by this worker
+        """
+        results = {}
+        for test_name in test_suite.test_names:
+            if self._report.has_test(test_name):
+                results[test_name] = self._report.result_of(test_name).to_dict()
+            else:
+                results[test_name] = {"status": FAILED.name, "time": 0.0}
+        return results
+
+    def get_output_path(self, test_suite_name):
+        """
+        Return the output path of a test suite
+        """
+        return self._get_output_path(test_suite_name)
+
+
+class _WorkerScheduler(object):
+    """
+    Scheduler for a :class:`.TestWorker` which gets the next test suite from the coordinator
+    """
+
+    def __init__(self, worker, channels, test_suites):
+        self._worker = worker
+        self._channels = channels
+        self._test_suites = {test_suite.name: test_suite for test_suite in test_suites}
+        self._current = {}
+
+    def next(self, thread_id):
+        """
+        Return the next test suite to run
+        """
+        ostools.PROGRAM_STATUS.check_for_shutdown()
+        channel = self._channels[thread_id]
+
+        try:
+            while True:
+                channel.send({"type": "request"})
+                message = channel.receive()
+                if (message is not None) and (message["type"] == "error"):
+                    LOGGER.error(message["message"])
+                if (message is None) or (message["type"] != "run"):
+                    raise StopIteration
+
+                test_suite = self._test_suites.get(message["test_suite"], None)
+                if test_suite is not None:
+                    self._current[thread_id] = (test_suite, message["output_path"])
+                    return test_suite
+
+                channel.send(
+                    {
+                        "type": "result",
+                        "error": f"Worker does not have a test suite named {message['test_suite']!s}",
+                    }
+                )
+        except (OSError, ValueError) as exc:
+            LOGGER.debug("TestWorker: Lost connection to coordinator: %s", exc)
+            raise StopIteration from exc
+
+    @staticmethod
+    def get_finish_times():
+        """
+        The test suites are scheduled by the coordinator which keeps track of their finish times
+        """
+        return {}
+
+    def test_done(self, thread_id):
+        """
+        Send the results of the test suite back to the coordinator
+        """
+        test_suite, remote_output_path = self._current.pop(thread_id)
+        results = self._worker.get_results(test_suite)
+        output_path = self._worker.get_output_path(test_suite.name)
+
+        # The coordinator sees the output files directly when they are on a shared file system
+        same_path = Path(output_path).resolve() == Path(remote_output_path).resolve()
+        message = {
+            "type": "result",
+            "results": {name: result["status"] for name, result in results.items()},
+            "time": sum(result["time"] for result in results.values()),
+            "seed": test_suite.get_seed(),
+            "archive": not same_path,
+            "peak_memory": max(
+                (result["peak_memory"] for result in results.values() if result.get("peak_memory") is not None),
+                default=None,
+            ),
+        }
+
+        try:
+            self._channels[thread_id].send(message)
+            if not same_path:
+                _send_archive(self._channels[thread_id], output_path)
+        except OSError as exc:
+            LOGGER.debug("TestWorker: Lost connection to coordinator: %s", exc)
+
+    @staticmethod
+    def is_finished():
+        return True
+
+    def wait_for_finish(self):
+        pass
+
+
+def _send_archive(channel, path):
+    """
+    Send a zip archive with the contents of a directory in messages of at most ARCHIVE_CHUNK_SIZE bytes
+
+    The archive is created in a temporary file such that the size of the test output does not affect
+    the memory usage.
+    """
+    with tempfile.TemporaryFile() as fptr:
+        with zipfile.ZipFile(fptr, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for file_name in sorted(Path(path).rglob("*")):
+                if file_name.is_file():
+                    archive.write(file_name, file_name.relative_to(path).as_posix())
+
+        fptr.seek(0)
+        for chunk in iter(lambda: fptr.read(ARCHIVE_CHUNK_SIZE), b""):
+            channel.send({"type": "archive", "data": base64.b64encode(chunk).decode("ascii")})
+    channel.send({"type": "archive", "data": None})
+
+
+def _receive_archive(channel, path, deleter=None):
+    """
+    Receive a zip archive sent by _send_archive and replace the contents of a directory with it
+
+    With a BackgroundDeleter the old contents of the directory are deleted in the background.
+    """
+    with tempfile.TemporaryFile() as fptr:
+        while True:
+            message = channel.receive()
+            if message is None:
+                raise OSError("Connection closed by worker")
+            if message["data"] is None:
+                break
+            fptr.write(base64.b64decode(message["data"]))
+
+        ostools.renew_path(path, deleter=deleter)
+        with zipfile.ZipFile(fptr) as archive:
+            archive.extractall(path)
+
+
+def _write_output(path, text, deleter=None):
+    """
+    Create a test suite output directory with an output file
+    """
+    ostools.renew_path(path, deleter=deleter)
+    ostools.write_file(str(Path(path) / "output.txt"), text + "\n")
@@ -0,0 +1,127 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Model the execution time of tests from the test history
+"""
+
+# Weight of the latest execution time in the exponentially weighted moving average of a test
+DURATION_EWMA_WEIGHT = 0.3
+
+# Number of recent execution times of a test kept for the percentiles
+DURATION_NUM_SAMPLES = 20
+
+
+def update_duration_model(duration_model, exec_time):
+    """
+    Return the duration model of a test updated with a new execution time
+
+    The model keeps an exponentially weighted moving average of the execution time and the most recent
+    execution times from which percentiles are calculated.
+    """
+    if not duration_model:
+        return {"ewma": exec_time, "samples": [exec_time]}
+
+    return {
+        "ewma": DURATION_EWMA_WEIGHT * exec_time + (1 - DURATION_EWMA_WEIGHT) * duration_model["ewma"],
+        "samples": (duration_model["samples"] + [exec_time])[-DURATION_NUM_SAMPLES:],
+    }
+
+
+def get_test_duration(test_data, percentile=None):
+    """
+    Return the expected execution time of a test from its history or None if unknown
+
+    The moving average is returned unless a percentile of the recent execution times is requested.
+    Histories without a duration model fall back to the latest execution time. Skipped tests never
+    completed and are not used.
+    """
+    if test_data["skipped"]:
+        return None
+
+    duration_model = test_data.get("duration", None)
+    if not duration_model:
+        return test_data["total_time"]
+
+    if percentile is None:
+        return duration_model["ewma"]
+
+    samples = sorted(duration_model["samples"])
+    return samples[min(len(samples) - 1, (len(samples) * percentile) // 100)]
+
+
+def _get_test_bench_name(test_name):
+    """
+    Return the library and test bench part of a test name
+    """
+    return ".".join(test_name.split(".", 2)[:2])
+
+
+def _get_base_test_name(test_name):
+    """
+    Return the name of a test without library, test bench and configuration
+    """
+    return test_name.rsplit(".", 1)[-1]
+
+
+class ExecTimeEstimator(object):
+    """
+    Estimate the execution time of test suites from the test history
+
+    Tests without a history are estimated from the same test in other configurations of the test bench,
+    from the other tests of the test bench or from the mean of all tests, in that order.
+    """
+
+    def __init__(self, test_history, percentile=None):
+        self._test_durations = {}
+        test_bench_durations = {}
+        base_test_durations = {}
+        for test_suite_data in test_history.values():
+            for test_name, test_data in test_suite_data.items():
+                duration = get_test_duration(test_data, percentile)
+                if duration is None:
+                    continue
+
+                self._test_durations[test_name] = duration
+                test_bench_name = _get_test_bench_name(test_name)
+                test_bench_durations.setdefault(test_bench_name, []).append(duration)
+                base_test_durations.setdefault((test_bench_name, _get_base_test_name(test_name)), []).append(duration)
+
+        self._test_bench_durations = {name: _mean(durations) for name, durations in test_bench_durations.items()}
+        self._base_test_durations = {key: _mean(durations) for key, durations in base_test_durations.items()}
+        self._default_duration = _mean(self._test_durations.values()) if self._test_durations else None
+
+    def test_exec_time(self, test_name):
+        """
+        Return the expected execution time of a test or None if there is no history to base it on
+        """
+        duration = self._test_durations.get(test_name, None)
+        if duration is not None:
+            return duration
+
+        test_bench_name = _get_test_bench_name(test_name)
+        duration = self._base_test_durations.get((test_bench_name, _get_base_test_name(test_name)), None)
+        if duration is not None:
+            return duration
+
+        return self._test_bench_durations.get(test_bench_name, self._default_duration)
+
+    def exec_time(self, test_suite):
+        """
+        Return the expected execution time of a test suite or None if there is no history to base it on
+        """
+        exec_time = 0
+        for test_name in test_suite.test_names:
+            test_exec_time = self.test_exec_time(test_name)
+            if test_exec_time is None:
+                return None
+            exec_time += test_exec_time
+        return exec_time
+
+
+def _mean(values):
+    values = list(values)
+    return sum(values) / len(values)
@@ -0,0 +1,253 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test impact analysis based on the content hashes of design units
+"""
+
+from ..hashing import hash_string
+from ..ostools import read_file
+from ..parsing.encodings import HDL_FILE_ENCODING
+from .bench import split_test_cases
+
+_SECONDARY_UNIT_TYPES = ("architecture", "package body")
+
+
+class TestImpactAnalysis(object):  # pylint: disable=too-many-instance-attributes
+    """
+    Computes a digest of the code each test suite depends on
+
+    The code of the VHDL files is split into design units which are hashed separately and the
+    dependencies of each design unit are found from its own context clause, entity and component
+    instantiations. Other files, and VHDL files which could not be parsed, are treated as a single unit
+    depending on everything the file depends on. A reference which cannot be resolved to a design unit
+    makes the design unit depend on everything its file depends on such that no change is missed.
+
+    The digest of a test suite covers all design units the test bench depends on directly or
+    indirectly. Optionally the code of the test bench is further split into the code of each test
+    case and the code common to all test cases such that a test suite only depends on the code of
+    its own test cases.
+    """
+
+    def __init__(self, project, dependency_graph):
+        """
+        :param dependency_graph: The dependency graph of the project files including implementation dependencies
+        """
+        self._hashes = {}
+        self._dependencies = {}
+        self._units_of_file = {}
+        self._units_of_primary = {}
+        self._file_of_unit = {}
+        self._source_files = {}
+        self._closures = {}
+        self._test_bench_code = {}
+        self._library_names = set(library.name.lower() for library in project.get_libraries())
+        self._create_graph(project.get_source_files_in_order(), dependency_graph)
+
+    @staticmethod
+    def _is_split(source_file):
+        return source_file.is_vhdl and bool(source_file.design_unit_sections)
+
+    def _create_graph(self, source_files, dependency_graph):
+        """
+        Create the design units and their dependencies
+        """
+        for source_file in source_files:
+            self._source_files[source_file.name] = source_file
+            if self._is_split(source_file):
+                self._add_vhdl_design_units(source_file)
+            else:
+                self._add_file_unit(source_file)
+
+        for source_file in source_files:
+            dependency_files = dependency_graph.get_direct_dependencies(source_file) - {source_file}
+            if self._is_split(source_file):
+                self._add_vhdl_dependencies(source_file, dependency_files)
+            else:
+                for unit in self._units_of_file[source_file]:
+                    self._dependencies[unit] = self._units_of_files(dependency_files)
+
+    def _add_unit(self, source_file, unit, unit_hash):
+        self._hashes[unit] = unit_hash
+        self._file_of_unit[unit] = source_file
+        self._units_of_file.setdefault(source_file, []).append(unit)
+
+    def _add_vhdl_design_units(self, source_file):
+        """
+        Add one unit for each design unit section of the VHDL file
+        """
+        library_name = source_file.library.name.lower()
+        for section in source_file.design_unit_sections:
+            unit = self._vhdl_unit_name(library_name, section)
+            self._add_unit(source_file, unit, source_file.hash_with_compile_options(section.code_hash))
+
+            if section.unit_type in _SECONDARY_UNIT_TYPES:
+                primary_identifier = section.primary_identifier
+            else:
+                primary_identifier = section.identifier
+            self._units_of_primary.setdefault((library_name, primary_identifier), []).append(unit)
+
+    @staticmethod
+    def _vhdl_unit_name(library_name, section):
+        """
+        Return the unique name of the design unit of a section
+        """
+        if section.unit_type == "architecture":
+            return f"{library_name!s}.{section.primary_identifier!s}({section.identifier!s})"
+
+        if section.unit_type == "package body":
+            return f"{library_name!s}.{section.identifier!s} body"
+
+        return f"{library_name!s}.{section.identifier!s}"
+
+    def _add_file_unit(self, source_file):
+        """
+        Add a single unit for the whole file
+        """
+        self._add_unit(source_file, source_file.name, source_file.content_hash)
+        library_name = source_file.library.name.lower()
+        for design_unit in source_file.design_units:
+            key = (library_name, design_unit.name.lower())
+            if source_file.name not in self._units_of_primary.get(key, []):
+                self._units_of_primary.setdefault(key, []).append(source_file.name)
+
+    def _units_of_files(self, source_files):
+        return set(unit for source_file in source_files for unit in self._units_of_file[source_file])
+
+    def _add_vhdl_dependencies(self, source_file, dependency_files):
+        """
+        Add the dependencies of the design units in a VHDL file
+        """
+        library_name = source_file.library.name.lower()
+        resolved = {}
+        for section, unit in zip(source_file.design_unit_sections, self._units_of_file[source_file]):
+            resolved[unit] = self._resolve(library_name, section)
+
+        resolved_files = set(
+            self._file_of_unit[dependency] for dependencies, _ in resolved.values() for dependency in dependencies
+        )
+
+        # Dependencies not found from the design units themselves, for example manual dependencies
+        unresolved_dependencies = self._units_of_files(dependency_files - resolved_files)
+        all_dependencies = self._units_of_files(dependency_files)
+
+        for unit, (dependencies, complete) in resolved.items():
+            self._dependencies[unit] = dependencies | (unresolved_dependencies if complete else all_dependencies)
+
+    def _resolve(self, library_name, section):
+        """
+        Return the units the design unit section depends on and False if some reference could not be resolved
+        """
+        dependencies = set()
+        complete = True
+
+        if section.unit_type in _SECONDARY_UNIT_TYPES:
+            dependencies.update(
+                unit
+                for unit in self._units_of_primary.get((library_name, section.primary_identifier), [])
+                if unit == f"{library_name!s}.{section.primary_identifier!s}"
+            )
+        elif section.unit_type == "configuration":
+            dependencies.update(self._units_of_primary.get((library_name, section.primary_identifier), []))
+
+        for ref in section.references:
+            ref_library_name = library_name if ref.library == "work" else ref.library
+            if ref_library_name not in self._library_names:
+                # Built-in or external libraries are not part of the project
+                continue
+
+            units = self._units_of_primary.get((ref_library_name, ref.design_unit))
+            if units is None:
+                complete = False
+                continue
+
+            if ref.is_entity_reference() and ref.name_within not in (None, "all"):
+                architecture = f"{ref_library_name!s}.{ref.design_unit!s}({ref.name_within!s})"
+                entity = f"{ref_library_name!s}.{ref.design_unit!s}"
+                units = [unit for unit in units if unit in (entity, architecture)] or units
+
+            dependencies.update(units)
+
+        for component in section.component_instantiations:
+            units = self._units_of_primary.get((library_name, component))
+            if units is None:
+                complete = False
+            else:
+                dependencies.update(units)
+
+        return dependencies, complete
+
+    def _closure(self, units):
+        """
+        Return the units and all units they depend on directly or indirectly
+        """
+        if units not in self._closures:
+            closure = set(units)
+            remaining = list(units)
+            while remaining:
+                for dependency in self._dependencies[remaining.pop()]:
+                    if dependency not in closure:
+                        closure.add(dependency)
+                        remaining.append(dependency)
+            self._closures[units] = closure
+        return self._closures[units]
+
+    def digest(self, test_suite, split_test_bench=False):
+        """
+        Return a digest of the code the test suite depends on or None if the test bench is unknown
+
+        :param split_test_bench: Only include the code of the test bench common to all test cases
+                                 and the code of the test cases within the test suite
+        """
+        # All tests of a test suite share the configuration
+        config = next(iter(test_suite.test_configuration.values()))
+        library_name = config.library_name.lower()
+        units = self._units_of_primary.get((library_name, config.design_unit_name.lower()))
+        if units is None:
+            return None
+
+        units = set(units)
+        if config.vhdl_configuration_name is not None:
+            configuration_units = self._units_of_primary.get((library_name, config.vhdl_configuration_name.lower()))
+            if configuration_units is None:
+                return None
+            units.update(configuration_units)
+
+        hashes = {unit: self._hashes[unit] for unit in self._closure(frozenset(units))}
+        if split_test_bench:
+            self._split_test_bench(hashes, test_suite)
+
+        return hash_string(repr(sorted(hashes.items())))
+
+    def _split_test_bench(self, hashes, test_suite):
+        """
+        Replace the hashes of the units in the test bench file with the hash of the code common to all
+        test cases and the hashes of the code of the test cases within the test suite
+        """
+        source_file = self._source_files.get(test_suite.file_name)
+        if source_file is None:
+            return
+
+        if source_file.name not in self._test_bench_code:
+            code = read_file(source_file.name, encoding=HDL_FILE_ENCODING, newline="")
+            self._test_bench_code[source_file.name] = split_test_cases(code, source_file.name)
+        common_code, test_case_code = self._test_bench_code[source_file.name]
+
+        for unit in self._units_of_file[source_file]:
+            hashes.pop(unit, None)
+
+        hashes[source_file.name] = source_file.hash_with_compile_options(_hash_code(common_code))
+
+        for test in test_suite.test_information.values():
+            if test.name in test_case_code:
+                hashes[f"{source_file.name!s}:{test.name!s}"] = _hash_code(test_case_code[test.name])
+
+
+def _hash_code(code):
+    """
+    Hash code with normalized whitespace
+    """
+    return hash_string(" ".join(code.split()))
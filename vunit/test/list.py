@@ -8,8 +8,6 @@
 Functionality to handle lists of test suites and filtering of them
 """
 
-from .report import PASSED, FAILED
-
 
 class TestList(object):
     """
@@ -35,6 +33,16 @@ class TestList(object):
         """
         self._test_suites = [test for test in self._test_suites if test.keep_matches(test_filter)]
 
+    def keep_shard(self, shard_idx, num_shards, test_history):
+        """
+        Keep only the test suites of one of num_shards shards with near-equal expected execution time
+
+        :param shard_idx: The index of the shard to keep starting at zero
+        """
+        from .runner import create_shards  # pylint: disable=import-outside-toplevel
+
+        self._test_suites = create_shards(self._test_suites, num_shards, test_history)[shard_idx]
+
     @property
     def num_tests(self):
         """
@@ -102,6 +110,8 @@ class TestSuiteWrapper(object):
         """
         Run the test suite and return the test results for all test cases
         """
+        from .report import PASSED, FAILED  # pylint: disable=import-outside-toplevel
+
         test_ok = self._test_case.run(*args, **kwargs)
         return {self._test_case.name: PASSED if test_ok else FAILED}
 
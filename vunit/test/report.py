@@ -10,6 +10,7 @@ Provide test reporting functionality
 
 
 from xml.etree import ElementTree
+from xml.sax.saxutils import quoteattr
 import os
 import socket
 import re
@@ -61,10 +62,14 @@ class TestReport(object):
     Collect reports from running testcases
     """
 
-    def __init__(self, printer=COLOR_PRINTER):
+    def __init__(self, printer=COLOR_PRINTER, junit_xml_writer=None):
+        """
+        :param junit_xml_writer: Optional :class:`JUnitXmlWriter` streaming the results as they are added
+        """
         self._test_results = {}
         self._test_names_in_order = []
         self._printer = printer
+        self._junit_xml_writer = junit_xml_writer
         self._real_total_time = 0.0
         self._expected_num_tests = 0
 
@@ -80,6 +85,18 @@ class TestReport(object):
         """
         self._expected_num_tests = expected_num_tests
 
+    def set_finish_times(self, finish_times):
+        """
+        Set the predicted and actual finish times of the tests from the finish times of their test suites
+
+        :param finish_times: Dictionary mapping test suite names to dictionaries with the predicted and actual
+                             finish times relative to the start of the test run
+        """
+        for result in self._test_results.values():
+            if result.test_suite_name in finish_times:
+                result.predicted_finish_time = finish_times[result.test_suite_name]["predicted"]
+                result.finish_time = finish_times[result.test_suite_name]["actual"]
+
     def num_tests(self):
         """
         Return the number of tests in the report
@@ -93,6 +110,15 @@ class TestReport(object):
         result = TestResult(*args, **kwargs)
         self._test_results[result.name] = result
         self._test_names_in_order.append(result.name)
+        if self._junit_xml_writer is not None:
+            self._junit_xml_writer.write_result(result)
+
+    def finalize_junit_xml(self):
+        """
+        Finalize the streamed junit xml file, if any, with the results added so far
+        """
+        if self._junit_xml_writer is not None:
+            self._junit_xml_writer.finalize()
 
     def _last_test_result(self):
         """
@@ -129,7 +155,8 @@ class TestReport(object):
         args.append(f"F={len(failed):d}")
         args.append(f"T={total_tests:d}")
 
-        self._printer.write(f" ({' '.join(args)!s}) {result.name!s} ({get_parsed_time(result.time)})\n")
+        timed_out = ", timed out" if result.timed_out else ""
+        self._printer.write(f" ({' '.join(args)!s}) {result.name!s} ({get_parsed_time(result.time)}{timed_out!s})\n")
 
     def all_ok(self):
         """
@@ -184,6 +211,7 @@ class TestReport(object):
         total_time = sum((result.time for result in self._test_results.values()))
         self._printer.write(f"Total time was {get_parsed_time(total_time)}\n")
         self._printer.write(f"Elapsed time was {get_parsed_time(self._real_total_time)}\n")
+        self._print_finish_times(all_tests)
 
         self._printer.write(("=" * (max(max_len + 25, 0))) + "\n")
 
@@ -204,6 +232,20 @@ class TestReport(object):
             )
             self._printer.write("\n")
 
+    def _print_finish_times(self, all_tests):
+        """
+        Print the predicted and actual finish time of the last test to measure the quality of the scheduling
+        """
+        predicted_finish_times = [
+            result.predicted_finish_time for result in all_tests if result.predicted_finish_time is not None
+        ]
+        finish_times = [result.finish_time for result in all_tests if result.finish_time is not None]
+        if predicted_finish_times and finish_times:
+            self._printer.write(
+                f"Predicted test finish time was {get_parsed_time(max(predicted_finish_times))}"
+                f" (actual {get_parsed_time(max(finish_times))})\n"
+            )
+
     def _split(self):
         """
         Split the test cases into passed and failures
@@ -228,12 +270,7 @@ class TestReport(object):
         _, failures, skipped = self._split()
 
         root = ElementTree.Element("testsuite")
-        root.attrib["name"] = "testsuite"
-        root.attrib["errors"] = "0"
-        root.attrib["failures"] = str(len(failures))
-        root.attrib["skipped"] = str(len(skipped))
-        root.attrib["tests"] = str(len(self._test_results))
-        root.attrib["hostname"] = socket.gethostname()
+        root.attrib.update(_testsuite_attributes(len(failures), len(skipped), len(self._test_results)))
 
         for result in self._test_results_in_order():
             root.append(result.to_xml(xunit_xml_format))
@@ -245,6 +282,103 @@ class TestReport(object):
         return iter(self._test_results.values())
 
 
+def _testsuite_attributes(num_failures, num_skipped, num_tests):
+    """
+    Return the attributes of the junit xml testsuite element
+    """
+    return {
+        "name": "testsuite",
+        "errors": "0",
+        "failures": str(num_failures),
+        "skipped": str(num_skipped),
+        "tests": str(num_tests),
+        "hostname": socket.gethostname(),
+    }
+
+
+class JUnitXmlWriter(object):  # pylint: disable=too-many-instance-attributes
+    """
+    Stream test results to a junit xml file
+
+    The xml file is created with a testsuite element when the writer is created, replacing any report of a
+    previous run. Each test case is written to the file as soon as its result is known, followed by the end
+    tag of the testsuite element, and the file is flushed such that it is a complete report of the tests run
+    so far if the run is killed. The start tag is padded to a fixed size such that it can be rewritten in
+    place with the updated test counts.
+    """
+
+    # Number of characters reserved in the start tag for the digits of the test counts
+    _COUNT_DIGITS = 30
+
+    def __init__(self, file_name, xunit_xml_format="jenkins", max_output_size=None):
+        """
+        :param max_output_size: Limit the output of each test to its last max_output_size bytes
+        """
+        self._file_name = str(file_name)
+        self._xunit_xml_format = xunit_xml_format
+        self._max_output_size = max_output_size
+        self._num_tests = 0
+        self._num_failures = 0
+        self._num_skipped = 0
+        Path(self._file_name).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._file_name, "w+b")  # pylint: disable=consider-using-with
+        self._start_tag_size = len(self._start_tag()) + self._COUNT_DIGITS
+        self._write_start_tag()
+        self._end = self._file.tell()
+        self._write_end_tag()
+
+    def _start_tag(self):
+        """
+        Return the start tag of the testsuite element with the current test counts
+        """
+        attributes = _testsuite_attributes(self._num_failures, self._num_skipped, self._num_tests)
+        return (
+            "<testsuite " + " ".join(f"{name}={quoteattr(value)}" for name, value in attributes.items()) + ">"
+        ).encode("utf-8")
+
+    def _write_start_tag(self):
+        """
+        Write the start tag at the beginning of the file padded to the reserved size
+        """
+        start_tag = self._start_tag()
+        self._file.seek(0)
+        self._file.write(start_tag[:-1] + b" " * (self._start_tag_size - len(start_tag)) + b">")
+
+    def _write_end_tag(self):
+        """
+        Write the end tag after the last test case and flush the file
+        """
+        self._file.seek(self._end)
+        self._file.write(b"</testsuite>")
+        self._file.flush()
+
+    def write_result(self, result):
+        """
+        Write the test case of a test result
+        """
+        xml = result.to_xml(self._xunit_xml_format, max_output_size=self._max_output_size)
+        self._file.seek(self._end)
+        self._file.write(ElementTree.tostring(xml, encoding="utf-8", xml_declaration=False))
+        self._end = self._file.tell()
+
+        self._num_tests += 1
+        if result.failed:
+            self._num_failures += 1
+        elif result.skipped:
+            self._num_skipped += 1
+
+        self._write_start_tag()
+        self._write_end_tag()
+
+    def finalize(self):
+        """
+        Close the xml file with the test cases written so far
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+
+
 class TestStatus(object):
     """
     The status of a test
@@ -267,17 +401,20 @@ class TestStatus(object):
 PASSED = TestStatus("passed")
 SKIPPED = TestStatus("skipped")
 FAILED = TestStatus("failed")
+# A failed test which was killed by the test runner when its wall-clock timeout expired
+TIMED_OUT = TestStatus("timed_out")
+STATUSES = {status.name: status for status in (PASSED, SKIPPED, FAILED, TIMED_OUT)}
 
 
-class TestResult(object):
+class TestResult(object):  # pylint: disable=too-many-instance-attributes
     """
     Represents the result of a single test case
     """
 
     def __init__(
-        self, name, status, time, output_file_name, *, test_suite_name, start_time, seed
+        self, name, status, time, output_file_name, *, test_suite_name, start_time, seed, peak_memory=None
     ):  # pylint: disable=too-many-arguments
-        assert status in (PASSED, FAILED, SKIPPED)
+        assert status in (PASSED, FAILED, SKIPPED, TIMED_OUT)
         self.name = name
         self._status = status
         self.time = time
@@ -285,18 +422,41 @@ class TestResult(object):
         self.test_suite_name = test_suite_name
         self.start_time = start_time
         self.seed = seed
+        self.peak_memory = peak_memory
+        self.predicted_finish_time = None
+        self.finish_time = None
 
     @property
     def output(self):
         """
         Return test output
         """
+        return self.get_output()
+
+    def get_output(self, max_size=None):
+        """
+        Return test output, optionally limited to its last max_size bytes
+        """
         file_exists = os.path.isfile(self._output_file_name)
         is_readable = os.access(self._output_file_name, os.R_OK)
-        if file_exists and is_readable:
+        if not (file_exists and is_readable):
+            return f"Failed to read output file: {self._output_file_name!s}"
+
+        if max_size is None:
             return read_file(self._output_file_name)
 
-        return f"Failed to read output file: {self._output_file_name!s}"
+        with Path(self._output_file_name).open("rb") as fread:
+            size = fread.seek(0, os.SEEK_END)
+            if size <= max_size:
+                return read_file(self._output_file_name)
+            fread.seek(size - max_size)
+            data = fread.read()
+
+        # Skip the partial first line
+        data = data[data.find(b"\n") + 1 :]
+        return f"(Output truncated to the last {len(data):d} bytes, see {self._output_file_name!s})\n" + data.decode(
+            "utf-8", errors="ignore"
+        ).replace("\r\n", "\n")
 
     @property
     def passed(self):
@@ -308,7 +468,11 @@ class TestResult(object):
 
     @property
     def failed(self):
-        return self._status == FAILED
+        return self._status in (FAILED, TIMED_OUT)
+
+    @property
+    def timed_out(self):
+        return self._status == TIMED_OUT
 
     def print_status(self, printer, padding=0, max_time=0):
         """
@@ -326,11 +490,14 @@ class TestResult(object):
 
         my_padding = max(padding - len(self.name), 0)
 
-        printer.write(f"{self.name + (' ' * my_padding)} ({get_parsed_time(self.time, max_time)})\n")
+        timed_out = ", timed out" if self.timed_out else ""
+        printer.write(f"{self.name + (' ' * my_padding)} ({get_parsed_time(self.time, max_time)}{timed_out!s})\n")
 
-    def to_xml(self, xunit_xml_format):
+    def to_xml(self, xunit_xml_format, max_output_size=None):
         """
         Convert the test result to ElementTree XML object
+
+        :param max_output_size: Limit the output to its last max_output_size bytes
         """
         test = ElementTree.Element("testcase")
         match = re.search(r"(.+)\.([^.]+)$", self.name)
@@ -343,11 +510,11 @@ class TestResult(object):
 
         # By default the output is stored in system-out
         system_out = ElementTree.SubElement(test, "system-out")
-        system_out.text = self.output
+        system_out.text = self.get_output(max_output_size)
 
         if self.failed:
             failure = ElementTree.SubElement(test, "failure")
-            failure.attrib["message"] = "Failed"
+            failure.attrib["message"] = "Timed out" if self.timed_out else "Failed"
 
             # Store output under <failure> if the 'bamboo' format is specified
             if xunit_xml_format == "bamboo":
@@ -367,4 +534,7 @@ class TestResult(object):
             "status": self._status.name,
             "time": self.time,
             "path": str(Path(self._output_file_name).parent),
+            "predicted_finish_time": self.predicted_finish_time,
+            "finish_time": self.finish_time,
+            "peak_memory": self.peak_memory,
         }
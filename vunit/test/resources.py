@@ -0,0 +1,97 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Resources used by test suites and the budget of resources available to the tests running in parallel
+
+Resources are dictionaries mapping resource names to amounts. The CPU weight is named ``cpu``, the memory
+in MB is named ``memory`` and each license token class is named ``license.<class>``. A resource missing
+from a budget is unlimited.
+"""
+
+# Allowed rounding error when fractional CPU weights are added and subtracted
+_TOLERANCE = 1e-9
+
+
+def create_resource_budget(cpu=None, memory=None, licenses=None):
+    """
+    Return a resource budget
+
+    :param cpu: The total CPU weight of the tests running in parallel
+    :param memory: The total memory in MB of the tests running in parallel
+    :param licenses: Dictionary mapping license token classes to the number of available tokens
+    """
+    budget = {}
+    if cpu is not None:
+        budget["cpu"] = cpu
+    if memory is not None:
+        budget["memory"] = memory
+    for license_class, num_tokens in ({} if licenses is None else licenses).items():
+        budget[f"license.{license_class!s}"] = num_tokens
+    return budget
+
+
+def get_resource_demand(test_suite, test_history):
+    """
+    Return the resources used by a test suite
+
+    The demand is taken from the resources sim options of the test suite. The memory is the largest of the
+    memory estimate and the peak memory measured for the tests of the test suite in the test history.
+    """
+    demand = {"cpu": 1, "memory": 0}
+    for config in test_suite.test_configuration.values():
+        sim_options = config.sim_options
+        demand["cpu"] = max(demand["cpu"], sim_options.get("resources.cpu", 1))
+        demand["memory"] = max(demand["memory"], sim_options.get("resources.memory", 0))
+        if sim_options.get("resources.license") is not None:
+            demand[f"license.{sim_options['resources.license']!s}"] = 1
+
+    test_suite_data = test_history.get(test_suite.name, {})
+    for test_name in test_suite.test_names:
+        peak_memory = test_suite_data.get(test_name, {}).get("peak_memory")
+        if peak_memory is not None:
+            demand["memory"] = max(demand["memory"], peak_memory)
+
+    return demand
+
+
+def fit_to_budget(demand, budget):
+    """
+    Return the demand limited by the budget such that a test suite demanding more than the budget can be
+    run when no other test suite is running
+    """
+    return {name: min(amount, budget[name]) if name in budget else amount for name, amount in demand.items()}
+
+
+def fits(demand, available):
+    """
+    Return True if the demand fits within the available resources
+
+    A demand of nothing always fits, also when the available amount is negative due to a reservation.
+    """
+    return all(
+        (amount <= 0) or (amount <= available[name] + _TOLERANCE)
+        for name, amount in demand.items()
+        if name in available
+    )
+
+
+def subtract(available, demand):
+    """
+    Subtract a demand from the available resources in place
+    """
+    for name, amount in demand.items():
+        if name in available:
+            available[name] -= amount
+
+
+def add(available, demand):
+    """
+    Add a demand to the available resources in place
+    """
+    for name, amount in demand.items():
+        if name in available:
+            available[name] += amount
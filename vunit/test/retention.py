@@ -0,0 +1,142 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Retention policy of the test output directories
+
+Without a policy the output directory of every test suite ever run is kept until the test suite is run again.
+"""
+
+import json
+import os
+from pathlib import Path
+
+# File in the test output path with the names of the output directories used by the latest runs
+RUN_HISTORY_FILE_NAME = "run_history.json"
+
+# Maximum number of runs in the run history
+MAX_RUN_HISTORY = 100
+
+
+class RetentionPolicy(object):
+    """
+    Decide which test output directories to keep after a run
+
+    :param keep: "all" keeps the output of all tests and "failed" only keeps the output of failed tests
+    :param max_runs: Only keep the output of test suites run in the last max_runs runs
+    :param max_size: Discard the oldest test output until the total size is at most max_size bytes
+    """
+
+    KEEP_CHOICES = ("all", "failed")
+
+    def __init__(self, keep="all", max_runs=None, max_size=None):
+        assert keep in self.KEEP_CHOICES
+        self._keep = keep
+        self._max_runs = max_runs
+        self._max_size = max_size
+
+    def apply(self, output_path, report, deleter):
+        """
+        Discard the test output directories which are not retained by the policy after the run of the report
+
+        The directories are handed to the deleter. Returns the discarded paths.
+        """
+        output_path = Path(output_path)
+        run_history = _update_run_history(output_path, report)
+        output_paths = [path for path in output_path.iterdir() if path.is_dir() and not path.name.startswith(".")]
+        discarded = set()
+
+        if self._keep == "failed":
+            names = _names_without_failures(report)
+            discarded.update(path for path in output_paths if path.name in names)
+
+        if self._max_runs is not None:
+            retained_names = set().union(*run_history[-self._max_runs :])
+            discarded.update(path for path in output_paths if path.name not in retained_names)
+
+        if self._max_size is not None:
+            discarded.update(self._paths_above_size_cap(output_paths, discarded, run_history))
+
+        for path in sorted(discarded):
+            deleter.discard(path)
+
+        return sorted(discarded)
+
+    def _paths_above_size_cap(self, output_paths, discarded, run_history):
+        """
+        Return the oldest of the remaining paths until the total size of the rest is within the size cap
+
+        The age is given by the latest run using a path, paths not used by any recorded run being the oldest.
+        """
+        latest_run = {}
+        for run_index, names in enumerate(run_history):
+            for name in names:
+                latest_run[name] = run_index
+
+        remaining = sorted(
+            (path for path in output_paths if path not in discarded),
+            key=lambda path: (latest_run.get(path.name, -1), path.stat().st_mtime),
+        )
+        sizes = {path: _get_size(path) for path in remaining}
+        total_size = sum(sizes.values())
+
+        result = []
+        for path in remaining:
+            if total_size <= self._max_size:
+                break
+            result.append(path)
+            total_size -= sizes[path]
+        return result
+
+
+def _names_without_failures(report):
+    """
+    Return the names of the output directories of the report where no test failed
+    """
+    failed = set()
+    names = set()
+    for result in report:
+        name = Path(result.to_dict()["path"]).name
+        names.add(name)
+        if result.failed:
+            failed.add(name)
+    return names - failed
+
+
+def _update_run_history(output_path, report):
+    """
+    Add the output directories used by the report to the run history and return the history, oldest run first
+    """
+    file_name = output_path / RUN_HISTORY_FILE_NAME
+    try:
+        with file_name.open("r", encoding="utf-8") as fptr:
+            run_history = [set(names) for names in json.load(fptr)]
+    except (OSError, ValueError, TypeError):
+        run_history = []
+
+    run_history.append({Path(result.to_dict()["path"]).name for result in report})
+    run_history = run_history[-MAX_RUN_HISTORY:]
+
+    temp_file_name = output_path / f"{RUN_HISTORY_FILE_NAME!s}.{os.getpid():d}.tmp"
+    with temp_file_name.open("w", encoding="utf-8") as fptr:
+        json.dump([sorted(names) for names in run_history], fptr)
+    os.replace(temp_file_name, file_name)
+
+    return run_history
+
+
+def _get_size(path):
+    """
+    Return the total size in bytes of the files in a directory tree
+    """
+    size = 0
+    for dir_name, _, file_names in os.walk(path):
+        for file_name in file_names:
+            try:
+                size += os.lstat(os.path.join(dir_name, file_name)).st_size
+            except OSError:
+                pass
+    return size
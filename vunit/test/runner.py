@@ -4,11 +4,18 @@
 #
 # Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
 
+# pylint: disable=too-many-lines
+
 """
 Provided functionality to run a suite of test in a robust way
 """
 
 import os
+import re
+import codecs
+import heapq
+import multiprocessing
+from collections import deque
 from multiprocessing import cpu_count
 from pathlib import Path
 import traceback
@@ -21,10 +28,23 @@ from datetime import datetime
 from contextlib import contextmanager
 from .. import ostools
 from ..hashing import hash_string
-from .report import PASSED, FAILED, SKIPPED
+from . import resources
+from .duration import ExecTimeEstimator
+from .resources import fit_to_budget, get_resource_demand
+from .report import PASSED, FAILED, SKIPPED, TIMED_OUT, STATUSES
+from .timeout import get_timeout
 
 LOGGER = logging.getLogger(__name__)
 
+# Maximum number of bytes of test output displayed on failure
+OUTPUT_TAIL_SIZE = 1 << 20
+
+# Percentile of the execution time used when the risk of delaying a test is estimated
+PESSIMISTIC_PERCENTILE = 90
+
+# Directory in the output path where old test output is moved before it is deleted in the background
+TRASH_PATH = ".trash"
+
 
 class TestRunner(object):  # pylint: disable=too-many-instance-attributes
     """
@@ -35,6 +55,8 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
     VERBOSITY_NORMAL = 1
     VERBOSITY_VERBOSE = 2
 
+    BACKENDS = ("thread", "process")
+
     def __init__(  # pylint: disable=too-many-arguments
         self,
         report,
@@ -47,6 +69,11 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
         no_color=False,
         latest_dependency_updates=None,
         test_history=None,
+        backend="thread",
+        resource_budget=None,
+        deleter=None,
+        timeout=None,
+        timeout_factor=None,
     ):
         self._lock = threading.Lock()
         self._fail_fast = fail_fast
@@ -68,6 +95,24 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
         self._no_color = no_color
         self._latest_dependency_updates = {} if latest_dependency_updates is None else latest_dependency_updates
         self._test_history = {} if test_history is None else test_history
+        assert backend in self.BACKENDS
+        if backend == "process" and "fork" not in multiprocessing.get_all_start_methods():
+            LOGGER.warning("The process runner backend requires fork support. Using the thread backend.")
+            backend = "thread"
+        self._backend = backend
+
+        # The CPU weight of the tests running in parallel is limited by the number of threads by default
+        self._resource_budget = None
+        if resource_budget is not None:
+            self._resource_budget = dict(resource_budget)
+            self._resource_budget.setdefault("cpu", self._num_threads)
+
+        # The default wall-clock timeout of a test suite and the factor of the historic execution time used instead
+        self._timeout = timeout
+        self._timeout_factor = timeout_factor
+
+        # Old test output is deleted in the background such that the workers never wait for the file system
+        self._deleter = ostools.BackgroundDeleter(Path(output_path) / TRASH_PATH) if deleter is None else deleter
 
         ostools.PROGRAM_STATUS.reset()
 
@@ -101,9 +146,10 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
 
         self._report.set_expected_num_tests(num_tests)
 
-        scheduler = TestScheduler(test_suites, self._num_threads, self._latest_dependency_updates, self._test_history)
+        scheduler = self._create_scheduler(test_suites)
 
         threads = []
+        worker_processes = []
 
         # Disable continuous output in parallel mode
         write_stdout = self._is_verbose and self._num_threads == 1
@@ -112,18 +158,38 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             sys.stdout = ThreadLocalOutput(self._local, self._stdout)
             sys.stderr = ThreadLocalOutput(self._local, self._stdout)
 
+            # Fork the worker processes before any worker or deletion thread is started, see _WorkerProcess
+            if self._backend == "process":
+                with self._deleter.paused():
+                    worker_processes = [
+                        _WorkerProcess(self, test_suites, write_stdout) for _ in range(self._num_threads)
+                    ]
+
+            self._deleter.discard_leftovers()
+
             # Start P-1 worker threads
             for thread_id in range(1, self._num_threads):
                 new_thread = threading.Thread(
                     target=self._run_thread,
                     args=(write_stdout, scheduler, num_tests),
-                    kwargs={"is_main": False, "thread_id": thread_id},
+                    kwargs={
+                        "is_main": False,
+                        "thread_id": thread_id,
+                        "worker_process": worker_processes[thread_id] if worker_processes else None,
+                    },
                 )
                 threads.append(new_thread)
                 new_thread.start()
 
             # Run one worker in main thread such that P=1 is not multithreaded
-            self._run_thread(write_stdout, scheduler, num_tests, is_main=True, thread_id=0)
+            self._run_thread(
+                write_stdout,
+                scheduler,
+                num_tests,
+                is_main=True,
+                thread_id=0,
+                worker_process=worker_processes[0] if worker_processes else None,
+            )
 
             scheduler.wait_for_finish()
 
@@ -136,13 +202,34 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             for thread in threads:
                 thread.join()
 
+            for worker_process in worker_processes:
+                worker_process.close()
+
+            self._report.set_finish_times(scheduler.get_finish_times())
             sys.stdout = self._stdout
             sys.stderr = self._stderr
             LOGGER.debug("TestRunner: Leaving")
 
-    def _run_thread(self, write_stdout, scheduler, num_tests, *, is_main, thread_id):
+    def _create_scheduler(self, test_suites):
+        """
+        Create the scheduler deciding the order in which the test suites are run
+        """
+        return TestScheduler(
+            test_suites,
+            self._num_threads,
+            self._latest_dependency_updates,
+            self._test_history,
+            resource_budget=self._resource_budget,
+        )
+
+    def _run_thread(
+        self, write_stdout, scheduler, num_tests, *, is_main, thread_id, worker_process=None
+    ):  # pylint: disable=too-many-arguments
         """
         Run worker thread
+
+        With a worker process the test suites are run by the process and the thread only adds the results
+        to the report.
         """
         self._local.output = self._stdout
 
@@ -160,7 +247,7 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
                         print(f"({now}) Starting {test_name!s}")
                     print(f"Output file: {output_file_name!s}")
 
-                self._run_test_suite(test_suite, write_stdout, num_tests, output_path, output_file_name)
+                self._run_test_suite(test_suite, write_stdout, num_tests, output_path, output_file_name, worker_process)
 
             except StopIteration:
                 return
@@ -199,62 +286,82 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
         return str(Path(output_path) / full_name)
 
     def _add_skipped_tests(
-        self, test_suite, results, start_time, num_tests, output_file_name
-    ):  # pylint: disable=too-many-positional-arguments
+        self, test_suite, results, start_time, num_tests, output_file_name, seed=None
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
         """
         Add skipped tests
         """
         for name in test_suite.test_names:
             results[name] = SKIPPED
-        self._add_results(test_suite, results, start_time, num_tests, output_file_name)
+        self._add_results(test_suite, results, start_time, num_tests, output_file_name, seed)
 
-    def _run_test_suite(  # pylint: disable=too-many-locals
-        self, test_suite, write_stdout, num_tests, output_path, output_file_name
-    ):  # pylint: disable=too-many-positional-arguments
+    def _run_test_suite(
+        self, test_suite, write_stdout, num_tests, output_path, output_file_name, worker_process=None
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
         """
         Run the actual test suite
         """
         color_output_file_name = str(Path(output_path) / "output_with_color.txt")
+        start_time = ostools.get_time()
 
-        output_file = None
-        color_output_file = None
+        if (worker_process is not None) and worker_process.is_alive():
+            results, seed, interrupted, output_tail, peak_memory = worker_process.run_test_suite(
+                test_suite, output_path, output_file_name, color_output_file_name
+            )
+        else:
+            results, interrupted, output_tail, peak_memory = self._simulate_test_suite(
+                test_suite, write_stdout, output_path, output_file_name, color_output_file_name
+            )
+            seed = None
 
-        start_time = ostools.get_time()
+        if interrupted:
+            self._add_skipped_tests(test_suite, results, start_time, num_tests, output_file_name, seed)
+            raise KeyboardInterrupt
+
+        any_not_passed = any(value != PASSED for value in results.values())
+
+        with self._stdout_lock():
+            if (
+                (not write_stdout)
+                and (output_tail is not None)
+                and (any_not_passed or self._is_verbose)
+                and not self._is_quiet
+            ):
+                self._print_output_tail(*output_tail, output_file_name)
+
+            self._add_results(test_suite, results, start_time, num_tests, output_file_name, seed, peak_memory)
+
+            if self._fail_fast and any_not_passed:
+                self._abort = True
+
+    def _simulate_test_suite(
+        self, test_suite, write_stdout, output_path, output_file_name, color_output_file_name
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """
+        Simulate the test suite with its output captured to the output files
+
+        Returns the results, whether the simulation was interrupted, the tail of the output and the peak
+        memory usage in MB of the simulator processes or None if unknown
+        """
+        output = None
         results = self._fail_suite(test_suite)
+        interrupted = False
+        ostools.PEAK_MEMORY.reset()
+        timeout = get_timeout(test_suite, self._test_history, self._timeout, self._timeout_factor)
 
         try:
             self._prepare_test_suite_output_path(output_path)
-            output_file = wrap(
-                Path(output_file_name).open("a+", encoding="utf-8"),  # pylint: disable=consider-using-with
-                use_color=False,
+            output = OutputCapture(
+                color_output_file_name,
+                output_file_name,
+                echo=self._stdout_ansi if write_stdout else None,
             )
-            output_file.seek(0)
-            output_file.truncate()
-
-            if write_stdout:
-                output_from = self._stdout_ansi
-            else:
-                color_output_file = Path(color_output_file_name).open(  # pylint: disable=consider-using-with
-                    "w", encoding="utf-8"
-                )
-                output_from = color_output_file
-            self._local.output = Tee([output_from, output_file])
-
-            def read_output():
-                """
-                Called to read the contents of the output file on demand
-                """
-                output_file.flush()
-                prev = output_file.tell()
-                output_file.seek(0)
-                contents = output_file.read()
-                output_file.seek(prev)
-                return contents
-
-            results = test_suite.run(output_path=output_path, read_output=read_output)
-        except KeyboardInterrupt as exk:
-            self._add_skipped_tests(test_suite, results, start_time, num_tests, output_file_name)
-            raise KeyboardInterrupt from exk
+            self._local.output = output
+            # The simulator processes are killed when the deadline passes while waiting for them
+            ostools.DEADLINE.set(timeout)
+            results = test_suite.run(output_path=output_path, read_output=output.read)
+        except KeyboardInterrupt:
+            interrupted = True
         except:  # pylint: disable=bare-except
             if self._dont_catch_exceptions:
                 raise
@@ -262,29 +369,62 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             with self._stdout_lock():
                 traceback.print_exc()
         finally:
+            if ostools.DEADLINE.expired:
+                print(f"Test suite {test_suite.name!s} timed out after {timeout:g} s and was killed")
+                results = {name: TIMED_OUT if status == FAILED else status for name, status in results.items()}
+            ostools.DEADLINE.set(None)
             self._local.output = self._stdout
 
-            for fptr in (ptr for ptr in [output_file, color_output_file] if ptr is not None):
-                fptr.flush()
-                fptr.close()
+            if output is not None:
+                output.close()
 
-        any_not_passed = any(value != PASSED for value in results.values())
+        return results, interrupted, output.tail() if output is not None else None, ostools.PEAK_MEMORY.get()
 
-        with self._stdout_lock():
-            if (color_output_file is not None) and (any_not_passed or self._is_verbose) and not self._is_quiet:
-                self._print_output(color_output_file_name)
+    def run_in_worker_process(self, connection, test_suites, write_stdout):
+        """
+        Main loop of a worker process. Run the test suites requested by the parent process
+        and send back the results.
+        """
+        # The deletion thread of the parent process is not inherited
+        self._deleter = ostools.BackgroundDeleter(Path(self._output_path) / TRASH_PATH)
 
-            self._add_results(test_suite, results, start_time, num_tests, output_file_name)
+        try:
+            while True:
+                request = connection.recv()
+                if request is None:
+                    return
+
+                index, output_path, output_file_name, color_output_file_name = request
+                test_suite = test_suites[index]
+                results, interrupted, output_tail, peak_memory = self._simulate_test_suite(
+                    test_suite, write_stdout, output_path, output_file_name, color_output_file_name
+                )
 
-            if self._fail_fast and any_not_passed:
-                self._abort = True
+                # The tail is only displayed for failing tests unless verbose
+                if all(value == PASSED for value in results.values()) and not self._is_verbose:
+                    output_tail = None
+
+                connection.send(
+                    (
+                        {name: status.name for name, status in results.items()},
+                        test_suite.get_seed(),
+                        interrupted,
+                        output_tail,
+                        peak_memory,
+                    )
+                )
 
-    @staticmethod
-    def _prepare_test_suite_output_path(output_path):
+                if interrupted:
+                    return
+        except (KeyboardInterrupt, EOFError):
+            return
+
+    def _prepare_test_suite_output_path(self, output_path):
         """
         Make sure the directory exists and is empty before running test.
+        The old contents are deleted in the background.
         """
-        ostools.renew_path(output_path)
+        ostools.renew_path(output_path, deleter=self._deleter)
 
     def _create_test_mapping_file(self, test_suites):
         """
@@ -297,7 +437,11 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
         # even when re-running only a single test case
         if mapping_file_name.exists():
             with mapping_file_name.open("r", encoding="utf-8") as fptr:
-                mapping = set(fptr.read().splitlines())
+                mapping = {
+                    value
+                    for value in fptr.read().splitlines()
+                    if (Path(self._output_path) / value.split(" ", 1)[0]).exists()
+                }
         else:
             mapping = set()
 
@@ -314,21 +458,33 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
 
     def _print_output(self, output_file_name):
         """
-        Print contents of output file if it exists
+        Print the contents of an output file, limited to its last OUTPUT_TAIL_SIZE bytes
         """
-        with Path(output_file_name).open("r", encoding="utf-8") as fread:
-            for line in fread.readlines():
-                self._stdout_ansi.write(line)
+        with Path(output_file_name).open("rb") as fread:
+            size = fread.seek(0, os.SEEK_END)
+            fread.seek(max(0, size - OUTPUT_TAIL_SIZE))
+            self._print_output_tail(fread.read(), size > OUTPUT_TAIL_SIZE, output_file_name)
+
+    def _print_output_tail(self, data, truncated, output_file_name):
+        """
+        Print the tail of the output of a test suite
+        """
+        if truncated:
+            # Skip the partial first line
+            data = data[data.find(b"\n") + 1 :]
+            self._stdout_ansi.write(f"(Output truncated to the last {len(data):d} bytes, see {output_file_name!s})\n")
+        self._stdout_ansi.write(data.decode("utf-8", errors="ignore").replace("\r\n", "\n"))
 
     def _add_results(
-        self, test_suite, results, start_time, num_tests, output_file_name
-    ):  # pylint: disable=too-many-positional-arguments
+        self, test_suite, results, start_time, num_tests, output_file_name, seed=None, peak_memory=None
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
         """
         Add results to test report
         """
         runtime = ostools.get_time() - start_time
         time_per_test = runtime / len(results)
-        seed = test_suite.get_seed()
+        if seed is None:
+            seed = test_suite.get_seed()
 
         for test_name in test_suite.test_names:
             status = results[test_name]
@@ -340,6 +496,7 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
                 test_suite_name=test_suite.name,
                 start_time=start_time,
                 seed=seed,
+                peak_memory=peak_memory,
             )
             self._report.print_latest_status(total_tests=num_tests)
         print()
@@ -364,22 +521,187 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             yield
 
 
-class Tee(object):
+class _WorkerProcess(object):
+    """
+    A forked process running the test suites of one TestRunner thread
+
+    The process inherits the test suites, including any pre_config and post_check callables, when it is
+    forked. Only the index of the test suite to run and the results are sent between the processes.
+
+    Only the forking thread exists in the forked process. Locks held by any other thread at the time of the fork
+    are never released in the forked process, so it must be created while the runner has no other thread running.
+    """
+
+    def __init__(self, runner, test_suites, write_stdout):
+        context = multiprocessing.get_context("fork")
+        self._test_suite_index = {id(test_suite): index for index, test_suite in enumerate(test_suites)}
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(
+            target=runner.run_in_worker_process,
+            args=(child_connection, list(test_suites), write_stdout),
+            daemon=True,
+        )
+        self._process.start()
+        child_connection.close()
+        self._alive = True
+
+    def is_alive(self):
+        return self._alive
+
+    def run_test_suite(self, test_suite, output_path, output_file_name, color_output_file_name):
+        """
+        Run the test suite in the worker process
+
+        Returns the results, the seed, whether it was interrupted, the tail of the output and the peak memory usage
+        """
+        try:
+            self._connection.send(
+                (self._test_suite_index[id(test_suite)], output_path, output_file_name, color_output_file_name)
+            )
+            results, seed, interrupted, output_tail, peak_memory = self._connection.recv()
+        except (EOFError, OSError):
+            self._alive = False
+            self._process.join()
+            print(f"Worker process died with exit code {self._process.exitcode!s} while running {test_suite.name!s}")
+            print("Remaining test suites of this thread are run in the main process")
+            return {name: FAILED for name in test_suite.test_names}, None, False, None, None
+
+        return {name: STATUSES[status] for name, status in results.items()}, seed, interrupted, output_tail, peak_memory
+
+    def close(self):
+        """
+        Stop the worker process
+        """
+        if self._alive:
+            try:
+                self._connection.send(None)
+            except OSError:
+                pass
+        self._connection.close()
+        self._process.join(timeout=10)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+
+
+class OutputCapture(object):  # pylint: disable=too-many-instance-attributes
     """
-    Provide a write method which writes to multiple files
-    like the unix 'tee' command.
+    Capture the output of a test suite
+
+    The output is written unmodified, including ANSI color codes, to the color output file and without
+    color codes to the plain output file. Both files are written as the output arrives such that they can be
+    followed while the test suite runs and are complete up to the last flush if the runner is killed. The last
+    tail_size bytes of the output are kept in memory to be displayed on failure.
+
+    Simulator output can be written in large binary chunks using write_raw, see
+    :meth:`vunit.ostools.Process.consume_output`, which avoids any per line processing.
     """
 
-    def __init__(self, files):
-        self._files = files
+    # Maximum time in seconds output is kept in the file buffers before it is visible to readers of the files
+    _FLUSH_INTERVAL = 1.0
+
+    def __init__(self, color_output_file_name, output_file_name, echo=None, tail_size=None):
+        self._lock = threading.Lock()
+        self._color_output_file_name = color_output_file_name
+        self._color_output_file = Path(color_output_file_name).open("wb")  # pylint: disable=consider-using-with
+        self._output_file_name = output_file_name
+        self._output_file = Path(output_file_name).open(  # pylint: disable=consider-using-with
+            "w", encoding="utf-8", newline=""
+        )
+        self._echo = echo
+        self._size = 0
+        self._flush_time = time.monotonic()
+        self._pending = b""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._tail = deque()
+        self._tail_length = 0
+        self._tail_size = OUTPUT_TAIL_SIZE if tail_size is None else tail_size
 
     def write(self, txt):
-        for ofile in self._files:
-            ofile.write(txt)
+        """
+        Write text output
+        """
+        if self._echo is not None:
+            self._echo.write(txt)
+        self.write_raw(txt.replace("\n", os.linesep).encode("utf-8"))
+
+    def write_raw(self, data):
+        """
+        Write binary output
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._color_output_file.write(data)
+            self._write_plain(data)
+            self._size += len(data)
+            now = time.monotonic()
+            if now - self._flush_time >= self._FLUSH_INTERVAL:
+                self._flush_time = now
+                self._color_output_file.flush()
+                self._output_file.flush()
+            self._tail.append(data)
+            self._tail_length += len(data)
+            while self._tail_length - len(self._tail[0]) >= self._tail_size:
+                self._tail_length -= len(self._tail.popleft())
+
+    def raw_writer(self):
+        """
+        Return the function accepting binary output or None when the output must be written as text
+        """
+        if self._echo is not None:
+            return None
+        return self.write_raw
 
     def flush(self):
-        for ofile in self._files:
-            ofile.flush()
+        """
+        Flush the output files and the echo
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._color_output_file.flush()
+            self._output_file.flush()
+        if self._echo is not None:
+            self._echo.flush()
+
+    def read(self):
+        """
+        Return the plain output written so far
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._output_file.flush()
+        return ostools.read_file(self._output_file_name)
+
+    def tail(self):
+        """
+        Return the tail of the output and whether it is truncated
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            data = b"".join(self._tail)[-self._tail_size :]
+            return data, len(data) < self._size
+
+    def close(self):
+        """
+        Write any incomplete character or escape sequence and close the files
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._output_file.write(self._decoder.decode(self._pending, final=True))
+            self._pending = b""
+            self._color_output_file.close()
+            self._output_file.close()
+
+    def _write_plain(self, data):
+        """
+        Write data without ANSI color codes to the plain output file
+        """
+        data = self._pending + data
+        self._pending = b""
+
+        # Keep an escape sequence which may continue in the next write
+        escape_start = data.rfind(b"\x1b")
+        if (escape_start != -1) and (len(data) - escape_start < 64):
+            if _ANSI_RE.match(data, escape_start) is None:
+                self._pending = data[escape_start:]
+                data = data[:escape_start]
+
+        self._output_file.write(self._decoder.decode(_ANSI_RE.sub(b"", data)))
 
 
 class ThreadLocalOutput(object):
@@ -410,6 +732,15 @@ class ThreadLocalOutput(object):
         else:
             self._stdout.flush()
 
+    def raw_writer(self):
+        """
+        Return a function accepting binary output if the thread local output supports it
+        """
+        output = getattr(self._local, "output", None)
+        if hasattr(output, "raw_writer"):
+            return output.raw_writer()
+        return None
+
 
 class TestScheduler(object):  # pylint: disable=too-many-instance-attributes
     """
@@ -433,27 +764,26 @@ class TestScheduler(object):  # pylint: disable=too-many-instance-attributes
         #
         # Within sets, test suites are sorted in execution time order starting with the fastest test.
         # This is in preparation for the dynamic scheduling that decides the final order within a set.
-        # The exception is set 2 which has no history of execution time.
+        # The execution time of test suites without a history is estimated from similar tests. A set
+        # is left unsorted if there is no history at all to base the estimates on.
 
-        # A test suite set keeps the sorted test suite list as well as the total estimated execution time (if available)
+        # A test suite set keeps the sorted test suite list as well as the total estimated execution time
         # for the test suites within the list.
-        test_suite_sets = [{"test_suites": [], "total_exec_time": 0 if idx != 2 else None} for idx in range(5)]
+        test_suite_sets = [{"test_suites": [], "total_exec_time": 0} for _ in range(5)]
+        estimator = ExecTimeEstimator(self._test_history)
+        pessimistic_estimator = ExecTimeEstimator(self._test_history, percentile=PESSIMISTIC_PERCENTILE)
 
         for test_suite in test_suites:
             test_suite_data = self._test_history.get(test_suite.name, None)
-            if not test_suite_data:
-                test_suite_sets[2]["test_suites"].append({"test_suite": test_suite, "exec_time": None})
-            else:
+            highest_priority_set = 2  # Default set for new test suites
+            if test_suite_data:
                 # Test suites with multiple tests are placed in the set where the highest priority test belongs
                 highest_priority_set = None
-                exec_time = 0
                 for test_name in test_suite.test_names:
                     test_data = test_suite_data.get(test_name, False)
                     set_idx = 2  # Default set for new test suites
 
                     if test_data:
-                        if test_data["total_time"] is not None:
-                            exec_time += test_data["total_time"]
                         updated_dependency = self._latest_dependency_updates[test_suite.file_name] > test_data.get(
                             "start_time", 0
                         )
@@ -469,98 +799,246 @@ class TestScheduler(object):  # pylint: disable=too-many-instance-attributes
                         min(highest_priority_set, set_idx) if highest_priority_set is not None else set_idx
                     )
 
-                test_suite_sets[highest_priority_set]["test_suites"].append(
-                    {"test_suite": test_suite, "exec_time": exec_time}
-                )
-                if highest_priority_set != 2:
-                    test_suite_sets[highest_priority_set]["total_exec_time"] += exec_time
+            exec_time = estimator.exec_time(test_suite)
+            test_suite_sets[highest_priority_set]["test_suites"].append(
+                {
+                    "test_suite": test_suite,
+                    "exec_time": exec_time,
+                    "pessimistic_exec_time": pessimistic_estimator.exec_time(test_suite),
+                    "resources": (
+                        None
+                        if self._resource_budget is None
+                        else fit_to_budget(get_resource_demand(test_suite, self._test_history), self._resource_budget)
+                    ),
+                }
+            )
+            if exec_time is not None:
+                test_suite_sets[highest_priority_set]["total_exec_time"] += exec_time
 
-        for set_idx, test_suite_set in enumerate(test_suite_sets):
-            if set_idx == 2:
-                continue
-            test_suite_set["test_suites"].sort(key=lambda item: item["exec_time"])
+        for test_suite_set in test_suite_sets:
+            if all(item["exec_time"] is not None for item in test_suite_set["test_suites"]):
+                test_suite_set["test_suites"].sort(key=lambda item: item["exec_time"])
 
         return test_suite_sets
 
-    def __init__(self, test_suites, num_threads, latest_dependency_updates, test_history):
+    def __init__(
+        self, test_suites, num_threads, latest_dependency_updates, test_history, resource_budget=None
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """
+        :param resource_budget: The resources available to the test suites running in parallel,
+                                see :mod:`vunit.test.resources`. None if only limited by the number of threads.
+        """
         self._num_threads = num_threads
         self._latest_dependency_updates = latest_dependency_updates
         self._test_history = test_history
+        self._resource_budget = resource_budget
+        self._available_resources = None if resource_budget is None else dict(resource_budget)
         self._test_suite_sets = self._create_test_suite_sets(test_suites)
-        self._lock = threading.Lock()
+        self._lock = threading.Condition()
         self._num_tests = sum(len(test_suite_set["test_suites"]) for test_suite_set in self._test_suite_sets)
         self._num_done = 0
-        self._thread_status = [{"start_time": None, "exec_time": None} for _ in range(num_threads)]
+        self._thread_status = [self._idle_thread_status() for _ in range(num_threads)]
+        self._start_time = None
+        self._finish_times = {}
 
         # Estimate remaing test time
         self._exec_time_for_remaining_tests = sum(
-            test_suite_set["total_exec_time"]
-            for test_suite_set in self._test_suite_sets
-            if test_suite_set["total_exec_time"]
+            test_suite_set["total_exec_time"] for test_suite_set in self._test_suite_sets
         )
 
+    @staticmethod
+    def _idle_thread_status():
+        return {"start_time": None, "exec_time": None, "test_suite_name": None, "resources": None}
+
     def next(self, thread_id):
         """
         Return the next test
+
+        Blocks while the resources needed by the remaining test suites are used by running test suites
         """
         ostools.PROGRAM_STATUS.check_for_shutdown()
         with self._lock:  # pylint: disable=not-context-manager
-            # Get the first non-empty test suite set or raise StopIteration
-            test_suite_set = next((tss for tss in self._test_suite_sets if tss["test_suites"]))
-
-            # Estimate remaining execution time for threads
             now = time.time()
-            remaining_exec_time_for_threads = []
-            for idx, status in enumerate(self._thread_status):
-                if (idx == thread_id) or not (status["start_time"] and status["exec_time"]):
-                    remaining_exec_time_for_threads.append(0)
-                else:
-                    remaining_exec_time_for_threads.append(max(0, status["start_time"] + status["exec_time"] - now))
-
-            # Estimate time to completion for all threads assuming perfect load-balancing
-            time_to_completion = (
-                sum(remaining_exec_time_for_threads) + self._exec_time_for_remaining_tests
-            ) / self._num_threads
-
-            # Assuming the shortest test is picked, when is the next thread available
-            test_suites = test_suite_set["test_suites"]
-            remaining_exec_time_for_threads[thread_id] = (
-                test_suites[0]["exec_time"] if test_suites[0]["exec_time"] is not None else 0
-            )
-            time_to_next_thread_completion = (
-                min(remaining_exec_time_for_threads) if remaining_exec_time_for_threads else None
-            )
-
-            # Select the longest test if delaying it would risk exceeding the ideal time to completion.
-            longest_test_exec_time = test_suites[-1]["exec_time"]
+            if self._start_time is None:
+                self._start_time = now
 
-            if (longest_test_exec_time is not None) and (
-                (time_to_completion <= longest_test_exec_time)
-                or (
-                    (time_to_next_thread_completion is not None)
-                    and (time_to_completion - time_to_next_thread_completion < longest_test_exec_time)
-                )
-            ):
-                test_suite_data = test_suites.pop(-1)  # Pick the longest test
-            else:
-                test_suite_data = test_suites.pop(0)  # Pick the fastest test
+            test_suite_data = self._pick(thread_id, now)
+            while test_suite_data is None:
+                self._lock.wait(timeout=0.05)
+                ostools.PROGRAM_STATUS.check_for_shutdown()
+                now = time.time()
+                test_suite_data = self._pick(thread_id, now)
 
             # Update execution tracking
             exec_time = test_suite_data["exec_time"]
+            test_suite_name = test_suite_data["test_suite"].name
             if exec_time:
                 self._exec_time_for_remaining_tests -= exec_time
-            self._thread_status[thread_id].update(exec_time=exec_time, start_time=now)
+            if test_suite_data["resources"] is not None:
+                resources.subtract(self._available_resources, test_suite_data["resources"])
+            self._thread_status[thread_id].update(
+                exec_time=exec_time,
+                start_time=now,
+                test_suite_name=test_suite_name,
+                resources=test_suite_data["resources"],
+            )
+            self._finish_times[test_suite_name] = {
+                "predicted": None if exec_time is None else now - self._start_time + exec_time,
+                "actual": None,
+            }
 
             return test_suite_data["test_suite"]
 
+    def _pick(self, thread_id, now):
+        """
+        Remove and return the next test suite to run or None if the resources it needs are in use
+
+        Raises StopIteration when there are no test suites left
+        """
+        # Get the first non-empty test suite set or raise StopIteration
+        test_suite_set = next((tss for tss in self._test_suite_sets if tss["test_suites"]))
+
+        # Estimate remaining execution time for threads
+        remaining_exec_time_for_threads = []
+        for idx, status in enumerate(self._thread_status):
+            if (idx == thread_id) or not (status["start_time"] and status["exec_time"]):
+                remaining_exec_time_for_threads.append(0)
+            else:
+                remaining_exec_time_for_threads.append(max(0, status["start_time"] + status["exec_time"] - now))
+
+        # Estimate time to completion for all threads assuming perfect load-balancing
+        time_to_completion = (
+            sum(remaining_exec_time_for_threads) + self._exec_time_for_remaining_tests
+        ) / self._num_threads
+
+        # Assuming the shortest test is picked, when is the next thread available
+        test_suites = test_suite_set["test_suites"]
+        remaining_exec_time_for_threads[thread_id] = (
+            test_suites[0]["exec_time"] if test_suites[0]["exec_time"] is not None else 0
+        )
+        time_to_next_thread_completion = (
+            min(remaining_exec_time_for_threads) if remaining_exec_time_for_threads else None
+        )
+
+        # Select the longest test if delaying it would risk exceeding the ideal time to completion. The risk
+        # is judged from a pessimistic estimate since a long test which runs late is what extends the
+        # total execution time.
+        longest_test_exec_time = test_suites[-1]["pessimistic_exec_time"]
+
+        pick_longest = (longest_test_exec_time is not None) and (
+            (time_to_completion <= longest_test_exec_time)
+            or (
+                (time_to_next_thread_completion is not None)
+                and (time_to_completion - time_to_next_thread_completion < longest_test_exec_time)
+            )
+        )
+
+        if self._available_resources is None:
+            return test_suites.pop(-1 if pick_longest else 0)
+
+        return self._pick_within_budget(test_suite_set, pick_longest, now)
+
+    def _pick_within_budget(self, first_test_suite_set, pick_longest, now):
+        """
+        Remove and return the first test suite in priority order which fits within the available resources
+        or None if there is no such test suite
+
+        The first test suite which does not fit reserves the resources it needs such that it is not starved by
+        smaller test suites using the resources as soon as they are released. Other test suites are only picked
+        if they fit in what remains after the reservation or are expected to finish before the running test
+        suites are expected to have released enough resources for the reserved test suite.
+        """
+
+        def candidates():
+            longest = len(first_test_suite_set["test_suites"]) - 1 if pick_longest else None
+            if longest is not None:
+                yield first_test_suite_set["test_suites"], longest
+
+            for test_suite_set in self._test_suite_sets:
+                for idx in range(len(test_suite_set["test_suites"])):
+                    if not ((test_suite_set is first_test_suite_set) and (idx == longest)):
+                        yield test_suite_set["test_suites"], idx
+
+        reservation = None
+        for test_suites, idx in candidates():
+            test_suite_data = test_suites[idx]
+            if not resources.fits(test_suite_data["resources"], self._available_resources):
+                if reservation is None:
+                    reservation = self._reserve(test_suite_data["resources"], now)
+                continue
+
+            if reservation is None:
+                return test_suites.pop(idx)
+
+            remaining, reserved_start_time = reservation
+            exec_time = test_suite_data["exec_time"]
+            if resources.fits(test_suite_data["resources"], remaining) or (
+                (exec_time is not None) and (now + exec_time <= reserved_start_time)
+            ):
+                return test_suites.pop(idx)
+
+        return None
+
+    def _reserve(self, demand, now):
+        """
+        Reserve resources for a test suite which does not fit within the available resources
+
+        Returns what remains of the available resources after the reservation and the time when enough resources
+        are expected to have been released by the running test suites for the reserved test suite to start
+        """
+        remaining = dict(self._available_resources)
+        resources.subtract(remaining, demand)
+
+        released = dict(self._available_resources)
+        reserved_start_time = float("inf")
+        running = sorted(
+            (
+                (status["start_time"] + status["exec_time"], status["resources"])
+                for status in self._thread_status
+                if status["resources"] is not None and status["exec_time"] is not None
+            ),
+            key=lambda item: item[0],
+        )
+        for finish_time, running_demand in running:
+            resources.add(released, running_demand)
+            if resources.fits(demand, released):
+                reserved_start_time = max(now, finish_time)
+                break
+
+        return remaining, reserved_start_time
+
+    def add_thread(self):
+        """
+        Add a thread, for example a remote worker, that can request tests and return its thread id
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._thread_status.append(self._idle_thread_status())
+            self._num_threads += 1
+            return self._num_threads - 1
+
     def test_done(self, thread_id):
         """
         Signal that a test has been done
         """
         with self._lock:  # pylint: disable=not-context-manager
-            self._thread_status[thread_id]["start_time"] = None
-            self._thread_status[thread_id]["exec_time"] = None
+            test_suite_name = self._thread_status[thread_id]["test_suite_name"]
+            if test_suite_name is not None:
+                self._finish_times[test_suite_name]["actual"] = time.time() - self._start_time
+            if self._thread_status[thread_id]["resources"] is not None:
+                resources.add(self._available_resources, self._thread_status[thread_id]["resources"])
+            self._thread_status[thread_id] = self._idle_thread_status()
             self._num_done += 1
+            self._lock.notify_all()
+
+    def get_finish_times(self):
+        """
+        Return the predicted and actual finish time of each started test suite relative to the start of the first
+
+        The predicted finish time is the start time plus the expected execution time of the test suite and is None
+        if there was no history to base the estimate on. The actual finish time is None until the test suite is done.
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            return {name: dict(finish_times) for name, finish_times in self._finish_times.items()}
 
     def is_finished(self):
         with self._lock:  # pylint: disable=not-context-manager
@@ -574,6 +1052,38 @@ class TestScheduler(object):  # pylint: disable=too-many-instance-attributes
             time.sleep(0.05)
 
 
+# The ANSI escape sequences stripped by colorama
+_ANSI_RE = re.compile(rb"\x01?\x1b(?:\[[0-9;]*[a-zA-Z]|\][^\x07]*\x07)\x02?")
+
+
+def create_shards(test_suites, num_shards, test_history):
+    """
+    Partition the test suites into num_shards lists with near-equal total expected execution time
+
+    The longest processing time first heuristic is used. Test suites are assigned in order of decreasing
+    expected execution time to the shard with the least total time so far. Test suites without history
+    are estimated from similar tests, see :class:`ExecTimeEstimator`. The partitioning only depends on
+    the test suite names and the test history. Within a shard, the original test suite order is kept.
+    """
+    estimator = ExecTimeEstimator(test_history)
+    exec_times = {test_suite.name: estimator.exec_time(test_suite) for test_suite in test_suites}
+    for name, exec_time in exec_times.items():
+        if exec_time is None:
+            exec_times[name] = 1.0
+
+    loads = [(0.0, shard_idx) for shard_idx in range(num_shards)]
+    shard_of = {}
+    for name in sorted(exec_times, key=lambda name: (-exec_times[name], name)):
+        load, shard_idx = heapq.heappop(loads)
+        heapq.heappush(loads, (load + exec_times[name], shard_idx))
+        shard_of[name] = shard_idx
+
+    shards = [[] for _ in range(num_shards)]
+    for test_suite in test_suites:
+        shards[shard_of[test_suite.name]].append(test_suite)
+    return shards
+
+
 LEGAL_CHARS = string.printable
 ILLEGAL_CHARS = ' <>"|:*%?\\/#&;()'
 
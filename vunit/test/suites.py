@@ -125,6 +125,13 @@ class SameSimTestSuite(object):
     def test_names(self):
         return [_full_name(self._name, test.name) for test in self._tests]
 
+    @property
+    def test_configuration(self):
+        """
+        Returns a dictionary mapping full test name to test configuration
+        """
+        return {_full_name(self._name, test.name): self._configuration for test in self._tests}
+
     @property
     def test_information(self):
         """
@@ -0,0 +1,46 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Wall-clock timeouts of test suites enforced by the test runner
+
+The timeouts catch simulators hanging outside of simulation time, for example during elaboration or while
+waiting for a license, where a watchdog in the test bench has no effect.
+"""
+
+from .duration import get_test_duration
+
+# Lower limit in seconds of a timeout derived from the test history such that fast tests are not timed out
+# by variations in the simulator startup time
+MIN_HISTORY_TIMEOUT = 60.0
+
+
+def get_timeout(test_suite, test_history, default=None, factor=None):
+    """
+    Return the wall-clock timeout in seconds of a test suite or None if unlimited
+
+    The timeout is the largest timeout sim option of the test suite. Without sim option and with a factor the
+    timeout is the factor times the execution time of the test suite in the test history, but at least
+    MIN_HISTORY_TIMEOUT. Otherwise the default timeout is used.
+    """
+    timeouts = [
+        config.sim_options["timeout"]
+        for config in test_suite.test_configuration.values()
+        if config.sim_options.get("timeout") is not None
+    ]
+    if timeouts:
+        return max(timeouts)
+
+    if factor is not None:
+        test_suite_data = test_history.get(test_suite.name, {})
+        durations = [
+            get_test_duration(test_suite_data[test_name]) if test_name in test_suite_data else None
+            for test_name in test_suite.test_names
+        ]
+        if durations and None not in durations:
+            return max(factor * sum(durations), MIN_HISTORY_TIMEOUT)
+
+    return default
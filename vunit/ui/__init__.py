@@ -10,36 +10,31 @@
 Public VUnit User Interface (UI)
 """
 
-import csv
 import sys
 import traceback
 import logging
 import json
 import os
-import ast
 import pickle
 from typing import Optional, Set, Union, Iterable
 from pathlib import Path
 from fnmatch import fnmatch
-from glob import glob
 
 from ..database import PickledDataBase, DataBase
 from .. import ostools
 from ..vunit_cli import VUnitCLI
 from ..sim_if.factory import SIMULATOR_FACTORY
 from ..sim_if import SimulatorInterface
+from ..sim_if.toolchain_cache import ToolchainCache
 from ..color_printer import COLOR_PRINTER, NO_COLOR_PRINTER
 
 from ..project import Project
 from ..exceptions import CompileError
-from ..location_preprocessor import LocationPreprocessor
-from ..check_preprocessor import CheckPreprocessor
+from ..ostools import FileWatcher
 from ..parsing.encodings import HDL_FILE_ENCODING
 from ..builtins import Builtins
 from ..vhdl_standard import VHDL, VHDLStandard
 from ..test.bench_list import TestBenchList
-from ..test.report import TestReport
-from ..test.runner import TestRunner
 from ..test.list import TestList
 from ..dependency_graph import CircularDependencyException
 
@@ -146,11 +141,17 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
         else:
             self._printer = COLOR_PRINTER
 
+        self._test_patterns = args.test_patterns
         self._test_filter = self._make_test_filter(args, args.test_patterns)
         self._vhdl_standard: VHDLStandard = select_vhdl_standard(vhdl_standard)
 
         self._preprocessors = []  # type: ignore
+        # Preprocessed file name to the preprocessors used to create it
+        self._preprocessors_of_file = {}  # type: ignore
 
+        self._toolchain_cache = ToolchainCache()
+        self._toolchain_cache.load(Path(self._output_path) / "toolchain_cache.json", refresh=args.refresh_toolchains)
+        self._toolchain_cache.activate()
         self._simulator_class = SIMULATOR_FACTORY.select_simulator()
 
         # Use default simulator options if no simulator was present
@@ -162,25 +163,29 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
             self._simulator_output_path = str(Path(self._output_path) / simulator_class.name)
 
         self._create_output_path(args.clean)
+        # Store the toolchain cache in case the output path did not exist or was cleaned
+        self._toolchain_cache.save()
 
-        self._database_version = (11, sys.version)
+        self._database_version = (13, sys.version)
         self._pickled_database_version = (self._database_version[0], pickle.HIGHEST_PROTOCOL)
 
         self._database = self._create_database()
         self._project = Project(
             database=self._database,
             depend_on_package_body=simulator_class.package_users_depend_on_bodies,
+            early_cutoff=args.early_cutoff,
         )
 
         self._test_bench_list = TestBenchList(database=self._database)
 
-        self._builtins = Builtins(self, self._vhdl_standard, simulator_class)
+        self._builtins = Builtins(self, self._vhdl_standard, simulator_class, self._toolchain_cache)
 
         self._dependency_graph = None
         self._include_in_test_pattern: Optional[Iterable[Union[str, Path]]] = None
         self._exclude_from_test_pattern: Optional[Iterable[Union[str, Path]]] = None
         self._latest_dependency_updates = None
         self._test_history = None
+        self._test_impact_analysis = None
 
     def _create_database(self):
         """
@@ -271,6 +276,8 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
         :returns: A list of files (:class:`.SourceFileList`) that were added
 
         """
+        import csv  # pylint: disable=import-outside-toplevel
+
         libs: Set[str] = set()
         files = SourceFileList([])
 
@@ -520,19 +527,10 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
         :param allow_empty: To disable an error if no files matched the pattern
         :returns: A :class:`.SourceFileList` object
         """
-        results = []
-        for source_file in self._project.get_source_files_in_order():
-            if library_name is not None:
-                if source_file.library.name != library_name:
-                    continue
-
-            if not (
-                fnmatch(str(Path(source_file.name).resolve()), pattern)
-                or fnmatch(ostools.simplify_path(source_file.name), pattern)
-            ):
-                continue
-
-            results.append(SourceFile(source_file, self._project, self))
+        results = [
+            SourceFile(source_file, self._project, self)
+            for source_file in self._project.find_source_files(pattern, library_name)
+        ]
 
         check_not_empty(
             results,
@@ -650,9 +648,7 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
         fname = str(Path(file_name).name)
 
         try:
-            code = ostools.read_file(file_name, encoding=HDL_FILE_ENCODING)
-            for preprocessor in preprocessors:
-                code = preprocessor.run(code, fname)
+            code = self._run_preprocessors(file_name, preprocessors)
         except KeyboardInterrupt as exk:
             raise KeyboardInterrupt from exk
         except:  # pylint: disable=bare-except
@@ -671,8 +667,34 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
                 idx += 1
 
             ostools.write_file(pp_file_name, code, encoding=HDL_FILE_ENCODING)
+            self._preprocessors_of_file[pp_file_name] = list(preprocessors)
             return pp_file_name
 
+    @staticmethod
+    def _run_preprocessors(file_name: Union[str, Path], preprocessors):
+        """
+        Return the code of file_name after applying the preprocessors in order
+        """
+        fname = str(Path(file_name).name)
+        code = ostools.read_file(file_name, encoding=HDL_FILE_ENCODING)
+        for preprocessor in preprocessors:
+            code = preprocessor.run(code, fname)
+        return code
+
+    def _repeat_preprocessing(self, source_file):
+        """
+        Re-create the preprocessed file of source_file after the original file has changed
+        """
+        try:
+            code = self._run_preprocessors(source_file.original_name, self._preprocessors_of_file[source_file.name])
+        except KeyboardInterrupt as exk:
+            raise KeyboardInterrupt from exk
+        except:  # pylint: disable=bare-except
+            traceback.print_exc()
+            LOGGER.error("Failed to preprocess %s", str(source_file.original_name))
+        else:
+            ostools.write_file(source_file.name, code, encoding=HDL_FILE_ENCODING)
+
     def add_preprocessor(self, preprocessor):
         """
         Adds a custom preprocessor to be used on all files. Must be called before adding any files.
@@ -700,6 +722,8 @@ other preprocessors. Lowest value first. The order between preprocessors with th
                                              exclude_subprograms=['log'])
 
         """
+        from ..location_preprocessor import LocationPreprocessor  # pylint: disable=import-outside-toplevel
+
         preprocessor = LocationPreprocessor(order)
         if additional_subprograms is not None:
             for subprogram in additional_subprograms:
@@ -719,6 +743,8 @@ other preprocessors. Lowest value first. The order between preprocessors with th
 other preprocessors. Lowest value first. The order between preprocessors with the same value is undefined.
 
         """
+        from ..check_preprocessor import CheckPreprocessor  # pylint: disable=import-outside-toplevel
+
         self.add_preprocessor(CheckPreprocessor(order))
 
     def main(self, post_run=None):
@@ -755,15 +781,26 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         self._test_bench_list.warn_when_empty()
         test_list = self._test_bench_list.create_tests(simulator_if, self._args.seed, self._args.elaborate)
         test_list.keep_matches(self._test_filter)
+
+        if self._args.shard is not None:
+            if self._test_history is None:
+                self._test_history = self._get_test_history(simulator_if)
+            test_list.keep_shard(*self._args.shard, self._test_history)
+
         return test_list
 
-    def _main(self, post_run):
+    def _main(self, post_run):  # pylint: disable=too-many-return-statements
         """
         Base vunit main function without performing exit
         """
+        self._toolchain_cache.activate()
+
         if self._include_in_test_pattern or self._exclude_from_test_pattern:
             self._update_test_filter(self._include_in_test_pattern, self._exclude_from_test_pattern)
 
+        if self._args.export_json_server is not None:
+            return self._main_export_json_server()
+
         if self._args.export_json is not None:
             return self._main_export_json(self._args.export_json)
 
@@ -776,6 +813,12 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         if self._args.compile:
             return self._main_compile_only()
 
+        if self._args.worker is not None:
+            return self._main_worker()
+
+        if self._args.watch:
+            return self._main_watch(post_run)
+
         all_ok = self._main_run(post_run)
         return all_ok
 
@@ -827,6 +870,7 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         if isinstance(self._args.test_patterns, list):
             test_patterns += self._args.test_patterns
 
+        self._test_patterns = test_patterns
         self._test_filter = self._make_test_filter(self._args, test_patterns)
 
     def _create_simulator_if(self):
@@ -935,6 +979,10 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         """
         Import previously exported items, see :meth:`.export_items`.
 
+        An imported test history is merged with the current test history such that the test histories
+        exported by several runs, for example the shards of a run using ``--shard``, can be combined by
+        importing them one after the other. The most recent result of each test is kept.
+
         :param directory_path: Path to the directory containing the items.
         """
         database_path = str(Path(directory_path))
@@ -972,12 +1020,38 @@ other preprocessors. Lowest value first. The order between preprocessors with th
             if key == b"version":
                 continue
 
-            self._database[key] = pickled_database[key]
+            if key == b"test_history" and key in self._database:
+                self._database[key] = self._merge_test_history(self._database[key], pickled_database[key])
+            else:
+                self._database[key] = pickled_database[key]
+
+    @staticmethod
+    def _merge_test_history(test_history, imported_test_history):
+        """
+        Merge an imported test history into a test history keeping the most recent result of each test
+        """
+        merged_test_history = {
+            test_suite_name: dict(test_suite_data) for test_suite_name, test_suite_data in test_history.items()
+        }
+        for test_suite_name, imported_test_suite_data in imported_test_history.items():
+            test_suite_data = merged_test_history.setdefault(test_suite_name, {})
+            for test_name, imported_test_data in imported_test_suite_data.items():
+                test_data = test_suite_data.get(test_name, None)
+                if (test_data is None) or (
+                    imported_test_data.get("start_time", 0) >= test_data.get("start_time", 0)
+                ):
+                    test_suite_data[test_name] = imported_test_data
+
+        return merged_test_history
 
     def _update_test_history(self, report, simulator_if):
         """
         Update the database test history with the results from the completed test run.
         """
+        from ..test.duration import update_duration_model  # pylint: disable=import-outside-toplevel
+
+        test_history = self._get_test_history(simulator_if)
+
         test_suite_data = {}
         for test_result in report:
             if test_result.test_suite_name not in test_suite_data:
@@ -993,7 +1067,20 @@ other preprocessors. Lowest value first. The order between preprocessors with th
             test_suite_data[test_result.test_suite_name][test_result.name]["start_time"] = test_result.start_time
             test_suite_data[test_result.test_suite_name][test_result.name]["seed"] = test_result.seed
 
-        test_history = self._get_test_history(simulator_if)
+            # Skipped tests did not complete and their execution time says nothing about their duration
+            duration_model = test_history.get(test_result.test_suite_name, {}).get(test_result.name, {}).get("duration")
+            if not test_result.skipped:
+                duration_model = update_duration_model(duration_model, test_result.time)
+            if duration_model:
+                test_suite_data[test_result.test_suite_name][test_result.name]["duration"] = duration_model
+
+            peak_memory = test_result.peak_memory
+            if peak_memory is None:
+                peak_memory = test_history.get(test_result.test_suite_name, {}).get(test_result.name, {}).get(
+                    "peak_memory"
+                )
+            if peak_memory is not None:
+                test_suite_data[test_result.test_suite_name][test_result.name]["peak_memory"] = peak_memory
 
         for test_suite_name, data in test_suite_data.items():
             if test_suite_name not in test_history:
@@ -1003,10 +1090,49 @@ other preprocessors. Lowest value first. The order between preprocessors with th
 
         self._database[b"test_history"] = test_history
 
-    def _get_test_list_depending_on_change(self, test_list):
+    def _get_test_impact(self, test_list):
+        """
+        Return a dictionary mapping the name of each test suite in test_list to a digest of the code it depends on
+        """
+        if self._test_impact_analysis is None:
+            from ..test.impact import TestImpactAnalysis  # pylint: disable=import-outside-toplevel
+
+            if not self._dependency_graph:
+                self._dependency_graph = self._project.create_dependency_graph(True)
+            self._test_impact_analysis = TestImpactAnalysis(self._project, self._dependency_graph)
+
+        split_test_bench = self._args.changed_granularity == "test-case"
+        return {
+            test_suite.name: self._test_impact_analysis.digest(test_suite, split_test_bench=split_test_bench)
+            for test_suite in test_list
+        }
+
+    def _update_test_impact(self, report, test_impact):
+        """
+        Record the digests of the code the test suites in the completed test run depended on
+
+        Test suites with skipped tests are not recorded such that they are selected by the next run with --changed.
+        """
+        completed = {}
+        for test_result in report:
+            completed[test_result.test_suite_name] = (
+                completed.get(test_result.test_suite_name, True) and not test_result.skipped
+            )
+
+        key = b"test_impact"
+        recorded_test_impact = self._database[key] if key in self._database else {}
+        for test_suite_name, test_suite_completed in completed.items():
+            if test_suite_completed and test_impact.get(test_suite_name) is not None:
+                recorded_test_impact[test_suite_name] = test_impact[test_suite_name]
+        self._database[key] = recorded_test_impact
+
+    def _get_test_list_depending_on_change(self, test_list, test_impact=None):
         """
         Extract the test suites in test_list that depends on changes.
         """
+        if self._args.changed_granularity != "file":
+            return self._get_test_list_depending_on_impact(test_list, test_impact)
+
         if self._latest_dependency_updates is None:
             self._latest_dependency_updates = self._get_latest_dependency_updates()
 
@@ -1032,43 +1158,178 @@ other preprocessors. Lowest value first. The order between preprocessors with th
 
         return new_test_list
 
+    def _get_test_list_depending_on_impact(self, test_list, test_impact=None):
+        """
+        Extract the test suites in test_list for which the digest of the code they depend on differs from the
+        digest recorded in their last run.
+        """
+        if test_impact is None:
+            test_impact = self._get_test_impact(test_list)
+
+        key = b"test_impact"
+        recorded_test_impact = self._database[key] if key in self._database else {}
+
+        new_test_list = TestList()
+        for test_suite in test_list:
+            digest = test_impact[test_suite.name]
+            if digest is None or recorded_test_impact.get(test_suite.name) != digest:
+                new_test_list.add_suite(test_suite)
+
+        return new_test_list
+
     def _main_run(self, post_run):
         """
         Main with running tests
         """
         simulator_if = self._create_simulator_if()
+        report = self._compile_and_run(simulator_if, post_run, changed_only=self._args.changed)
+
+        del simulator_if
+
+        return report.all_ok()
+
+    def _main_watch(self, post_run):
+        """
+        Main with running tests and then re-running the tests affected by file changes until interrupted
+
+        The project, the parse results and the simulator interface, including any persistent
+        simulator processes, are kept between runs.
+        """
+        simulator_if = self._create_simulator_if()
+        watched_files = self._get_watched_files()
+        watcher = FileWatcher(watched_files.keys())
+        changed_only = self._args.changed
+        all_ok = True
+
+        try:
+            while True:
+                try:
+                    report = self._compile_and_run(simulator_if, post_run, changed_only=changed_only)
+                except CompileError:
+                    all_ok = False
+                else:
+                    all_ok = report.all_ok()
+
+                changed_only = True
+                print(f"Watching {len(watched_files):d} files for changes. Press Ctrl-C to stop.")
+                changed_file_names = watcher.wait_for_changes(self._args.watch_interval)
+                self._refresh_changed_files(watched_files, changed_file_names)
+        except KeyboardInterrupt:
+            print()
+            LOGGER.debug("_main_watch: Caught Ctrl-C shutting down")
+
+        return all_ok
+
+    def _get_watched_files(self):
+        """
+        Return a dictionary mapping the file names to watch to the project source files created from them
+        """
+        watched_files = {}  # type: ignore
+        for source_file in self._project.get_source_files_in_order():
+            watched_files.setdefault(str(source_file.original_name), []).append(source_file)
+        return watched_files
+
+    def _refresh_changed_files(self, watched_files, changed_file_names):
+        """
+        Re-preprocess and re-scan the source files created from the changed files
+        """
+        source_files = []
+        for file_name in changed_file_names:
+            if not ostools.file_exists(file_name):
+                LOGGER.warning("%s was removed. Restart to remove it from the project.", file_name)
+                continue
+
+            print(f"Detected change in {ostools.simplify_path(file_name)!s}")
+            for source_file in watched_files[file_name]:
+                if source_file.name in self._preprocessors_of_file:
+                    self._repeat_preprocessing(source_file)
+                source_files.append(source_file)
+
+        self._project.refresh_source_files(source_files)
+        self._test_bench_list.rescan_tests(source_file.name for source_file in source_files)
+
+        # Dependencies and timestamps must be re-evaluated for the next run
+        self._dependency_graph = None
+        self._latest_dependency_updates = None
+        self._test_history = None
+        self._test_impact_analysis = None
+
+    def _compile_and_run(self, simulator_if, post_run, changed_only):
+        """
+        Compile and run the tests and return the report
+        """
+        # pylint: disable=import-outside-toplevel
+        from ..test.report import TestReport
+        from ..test.runner import TRASH_PATH
+
         test_list = self._create_tests(simulator_if)
-        if self._args.changed:
-            test_list = self._get_test_list_depending_on_change(test_list)
+        test_impact = self._get_test_impact(test_list) if self._args.changed_granularity != "file" else None
+        if changed_only:
+            test_list = self._get_test_list_depending_on_change(test_list, test_impact)
 
         self._compile(simulator_if)
         print()
 
         start_time = ostools.get_time()
-        report = TestReport(printer=self._printer)
+        report = TestReport(printer=self._printer, junit_xml_writer=self._create_junit_xml_writer())
+        deleter = ostools.BackgroundDeleter(Path(self._output_path) / TEST_OUTPUT_PATH / TRASH_PATH)
 
         try:
-            self._run_test(test_list, report, simulator_if)
+            self._run_test(test_list, report, simulator_if, deleter)
         except KeyboardInterrupt:
             print()
             LOGGER.debug("_main: Caught Ctrl-C shutting down")
         finally:
             del test_list
+            # Finalize also when aborted such that the report contains the tests run so far
+            report.finalize_junit_xml()
 
         report.set_real_total_time(ostools.get_time() - start_time)
         self._update_test_history(report, simulator_if)
+        if test_impact is not None:
+            self._update_test_impact(report, test_impact)
         report.print_str()
 
         if post_run is not None:
             post_run(results=Results(self._output_path, simulator_if, report))
 
-        del simulator_if
+        self._clean_test_output(report, deleter)
+        return report
 
-        if self._args.xunit_xml is not None:
-            xml = report.to_junit_xml_str(self._args.xunit_xml_format)
-            ostools.write_file(self._args.xunit_xml, xml)
+    def _clean_test_output(self, report, deleter):
+        """
+        Discard the test output not retained by the retention policy and wait until the old test output
+        has been deleted in the background
+        """
+        from ..test.retention import RetentionPolicy  # pylint: disable=import-outside-toplevel
 
-        return report.all_ok()
+        test_output_path = Path(self._output_path) / TEST_OUTPUT_PATH
+        if test_output_path.is_dir():
+            policy = RetentionPolicy(
+                keep=self._args.keep_output,
+                max_runs=self._args.keep_output_runs,
+                max_size=(
+                    None if self._args.max_test_output_size is None else int(self._args.max_test_output_size * 2**20)
+                ),
+            )
+            policy.apply(test_output_path, report, deleter)
+
+        deleter.wait()
+
+    def _create_junit_xml_writer(self):
+        """
+        Return a writer streaming the results to the xunit XML report if requested
+        """
+        from ..test.report import JUnitXmlWriter  # pylint: disable=import-outside-toplevel
+
+        if self._args.xunit_xml is None:
+            return None
+
+        return JUnitXmlWriter(
+            self._args.xunit_xml,
+            xunit_xml_format=self._args.xunit_xml_format,
+            max_output_size=self._args.xunit_xml_max_output,
+        )
 
     def _main_list_only(self):
         """
@@ -1083,61 +1344,71 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         print(f"Listed {test_list.num_tests} tests")
         return True
 
-    def _main_export_json(self, json_file_name: Union[str, Path]):  # pylint: disable=too-many-locals
+    def _main_export_json(self, json_file_name: Union[str, Path]):
         """
         Main function when exporting to JSON
+
+        The file is only written when the export has changed
         """
+        if self._args.shard is not None:
+            test_list = self._create_tests(simulator_if=None)
+        else:
+            self._test_bench_list.warn_when_empty()
+            test_list = None
+        data = self._create_json_exporter().export(test_list)
 
-        file_objects = self.get_compile_order()
-        files = []
-        for source_file in file_objects:
-            files.append(
-                {
-                    "file_name": str(Path(source_file.name).resolve()),
-                    "library_name": source_file.library.name,
-                }
-            )
+        json_file = Path(json_file_name)
+        if not (json_file.is_file() and json_file.read_text(encoding="utf-8") == data):
+            json_file.write_text(data, encoding="utf-8")
 
-        tests = []
-        for test_suite in self._create_tests(simulator_if=None):
-            test_information = test_suite.test_information
-            test_configuration = test_suite.test_configuration
-            for name in test_suite.test_names:
-                info = test_information[name]
-                config = test_configuration[name]
-
-                attributes = {}
-                for attr in info.attributes:
-                    attributes[attr.name] = attr.value
-
-                attributes.update(config.attributes)
-
-                tests.append(
-                    {
-                        "name": name,
-                        "location": {
-                            "file_name": str(info.location.file_name),
-                            "offset": info.location.offset,
-                            "length": info.location.length,
-                        },
-                        "attributes": attributes,
-                    }
-                )
+        return True
 
-        json_data = {
-            # The semantic version (https://semver.org/) of the JSON export data format
-            "export_format_version": {"major": 1, "minor": 0, "patch": 0},
-            # The set of files added to the project
-            "files": files,
-            # The list of all tests
-            "tests": tests,
-        }
+    def _main_export_json_server(self):
+        """
+        Main function when serving the JSON export until interrupted
+
+        Changed source files are re-scanned before each export.
+        """
+        from .json_export import JsonExportServer  # pylint: disable=import-outside-toplevel
 
-        with Path(json_file_name).open("w", encoding="utf-8") as fptr:
-            json.dump(json_data, fptr, sort_keys=True, indent=4, separators=(",", ": "))
+        self._test_bench_list.warn_when_empty()
+        exporter = self._create_json_exporter()
+        watched_files = self._get_watched_files()
+        watcher = FileWatcher(watched_files.keys())
+
+        def refresh():
+            changed_file_names = watcher.poll()
+            if changed_file_names:
+                self._refresh_changed_files(watched_files, changed_file_names)
+
+        host, port = self._args.export_json_server
+        server = JsonExportServer((host or "localhost", port), exporter.export, refresh)
+        host, port = server.address
+        print(f"Serving the JSON export on {host!s}:{port:d}. Press Ctrl-C to stop.")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print()
+            LOGGER.debug("_main_export_json_server: Caught Ctrl-C shutting down")
 
         return True
 
+    def _create_json_exporter(self):
+        """
+        Create the JSON exporter of the project
+        """
+        from .json_export import JsonExporter  # pylint: disable=import-outside-toplevel
+
+        return JsonExporter(
+            self._project,
+            self._test_bench_list,
+            self._database,
+            get_compile_order=self.get_compile_order,
+            test_filter=self._test_filter,
+            test_filter_key=repr((self._test_patterns, self._args.with_attributes, self._args.without_attributes)),
+        )
+
     def _main_list_files_only(self):
         """
         Main function when only listing files
@@ -1194,6 +1465,7 @@ other preprocessors. Lowest value first. The order between preprocessors with th
             continue_on_error=self._args.keep_compiling,
             printer=self._printer,
             target_files=target_files,
+            batch=self._args.batch_compile,
         )
 
     def _get_testbench_files(self, simulator_if: Union[None, SimulatorInterface]):
@@ -1207,17 +1479,74 @@ other preprocessors. Lowest value first. The order between preprocessors with th
             for file_name in tb_file_names
         ]
 
-    def _run_test(self, test_cases, report, simulator_if):
+    def _main_worker(self):
         """
-        Run the test suites and return the report
+        Main function when running as a worker for a remote coordinator
         """
+        # pylint: disable=import-outside-toplevel
+        from ..test.report import TestReport
+        from ..test.distributed import TestWorker, TOKEN_ENVIRONMENT_VARIABLE
+
+        simulator_if = self._create_simulator_if()
+        test_list = self._create_tests(simulator_if)
+        report = TestReport(printer=self._printer)
+
+        host, port = self._args.worker
+        worker = TestWorker(
+            report,
+            str(Path(self._output_path) / TEST_OUTPUT_PATH),
+            (host or "localhost", port),
+            token=os.environ.get(TOKEN_ENVIRONMENT_VARIABLE) or None,
+            verbosity=self._get_verbosity(),
+            num_threads=self._args.num_threads,
+            dont_catch_exceptions=self._args.dont_catch_exceptions,
+            no_color=self._args.no_color,
+            backend=self._args.runner_backend,
+            test_history=self._get_test_history(simulator_if),
+            timeout=self._args.test_timeout,
+            timeout_factor=self._args.test_timeout_factor,
+        )
+
+        # The coordinator accepts workers once it has compiled the project. Compiling after connecting
+        # means that a worker sharing the output path with the coordinator finds everything up to date.
+        worker.connect()
+        self._compile(simulator_if)
+        print()
+
+        try:
+            worker.run(test_list)
+        except KeyboardInterrupt:
+            print()
+            LOGGER.debug("_main: Caught Ctrl-C shutting down")
+        finally:
+            del test_list
+
+        return report.all_ok()
+
+    def _get_verbosity(self):
+        """
+        Return the test runner verbosity
+        """
+        from ..test.runner import TestRunner  # pylint: disable=import-outside-toplevel
 
         if self._args.verbose:
-            verbosity = TestRunner.VERBOSITY_VERBOSE
-        elif self._args.quiet:
-            verbosity = TestRunner.VERBOSITY_QUIET
-        else:
-            verbosity = TestRunner.VERBOSITY_NORMAL
+            return TestRunner.VERBOSITY_VERBOSE
+
+        if self._args.quiet:
+            return TestRunner.VERBOSITY_QUIET
+
+        return TestRunner.VERBOSITY_NORMAL
+
+    def _run_test(self, test_cases, report, simulator_if, deleter=None):
+        """
+        Run the test suites and return the report
+        """
+        # pylint: disable=import-outside-toplevel
+        from ..test.runner import TestRunner
+        from ..test.distributed import TestCoordinator, TOKEN_ENVIRONMENT_VARIABLE
+        from ..test.resources import create_resource_budget
+
+        verbosity = self._get_verbosity()
 
         # Ordered test priority can be achieved by not supplying
         # any history. When no history is supplied, the latest dependency
@@ -1229,17 +1558,45 @@ other preprocessors. Lowest value first. The order between preprocessors with th
             latest_dependency_updates = self._get_latest_dependency_updates()
             test_history = self._get_test_history(simulator_if)
 
-        runner = TestRunner(
-            report,
-            str(Path(self._output_path) / TEST_OUTPUT_PATH),
-            verbosity=verbosity,
-            num_threads=self._args.num_threads,
-            fail_fast=self._args.fail_fast,
-            dont_catch_exceptions=self._args.dont_catch_exceptions,
-            no_color=self._args.no_color,
-            latest_dependency_updates=latest_dependency_updates,
-            test_history=test_history,
-        )
+        if self._args.coordinator is not None:
+            try:
+                runner = TestCoordinator(
+                    report,
+                    str(Path(self._output_path) / TEST_OUTPUT_PATH),
+                    self._args.coordinator,
+                    token=os.environ.get(TOKEN_ENVIRONMENT_VARIABLE) or None,
+                    verbosity=verbosity,
+                    fail_fast=self._args.fail_fast,
+                    dont_catch_exceptions=self._args.dont_catch_exceptions,
+                    no_color=self._args.no_color,
+                    latest_dependency_updates=latest_dependency_updates,
+                    test_history=test_history,
+                    deleter=deleter,
+                )
+            except ValueError as exc:
+                LOGGER.error(str(exc))
+                sys.exit(1)
+        else:
+            runner = TestRunner(
+                report,
+                str(Path(self._output_path) / TEST_OUTPUT_PATH),
+                verbosity=verbosity,
+                num_threads=self._args.num_threads,
+                fail_fast=self._args.fail_fast,
+                dont_catch_exceptions=self._args.dont_catch_exceptions,
+                no_color=self._args.no_color,
+                latest_dependency_updates=latest_dependency_updates,
+                test_history=test_history,
+                backend=self._args.runner_backend,
+                resource_budget=create_resource_budget(
+                    cpu=self._args.cpu_budget,
+                    memory=self._args.memory_budget,
+                    licenses=dict(self._args.license_budget),
+                ),
+                deleter=deleter,
+                timeout=self._args.test_timeout,
+                timeout_factor=self._args.test_timeout_factor,
+            )
         runner.run(test_cases)
 
     def add_verilog_builtins(self):
@@ -1288,6 +1645,31 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         """
         self._builtins.add("com")
 
+    def generate_codecs(self, packages, used_packages=None, num_processes=None):
+        """
+        Generate codecs for the datatypes of several packages in parallel
+
+        The codecs of each package are generated as by ``generate_codecs`` of the package using the default codec
+        package name and output file name.
+
+        :param packages: A list of packages as returned by :meth:`.Library.package`
+        :param used_packages: Packages to use in all codec packages in addition to the package itself
+        :param num_processes: The number of processes generating codecs, defaults to the number of CPUs
+        :returns: A list of the added codec package files (:class:`.SourceFileList`)
+        """
+        from ..com import codec_generator  # pylint: disable=import-outside-toplevel
+
+        jobs = [
+            package._get_codec_job(used_packages=used_packages)  # pylint: disable=protected-access
+            for package in packages
+        ]
+        codec_generator.generate_codecs_in_parallel(jobs, num_processes=num_processes)
+
+        source_files = []
+        for package, job in zip(packages, jobs):
+            source_files += self.add_source_files(job[-1], package.library_name)
+        return SourceFileList(source_files)
+
     def add_array_util(self):
         """
         Add array util
@@ -1409,4 +1791,5 @@ Then replace the add_json4vhdl() call with add_package("vunit-json-for-vhdl").
         """
         if self._simulator_class is None:
             return None
+        self._toolchain_cache.activate()
         return self._simulator_class.supports_coverage()
@@ -0,0 +1,207 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Export of the project files and tests to JSON
+
+The parts of the export are cached in the project database. The file list is only re-created when a
+source file or a manual dependency has changed and the tests of a test bench are only re-created when
+its tests or configurations have changed.
+"""
+
+import json
+import logging
+import socket
+import threading
+from pathlib import Path
+from ..hashing import hash_string
+from ..ostools import PROGRAM_STATUS
+
+LOGGER = logging.getLogger(__name__)
+
+# The semantic version (https://semver.org/) of the JSON export data format
+EXPORT_FORMAT_VERSION = {"major": 1, "minor": 0, "patch": 0}
+
+
+class JsonExporter(object):
+    """
+    Create the JSON export of a project
+
+    :param project: The project
+    :param test_bench_list: The test benches of the project
+    :param database: The project database where the parts of the export are cached
+    :param get_compile_order: Callable returning the source files of the project in compile order
+    :param test_filter: The filter of the tests to export
+    :param test_filter_key: A string which changes when the test filter changes
+    """
+
+    FILES_KEY = b"export_json.files"
+    TESTS_KEY = b"export_json.tests"
+
+    def __init__(
+        self, project, test_bench_list, database, *, get_compile_order, test_filter, test_filter_key
+    ):  # pylint: disable=too-many-arguments
+        self._project = project
+        self._test_bench_list = test_bench_list
+        self._database = database
+        self._get_compile_order = get_compile_order
+        self._test_filter = test_filter
+        self._test_filter_key = test_filter_key
+
+    def export(self, test_list=None):
+        """
+        Return the export as compact JSON
+
+        :param test_list: The tests to export instead of the cached tests of all test benches
+        """
+        json_data = {
+            "export_format_version": EXPORT_FORMAT_VERSION,
+            # The set of files added to the project
+            "files": self._get_files(),
+            # The list of all tests
+            "tests": self._get_tests() if test_list is None else _get_test_entries(test_list),
+        }
+        return json.dumps(json_data, sort_keys=True, separators=(",", ":"))
+
+    def _get_files(self):
+        """
+        Return the files in compile order
+        """
+        digest = self._project.get_digest()
+        cached = self._database[self.FILES_KEY] if self.FILES_KEY in self._database else None
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+
+        files = [
+            {
+                "file_name": str(Path(source_file.name).resolve()),
+                "library_name": source_file.library.name,
+            }
+            for source_file in self._get_compile_order()
+        ]
+        self._database[self.FILES_KEY] = (digest, files)
+        return files
+
+    def _get_tests(self):
+        """
+        Return the tests of all test benches, only re-creating the tests of changed test benches
+        """
+        cached = self._database[self.TESTS_KEY] if self.TESTS_KEY in self._database else {}
+        updated = {}
+        tests = []
+        for test_bench in self._test_bench_list.get_test_benches():
+            key = (test_bench.library_name, test_bench.name)
+            digest = hash_string(self._test_filter_key + test_bench.get_digest())
+            if key in cached and cached[key][0] == digest:
+                entries = cached[key][1]
+            else:
+                test_list = test_bench.create_tests(None, None, False)
+                test_list.keep_matches(self._test_filter)
+                entries = _get_test_entries(test_list)
+            updated[key] = (digest, entries)
+            tests += entries
+
+        if updated != cached:
+            self._database[self.TESTS_KEY] = updated
+
+        return tests
+
+
+def _get_test_entries(test_list):
+    """
+    Return the export of the tests in the test list
+    """
+    tests = []
+    for test_suite in test_list:
+        test_information = test_suite.test_information
+        test_configuration = test_suite.test_configuration
+        for name in test_suite.test_names:
+            info = test_information[name]
+            config = test_configuration[name]
+
+            attributes = {}
+            for attr in info.attributes:
+                attributes[attr.name] = attr.value
+
+            attributes.update(config.attributes)
+
+            tests.append(
+                {
+                    "name": name,
+                    "location": {
+                        "file_name": str(info.location.file_name),
+                        "offset": info.location.offset,
+                        "length": info.location.length,
+                    },
+                    "attributes": attributes,
+                }
+            )
+    return tests
+
+
+class JsonExportServer(object):
+    """
+    Serve the JSON export to the clients connecting to a socket
+
+    Each client is sent the export as one line of compact JSON after which the connection is closed.
+    The refresh callable is called before each export such that changed source files are picked up.
+    """
+
+    def __init__(self, address, export, refresh=None):
+        self._server = socket.create_server(address)
+        self._server.settimeout(0.1)
+        self._export = export
+        self._refresh = refresh
+        self._stopped = threading.Event()
+
+    @property
+    def address(self):
+        """
+        The (host, port) address the server is listening to
+        """
+        return self._server.getsockname()[:2]
+
+    def serve_forever(self):
+        """
+        Serve clients until stopped or interrupted
+        """
+        try:
+            while not self._stopped.is_set():
+                PROGRAM_STATUS.check_for_shutdown()
+                try:
+                    sock, _ = self._server.accept()
+                except socket.timeout:
+                    continue
+
+                with sock:
+                    sock.settimeout(None)
+                    self._serve(sock)
+        finally:
+            self._server.close()
+
+    def _serve(self, sock):
+        """
+        Send the export to a client
+        """
+        try:
+            if self._refresh is not None:
+                self._refresh()
+            data = self._export()
+        except Exception:  # pylint: disable=broad-except
+            # The server shall survive source files which are temporarily broken while being edited
+            LOGGER.exception("Failed to create the JSON export")
+            return
+
+        try:
+            sock.sendall(data.encode("utf-8") + b"\n")
+        except OSError as exc:
+            LOGGER.debug("Failed to send the JSON export: %s", exc)
+
+    def stop(self):
+        """
+        Stop serving clients
+        """
+        self._stopped.set()
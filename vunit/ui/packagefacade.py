@@ -9,7 +9,6 @@ UI class PackageFacade
 """
 
 from pathlib import Path
-from ..com import codec_generator
 
 
 class PackageFacade(object):
@@ -26,6 +25,19 @@ class PackageFacade(object):
     def generate_codecs(self, codec_package_name=None, used_packages=None, output_file_name=None):
         """
         Generates codecs for the datatypes in this Package
+
+        The codecs are only generated again when the package, the arguments or the codec generator have changed.
+        """
+        from ..com import codec_generator  # pylint: disable=import-outside-toplevel
+
+        job = self._get_codec_job(codec_package_name, used_packages, output_file_name)
+        codec_generator.generate_codecs(*job)
+
+        return self._parent.add_source_files(job[-1], self._library_name)
+
+    def _get_codec_job(self, codec_package_name=None, used_packages=None, output_file_name=None):
+        """
+        Return the arguments to generate the codecs of this package
         """
         if codec_package_name is None:
             codec_package_name = self._package_name + "_codecs"
@@ -35,6 +47,11 @@ class PackageFacade(object):
             file_extension = Path(self._design_unit.source_file.name).suffix
             output_file_name = codecs_path / (codec_package_name + file_extension)
 
-        codec_generator.generate_codecs(self._design_unit, codec_package_name, used_packages, output_file_name)
+        return self._design_unit, codec_package_name, used_packages, output_file_name
 
-        return self._parent.add_source_files(output_file_name, self._library_name)
+    @property
+    def library_name(self):
+        """
+        The name of the library of this Package
+        """
+        return self._library_name
@@ -9,7 +9,7 @@ UI class Results
 """
 
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 from .common import TEST_OUTPUT_PATH
 
 
@@ -48,6 +48,8 @@ class Results(object):
                         obj["status"],
                         obj["time"],
                         obj["path"],
+                        predicted_finish_time=obj["predicted_finish_time"],
+                        finish_time=obj["finish_time"],
                     )
                 }
             )
@@ -71,9 +73,12 @@ class TestResult(object):
     """
     Gives access to a subset of the results of a test
 
-    :data status: Result status (passed, failed or skipped)
+    :data status: Result status (passed, failed, timed_out or skipped)
     :data time: Simulation time
     :data path: Absolute path of the test output
+    :data predicted_finish_time: Finish time of the test predicted by the scheduler relative to the start of the
+                                 test run, None if there was no test history to base the prediction on
+    :data finish_time: Actual finish time of the test relative to the start of the test run
 
     :example:
 
@@ -92,11 +97,22 @@ class TestResult(object):
        vu.main(post_run=post_func)
     """
 
-    def __init__(self, test_output_path: Union[str, Path], status, time, path: Union[str, Path]):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        test_output_path: Union[str, Path],
+        status,
+        time,
+        path: Union[str, Path],
+        *,
+        predicted_finish_time: Optional[float] = None,
+        finish_time: Optional[float] = None,
+    ):
         self._test_output_path = Path(test_output_path)
         self.status = status
         self.time = time
         self.path = Path(path)
+        self.predicted_finish_time = predicted_finish_time
+        self.finish_time = finish_time
 
     @property
     def relpath(self) -> str:
@@ -395,6 +395,12 @@ package com_types_pkg is
   alias push_integer_array_t_ref is push_ref[msg_t, integer_array_t];
   alias pop_integer_array_t_ref is pop_ref[msg_t return integer_array_t];
 
+  -- Push and pop a copy of an integer array as one block
+  procedure push(msg : msg_t; value : integer_array_t);
+  impure function pop(msg : msg_t) return integer_array_t;
+  alias push_integer_array_t is push[msg_t, integer_array_t];
+  alias pop_integer_array_t is pop[msg_t return integer_array_t];
+
   procedure push_ref(constant msg : msg_t; value : inout dict_t);
   impure function pop_ref(msg : msg_t) return dict_t;
   alias push_dict_t_ref is push_ref[msg_t, dict_t];
@@ -866,6 +872,16 @@ package body com_types_pkg is
     return pop_ref(msg.data);
   end;
 
+  procedure push(msg : msg_t; value : integer_array_t) is
+  begin
+    push(msg.data, value);
+  end;
+
+  impure function pop(msg : msg_t) return integer_array_t is
+  begin
+    return pop(msg.data);
+  end;
+
   procedure push_ref(constant msg : msg_t; value : inout dict_t) is
   begin
     push_ref(msg.data, value);
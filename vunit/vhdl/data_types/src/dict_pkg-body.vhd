@@ -9,29 +9,37 @@ package body dict_pkg is
   constant str_pool : string_ptr_pool_t := new_string_ptr_pool;
   constant meta_num_keys : natural := 0;
   constant meta_length : natural := meta_num_keys+1;
-  constant new_bucket_size : natural := 1;
+  constant new_num_buckets : positive := 1;
+  constant new_bucket_size : positive := 1;
+  -- The number of buckets is doubled before the average number of keys per
+  -- bucket exceeds the max load factor
+  constant max_load_factor : positive := 1;
+
+  procedure new_bucket (
+    dict       : dict_t;
+    bucket_idx : natural
+  ) is
+  begin
+    set(dict.p_bucket_lengths, bucket_idx, 0);
+    set(dict.p_bucket_keys, bucket_idx, to_integer(new_integer_vector_ptr(int_pool, new_bucket_size)));
+    set(dict.p_bucket_key_hashes, bucket_idx, to_integer(new_integer_vector_ptr(int_pool, new_bucket_size)));
+    set(dict.p_bucket_values, bucket_idx, to_integer(new_integer_vector_ptr(int_pool, new_bucket_size)));
+    set(dict.p_bucket_value_types, bucket_idx, to_integer(new_integer_vector_ptr(int_pool, new_bucket_size)));
+  end;
 
   impure function new_dict
   return dict_t is
     variable dict : dict_t;
-    variable tmp : integer_vector_ptr_t;
-    constant num_buckets : natural := 1;
   begin
     dict := (p_meta => new_integer_vector_ptr(int_pool, meta_length),
-             p_bucket_lengths => new_integer_vector_ptr(int_pool, num_buckets),
-             p_bucket_keys => new_integer_vector_ptr(int_pool, num_buckets),
-             p_bucket_values => new_integer_vector_ptr(int_pool, num_buckets),
-             p_bucket_value_types => new_integer_vector_ptr(int_pool, num_buckets));
+             p_bucket_lengths => new_integer_vector_ptr(int_pool, new_num_buckets),
+             p_bucket_keys => new_integer_vector_ptr(int_pool, new_num_buckets),
+             p_bucket_key_hashes => new_integer_vector_ptr(int_pool, new_num_buckets),
+             p_bucket_values => new_integer_vector_ptr(int_pool, new_num_buckets),
+             p_bucket_value_types => new_integer_vector_ptr(int_pool, new_num_buckets));
     set(dict.p_meta, meta_num_keys, 0);
-    for i in 0 to length(dict.p_bucket_lengths)-1 loop
-      -- Zero items in bucket
-      set(dict.p_bucket_lengths, i, 0);
-      tmp := new_integer_vector_ptr(int_pool, new_bucket_size);
-      set(dict.p_bucket_keys, i, to_integer(tmp));
-      tmp := new_integer_vector_ptr(int_pool, new_bucket_size);
-      set(dict.p_bucket_values, i, to_integer(tmp));
-      tmp := new_integer_vector_ptr(int_pool, new_bucket_size);
-      set(dict.p_bucket_value_types, i, to_integer(tmp));
+    for i in 0 to new_num_buckets-1 loop
+      new_bucket(dict, i);
     end loop;
     return dict;
   end;
@@ -44,6 +52,7 @@ package body dict_pkg is
     variable bucket_values : integer_vector_ptr_t;
     variable bucket_value_types : integer_vector_ptr_t;
     variable bucket_keys : integer_vector_ptr_t;
+    variable bucket_key_hashes : integer_vector_ptr_t;
     variable bucket_length : natural;
 
     variable key : string_ptr_t;
@@ -51,6 +60,7 @@ package body dict_pkg is
   begin
     for bucket_idx in 0 to num_buckets-1 loop
       bucket_keys := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
+      bucket_key_hashes := to_integer_vector_ptr(get(dict.p_bucket_key_hashes, bucket_idx));
       bucket_values := to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx));
       bucket_value_types := to_integer_vector_ptr(get(dict.p_bucket_value_types, bucket_idx));
       bucket_length := get(dict.p_bucket_lengths, bucket_idx);
@@ -63,12 +73,14 @@ package body dict_pkg is
       recycle(int_pool, bucket_values);
       recycle(int_pool, bucket_value_types);
       recycle(int_pool, bucket_keys);
+      recycle(int_pool, bucket_key_hashes);
     end loop;
     recycle(int_pool, dict.p_meta);
     recycle(int_pool, dict.p_bucket_lengths);
     recycle(int_pool, dict.p_bucket_values);
     recycle(int_pool, dict.p_bucket_value_types);
     recycle(int_pool, dict.p_bucket_keys);
+    recycle(int_pool, dict.p_bucket_key_hashes);
   end;
 
   -- DJB2 hash
@@ -83,42 +95,69 @@ package body dict_pkg is
     return value;
   end;
 
-  impure function get_value_ptr (
+  impure function bucket_index (
     dict     : dict_t;
-    key_hash : natural;
-    key      : string
-  ) return string_ptr_t is
-    constant num_buckets : natural := length(dict.p_bucket_lengths);
-    constant bucket_idx : natural := key_hash mod num_buckets;
+    key_hash : natural
+  ) return natural is
+  begin
+    return key_hash mod length(dict.p_bucket_lengths);
+  end;
+
+  -- Compare a stored key with a key without copying the stored key. The lengths
+  -- are compared first such that most keys differing are rejected directly
+  impure function is_equal (
+    key_ptr : string_ptr_t;
+    key     : string
+  ) return boolean is
+    variable idx : natural := 0;
+  begin
+    if length(key_ptr) /= key'length then
+      return false;
+    end if;
+
+    for i in key'range loop
+      idx := idx + 1;
+      if get(key_ptr, idx) /= key(i) then
+        return false;
+      end if;
+    end loop;
+    return true;
+  end;
+
+  -- Return the index of the key within the bucket or -1 if the key is missing.
+  -- Only keys with the same hash as the key are compared
+  impure function find_item (
+    dict       : dict_t;
+    bucket_idx : natural;
+    key_hash   : natural;
+    key        : string
+  ) return integer is
     constant bucket_length : natural := get(dict.p_bucket_lengths, bucket_idx);
-    constant bucket_values : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx));
     constant bucket_keys : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
+    constant bucket_key_hashes : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_key_hashes, bucket_idx));
   begin
     for i in 0 to bucket_length-1 loop
-      if to_string(to_string_ptr(get(bucket_keys, i))) = key then
-        return to_string_ptr(get(bucket_values, i));
+      if get(bucket_key_hashes, i) = key_hash then
+        if is_equal(to_string_ptr(get(bucket_keys, i)), key) then
+          return i;
+        end if;
       end if;
     end loop;
-    return null_string_ptr;
+    return -1;
   end;
 
-  impure function get_value_type (
+  impure function get_value_ptr (
     dict     : dict_t;
     key_hash : natural;
     key      : string
-  ) return data_type_t is
-    constant num_buckets : natural := length(dict.p_bucket_lengths);
-    constant bucket_idx : natural := key_hash mod num_buckets;
-    constant bucket_length : natural := get(dict.p_bucket_lengths, bucket_idx);
-    constant bucket_value_types : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_value_types, bucket_idx));
-    constant bucket_keys : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
+  ) return string_ptr_t is
+    constant bucket_idx : natural := bucket_index(dict, key_hash);
+    constant item_idx : integer := find_item(dict, bucket_idx, key_hash, key);
   begin
-    for i in 0 to bucket_length-1 loop
-      if to_string(to_string_ptr(get(bucket_keys, i))) = key then
-        return data_type_t'val(get(bucket_value_types, i));
-      end if;
-    end loop;
-    return vhdl_character;
+    if item_idx = -1 then
+      return null_string_ptr;
+    end if;
+    return to_string_ptr(get(to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx)), item_idx));
   end;
 
   procedure remove (
@@ -131,6 +170,7 @@ package body dict_pkg is
     constant bucket_values : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx));
     constant bucket_value_types : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_value_types, bucket_idx));
     constant bucket_keys : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
+    constant bucket_key_hashes : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_key_hashes, bucket_idx));
     variable key, value : string_ptr_t;
   begin
     if deallocate_item then
@@ -140,6 +180,7 @@ package body dict_pkg is
       recycle(str_pool, value);
     end if;
     set(bucket_keys, i, get(bucket_keys, bucket_length-1));
+    set(bucket_key_hashes, i, get(bucket_key_hashes, bucket_length-1));
     set(bucket_values, i, get(bucket_values, bucket_length-1));
     set(bucket_value_types, i, get(bucket_value_types, bucket_length-1));
     set(dict.p_bucket_lengths, bucket_idx, bucket_length-1);
@@ -151,66 +192,82 @@ package body dict_pkg is
     key_hash : natural;
     key      : string
   ) is
-    constant num_buckets : natural := length(dict.p_bucket_lengths);
-    constant bucket_idx : natural := key_hash mod num_buckets;
-    constant bucket_length : natural := get(dict.p_bucket_lengths, bucket_idx);
-    constant bucket_keys : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
+    constant bucket_idx : natural := bucket_index(dict, key_hash);
+    constant item_idx : integer := find_item(dict, bucket_idx, key_hash, key);
   begin
-    for i in 0 to bucket_length-1 loop
-      if to_string(to_string_ptr(get(bucket_keys, i))) = key then
-        remove(dict, bucket_idx, i);
-        return;
-      end if;
-    end loop;
+    if item_idx /= -1 then
+      remove(dict, bucket_idx, item_idx);
+    end if;
   end;
 
-  procedure insert_new (
+  procedure append_item (
     dict       : dict_t;
+    bucket_idx : natural;
     key_hash   : natural;
     key, value : string_ptr_t;
     value_type : data_type_t
-  );
+  ) is
+    constant bucket_length : natural := get(dict.p_bucket_lengths, bucket_idx);
+    constant bucket_values : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx));
+    constant bucket_value_types : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_value_types, bucket_idx));
+    constant bucket_keys : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
+    constant bucket_key_hashes : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_key_hashes, bucket_idx));
+    constant bucket_max_length : natural := length(bucket_keys);
+  begin
+    if bucket_length = bucket_max_length then
+      -- Bucket size to small, double it
+      resize(bucket_keys, 2*bucket_max_length);
+      resize(bucket_key_hashes, 2*bucket_max_length);
+      resize(bucket_values, 2*bucket_max_length);
+      resize(bucket_value_types, 2*bucket_max_length);
+    end if;
+    set(dict.p_meta, meta_num_keys, num_keys(dict)+1);
+    set(dict.p_bucket_lengths, bucket_idx, bucket_length+1);
+    set(bucket_keys, bucket_length, to_integer(key));
+    set(bucket_key_hashes, bucket_length, key_hash);
+    set(bucket_values, bucket_length, to_integer(value));
+    set(bucket_value_types, bucket_length, data_type_t'pos(value_type));
+  end;
 
   procedure relocate_items (
     dict : dict_t;
     old_num_buckets : natural
   ) is
-    constant num_buckets : natural := length(dict.p_bucket_lengths);
     variable bucket_values : integer_vector_ptr_t;
     variable bucket_value_types : integer_vector_ptr_t;
     variable bucket_keys : integer_vector_ptr_t;
+    variable bucket_key_hashes : integer_vector_ptr_t;
     variable idx : natural;
     variable key_hash : natural;
+    variable new_bucket_idx : natural;
     variable key : string_ptr_t;
     variable value : string_ptr_t;
     variable value_type : data_type_t;
   begin
     for bucket_idx in 0 to old_num_buckets-1 loop
       bucket_keys := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
+      bucket_key_hashes := to_integer_vector_ptr(get(dict.p_bucket_key_hashes, bucket_idx));
       bucket_values := to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx));
       bucket_value_types := to_integer_vector_ptr(get(dict.p_bucket_value_types, bucket_idx));
 
       idx := 0;
       while idx < get(dict.p_bucket_lengths, bucket_idx) loop
-        key := to_string_ptr(get(bucket_keys, idx));
-
-        key_hash := hash(to_string(key));
-        if key_hash mod num_buckets /= bucket_idx then
+        -- The cached hash avoids rehashing the key
+        key_hash := get(bucket_key_hashes, idx);
+        new_bucket_idx := bucket_index(dict, key_hash);
+        if new_bucket_idx /= bucket_idx then
           -- Key hash belongs in another bucket now
+          key := to_string_ptr(get(bucket_keys, idx));
           value := to_string_ptr(get(bucket_values, idx));
           value_type := data_type_t'val(get(bucket_value_types, idx));
 
           -- Move key
           remove(dict, bucket_idx, idx, deallocate_item => false);
-          insert_new(dict, key_hash, key, value, value_type);
+          append_item(dict, new_bucket_idx, key_hash, key, value, value_type);
         else
-
           idx := idx + 1;
         end if;
       end loop;
-
-      resize(bucket_keys, get(dict.p_bucket_lengths, bucket_idx));
-      resize(bucket_values, get(dict.p_bucket_lengths, bucket_idx));
     end loop;
   end;
 
@@ -222,15 +279,13 @@ package body dict_pkg is
   begin
     resize(dict.p_bucket_lengths, num_buckets);
     resize(dict.p_bucket_keys, num_buckets);
+    resize(dict.p_bucket_key_hashes, num_buckets);
     resize(dict.p_bucket_values, num_buckets);
     resize(dict.p_bucket_value_types, num_buckets);
 
     -- Create new buckets
     for i in old_num_buckets to num_buckets-1 loop
-      set(dict.p_bucket_keys, i, to_integer(new_integer_vector_ptr(int_pool, new_bucket_size)));
-      set(dict.p_bucket_values, i, to_integer(new_integer_vector_ptr(int_pool, new_bucket_size)));
-      set(dict.p_bucket_value_types, i, to_integer(new_integer_vector_ptr(int_pool, new_bucket_size)));
-      set(dict.p_bucket_lengths, i, 0);
+      new_bucket(dict, i);
     end loop;
 
     relocate_items(dict, old_num_buckets);
@@ -243,32 +298,12 @@ package body dict_pkg is
     value_type : data_type_t
   ) is
     constant num_buckets : natural := length(dict.p_bucket_lengths);
-    constant bucket_idx : natural := key_hash mod num_buckets;
-    constant bucket_length : natural := get(dict.p_bucket_lengths, bucket_idx);
-    constant bucket_values : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx));
-    constant bucket_value_types : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_value_types, bucket_idx));
-    constant bucket_keys : integer_vector_ptr_t := to_integer_vector_ptr(get(dict.p_bucket_keys, bucket_idx));
-    constant bucket_max_length : natural := length(bucket_values);
-    constant num_keys : natural := get(dict.p_meta, meta_num_keys);
   begin
-    if num_keys > num_buckets then
-      -- Average bucket length is larger than 1, reallocate
-      -- Occupancy is to high, resize
+    if num_keys(dict) >= max_load_factor * num_buckets then
+      -- Occupancy would become too high, double the number of buckets
       resize(dict, 2*num_buckets);
-      insert_new(dict, key_hash, key, value, value_type);
-      return;
-    elsif bucket_length = bucket_max_length then
-      -- Bucket size to small, resize
-      resize(bucket_keys, bucket_max_length+1);
-      resize(bucket_values, bucket_max_length+1);
-      resize(bucket_value_types, bucket_max_length+1);
     end if;
-    set(dict.p_meta, meta_num_keys, num_keys+1);
-    set(dict.p_bucket_lengths, bucket_idx, bucket_length+1);
-    -- Create new value storage
-    set(bucket_keys, bucket_length, to_integer(key));
-    set(bucket_values, bucket_length, to_integer(value));
-    set(bucket_value_types, bucket_length, data_type_t'pos(value_type));
+    append_item(dict, bucket_index(dict, key_hash), key_hash, key, value, value_type);
   end;
 
   impure function has_key (
@@ -317,9 +352,17 @@ package body dict_pkg is
     expected_value_type : data_type_t
   ) return string is
     constant key_hash : natural := hash(key);
-    constant value_ptr : string_ptr_t := get_value_ptr(dict, key_hash, key);
-    constant stored_value_type : data_type_t := get_value_type(dict, key_hash, key);
-  begin
+    constant bucket_idx : natural := bucket_index(dict, key_hash);
+    constant item_idx : integer := find_item(dict, bucket_idx, key_hash, key);
+    variable value_ptr : string_ptr_t := null_string_ptr;
+    variable stored_value_type : data_type_t := vhdl_character;
+  begin
+    if item_idx /= -1 then
+      value_ptr := to_string_ptr(get(to_integer_vector_ptr(get(dict.p_bucket_values, bucket_idx)), item_idx));
+      stored_value_type := data_type_t'val(get(to_integer_vector_ptr(get(dict.p_bucket_value_types, bucket_idx)),
+                                               item_idx));
+    end if;
+
     assert value_ptr /= null_string_ptr report "missing key '" & key & "'";
     if expected_value_type /= stored_value_type then
       report "Stored value for " & key & " is of type " & to_string(stored_value_type) &
@@ -750,6 +793,7 @@ package body dict_pkg is
     unsafe_push(queue, value.p_meta);
     unsafe_push(queue, value.p_bucket_lengths);
     unsafe_push(queue, value.p_bucket_keys);
+    unsafe_push(queue, value.p_bucket_key_hashes);
     unsafe_push(queue, value.p_bucket_values);
     unsafe_push(queue, value.p_bucket_value_types);
     value := null_dict;
@@ -764,6 +808,7 @@ package body dict_pkg is
       p_meta => unsafe_pop(queue),
       p_bucket_lengths => unsafe_pop(queue),
       p_bucket_keys => unsafe_pop(queue),
+      p_bucket_key_hashes => unsafe_pop(queue),
       p_bucket_values => unsafe_pop(queue),
       p_bucket_value_types => unsafe_pop(queue));
   end;
@@ -773,7 +818,7 @@ package body dict_pkg is
   ) return string is
   begin
     return encode(data.p_meta) & encode(data.p_bucket_lengths) & encode(data.p_bucket_keys) &
-    encode(data.p_bucket_values) & encode(data.p_bucket_value_types);
+    encode(data.p_bucket_key_hashes) & encode(data.p_bucket_values) & encode(data.p_bucket_value_types);
   end;
 
   function decode (
@@ -796,6 +841,7 @@ package body dict_pkg is
     decode(code, index, result.p_meta);
     decode(code, index, result.p_bucket_lengths);
     decode(code, index, result.p_bucket_keys);
+    decode(code, index, result.p_bucket_key_hashes);
     decode(code, index, result.p_bucket_values);
     decode(code, index, result.p_bucket_value_types);
   end;
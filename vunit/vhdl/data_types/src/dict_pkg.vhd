@@ -28,6 +28,7 @@ package dict_pkg is
     p_meta               : integer_vector_ptr_t;
     p_bucket_lengths     : integer_vector_ptr_t;
     p_bucket_keys        : integer_vector_ptr_t;
+    p_bucket_key_hashes  : integer_vector_ptr_t;
     p_bucket_values      : integer_vector_ptr_t;
     p_bucket_value_types : integer_vector_ptr_t;
   end record;
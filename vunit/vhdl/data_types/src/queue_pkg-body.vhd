@@ -44,9 +44,7 @@ package body queue_pkg is
   ) return queue_t is
     constant result : queue_t := new_queue;
   begin
-    for i in 0 to length(queue) - 1 loop
-      unsafe_push(result, get(queue.data, 1 + i));
-    end loop;
+    push_fix_string(result, get(queue.data, 1 + get(queue.p_meta, head_idx), length(queue)));
     return result;
   end;
 
@@ -155,23 +153,37 @@ package body queue_pkg is
   procedure push_fix_string (
     queue : queue_t;
     value : string
-  ) is begin
-    for i in value'range loop
-      unsafe_push(queue, value(i));
-    end loop;
+  ) is
+    variable tail : integer;
+    variable head : integer;
+  begin
+    assert queue /= null_queue report "Push to null queue";
+    tail := get(queue.p_meta, tail_idx);
+    head := get(queue.p_meta, head_idx);
+    if length(queue.data) < tail + value'length then
+      -- Allocate more new data, double data to avoid
+      -- to much copying.
+      -- Also normalize the queue by dropping unnused data before head
+      resize(queue.data, 2 * (tail - head + value'length) + 1, drop => head);
+      tail := tail - head;
+      head := 0;
+      set(queue.p_meta, head_idx, head);
+    end if;
+    set(queue.data, 1 + tail, value);
+    set(queue.p_meta, tail_idx, tail + value'length);
   end;
 
   impure function pop_fix_string (
     queue  : queue_t;
     length : natural
   ) return string is
-    variable result : string(1 to length);
+    variable head : integer;
   begin
-    for i in result'range loop
-      result(i) := unsafe_pop(queue);
-    end loop;
-
-    return result;
+    assert queue /= null_queue report "Pop from null queue";
+    assert work.queue_pkg.length(queue) >= length report "Pop from empty queue";
+    head := get(queue.p_meta, head_idx);
+    set(queue.p_meta, head_idx, head + length);
+    return get(queue.data, 1 + head, length);
   end;
 
   procedure unsafe_push (
@@ -615,4 +627,72 @@ package body queue_pkg is
     );
   end;
 
+  procedure push (
+    queue : queue_t;
+    value : integer_array_t
+  ) is
+    variable code : string(1 to value.length * integer_code_length);
+  begin
+    push_type(queue, vunit_integer_array_t_value);
+    unsafe_push(queue, value.length);
+    unsafe_push(queue, value.width);
+    unsafe_push(queue, value.height);
+    unsafe_push(queue, value.depth);
+    unsafe_push(queue, value.bit_width);
+    unsafe_push(queue, value.is_signed);
+    unsafe_push(queue, value.lower_limit);
+    unsafe_push(queue, value.upper_limit);
+
+    for i in 0 to value.length - 1 loop
+      code(1 + i * integer_code_length to (i + 1) * integer_code_length) := encode(get(value.data, i));
+    end loop;
+    push_fix_string(queue, code);
+  end;
+
+  impure function pop (
+    queue : queue_t
+  ) return integer_array_t is
+    variable length, width, height, depth, bit_width : natural;
+    variable is_signed : boolean;
+    variable lower_limit, upper_limit : integer;
+    variable data : integer_vector_ptr_t;
+
+    procedure set_decoded (
+      code : string
+    ) is begin
+      for i in 0 to length - 1 loop
+        set(data, i, decode(code(code'left + i * integer_code_length to code'left + (i + 1) * integer_code_length - 1)));
+      end loop;
+    end;
+
+  begin
+    check_type(queue, vunit_integer_array_t_value);
+
+    -- Assigning values to temporary varibles solves
+    -- a Questa bug.
+    length      := unsafe_pop(queue);
+    width       := unsafe_pop(queue);
+    height      := unsafe_pop(queue);
+    depth       := unsafe_pop(queue);
+    bit_width   := unsafe_pop(queue);
+    is_signed   := unsafe_pop(queue);
+    lower_limit := unsafe_pop(queue);
+    upper_limit := unsafe_pop(queue);
+
+    data := new_integer_vector_ptr(length);
+    set_decoded(pop_fix_string(queue, length * integer_code_length));
+
+    return (
+      length      => length,
+      width       => width,
+      height      => height,
+      depth       => depth,
+      bit_width   => bit_width,
+      is_signed   => is_signed,
+      lower_limit => lower_limit,
+      upper_limit => upper_limit,
+      data        => data
+    );
+  end;
+
 end package body;
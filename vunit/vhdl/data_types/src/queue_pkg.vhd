@@ -332,6 +332,21 @@ package queue_pkg is
   alias push_integer_array_t_ref is push_ref[queue_t, integer_array_t];
   alias pop_integer_array_t_ref is pop_ref[queue_t return integer_array_t];
 
+  -- Push a copy of the integer array. The elements are pushed as one block
+  -- rather than one at a time
+  procedure push (
+    queue : queue_t;
+    value : integer_array_t
+  );
+
+  -- Pop a copy of an integer array into a new integer array
+  impure function pop (
+    queue : queue_t
+  ) return integer_array_t;
+
+  alias push_integer_array_t is push[queue_t, integer_array_t];
+  alias pop_integer_array_t is pop[queue_t return integer_array_t];
+
   function encode (
     data : queue_t
   ) return string;
@@ -368,6 +383,8 @@ package queue_pkg is
     queue : queue_t
   ) return character;
 
+  -- Strings are pushed and popped as one block with a single update of the
+  -- queue head or tail
   procedure push_variable_string (
     queue : queue_t;
     value : string
@@ -36,6 +36,18 @@ package body string_ptr_pkg is
       index : positive
     ) return val_t;
 
+    procedure set (
+      ref   : natural;
+      index : positive;
+      value : vec_t
+    );
+
+    impure function get (
+      ref    : natural;
+      index  : positive;
+      length : natural
+    ) return vec_t;
+
     procedure reallocate (
       ref   : natural;
       value : vec_t
@@ -226,6 +238,43 @@ package body string_ptr_pkg is
       end case;
     end;
 
+    procedure set (
+      ref   : natural;
+      index : positive;
+      value : vec_t
+    ) is
+      variable s : storage_t := st.idxs(ref);
+      variable n_value : vec_t(1 to value'length) := value;
+    begin
+      case s.mode is
+        when internal =>
+          st.ptrs(s.id)(index to index + n_value'length - 1) := n_value;
+        when others =>
+          for i in n_value'range loop
+            set(ref, index + i - 1, n_value(i));
+          end loop;
+      end case;
+    end;
+
+    impure function get (
+      ref    : natural;
+      index  : positive;
+      length : natural
+    ) return vec_t is
+      variable s : storage_t := st.idxs(ref);
+      variable result : vec_t(1 to length);
+    begin
+      case s.mode is
+        when internal =>
+          result := st.ptrs(s.id)(index to index + length - 1);
+        when others =>
+          for i in result'range loop
+            result(i) := get(ref, index + i - 1);
+          end loop;
+      end case;
+      return result;
+    end;
+
     procedure reallocate (
       ref   : natural;
       value : vec_t
@@ -326,11 +375,8 @@ package body string_ptr_pkg is
     eid   : index_t := -1
   ) return ptr_t is
     variable ptr : string_ptr_t := new_string_ptr(value'length, mode, eid, val_t'low);
-    variable n_value : string(1 to value'length) := value;
   begin
-    for i in 1 to n_value'length loop
-      set(ptr, i, n_value(i));
-    end loop;
+    set(ptr, 1, value);
     return ptr;
   end;
 
@@ -367,6 +413,22 @@ package body string_ptr_pkg is
     return vec_ptr_storage.get(ptr.ref, index);
   end;
 
+  procedure set (
+    ptr   : ptr_t;
+    index : positive;
+    value : vec_t
+  ) is begin
+    vec_ptr_storage.set(ptr.ref, index, value);
+  end;
+
+  impure function get (
+    ptr    : ptr_t;
+    index  : positive;
+    length : natural
+  ) return vec_t is begin
+    return vec_ptr_storage.get(ptr.ref, index, length);
+  end;
+
   procedure reallocate (
     ptr    : ptr_t;
     length : natural;
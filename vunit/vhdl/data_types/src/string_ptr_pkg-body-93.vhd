@@ -120,11 +120,8 @@ package body string_ptr_pkg is
     eid   : index_t := -1
   ) return ptr_t is
     variable ptr : string_ptr_t := new_string_ptr(value'length, mode, eid, character'low);
-    variable n_value : string(1 to value'length) := value;
   begin
-    for i in 1 to n_value'length loop
-      set(ptr, i, n_value(i));
-    end loop;
+    set(ptr, 1, value);
     return ptr;
   end;
 
@@ -191,6 +188,43 @@ package body string_ptr_pkg is
     end case;
   end;
 
+  procedure set (
+    ptr   : ptr_t;
+    index : positive;
+    value : vec_t
+  ) is
+    variable s : storage_t := st.idxs(ptr.ref);
+    variable n_value : vec_t(1 to value'length) := value;
+  begin
+    case s.mode is
+      when internal =>
+        st.ptrs(s.id)(index to index + n_value'length - 1) := n_value;
+      when others =>
+        for i in n_value'range loop
+          set(ptr, index + i - 1, n_value(i));
+        end loop;
+    end case;
+  end;
+
+  impure function get (
+    ptr    : ptr_t;
+    index  : positive;
+    length : natural
+  ) return vec_t is
+    variable s : storage_t := st.idxs(ptr.ref);
+    variable result : vec_t(1 to length);
+  begin
+    case s.mode is
+      when internal =>
+        result := st.ptrs(s.id)(index to index + length - 1);
+      when others =>
+        for i in result'range loop
+          result(i) := get(ptr, index + i - 1);
+        end loop;
+    end case;
+    return result;
+  end;
+
   procedure reallocate (
     ptr    : ptr_t;
     length : natural;
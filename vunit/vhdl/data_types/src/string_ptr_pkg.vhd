@@ -75,6 +75,20 @@ package string_ptr_pkg is
     index : positive
   ) return val_t;
 
+  -- Set the characters starting at index to value in one operation
+  procedure set (
+    ptr   : ptr_t;
+    index : positive;
+    value : vec_t
+  );
+
+  -- Get length characters starting at index in one operation
+  impure function get (
+    ptr    : ptr_t;
+    index  : positive;
+    length : natural
+  ) return vec_t;
+
   procedure reallocate (
     ptr    : ptr_t;
     length : natural;
@@ -37,6 +37,7 @@ begin
     variable queue : queue_t;
     constant many_keys : natural := 2**13;
     constant long_key : string := "long--------------------------------------------------------key";
+    constant descending_key : string(4 downto 1) := "key0";
   begin
     test_runner_setup(runner, runner_cfg);
 
@@ -88,6 +89,19 @@ begin
       set_string(dict, "key", "value2");
       check(get_string(dict, "key") = "value2");
 
+    elsif run("test keys of equal length") then
+      dict := new_dict;
+      for i in 0 to 9 loop
+        set_string(dict, "key" & integer'image(i), integer'image(i));
+      end loop;
+
+      for i in 0 to 9 loop
+        check(get_string(dict, "key" & integer'image(i)) = integer'image(i));
+      end loop;
+      check(get_string(dict, descending_key) = "0");
+      check_false(has_key(dict, "key"));
+      check_false(has_key(dict, "key00"));
+
     elsif run("test set and get many keys") then
       dict := new_dict;
 
@@ -0,0 +1,75 @@
+-- This Source Code Form is subject to the terms of the Mozilla Public
+-- License, v. 2.0. If a copy of the MPL was not distributed with this file,
+-- You can obtain one at http://mozilla.org/MPL/2.0/.
+--
+-- Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+-- Benchmark of the dict access rate with scoreboard like keys. Each test
+-- makes num_transactions accesses such that the access rate is
+-- num_transactions divided by the test time reported by VUnit.
+
+library vunit_lib;
+use vunit_lib.check_pkg.all;
+use vunit_lib.logger_pkg.all;
+use vunit_lib.run_pkg.all;
+use work.dict_pkg.all;
+
+entity tb_dict_benchmark is
+  generic (
+    runner_cfg : string;
+    num_transactions : positive := 100000);
+end entity;
+
+architecture a of tb_dict_benchmark is
+begin
+  main : process
+    variable dict : dict_t;
+
+    function key(id : natural) return string is
+    begin
+      return "transaction_id_" & integer'image(id);
+    end;
+
+    procedure set_all_keys is
+    begin
+      for i in 0 to num_transactions - 1 loop
+        set_integer(dict, key(i), i);
+      end loop;
+    end;
+  begin
+    test_runner_setup(runner, runner_cfg);
+
+    while test_suite loop
+      dict := new_dict;
+
+      if run("Test set rate") then
+        set_all_keys;
+        check_equal(num_keys(dict), num_transactions);
+
+      elsif run("Test get rate") then
+        set_all_keys;
+        for i in 0 to num_transactions - 1 loop
+          check(get_integer(dict, key(i)) = i);
+        end loop;
+
+      elsif run("Test has_key rate of missing keys") then
+        set_all_keys;
+        for i in num_transactions to 2 * num_transactions - 1 loop
+          check(not has_key(dict, key(i)));
+        end loop;
+
+      elsif run("Test remove rate") then
+        set_all_keys;
+        for i in 0 to num_transactions - 1 loop
+          remove(dict, key(i));
+        end loop;
+        check_equal(num_keys(dict), 0);
+      end if;
+
+      info("Accessed " & integer'image(num_transactions) & " keys");
+      deallocate(dict);
+    end loop;
+
+    test_runner_cleanup(runner);
+  end process;
+end architecture;
@@ -323,6 +323,54 @@ begin
       assert integer_array = null_integer_array;
       assert pop_integer_array_t_ref(queue) = integer_array_copy;
 
+    elsif run("Test push and pop copy of integer_array_t") then
+      queue := new_queue;
+      integer_array := new_3d(2, 3, 4, 9, is_signed => true);
+      for i in 0 to length(integer_array) - 1 loop
+        set(integer_array, i, i - 12);
+      end loop;
+      push_integer_array_t(queue, integer_array);
+      set(integer_array, 0, 100);
+
+      integer_array_copy := pop_integer_array_t(queue);
+      check(is_empty(queue), "Empty queue");
+      check(integer_array_copy.data /= integer_array.data, "Copied data");
+      check_equal(width(integer_array_copy), 2);
+      check_equal(height(integer_array_copy), 3);
+      check_equal(depth(integer_array_copy), 4);
+      check_equal(bit_width(integer_array_copy), 9);
+      check(is_signed(integer_array_copy), "Signed");
+      check_equal(length(integer_array_copy), 24);
+      for i in 0 to length(integer_array_copy) - 1 loop
+        check_equal(get(integer_array_copy, i), i - 12);
+      end loop;
+
+      push_integer_array_t(queue, new_1d);
+      check_equal(length(pop_integer_array_t(queue)), 0);
+
+    elsif run("Test push and pop long strings across resize") then
+      queue := new_queue;
+      push_string(queue, test_string1);
+      push_integer(queue, 7);
+      check_equal(pop_string(queue), test_string1);
+      for i in 1 to 10 loop
+        push_string(queue, string'(1 to 100 * i => character'val(i)));
+        check_equal(pop_integer(queue), 7 + i - 1);
+        push_integer(queue, 7 + i);
+        check_equal(pop_string(queue), string'(1 to 100 * i => character'val(i)));
+      end loop;
+      check_equal(pop_integer(queue), 17);
+      check(is_empty(queue), "Empty queue");
+
+    elsif run("Test copy of partially popped queue") then
+      queue := new_queue;
+      push_integer(queue, 1);
+      push_string(queue, "hello");
+      check_equal(pop_integer(queue), 1);
+      queue_copy := copy(queue);
+      check_equal(length(queue_copy), length(queue));
+      check_equal(pop_string(queue_copy), "hello");
+
     elsif run("Test codecs") then
       queue := new_queue;
       check(decode(encode(queue)) = queue);
@@ -0,0 +1,85 @@
+-- This Source Code Form is subject to the terms of the Mozilla Public
+-- License, v. 2.0. If a copy of the MPL was not distributed with this file,
+-- You can obtain one at http://mozilla.org/MPL/2.0/.
+--
+-- Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+-- Benchmark of the queue throughput when frames are pushed and popped one
+-- element at a time compared to as one block. The throughput is the number
+-- of frames times the frame length divided by the test time reported by VUnit.
+
+library vunit_lib;
+use vunit_lib.check_pkg.all;
+use vunit_lib.logger_pkg.all;
+use vunit_lib.run_pkg.all;
+use vunit_lib.integer_array_pkg.all;
+use work.queue_pkg.all;
+
+entity tb_queue_benchmark is
+  generic (
+    runner_cfg : string;
+    frame_length : positive := 1024;
+    num_frames : positive := 100);
+end entity;
+
+architecture a of tb_queue_benchmark is
+begin
+  main : process
+    variable queue : queue_t;
+    variable frame : string(1 to frame_length);
+    variable integer_array, integer_array_copy : integer_array_t;
+  begin
+    test_runner_setup(runner, runner_cfg);
+
+    queue := new_queue;
+    for i in frame'range loop
+      frame(i) := character'val(i mod 256);
+    end loop;
+    integer_array := new_1d(frame_length);
+    for i in 0 to frame_length - 1 loop
+      set(integer_array, i, i);
+    end loop;
+
+    while test_suite loop
+      if run("Test push and pop bytes per element") then
+        for n in 1 to num_frames loop
+          for i in frame'range loop
+            push_character(queue, frame(i));
+          end loop;
+          for i in frame'range loop
+            check(pop_character(queue) = frame(i));
+          end loop;
+        end loop;
+
+      elsif run("Test push and pop bytes as string") then
+        for n in 1 to num_frames loop
+          push_string(queue, frame);
+          check(pop_string(queue) = frame);
+        end loop;
+
+      elsif run("Test push and pop integers per element") then
+        for n in 1 to num_frames loop
+          for i in 0 to frame_length - 1 loop
+            push_integer(queue, get(integer_array, i));
+          end loop;
+          for i in 0 to frame_length - 1 loop
+            check(pop_integer(queue) = i);
+          end loop;
+        end loop;
+
+      elsif run("Test push and pop integers as integer_array_t") then
+        for n in 1 to num_frames loop
+          push_integer_array_t(queue, integer_array);
+          integer_array_copy := pop_integer_array_t(queue);
+          check(get(integer_array_copy, frame_length - 1) = frame_length - 1);
+          deallocate(integer_array_copy);
+        end loop;
+      end if;
+
+      info("Pushed and popped " & integer'image(num_frames) & " frames of " & integer'image(frame_length) &
+           " elements");
+    end loop;
+
+    test_runner_cleanup(runner);
+  end process;
+end architecture;
@@ -64,6 +64,16 @@ begin
         assert get(ptr, 1) = a_random_value report
           "Checking that ptr was not affected by ptr2";
 
+      elsif run("test_slice_access") then
+        ptr := new_string_ptr("abcdefgh");
+        set(ptr, 3, "XYZ");
+        assert to_string(ptr) = "abXYZfgh";
+        assert get(ptr, 2, 5) = "bXYZf";
+        assert get(ptr, 8, 1) = "h";
+        assert get(ptr, 4, 0) = "";
+        set(ptr, 1, "");
+        assert to_string(ptr) = "abXYZfgh";
+
       elsif run("test_resize") then
         ptr := new_string_ptr(1);
         check_equal(length(ptr), 1);
@@ -10,6 +10,19 @@ package body memory_pkg is
   constant num_buffers_idx : natural := 1;
   constant num_meta : natural := num_buffers_idx + 1;
 
+  -- The data is stored in pages of page_size bytes which are created on first write. p_data is the page
+  -- table holding the pointer of each page or null_ptr for a page that has not been written.
+  constant page_size : positive := 4096;
+  constant null_page : integer := to_integer(null_ptr);
+
+  -- The fields of each buffer in p_buffers. Buffers are allocated at increasing addresses such that the
+  -- buffers are sorted on their base address.
+  constant buffer_name_idx : natural := 0;
+  constant buffer_address_idx : natural := 1;
+  constant buffer_num_bytes_idx : natural := 2;
+  constant buffer_permissions_idx : natural := 3;
+  constant num_buffer_fields : natural := buffer_permissions_idx + 1;
+
   type memory_data_t is record
     byte : byte_t;
     exp : byte_t;
@@ -33,8 +46,15 @@ package body memory_pkg is
   end;
 
   procedure clear(memory : memory_t) is
+    variable page : integer_vector_ptr_t;
   begin
     assert memory /= null_memory;
+    for page_idx in 0 to length(memory.p_data)-1 loop
+      page := to_integer_vector_ptr(get(memory.p_data, page_idx));
+      if page /= null_ptr then
+        deallocate(page);
+      end if;
+    end loop;
     set(memory.p_meta, num_bytes_idx, 0);
     set(memory.p_meta, num_buffers_idx, 0);
     reallocate(memory.p_data, 0);
@@ -70,6 +90,102 @@ package body memory_pkg is
     return result;
   end;
 
+  impure function get_buffer_field(memory : memory_t; buffer_idx : natural; field_idx : natural) return integer is
+  begin
+    return get(memory.p_buffers, num_buffer_fields*buffer_idx + field_idx);
+  end;
+
+  -- Return the index of the last buffer with a base address not above the address or -1 if there is none
+  impure function find_buffer(memory : memory_t; address : natural) return integer is
+    variable low : integer := 0;
+    variable high : integer := get(memory.p_meta, num_buffers_idx) - 1;
+    variable mid : natural;
+  begin
+    while low <= high loop
+      mid := (low + high) / 2;
+      if get_buffer_field(memory, mid, buffer_address_idx) <= address then
+        low := mid + 1;
+      else
+        high := mid - 1;
+      end if;
+    end loop;
+    return high;
+  end;
+
+  -- Return the encoded data of an address within a page that has not been written
+  impure function default_data(memory : memory_t; address : natural) return integer is
+    constant buffer_idx : integer := find_buffer(memory, address);
+    variable permissions : permissions_t := no_access;
+  begin
+    if buffer_idx >= 0 then
+      if address < (get_buffer_field(memory, buffer_idx, buffer_address_idx) +
+                    get_buffer_field(memory, buffer_idx, buffer_num_bytes_idx)) then
+        permissions := permissions_t'val(get_buffer_field(memory, buffer_idx, buffer_permissions_idx));
+      end if;
+    end if;
+    return encode((byte => 0, exp => 0, has_exp => false, perm => permissions));
+  end;
+
+  -- Set the default data of the addresses of the page which are within the buffer
+  procedure set_default_data(memory : memory_t;
+                             page : integer_vector_ptr_t;
+                             page_address : natural;
+                             buffer_idx : natural) is
+    constant address : natural := get_buffer_field(memory, buffer_idx, buffer_address_idx);
+    constant num_bytes : natural := get_buffer_field(memory, buffer_idx, buffer_num_bytes_idx);
+    constant permissions : permissions_t := permissions_t'val(
+      get_buffer_field(memory, buffer_idx, buffer_permissions_idx));
+    constant first : integer := maximum(address, page_address);
+    constant last : integer := minimum(address + num_bytes - 1, page_address + (page_size - 1));
+  begin
+    for addr in first to last loop
+      set(page, addr - page_address, encode((byte => 0, exp => 0, has_exp => false, perm => permissions)));
+    end loop;
+  end;
+
+  -- Return the page holding the address. A page that has not been written is created when create is
+  -- true and is otherwise returned as null_ptr.
+  impure function get_page(memory : memory_t; address : natural; create : boolean) return integer_vector_ptr_t is
+    constant page_idx : natural := address / page_size;
+    constant page_address : natural := page_idx * page_size;
+    variable page : integer_vector_ptr_t := to_integer_vector_ptr(get(memory.p_data, page_idx));
+    variable buffer_idx : integer;
+  begin
+    if page /= null_ptr or not create then
+      return page;
+    end if;
+
+    page := new_integer_vector_ptr(page_size,
+                                   value => encode((byte => 0, exp => 0, has_exp => false, perm => no_access)));
+
+    buffer_idx := maximum(find_buffer(memory, page_address), 0);
+    while buffer_idx < get(memory.p_meta, num_buffers_idx) loop
+      exit when get_buffer_field(memory, buffer_idx, buffer_address_idx) > page_address + (page_size - 1);
+      set_default_data(memory, page, page_address, buffer_idx);
+      buffer_idx := buffer_idx + 1;
+    end loop;
+
+    set(memory.p_data, page_idx, to_integer(page));
+    return page;
+  end;
+
+  -- Return the encoded data of an address
+  impure function get_data(memory : memory_t; address : natural) return integer is
+    constant page : integer_vector_ptr_t := get_page(memory, address, create => false);
+  begin
+    if page = null_ptr then
+      return default_data(memory, address);
+    end if;
+    return get(page, address mod page_size);
+  end;
+
+  -- Set the encoded data of an address
+  procedure set_data(memory : memory_t; address : natural; value : integer) is
+    constant page : integer_vector_ptr_t := get_page(memory, address, create => true);
+  begin
+    set(page, address mod page_size, value);
+  end;
+
   impure function allocate(memory : memory_t;
                            num_bytes : natural;
                            name : string := "";
@@ -77,6 +193,8 @@ package body memory_pkg is
                            permissions : permissions_t := read_and_write) return buffer_t is
     variable buf : buffer_t;
     variable num_buffers : natural;
+    variable num_pages : natural;
+    variable page : integer_vector_ptr_t;
   begin
     buf.p_memory_ref := memory;
     buf.p_name := new_string_ptr(name);
@@ -85,27 +203,34 @@ package body memory_pkg is
     buf.p_num_bytes := num_bytes;
     set(memory.p_meta, num_bytes_idx, last_address(buf)+1);
 
-    if length(memory.p_data) < last_address(buf) + 1 then
-      -- Allocate exponentially more memory to avoid to much copying
-      resize(memory.p_data, 2*last_address(buf) + 1, value => encode((byte => 0, exp => 0, has_exp => false, perm => no_access)));
+    num_pages := last_address(buf) / page_size + 1;
+    if length(memory.p_data) < num_pages then
+      -- Allocate exponentially more pages to avoid to much copying
+      resize(memory.p_data, 2*num_pages, value => null_page);
     end if;
 
     num_buffers := get(memory.p_meta, num_buffers_idx) + 1;
 
     set(memory.p_meta, num_buffers_idx, num_buffers);
-    if length(memory.p_buffers) < num_buffers*3 then
+    if length(memory.p_buffers) < num_buffers*num_buffer_fields then
       -- Allocate exponentially more memory to avoid to much copying
-      resize(memory.p_buffers, 2*num_buffers*3);
+      resize(memory.p_buffers, 2*num_buffers*num_buffer_fields);
     end if;
 
-    set(memory.p_buffers, 3*num_buffers-3, to_integer(buf.p_name));
-    set(memory.p_buffers, 3*num_buffers-2, buf.p_address);
-    set(memory.p_buffers, 3*num_buffers-1, buf.p_num_bytes);
-
-    -- Set default access type
-    for i in 0 to num_bytes-1 loop
-      set(memory.p_data, buf.p_address + i, encode((byte => 0, exp => 0, has_exp => false, perm => permissions)));
-    end loop;
+    set(memory.p_buffers, num_buffer_fields*(num_buffers-1) + buffer_name_idx, to_integer(buf.p_name));
+    set(memory.p_buffers, num_buffer_fields*(num_buffers-1) + buffer_address_idx, buf.p_address);
+    set(memory.p_buffers, num_buffer_fields*(num_buffers-1) + buffer_num_bytes_idx, buf.p_num_bytes);
+    set(memory.p_buffers, num_buffer_fields*(num_buffers-1) + buffer_permissions_idx,
+        permissions_t'pos(permissions));
+
+    -- The pages of the buffer are created with the default access type on first write. Only the
+    -- first page may have been written before as it can be shared with the previous buffer.
+    if num_bytes > 0 then
+      page := get_page(memory, buf.p_address, create => false);
+      if page /= null_ptr then
+        set_default_data(memory, page, buf.p_address - buf.p_address mod page_size, num_buffers-1);
+      end if;
+    end if;
     return buf;
   end function;
 
@@ -130,21 +255,18 @@ package body memory_pkg is
   end function;
 
   impure function address_to_allocation(memory : memory_t; address : natural) return buffer_t is
+    constant buffer_idx : integer := find_buffer(memory, address);
     variable buf : buffer_t;
   begin
-    -- @TODO use bisection for speedup
-    for i in 0 to get(memory.p_meta, num_buffers_idx)-1 loop
-      buf.p_address := get(memory.p_buffers, 3*i+1);
+    if buffer_idx >= 0 then
+      buf.p_address := get_buffer_field(memory, buffer_idx, buffer_address_idx);
+      buf.p_num_bytes := get_buffer_field(memory, buffer_idx, buffer_num_bytes_idx);
 
-      if address >= buf.p_address then
-        buf.p_num_bytes := get(memory.p_buffers, 3*i+2);
-
-        if address < buf.p_address + buf.p_num_bytes then
-          buf.p_name := to_string_ptr(get(memory.p_buffers, 3*i));
-          return buf;
-        end if;
+      if address < buf.p_address + buf.p_num_bytes then
+        buf.p_name := to_string_ptr(get_buffer_field(memory, buffer_idx, buffer_name_idx));
+        return buf;
       end if;
-    end loop;
+    end if;
 
     return null_buffer;
   end;
@@ -152,7 +274,7 @@ package body memory_pkg is
   impure function check_write_data(memory : memory_t;
                                    address : natural;
                                    byte : byte_t) return boolean is
-    constant memory_data : memory_data_t := decode(get(memory.p_data, address));
+    constant memory_data : memory_data_t := decode(get_data(memory, address));
   begin
     if memory_data.has_exp and byte /= memory_data.exp then
       failure(memory.p_logger, "Writing to " & describe_address(memory, address) &
@@ -175,20 +297,26 @@ package body memory_pkg is
       end if;
     end function;
 
+    variable memory_data : memory_data_t;
   begin
-    if length(memory.p_data) = 0 then
+    if num_bytes(memory) = 0 then
       failure(memory.p_logger, verb & " empty memory");
       return false;
-    elsif address >= length(memory.p_data) then
-      failure(memory.p_logger, verb & " address " & to_string(address) & " out of range 0 to " & to_string(length(memory.p_data)-1));
+    elsif address >= num_bytes(memory) then
+      failure(memory.p_logger, verb & " address " & to_string(address) & " out of range 0 to " & to_string(num_bytes(memory)-1));
       return false;
-    elsif check_permissions and get_permissions(memory, address) = no_access then
+    elsif not check_permissions then
+      return true;
+    end if;
+
+    memory_data := decode(get_data(memory, address));
+    if memory_data.perm = no_access then
       failure(memory.p_logger, verb & " " & describe_address(memory, address) & " without permission (no_access)");
       return false;
-    elsif check_permissions and reading and get_permissions(memory, address) = write_only then
+    elsif reading and memory_data.perm = write_only then
       failure(memory.p_logger, verb & " " & describe_address(memory, address) & " without permission (write_only)");
       return false;
-    elsif check_permissions and not reading and get_permissions(memory, address) = read_only then
+    elsif not reading and memory_data.perm = read_only then
       failure(memory.p_logger, verb & " " & describe_address(memory, address) & " without permission (read_only)");
       return false;
     end if;
@@ -203,7 +331,7 @@ package body memory_pkg is
     if not check_address(memory, address, reading, check_permissions) then
       return decode(0);
     end if;
-    return decode(get(memory.p_data, address));
+    return decode(get_data(memory, address));
   end;
 
   impure function num_bytes(memory : memory_t) return natural is
@@ -214,8 +342,8 @@ package body memory_pkg is
   procedure write_byte_unchecked(memory : memory_t; address : natural; byte : byte_t) is
     variable old : memory_data_t;
   begin
-    old := decode(get(memory.p_data, address));
-    set(memory.p_data, address, encode((byte => byte, exp => old.exp, has_exp => old.has_exp, perm => old.perm)));
+    old := decode(get_data(memory, address));
+    set_data(memory, address, encode((byte => byte, exp => old.exp, has_exp => old.has_exp, perm => old.perm)));
   end;
 
   procedure write_byte(memory : memory_t; address : natural; byte : byte_t) is
@@ -235,31 +363,126 @@ package body memory_pkg is
     return get(memory, address, true, memory.p_check_permissions).byte;
   end;
 
-  procedure check_expected_was_written(memory : memory_t; address : natural; num_bytes : natural) is
+  -- Write bytes to consecutive addresses looking up the page once per page rather than once per byte.
+  -- A byte failing the address, permission or expected data check is left to write_byte to report.
+  procedure write_bytes(memory : memory_t; address : natural; bytes : integer_vector) is
+    constant memory_num_bytes : natural := num_bytes(memory);
+    constant bytes_i : integer_vector(0 to bytes'length-1) := bytes;
+    variable page : integer_vector_ptr_t := null_ptr;
+    variable page_idx : integer := -1;
+    variable addr : natural;
+    variable old : memory_data_t;
+  begin
+    for idx in bytes_i'range loop
+      addr := address + idx;
+
+      if addr >= memory_num_bytes then
+        write_byte(memory, addr, bytes_i(idx));
+      else
+        if addr / page_size /= page_idx then
+          page_idx := addr / page_size;
+          page := get_page(memory, addr, create => true);
+        end if;
+
+        old := decode(get(page, addr mod page_size));
+        if ((memory.p_check_permissions and (old.perm = no_access or old.perm = read_only)) or
+            (old.has_exp and old.exp /= bytes_i(idx))) then
+          write_byte(memory, addr, bytes_i(idx));
+        else
+          set(page, addr mod page_size,
+              encode((byte => bytes_i(idx), exp => old.exp, has_exp => old.has_exp, perm => old.perm)));
+        end if;
+      end if;
+    end loop;
+  end;
+
+  -- Read bytes from consecutive addresses looking up the page once per page rather than once per byte.
+  -- A byte failing the address or permission check is left to read_byte to report.
+  impure function read_bytes(memory : memory_t; address : natural; bytes_per_word : positive) return integer_vector is
+    constant memory_num_bytes : natural := num_bytes(memory);
+    variable result : integer_vector(0 to bytes_per_word-1);
+    variable page : integer_vector_ptr_t := null_ptr;
+    variable page_idx : integer := -1;
+    variable addr : natural;
     variable memory_data : memory_data_t;
   begin
-    for addr in address to address + num_bytes - 1 loop
-      memory_data := decode(get(memory.p_data, addr));
-      if memory_data.has_exp and memory_data.byte /= memory_data.exp then
-        failure(memory.p_logger, "The " & describe_address(memory, addr) &
-                " was never written with expected byte " & to_string(memory_data.exp));
+    for idx in result'range loop
+      addr := address + idx;
+
+      if addr >= memory_num_bytes then
+        result(idx) := read_byte(memory, addr);
+      else
+        if addr / page_size /= page_idx then
+          page_idx := addr / page_size;
+          page := get_page(memory, addr, create => false);
+        end if;
+
+        if page = null_ptr then
+          memory_data := decode(default_data(memory, addr));
+        else
+          memory_data := decode(get(page, addr mod page_size));
+        end if;
+
+        if memory.p_check_permissions and (memory_data.perm = no_access or memory_data.perm = write_only) then
+          result(idx) := read_byte(memory, addr);
+        else
+          result(idx) := memory_data.byte;
+        end if;
       end if;
     end loop;
-  end procedure;
+    return result;
+  end;
 
-  impure function expected_was_written(memory    : memory_t;
-                                       address   : natural;
-                                       num_bytes : natural) return boolean is
+  -- Check that all expected bytes within the address range were written. Each failure is logged when
+  -- log_failures is true, otherwise the check stops at the first failure. Pages that have not been
+  -- written have no expected bytes and are skipped.
+  procedure check_expected(memory : memory_t;
+                           address : natural;
+                           num_bytes : natural;
+                           log_failures : boolean;
+                           result : out boolean) is
+    variable page : integer_vector_ptr_t;
+    variable page_address : natural;
     variable memory_data : memory_data_t;
   begin
-    for addr in address to address + num_bytes - 1 loop
-      memory_data := decode(get(memory.p_data, addr));
-      if memory_data.has_exp and memory_data.byte /= memory_data.exp then
-        return false;
+    result := true;
+    if num_bytes = 0 then
+      return;
+    end if;
+
+    for page_idx in address / page_size to (address + num_bytes - 1) / page_size loop
+      page_address := page_idx * page_size;
+      page := get_page(memory, page_address, create => false);
+
+      if page /= null_ptr then
+        for addr in maximum(address, page_address) to minimum(address + num_bytes - 1, page_address + (page_size - 1)) loop
+          memory_data := decode(get(page, addr - page_address));
+          if memory_data.has_exp and memory_data.byte /= memory_data.exp then
+            result := false;
+            if not log_failures then
+              return;
+            end if;
+            failure(memory.p_logger, "The " & describe_address(memory, addr) &
+                    " was never written with expected byte " & to_string(memory_data.exp));
+          end if;
+        end loop;
       end if;
     end loop;
+  end procedure;
 
-    return true;
+  procedure check_expected_was_written(memory : memory_t; address : natural; num_bytes : natural) is
+    variable result : boolean;
+  begin
+    check_expected(memory, address, num_bytes, true, result);
+  end procedure;
+
+  impure function expected_was_written(memory    : memory_t;
+                                       address   : natural;
+                                       num_bytes : natural) return boolean is
+    variable result : boolean;
+  begin
+    check_expected(memory, address, num_bytes, false, result);
+    return result;
   end;
 
   procedure check_expected_was_written(buf : buffer_t) is
@@ -293,8 +516,8 @@ package body memory_pkg is
     if not check_address(memory, address, false) then
       return;
     end if;
-    old := decode(get(memory.p_data, address));
-    set(memory.p_data, address, encode((byte => old.byte, exp => old.exp, has_exp => old.has_exp, perm => permissions)));
+    old := decode(get_data(memory, address));
+    set_data(memory, address, encode((byte => old.byte, exp => old.exp, has_exp => old.has_exp, perm => permissions)));
   end procedure;
 
   impure function has_expected_byte(memory : memory_t; address : natural) return boolean is
@@ -308,8 +531,8 @@ package body memory_pkg is
     if not check_address(memory, address, false) then
       return;
     end if;
-    old := decode(get(memory.p_data, address));
-    set(memory.p_data, address, encode((byte => old.byte, exp => 0, has_exp => false, perm => old.perm)));
+    old := decode(get_data(memory, address));
+    set_data(memory, address, encode((byte => old.byte, exp => 0, has_exp => false, perm => old.perm)));
   end procedure;
 
   procedure set_expected_byte(memory : memory_t; address : natural; expected : byte_t) is
@@ -318,8 +541,8 @@ package body memory_pkg is
     if not check_address(memory, address, false) then
       return;
     end if;
-    old := decode(get(memory.p_data, address));
-    set(memory.p_data, address, encode((byte => old.byte, exp => expected, has_exp => true, perm => old.perm)));
+    old := decode(get_data(memory, address));
+    set_data(memory, address, encode((byte => old.byte, exp => expected, has_exp => true, perm => old.perm)));
   end procedure;
 
   impure function get_expected_byte(memory : memory_t; address : natural) return byte_t is
@@ -418,19 +641,17 @@ package body memory_pkg is
     -- Normalize to downto range to enable std_logic_vector literals which are
     -- 1 to N
     constant word_i : std_logic_vector(word'length-1 downto 0) := word;
+    variable bytes : integer_vector(0 to word_i'length/8-1);
   begin
-    case endianness is
-      when big_endian =>
-        for idx in 0 to word_i'length/8-1 loop
-          write_byte(memory, address + word_i'length/8 - 1 - idx,
-                     to_integer(unsigned(word_i(8*idx+7 downto 8*idx))));
-        end loop;
-      when little_endian =>
-        for idx in 0 to word_i'length/8-1 loop
-          write_byte(memory, address + idx,
-                     to_integer(unsigned(word_i(8*idx+7 downto 8*idx))));
-        end loop;
-    end case;
+    for idx in bytes'range loop
+      case endianness is
+        when big_endian =>
+          bytes(bytes'length - 1 - idx) := to_integer(unsigned(word_i(8*idx+7 downto 8*idx)));
+        when little_endian =>
+          bytes(idx) := to_integer(unsigned(word_i(8*idx+7 downto 8*idx)));
+      end case;
+    end loop;
+    write_bytes(memory, address, bytes);
   end procedure;
 
 
@@ -439,6 +660,7 @@ package body memory_pkg is
                             bytes_per_word : positive;
                             endian : endianness_arg_t := default_endian) return std_logic_vector is
     constant endianness : endianness_t := evaluate_endian(memory, endian);
+    constant bytes : integer_vector(0 to bytes_per_word-1) := read_bytes(memory, address, bytes_per_word);
     variable result : std_logic_vector(8*bytes_per_word-1 downto 0);
     variable bidx : natural;
   begin
@@ -450,8 +672,7 @@ package body memory_pkg is
           bidx := idx;
       end case;
 
-      result(8*bidx+7 downto 8*bidx) := std_logic_vector(
-        to_unsigned(read_byte(memory, address + idx), 8));
+      result(8*bidx+7 downto 8*bidx) := std_logic_vector(to_unsigned(bytes(idx), 8));
 
     end loop;
     return result;
@@ -467,12 +688,36 @@ package body memory_pkg is
                                                  bytes_per_word,
                                                  evaluate_endian(memory, endian));
   begin
-    for byte_idx in 0 to bytes_per_word-1 loop
-      write_byte(memory, address + byte_idx,
-                 bytes(byte_idx));
-    end loop;
+    write_bytes(memory, address, bytes);
   end procedure;
 
+  impure function read_integer(memory : memory_t;
+                               address : natural;
+                               bytes_per_word : natural range 1 to 4 := 4;
+                               endian : endianness_arg_t := default_endian) return integer is
+    constant endianness : endianness_t := evaluate_endian(memory, endian);
+    constant bytes : integer_vector(0 to bytes_per_word-1) := read_bytes(memory, address, bytes_per_word);
+    variable byte : integer;
+    variable result : integer := 0;
+  begin
+    -- Most significant byte first
+    for idx in 0 to bytes_per_word-1 loop
+      case endianness is
+        when big_endian =>
+          byte := bytes(idx);
+        when little_endian =>
+          byte := bytes(bytes_per_word - 1 - idx);
+      end case;
+
+      if idx = 0 and bytes_per_word = 4 and byte >= 128 then
+        -- Negative two's complement word
+        byte := byte - 256;
+      end if;
+      result := 256*result + byte;
+    end loop;
+    return result;
+  end;
+
   impure function to_vc_interface(memory : memory_t;
 
                                   -- Override logger, null_logger means no override
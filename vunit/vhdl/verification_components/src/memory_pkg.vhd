@@ -76,6 +76,13 @@ package memory_pkg is
                           bytes_per_word : natural range 1 to 4 := 4;
                           endian : endianness_arg_t := default_endian);
 
+  -- Read integer, the word is a two's complement number when bytes_per_word is 4
+  -- and an unsigned number otherwise
+  impure function read_integer(memory : memory_t;
+                               address : natural;
+                               bytes_per_word : natural range 1 to 4 := 4;
+                               endian : endianness_arg_t := default_endian) return integer;
+
   -----------------------------------------------------
   -- Memory access permission control functions
   -----------------------------------------------------
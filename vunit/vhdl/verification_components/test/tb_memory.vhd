@@ -371,6 +371,83 @@ begin
       check_equal(read_word(memory, 7, 5), std_logic_vector'(x"aaffbbccdd"));
       check_equal(read_word(memory, 7, 1), std_logic_vector'(x"aa"));
       check_equal(read_word(memory, 8, 1), std_logic_vector'(x"ff"));
+
+    elsif run("Test read_integer") then
+      memory := new_memory;
+      buf := allocate(memory, 4);
+
+      for bytes_per_word in 1 to 3 loop
+        write_integer(memory, 0, 2**(8*bytes_per_word) - 2, bytes_per_word => bytes_per_word);
+        check_equal(read_integer(memory, 0, bytes_per_word => bytes_per_word), 2**(8*bytes_per_word) - 2);
+        write_integer(memory, 0, 16#12#, bytes_per_word => bytes_per_word, endian => big_endian);
+        check_equal(read_integer(memory, 0, bytes_per_word => bytes_per_word, endian => big_endian), 16#12#);
+      end loop;
+
+      write_integer(memory, 0, 16#11223344#);
+      check_equal(read_integer(memory, 0), 16#11223344#);
+      check_equal(read_integer(memory, 0, endian => big_endian), 16#44332211#);
+      check_equal(read_integer(memory, 0, bytes_per_word => 1), 16#44#);
+
+      write_integer(memory, 0, -2);
+      check_equal(read_integer(memory, 0), -2);
+      write_integer(memory, 0, integer'low, endian => big_endian);
+      check_equal(read_integer(memory, 0, endian => big_endian), integer'low);
+
+    elsif run("Test access words crossing pages") then
+      memory := new_memory;
+      buf := allocate(memory, 3*4096);
+
+      write_integer(memory, 4094, 16#11223344#);
+      check_equal(read_integer(memory, 4094), 16#11223344#);
+      check_equal(read_byte(memory, 4095), 16#33#);
+      check_equal(read_byte(memory, 4096), 16#22#);
+
+      write_word(memory, 2*4096-1, x"aabb", endian => big_endian);
+      check_equal(read_word(memory, 2*4096-1, 2, endian => big_endian), std_logic_vector'(x"aabb"));
+
+    elsif run("Test allocate large sparse buffers") then
+      memory := new_memory;
+      buf := allocate(memory, 2**30, name => "large");
+      buf := allocate(memory, 16, alignment => 2**30, name => "small", permissions => read_only);
+      check_equal(base_address(buf), 2**30);
+      check_equal(num_bytes(memory), 2**30 + 16);
+
+      check_equal(read_byte(memory, 2**29), 0);
+      assert get_permissions(memory, 2**29) = read_and_write;
+      assert get_permissions(memory, 2**30) = read_only;
+
+      write_integer(memory, 2**29, 16#7eadbeef#);
+      check_equal(read_integer(memory, 2**29), 16#7eadbeef#);
+      check_equal(describe_address(memory, 2**30 + 3),
+                  "address " & to_string(2**30 + 3) & " at offset 3 within buffer 'small' at range (" &
+                  to_string(2**30) & " to " & to_string(2**30 + 15) & ")");
+
+    elsif run("Test allocate within written page") then
+      memory := new_memory;
+      buf := allocate(memory, 1);
+      write_byte(memory, 0, 1);
+      buf := allocate(memory, 2, alignment => 2, permissions => read_only);
+
+      assert get_permissions(memory, 0) = read_and_write;
+      assert get_permissions(memory, 1) = no_access;
+      assert get_permissions(memory, 2) = read_only;
+      assert get_permissions(memory, 3) = read_only;
+      check_equal(read_byte(memory, 0), 1);
+
+    elsif run("Test describe address with many buffers") then
+      memory := new_memory;
+      for i in 0 to 99 loop
+        buf := allocate(memory, 10, name => "buffer" & to_string(i), alignment => 16);
+      end loop;
+
+      check_equal(describe_address(memory, 0),
+                  "address 0 at offset 0 within buffer 'buffer0' at range (0 to 9)");
+      check_equal(describe_address(memory, 16*57 + 9),
+                  "address 921 at offset 9 within buffer 'buffer57' at range (912 to 921)");
+      check_equal(describe_address(memory, 16*57 + 10),
+                  "address 922 at unallocated location");
+      check_equal(describe_address(memory, 16*99 + 9),
+                  "address 1593 at offset 9 within buffer 'buffer99' at range (1584 to 1593)");
     end if;
 
     test_runner_cleanup(runner);
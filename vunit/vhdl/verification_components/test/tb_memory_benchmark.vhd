@@ -0,0 +1,79 @@
+-- This Source Code Form is subject to the terms of the Mozilla Public
+-- License, v. 2.0. If a copy of the MPL was not distributed with this file,
+-- You can obtain one at http://mozilla.org/MPL/2.0/.
+--
+-- Copyright (c) 2014-2026, Lars Asplund lars.anders.asplund@gmail.com
+
+-- Benchmark of the memory model access rate. Each test makes num_accesses
+-- accesses to buffers scattered over a large address map such that the
+-- access rate is num_accesses divided by the test time reported by VUnit.
+
+library vunit_lib;
+context vunit_lib.vunit_context;
+
+use work.memory_pkg.all;
+
+entity tb_memory_benchmark is
+  generic (
+    runner_cfg : string;
+    num_buffers : positive := 1000;
+    buffer_size : positive := 64; -- Multiple of 4
+    buffer_alignment : positive := 2**20;
+    num_accesses : positive := 20000);
+end entity;
+
+architecture a of tb_memory_benchmark is
+begin
+
+  main : process
+    variable memory : memory_t;
+    variable buf : buffer_t;
+    variable seed : natural := 1;
+    variable address : natural;
+    variable sum : integer := 0;
+
+    -- Set address to a random word aligned address within one of the buffers
+    procedure random_address(result : out natural) is
+    begin
+      -- Linear congruential generator to avoid measuring a random number package
+      seed := (seed * 25173 + 13849) mod 65536;
+      result := (seed mod num_buffers) * buffer_alignment + 4 * ((seed / num_buffers) mod (buffer_size / 4));
+    end;
+
+  begin
+    test_runner_setup(runner, runner_cfg);
+
+    memory := new_memory;
+    for i in 0 to num_buffers - 1 loop
+      buf := allocate(memory, buffer_size, alignment => buffer_alignment);
+    end loop;
+    info("Allocated " & to_string(num_buffers) & " buffers over " & to_string(num_bytes(memory)) & " bytes");
+
+    while test_suite loop
+      if run("Test write_integer access rate") then
+        for i in 1 to num_accesses loop
+          random_address(address);
+          write_integer(memory, address, i);
+        end loop;
+
+      elsif run("Test read_integer access rate") then
+        -- Most reads are from pages that have not been written which requires a buffer lookup
+        for i in 1 to num_accesses loop
+          random_address(address);
+          sum := sum + read_integer(memory, address) mod 2;
+        end loop;
+
+      elsif run("Test write and read byte access rate") then
+        for i in 1 to num_accesses / 2 loop
+          random_address(address);
+          write_byte(memory, address, i mod 256);
+          check_equal(read_byte(memory, address), i mod 256);
+        end loop;
+      end if;
+
+      info("Made " & to_string(num_accesses) & " accesses");
+    end loop;
+
+    test_runner_cleanup(runner);
+  end process;
+end architecture;
@@ -14,6 +14,7 @@ import re
 from pathlib import Path
 import logging
 from vunit.cached import cached
+from vunit.hashing import hash_string
 from vunit.parsing.encodings import HDL_FILE_ENCODING
 
 LOGGER = logging.getLogger(__name__)
@@ -61,6 +62,8 @@ class VHDLDesignFile(object):  # pylint: disable=too-many-instance-attributes
         component_instantiations=None,
         configurations=None,
         references=None,
+        interface_hash=None,
+        design_unit_sections=None,
     ):
         self.entities = [] if entities is None else entities
         self.packages = [] if packages is None else packages
@@ -70,30 +73,224 @@ class VHDLDesignFile(object):  # pylint: disable=too-many-instance-attributes
         self.component_instantiations = [] if component_instantiations is None else component_instantiations
         self.configurations = [] if configurations is None else configurations
         self.references = [] if references is None else references
+        self.interface_hash = interface_hash
+        self.design_unit_sections = [] if design_unit_sections is None else design_unit_sections
 
     @classmethod
     def parse(cls, code):
         """
         Return a new VHDLDesignFile instance by parsing the code
         """
-        code = remove_comments(code).lower()
+        original_code = remove_comments(code)
+        code = original_code.lower()
+        if len(code) != len(original_code):
+            # Lower casing changed the positions, hash the lower case code instead
+            original_code = code
+
+        entities = list(VHDLEntity.find(code))
+        packages = list(VHDLPackage.find(code))
+        contexts = list(VHDLContext.find(code))
+        configurations = list(VHDLConfiguration.find(code))
+
+        # Re-analysing a primary unit makes all units depending on it obsolete, only a file without primary
+        # units has an interface which can stay the same when the file changes
+        has_primary_units = entities or packages or contexts or configurations
+
         return cls(
-            entities=list(VHDLEntity.find(code)),
+            interface_hash=None if has_primary_units else hash_string(cls._find_interface(code)),
+            design_unit_sections=VHDLDesignUnitSection.find(code, original_code),
+            entities=entities,
             architectures=list(VHDLArchitecture.find(code)),
-            packages=list(VHDLPackage.find(code)),
+            packages=packages,
             package_bodies=list(VHDLPackageBody.find(code)),
-            contexts=list(VHDLContext.find(code)),
-            component_instantiations=list(cls._component_re.findall(code)),
-            configurations=list(VHDLConfiguration.find(code)),
+            contexts=contexts,
+            component_instantiations=list(cls.find_component_instantiations(code)),
+            configurations=configurations,
             references=list(VHDLReference.find(code)),
         )
 
+    _secondary_unit_start_re = re.compile(
+        rf"\b(?:architecture\s+(?:{_ID_PATTERN})\s+of|package\s+body)\s+(?:{_ID_PATTERN})\s+is\b",
+        re.IGNORECASE,
+    )
+    _unit_start_re = re.compile(
+        r";\s*(?:library|use|context|entity|package|configuration|architecture)\b",
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    def _find_interface(cls, code):
+        """
+        Return the code seen by users of the secondary units within the code with normalized whitespace
+
+        This is the code with the bodies of architectures and package bodies removed. A body ends
+        where a statement starting like a context clause or a design unit is found which may be
+        earlier than the actual end of the body but never later.
+        """
+        interface = []
+        pos = 0
+        while True:
+            match = cls._secondary_unit_start_re.search(code, pos)
+            if match is None:
+                interface.append(code[pos:])
+                break
+
+            interface.append(code[pos : match.end()])
+            end = cls._unit_start_re.search(code, match.end())
+            if end is None:
+                break
+            pos = end.start() + 1
+
+        return " ".join(" ".join(interface).split())
+
     _component_re = re.compile(
         rf"(?:{_ID_PATTERN})\s*\:\s*(?:component)?\s*(?:(?:{_ID_PATTERN})\.)?({_ID_PATTERN})\s*"
         r"(?:generic|port) map\s*\([\s\w\=\>\,\.\)\(\+\-\*\/\'\"]*\);",
         re.IGNORECASE,
     )
 
+    @classmethod
+    def find_component_instantiations(cls, code):
+        """
+        Return the names of the instantiated components within the code
+        """
+        return cls._component_re.findall(code)
+
+
+class VHDLDesignUnitSection(object):
+    """
+    The code of a design unit including its context clause
+
+    A file is split into one section per design unit such that the code of each design unit can be
+    hashed separately. The code of a section starts after the end of the previous design unit. A
+    section which does not end like a design unit, for example since a nested package declaration
+    was taken as the start of the next design unit, is merged with the following section.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        unit_type,
+        identifier,
+        primary_identifier,
+        code_hash,
+        references,
+        component_instantiations,
+    ):
+        self.unit_type = unit_type
+        self.identifier = identifier
+        self.primary_identifier = primary_identifier
+        self.code_hash = code_hash
+        self.references = references
+        self.component_instantiations = component_instantiations
+
+    _unit_start_re = re.compile(
+        rf"""
+        (?:\A|(?<=;))                 # Start of code or end of previous statement
+        \s*                            # Potential whitespaces
+        (?:
+            (?P<unit_type>entity|package\s+body|package|context)
+        |
+            (?P<secondary_type>architecture|configuration)
+            \s+                        # At least one whitespace
+            (?P<secondary_id>{_ID_PATTERN})
+            \s+                        # At least one whitespace
+            of                         # of keyword
+        )
+        \s+                            # At least one whitespace
+        (?P<id>{_ID_PATTERN})           # An identifier
+        \s+                            # At least one whitespace
+        is\b                           # is keyword
+        (?P<instance>\s+new\b)?         # Package instantiation
+        """,
+        re.MULTILINE | re.IGNORECASE | re.VERBOSE,
+    )
+    _context_item_re = re.compile(r"\s*(?:library|use|context)\b", re.IGNORECASE)
+    _end_re = re.compile(r"\bend\b", re.IGNORECASE)
+
+    @classmethod
+    def find(cls, code, original_code=None):
+        """
+        Return the design unit sections of the lower case code without comments
+
+        The hashes are computed from the original_code which has the same positions as code
+        """
+        original_code = code if original_code is None else original_code
+        starts = []
+        lower_bound = 0
+        for match in cls._unit_start_re.finditer(code):
+            start = 0 if not starts else cls._context_clause_start(code, match.start(), lower_bound)
+            if starts and not cls._ends_like_design_unit(code[starts[-1][0] : start], starts[-1][1]):
+                # The previous section continues past this match
+                lower_bound = match.end()
+                continue
+            starts.append((start, match))
+            lower_bound = match.end()
+
+        sections = []
+        for idx, (start, match) in enumerate(starts):
+            end = starts[idx + 1][0] if idx + 1 < len(starts) else len(code)
+            sections.append(cls._create(match, code[start:end], original_code[start:end]))
+        return sections
+
+    @classmethod
+    def _context_clause_start(cls, code, start, lower_bound):
+        """
+        Return the start of the context clause in front of the design unit starting at start
+        """
+        while True:
+            end = code.rfind(";", lower_bound, start)
+            if end == -1:
+                return start
+
+            begin = code.rfind(";", lower_bound, end)
+            begin = lower_bound if begin == -1 else begin + 1
+            if not cls._context_item_re.match(code, begin, end):
+                return start
+            start = begin
+
+    @classmethod
+    def _ends_like_design_unit(cls, code, match):
+        """
+        Return True if code ends with the end of the design unit started by match
+        """
+        code = code.rstrip()
+        if not code.endswith(";"):
+            return False
+
+        if match.group("instance") is not None:
+            return True
+
+        # The end keyword is reserved and only found in statements ending a construct
+        return cls._end_re.search(code, code.rfind(";", 0, len(code) - 1) + 1) is not None
+
+    @classmethod
+    def _create(cls, match, code, original_code):
+        """
+        Create a section for the design unit started by match
+        """
+        identifier = match.group("id")
+        if match.group("secondary_type") is not None:
+            unit_type = match.group("secondary_type")
+            primary_identifier = identifier
+            if unit_type == "architecture":
+                identifier = match.group("secondary_id")
+            else:
+                # A configuration is a primary unit of the entity it configures
+                identifier, primary_identifier = match.group("secondary_id"), identifier
+        else:
+            unit_type = " ".join(match.group("unit_type").split())
+            primary_identifier = identifier
+
+        return cls(
+            unit_type=unit_type,
+            identifier=identifier,
+            primary_identifier=primary_identifier,
+            code_hash=hash_string(" ".join(original_code.split())),
+            references=VHDLReference.find(code),
+            component_instantiations=list(VHDLDesignFile.find_component_instantiations(code)),
+        )
+
 
 class VHDLPackageBody(object):
     """
@@ -63,7 +63,7 @@ class VUnitCLI(object):
         return self.parser.parse_args(args=argv)
 
 
-def _create_argument_parser(description=None, for_documentation=False):
+def _create_argument_parser(description=None, for_documentation=False):  # pylint: disable=too-many-statements
     """
     Create the argument parser
 
@@ -136,6 +136,40 @@ def _create_argument_parser(description=None, for_documentation=False):
         help="Continue compiling even after errors only skipping files that depend on failed files",
     )
 
+    parser.add_argument(
+        "--refresh-toolchains",
+        action="store_true",
+        default=False,
+        help=(
+            "Discard the cached simulator toolchain locations, versions and capabilities and detect them again. "
+            "The cache is kept in the output path and is refreshed automatically when PATH, "
+            "the VUNIT_<SIMULATOR_NAME>_PATH variables or the simulator executables change."
+        ),
+    )
+
+    parser.add_argument(
+        "--early-cutoff",
+        action="store_true",
+        default=False,
+        help=(
+            "Only recompile files depending on a changed file when the interface of its design units has changed. "
+            "Applies to files containing nothing but architectures and package bodies, where changes to the bodies "
+            "do not recompile dependent files, and to Verilog modules, where only changes to the ports and "
+            "parameters do. A file also containing an entity, package or other primary unit always recompiles "
+            "its dependent files since re-analysing the primary unit makes the units depending on it obsolete."
+        ),
+    )
+
+    parser.add_argument(
+        "--batch-compile",
+        action="store_true",
+        default=False,
+        help=(
+            "Compile consecutive files sharing library, file type, VHDL standard and compile options "
+            "with a single compiler invocation. Files of a failing batch are compiled one by one."
+        ),
+    )
+
     parser.add_argument(
         "--fail-fast",
         action="store_true",
@@ -174,6 +208,50 @@ def _create_argument_parser(description=None, for_documentation=False):
         help="Include only test_patterns that depend on file changes since the last recorded test run",
     )
 
+    parser.add_argument(
+        "--changed-granularity",
+        choices=["file", "design-unit", "test-case"],
+        default="file",
+        help=(
+            "How changes are found for --changed. "
+            "file compares the compile times of the files a test depends on with the start time of its last run. "
+            "design-unit compares the content hashes of the design units a test suite depends on with the hashes "
+            "of its last run. "
+            "test-case also separates the code of each test case within the test bench from the code of the others."
+        ),
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        default=False,
+        help=(
+            "Keep running after the first test run and watch the source files for changes. "
+            "Changed files and their dependents are re-compiled and the tests depending on them are re-run. "
+            "Stop with Ctrl-C."
+        ),
+    )
+
+    parser.add_argument(
+        "--watch-interval",
+        type=positive_float,
+        default=0.5,
+        help="Interval in seconds between polls for file changes in watch mode",
+    )
+
+    parser.add_argument(
+        "--shard",
+        default=None,
+        type=shard,
+        metavar="K/N",
+        help=(
+            "Only run shard K of N shards. The selected tests are partitioned into N shards with "
+            "near-equal expected execution time based on the test history. "
+            "The partitioning is the same for all shards given the same test history. "
+            "The test history of the shards can be merged with import_items."
+        ),
+    )
+
     parser.add_argument(
         "--test-prio",
         choices=["opt", "ordered"],
@@ -200,6 +278,17 @@ def _create_argument_parser(description=None, for_documentation=False):
         ),
     )
 
+    parser.add_argument(
+        "--xunit-xml-max-output",
+        type=nonnegative_int,
+        default=None,
+        help=(
+            "Only valid with --xunit-xml argument. "
+            "Limit the simulator output stored in the XML file for each test to its last N bytes. "
+            "Default is to store the full output."
+        ),
+    )
+
     parser.add_argument(
         "--exit-0",
         default=False,
@@ -254,6 +343,111 @@ def _create_argument_parser(description=None, for_documentation=False):
         ),
     )
 
+    parser.add_argument(
+        "--runner-backend",
+        choices=["thread", "process"],
+        default="thread",
+        help=(
+            "Controls how tests are run in parallel. "
+            '"thread" (default) = The output and results of all tests are handled by threads in the main process. '
+            '"process" = Each of the p workers is a separate process forked from the main process which only '
+            "sends the test results back to the main process. "
+            "pre_config and post_check are called in the worker process. Requires fork support."
+        ),
+    )
+
+    parser.add_argument(
+        "--cpu-budget",
+        type=positive_float,
+        default=None,
+        help=(
+            "Total CPU weight of the tests running in parallel. "
+            "The CPU weight of a test is set with the resources.cpu sim option and is 1 by default. "
+            "Defaults to the number of tests to run in parallel."
+        ),
+    )
+
+    parser.add_argument(
+        "--memory-budget",
+        type=positive_float,
+        default=None,
+        metavar="MB",
+        help=(
+            "Total memory in MB of the tests running in parallel. "
+            "The memory of a test is the largest of the resources.memory sim option and the peak memory "
+            "measured when the test was last run. Unlimited by default."
+        ),
+    )
+
+    parser.add_argument(
+        "--license-budget",
+        type=license_budget,
+        action="append",
+        default=[],
+        metavar="CLASS=N",
+        help=(
+            "Number of license tokens of a class available to the tests running in parallel. "
+            "A test uses one token of the class set with the resources.license sim option. "
+            "Can be given several times. Unlimited by default."
+        ),
+    )
+
+    parser.add_argument(
+        "--test-timeout",
+        type=positive_float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Wall-clock timeout of a test suite after which the simulator processes are killed and the tests "
+            "are marked as timed out. Used for tests without the timeout sim option and, with "
+            "--test-timeout-factor, without test history. Unlimited by default."
+        ),
+    )
+
+    parser.add_argument(
+        "--test-timeout-factor",
+        type=positive_float,
+        default=None,
+        metavar="K",
+        help=(
+            "Set the wall-clock timeout of a test suite without the timeout sim option to K times its "
+            "execution time in the test history, but at least 60 seconds."
+        ),
+    )
+
+    parser.add_argument(
+        "--keep-output",
+        choices=["all", "failed"],
+        default="all",
+        help=(
+            "Controls which test output is kept after the run. "
+            '"all" (default) = Keep the output of all tests, '
+            '"failed" = Only keep the output of test suites with a failed test.'
+        ),
+    )
+
+    parser.add_argument(
+        "--keep-output-runs",
+        type=positive_int,
+        default=None,
+        metavar="N",
+        help=(
+            "Only keep the test output of the test suites run in the last N runs. "
+            "Default is to keep the test output until the test suite is run again."
+        ),
+    )
+
+    parser.add_argument(
+        "--max-test-output-size",
+        type=positive_float,
+        default=None,
+        metavar="MB",
+        help=(
+            "Delete the oldest test output after the run until the total size of the test output "
+            "is at most this many MB. Unlimited by default."
+        ),
+    )
+
     parser.add_argument(
         "-u",
         "--unique-sim",
@@ -262,7 +456,52 @@ def _create_argument_parser(description=None, for_documentation=False):
         help="Do not re-use the same simulator process for running different test cases (slower)",
     )
 
-    parser.add_argument("--export-json", default=None, help="Export project information to a JSON file.")
+    parser.add_argument(
+        "--coordinator",
+        default=None,
+        type=network_address,
+        metavar="[HOST:]PORT",
+        help=(
+            "Compile the project and hand out the tests to workers connecting to this address "
+            "instead of running them locally. The workers are started with --worker. "
+            "The host defaults to 127.0.0.1. Other hosts require a token shared with the workers "
+            "in the VUNIT_DISTRIBUTED_TOKEN environment variable."
+        ),
+    )
+
+    parser.add_argument(
+        "--worker",
+        default=None,
+        type=network_address,
+        metavar="[HOST:]PORT",
+        help=(
+            "Run tests handed out by the coordinator at this address. "
+            "The worker must use the same run script and arguments as the coordinator and have access to the "
+            "compiled libraries, for example through a shared output path. "
+            "-p sets the number of tests run in parallel by the worker."
+        ),
+    )
+
+    parser.add_argument(
+        "--export-json",
+        default=None,
+        help=(
+            "Export project information to a compact JSON file. "
+            "The export is cached such that only changed files and test benches are re-scanned."
+        ),
+    )
+
+    parser.add_argument(
+        "--export-json-server",
+        default=None,
+        type=network_address,
+        metavar="[HOST:]PORT",
+        help=(
+            "Keep running and send the project information as one line of compact JSON to each client "
+            "connecting to this address. The host defaults to localhost. "
+            "Changed source files are re-scanned before each export. Stop with Ctrl-C."
+        ),
+    )
 
     parser.add_argument("--version", action="version", version=version())
 
@@ -307,6 +546,66 @@ def nonnegative_int(val):
         raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid non-negative int") from exv
 
 
+def positive_int(val):
+    """
+    ArgumentParse positive int check
+    """
+    try:
+        ival = int(val)
+        assert ival > 0
+        return ival
+    except (ValueError, AssertionError) as exv:
+        raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid positive int") from exv
+
+
+def positive_float(val):
+    """
+    ArgumentParse positive float check
+    """
+    try:
+        fval = float(val)
+        assert fval > 0
+        return fval
+    except (ValueError, AssertionError) as exv:
+        raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid positive float") from exv
+
+
+def license_budget(val):
+    """
+    ArgumentParse CLASS=N license budget check. Returns the license class and the number of tokens
+    """
+    try:
+        license_class, num_tokens = val.split("=")
+        assert license_class
+        return license_class, nonnegative_int(num_tokens)
+    except (ValueError, AssertionError, argparse.ArgumentTypeError) as exv:
+        raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid CLASS=N license budget") from exv
+
+
+def shard(val):
+    """
+    ArgumentParse K/N shard check. Returns a zero based shard index and the number of shards
+    """
+    try:
+        shard_num, num_shards = (int(value) for value in val.split("/"))
+        assert 1 <= shard_num <= num_shards
+        return shard_num - 1, num_shards
+    except (ValueError, AssertionError) as exv:
+        raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid K/N shard with 1 <= K <= N") from exv
+
+
+def network_address(val):
+    """
+    ArgumentParse [host:]port check
+    """
+    from vunit.test.distributed import parse_address  # pylint: disable=import-outside-toplevel
+
+    try:
+        return parse_address(val)
+    except ValueError as exv:
+        raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid [host:]port address") from exv
+
+
 def _parser_for_documentation():
     """
     Returns an argparse object used by sphinx for documentation in user_guide.rst